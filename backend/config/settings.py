@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import importlib.util
 import os
 import sys
 from datetime import timedelta
@@ -120,6 +121,56 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# A per-process LRU (L1) in front of a cache shared by all workers (L2).
+# Set REDIS_URL or MEMCACHED_LOCATION in production (requires the redis or
+# pymemcache client); otherwise L2 is a process-local LocMemCache stand-in.
+
+if redis_url := os.getenv("REDIS_URL"):
+    SHARED_CACHE = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": redis_url,
+    }
+elif memcached_location := os.getenv("MEMCACHED_LOCATION"):
+    SHARED_CACHE = {
+        "BACKEND": "django.core.cache.backends.memcached.PyMemcacheCache",
+        "LOCATION": memcached_location,
+    }
+else:
+    SHARED_CACHE = {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "shared-cache",
+    }
+
+CACHES = {
+    "default": {
+        "BACKEND": "core.cache_backends.TwoTierCache",
+        "OPTIONS": {
+            "L2_ALIAS": "shared",
+            "L1_MAX_ENTRIES": int(os.getenv("CACHE_L1_MAX_ENTRIES", "1000")),
+            "L1_TIMEOUT": int(os.getenv("CACHE_L1_TIMEOUT", "30")),
+            "L1_SYNC_INTERVAL": float(os.getenv("CACHE_L1_SYNC_INTERVAL", "1")),
+            # Generation counters and recompute locks must always be read
+            # from the shared cache
+            "L1_BYPASS_PREFIXES": ["generation:", "lock:"],
+        },
+    },
+    "shared": SHARED_CACHE,
+}
+
+# Background refreshes of dashboard and analytics payloads (see core.caching):
+# threads per process, and how many more refreshes may wait for a thread
+# before new ones are dropped
+CACHE_REFRESH_WORKERS = int(os.getenv("CACHE_REFRESH_WORKERS", "4"))
+CACHE_REFRESH_QUEUE_SIZE = int(os.getenv("CACHE_REFRESH_QUEUE_SIZE", "16"))
+
+
+# Query shape capture for the index advisor (see core.index_advisor):
+# set to a file path to record every query of the process to it.
+INDEX_ADVISOR_CAPTURE = os.getenv("INDEX_ADVISOR_CAPTURE")
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -170,6 +221,23 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # Custom user model
 AUTH_USER_MODEL = "core.User"
 
+# API renderers and parsers (see core/renderers.py)
+# API_JSON_BACKEND: "orjson" (default) or "stdlib" for DRF's json-based classes
+# API_MSGPACK: also serve and accept application/msgpack when msgpack is installed
+API_JSON_BACKEND = os.getenv("API_JSON_BACKEND", "orjson").lower()
+API_MSGPACK = os.getenv("API_MSGPACK", "True").lower() in ["true", "1", "yes"]
+API_MSGPACK = API_MSGPACK and importlib.util.find_spec("msgpack") is not None
+
+if API_JSON_BACKEND == "orjson":
+    API_RENDERER_CLASSES = ["core.renderers.ORJSONRenderer"]
+    API_PARSER_CLASSES = ["core.renderers.ORJSONParser"]
+else:
+    API_RENDERER_CLASSES = ["rest_framework.renderers.JSONRenderer"]
+    API_PARSER_CLASSES = ["rest_framework.parsers.JSONParser"]
+if API_MSGPACK:
+    API_RENDERER_CLASSES.append("core.renderers.MessagePackRenderer")
+    API_PARSER_CLASSES.append("core.renderers.MessagePackParser")
+
 # REST Framework settings
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
@@ -179,6 +247,13 @@ REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
     "EXCEPTION_HANDLER": "core.exception_handler.custom_exception_handler",
+    "DEFAULT_RENDERER_CLASSES": API_RENDERER_CLASSES
+    + ["rest_framework.renderers.BrowsableAPIRenderer"],
+    "DEFAULT_PARSER_CLASSES": API_PARSER_CLASSES
+    + [
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
 }
 
 # JWT Authentication settings
@@ -7,6 +7,7 @@ Core API Routes:
 - /api/v1/: Core REST API endpoints for all platform functionality
 - /api/v1/admin/dashboard/: Admin dashboard data and analytics
 - /api/v1/instructor/dashboard/: Instructor-specific views
+- /api/v1/batch/: Several GET requests in one round trip
 - /auth/: Authentication endpoints (login, logout, token refresh)
 - /users/profile/: User profile management
 
@@ -55,6 +56,7 @@ from core.views.dashboards import (
 )
 from core.views.enrollments import EnrollmentViewSet
 from core.views.health import health_check
+from core.views.misc import autocomplete_suggestions, batch_requests
 from core.views.quizzes import QuizOptionViewSet, QuizQuestionViewSet, QuizTaskViewSet
 from core.views.tasks import LearningTaskViewSet
 from core.views.users import UserProfileAPI, UserViewSet
@@ -122,6 +124,16 @@ analytics_urls = [
     ),
 ]
 
+# Search URLs
+search_urls = [
+    path("autocomplete/", autocomplete_suggestions, name="autocomplete"),
+]
+
+# Batched GET requests
+batch_urls = [
+    path("batch/", batch_requests, name="batch_requests"),
+]
+
 # Custom instructor URL
 instructor_urls = [
     path(
@@ -258,6 +270,8 @@ urlpatterns = [
     path("api/v1/", include(router.urls)),
     path("api/v1/", include(analytics_urls)),
     path("api/v1/", include(instructor_urls)),
+    path("api/v1/", include(search_urls)),
+    path("api/v1/", include(batch_urls)),
     path("auth/", include(auth_urls)),
     path("api-auth/", include("rest_framework.urls")),
     path("health/", health_check, name="health_check"),
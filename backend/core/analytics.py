@@ -0,0 +1,607 @@
+"""
+Set-based analytics computations for the Learning Platform.
+
+This module builds the payloads served by the analytics endpoints in
+``core.progress_api``. Every function runs a fixed number of grouped
+aggregate queries, so its cost does not grow with the number of students,
+tasks or quiz questions in a course.
+"""
+
+import logging
+from functools import reduce
+from operator import or_
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.db.models import (
+    Avg,
+    Count,
+    DurationField,
+    ExpressionWrapper,
+    F,
+    FilteredRelation,
+    FloatField,
+    Max,
+    Min,
+    Q,
+    Window,
+)
+from django.db.models.functions import Cast, Ceil, RowNumber
+
+from .models import (
+    Course,
+    CourseEnrollment,
+    LearningTask,
+    QuizAttempt,
+    QuizQuestion,
+    QuizResponse,
+    TaskProgress,
+)
+from .progress_summary import COUNTED_TASK_FILTER, calculate_percentage
+
+logger = logging.getLogger(__name__)
+
+# Task type buckets reported in course content distributions. LearningTask has
+# no type column; quizzes are identified by their QuizTask child row.
+CONTENT_TYPES = ("reading", "video", "quiz", "assignment", "discussion")
+
+# Per-student completion rate buckets, in percent
+COMPLETION_BUCKETS = {
+    "below_25": Q(rate__lt=25),
+    "25_to_50": Q(rate__gte=25, rate__lt=50),
+    "50_to_75": Q(rate__gte=50, rate__lt=75),
+    "above_75": Q(rate__gte=75),
+}
+
+# Questions below this success rate, with at least the minimum number of
+# responses, are reported as challenging content.
+CHALLENGING_SUCCESS_RATE = 50
+CHALLENGING_MIN_RESPONSES = 5
+
+
+def _rate(part, whole):
+    """Expression for ``part`` as a percentage of ``whole``."""
+    return Cast(part, FloatField()) * 100 / whole
+
+
+def course_analytics(course: Course) -> Dict[str, Any]:
+    """
+    Build the aggregated analytics payload for a course.
+
+    Runs five queries regardless of course size:
+    enrollment status counts, task counts, the per-student completion
+    histogram, the average quiz score and the per-question success rates.
+
+    Returns:
+        dict: enrollment_stats, completion_rates, average_scores,
+        content_distribution and challenging_content
+    """
+    enrollment_stats = CourseEnrollment.objects.filter(course=course).aggregate(
+        total=Count("id"),
+        active=Count("id", filter=Q(status="active")),
+        completed=Count("id", filter=Q(status="completed")),
+        dropped=Count("id", filter=Q(status="dropped")),
+    )
+
+    task_stats = LearningTask.objects.filter(course=course, is_deleted=False).aggregate(
+        counted=Count("id", filter=COUNTED_TASK_FILTER),
+        quiz=Count("id", filter=Q(quiztask__isnull=False)),
+    )
+    total_tasks = task_stats["counted"]
+
+    # Completion rate per student with any progress, bucketed in the database
+    histogram = dict.fromkeys(COMPLETION_BUCKETS, 0)
+    histogram["average"] = 0
+    if total_tasks > 0:
+        completed = Q(
+            status="completed", task__is_published=True, task__is_deleted=False
+        )
+        histogram = (
+            TaskProgress.objects.filter(task__course=course)
+            .values("user_id")
+            .annotate(rate=_rate(Count("id", filter=completed), total_tasks))
+            .order_by()
+            .aggregate(
+                average=Avg("rate"),
+                **{
+                    bucket: Count("user_id", filter=condition)
+                    for bucket, condition in COMPLETION_BUCKETS.items()
+                },
+            )
+        )
+
+    avg_quiz_score = (
+        QuizAttempt.objects.filter(
+            quiz__course=course, completion_status="completed"
+        ).aggregate(Avg("score"))["score__avg"]
+        or 0
+    )
+
+    challenging_questions = [
+        {
+            "id": row["question_id"],
+            "text": row["question__text"],
+            "quiz": row["question__quiz__title"],
+            "success_rate": round(row["success_rate"], 2),
+            "total_attempts": row["total"],
+        }
+        for row in QuizResponse.objects.filter(question__quiz__course=course)
+        .values("question_id", "question__text", "question__quiz__title")
+        .annotate(
+            total=Count("id"),
+            success_rate=_rate(Count("id", filter=Q(is_correct=True)), F("total")),
+        )
+        .filter(
+            total__gte=CHALLENGING_MIN_RESPONSES,
+            success_rate__lt=CHALLENGING_SUCCESS_RATE,
+        )
+        .order_by("success_rate", "question_id")[:10]
+    ]
+
+    total_enrollments = enrollment_stats["total"]
+    content_distribution = dict.fromkeys(CONTENT_TYPES, 0)
+    content_distribution["quiz"] = task_stats["quiz"]
+
+    return {
+        "enrollment_stats": {
+            **enrollment_stats,
+            "completion_percentage": (
+                round((enrollment_stats["completed"] / total_enrollments * 100), 2)
+                if total_enrollments > 0
+                else 0
+            ),
+        },
+        "completion_rates": {
+            "average": round(histogram["average"] or 0, 2),
+            "distribution": {
+                bucket: histogram[bucket] for bucket in COMPLETION_BUCKETS
+            },
+        },
+        "average_scores": {"quizzes": round(avg_quiz_score, 2)},
+        "content_distribution": content_distribution,
+        "challenging_content": {"questions": challenging_questions},
+    }
+
+
+# Completion time percentiles reported per task, using the nearest-rank method
+DURATION_PERCENTILES = {"median": 0.5, "p90": 0.9}
+
+
+def _hours(duration) -> float | None:
+    return round(duration.total_seconds() / 3600, 2) if duration is not None else None
+
+
+def _completion_durations(task_ids) -> Dict[int, Dict[str, Any]]:
+    """
+    Compute completion time percentiles per task in a single window query.
+
+    Completed progress rows are ranked by duration within their task and only
+    the rows sitting at each percentile's nearest rank are returned.
+    """
+    duration = ExpressionWrapper(
+        F("completion_date") - F("start_date"), output_field=DurationField()
+    )
+    ranks = {
+        name: Ceil(Window(Count("id"), partition_by=F("task_id")) * fraction)
+        for name, fraction in DURATION_PERCENTILES.items()
+    }
+    rows = (
+        TaskProgress.objects.filter(
+            task_id__in=task_ids,
+            status="completed",
+            start_date__isnull=False,
+            completion_date__isnull=False,
+        )
+        .annotate(
+            duration=duration,
+            position=Window(
+                RowNumber(), partition_by=F("task_id"), order_by=duration.asc()
+            ),
+            **{f"{name}_rank": rank for name, rank in ranks.items()},
+        )
+        .filter(reduce(or_, (Q(position=F(f"{name}_rank")) for name in ranks)))
+        .values_list("task_id", "position", "duration", *(f"{n}_rank" for n in ranks))
+    )
+    percentiles: Dict[int, Dict[str, Any]] = {}
+    for task_id, position, value, *task_ranks in rows:
+        for name, rank in zip(ranks, task_ranks):
+            if position == rank:
+                percentiles.setdefault(task_id, {})[name] = value
+    return percentiles
+
+
+def _quiz_analysis(quiz_ids) -> Dict[int, Dict[str, Any]]:
+    """Build per-quiz score and question statistics in two grouped queries."""
+    attempts = {
+        row["quiz_id"]: row
+        for row in QuizAttempt.objects.filter(
+            quiz_id__in=quiz_ids, completion_status="completed"
+        )
+        .values("quiz_id")
+        .annotate(average_score=Avg("score"), total=Count("id"))
+        .order_by()
+    }
+    questions: Dict[int, List[Dict[str, Any]]] = {}
+    question_rows = (
+        QuizQuestion.objects.filter(quiz_id__in=quiz_ids)
+        .values("id", "quiz_id", "text")
+        .annotate(
+            total=Count("responses"),
+            correct=Count("responses", filter=Q(responses__is_correct=True)),
+        )
+        .order_by("id")
+    )
+    for row in question_rows:
+        questions.setdefault(row["quiz_id"], []).append(
+            {
+                "question_id": row["id"],
+                "text": row["text"],
+                "success_rate": round(
+                    row["correct"] / row["total"] * 100 if row["total"] else 0, 2
+                ),
+                "total_responses": row["total"],
+            }
+        )
+    return {
+        quiz_id: {
+            "average_score": round(
+                attempts.get(quiz_id, {}).get("average_score") or 0, 2
+            ),
+            "total_attempts": attempts.get(quiz_id, {}).get("total", 0),
+            "question_analysis": sorted(
+                questions.get(quiz_id, []), key=lambda q: q["success_rate"]
+            ),
+        }
+        for quiz_id in quiz_ids
+    }
+
+
+def task_analytics(
+    course: Course, task_ids: Optional[Iterable[int]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Build per-task analytics for a course.
+
+    Runs a fixed number of queries regardless of the number of tasks,
+    students or quiz questions: the task list, one grouped query for status
+    counts and average completion time, one window query for completion time
+    percentiles, and two grouped queries for quiz scores and question
+    success rates. The results are merged in memory.
+
+    Args:
+        course: Course to analyse
+        task_ids: Optional subset of task IDs to restrict the analytics to
+
+    Returns:
+        list: Task analytics, sorted by ascending completion rate
+    """
+    tasks = LearningTask.objects.filter(course=course)
+    if task_ids is not None:
+        tasks = tasks.filter(id__in=task_ids)
+    tasks = list(tasks.values("id", "title", "quiztask"))
+    if not tasks:
+        return []
+    ids = [task["id"] for task in tasks]
+
+    duration = ExpressionWrapper(
+        F("completion_date") - F("start_date"), output_field=DurationField()
+    )
+    timed = Q(
+        status="completed", start_date__isnull=False, completion_date__isnull=False
+    )
+    status_counts = {
+        row["task_id"]: row
+        for row in TaskProgress.objects.filter(task_id__in=ids)
+        .values("task_id")
+        .annotate(
+            total=Count("id"),
+            completed=Count("id", filter=Q(status="completed")),
+            in_progress=Count("id", filter=Q(status="in_progress")),
+            not_started=Count("id", filter=Q(status="not_started")),
+            average=Avg(duration, filter=timed),
+        )
+        .order_by()
+    }
+    durations = _completion_durations(ids)
+    quizzes = _quiz_analysis(
+        [task["id"] for task in tasks if task["quiztask"] is not None]
+    )
+
+    results = []
+    for task in tasks:
+        counts = status_counts.get(task["id"], {})
+        total = counts.get("total", 0)
+        completed = counts.get("completed", 0)
+        completion_rate = completed / total * 100 if total > 0 else 0
+        task_durations = durations.get(task["id"], {})
+        task_data = {
+            "task_id": task["id"],
+            "title": task["title"],
+            "type": "quiz" if task["quiztask"] is not None else "task",
+            "completion_stats": {
+                "total_students": total,
+                "completed": completed,
+                "in_progress": counts.get("in_progress", 0),
+                "not_started": counts.get("not_started", 0),
+                "completion_rate": round(completion_rate, 2),
+                "avg_completion_time_hours": _hours(counts.get("average")),
+                **{
+                    f"{name}_completion_time_hours": _hours(task_durations.get(name))
+                    for name in DURATION_PERCENTILES
+                },
+            },
+            "difficulty_assessment": {
+                "estimated_difficulty": (
+                    "high"
+                    if completion_rate < 50
+                    else ("medium" if completion_rate < 80 else "low")
+                ),
+                "avg_attempts_to_complete": (
+                    round(total / completed, 2) if completed > 0 else None
+                ),
+            },
+        }
+        if task["id"] in quizzes:
+            task_data["quiz_analysis"] = quizzes[task["id"]]
+        results.append(task_data)
+
+    # Sort by completion rate (ascending, to highlight problematic tasks)
+    results.sort(key=lambda x: x["completion_stats"]["completion_rate"])
+    return results
+
+
+def _user_info(user) -> Dict[str, Any]:
+    return {
+        "id": user.id,
+        "username": user.username,
+        "email": user.email,
+        "full_name": f"{getattr(user, 'first_name', '')} {getattr(user, 'last_name', '')}".strip(),
+    }
+
+
+def attempt_statistics(user):
+    """
+    Return a queryset of the user's completed attempts with response counts.
+
+    Each row carries the quiz and course titles and the number of correct and
+    total responses, grouped in the database. The queryset is lazy, so callers
+    can slice or paginate it to keep memory bounded for users with thousands
+    of attempts.
+    """
+    return (
+        QuizAttempt.objects.filter(user=user, completion_status="completed")
+        .values(
+            "id",
+            "quiz_id",
+            "quiz__title",
+            "quiz__course__title",
+            "score",
+            "started_at",
+            "attempt_date",
+        )
+        .annotate(
+            correct=Count("responses", filter=Q(responses__is_correct=True)),
+            total=Count("responses"),
+        )
+        .order_by("-attempt_date", "-id")
+    )
+
+
+def attempt_payload(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Format a row of ``attempt_statistics`` for the API response."""
+    return {
+        "attempt_id": row["id"],
+        "quiz_id": row["quiz_id"],
+        "quiz_title": row["quiz__title"],
+        "course_title": row["quiz__course__title"],
+        "score": round(row["score"], 2),
+        "correct_answers": row["correct"],
+        "total_questions": row["total"],
+        "submission_time": row["attempt_date"],
+        "time_spent": (
+            str(row["attempt_date"] - row["started_at"]) if row["started_at"] else None
+        ),
+    }
+
+
+def student_quiz_performance(user, recent: int = 5) -> Dict[str, Any]:
+    """
+    Build the quiz performance payload for a student.
+
+    Runs three queries regardless of how many attempts or responses the
+    student has: one aggregate for the overall stats (passes are judged
+    against each quiz's own ``pass_threshold``), one grouped query for the
+    per-course breakdown and one grouped query for the response counts of
+    the most recent attempts.
+
+    QuizQuestion has no category or tag, so ``performance_by_category`` is
+    always empty.
+    """
+    attempts = QuizAttempt.objects.filter(user=user, completion_status="completed")
+    overall = attempts.aggregate(
+        total_attempts=Count("id"),
+        average_score=Avg("score"),
+        quizzes_passed=Count("id", filter=Q(score__gte=F("quiz__pass_threshold"))),
+    )
+    total_attempts = overall["total_attempts"]
+    if total_attempts == 0:
+        return {
+            "user_info": _user_info(user),
+            "overall_stats": {
+                "total_attempts": 0,
+                "average_score": 0,
+                "quizzes_passed": 0,
+                "quizzes_failed": 0,
+            },
+            "course_breakdown": [],
+            "recent_attempts": [],
+            "performance_by_category": [],
+        }
+
+    course_breakdown = [
+        {
+            "course_id": row["quiz__course_id"],
+            "course_title": row["quiz__course__title"],
+            "total_quizzes": row["total_quizzes"],
+            "total_attempts": row["total_attempts"],
+            "average_score": round(row["average_score"], 2),
+            "highest_score": round(row["highest_score"], 2),
+            "lowest_score": round(row["lowest_score"], 2),
+        }
+        for row in attempts.values("quiz__course_id", "quiz__course__title")
+        .annotate(
+            total_quizzes=Count("quiz_id", distinct=True),
+            total_attempts=Count("id"),
+            average_score=Avg("score"),
+            highest_score=Max("score"),
+            lowest_score=Min("score"),
+        )
+        .order_by("-average_score", "quiz__course_id")
+    ]
+
+    passed = overall["quizzes_passed"]
+    return {
+        "user_info": _user_info(user),
+        "overall_stats": {
+            "total_attempts": total_attempts,
+            "average_score": round(overall["average_score"] or 0, 2),
+            "quizzes_passed": passed,
+            "quizzes_failed": total_attempts - passed,
+            "pass_rate": round(passed / total_attempts * 100, 2),
+        },
+        "course_breakdown": course_breakdown,
+        "recent_attempts": [
+            attempt_payload(row) for row in attempt_statistics(user)[:recent]
+        ],
+        "performance_by_category": [],
+    }
+
+
+# Number of recent task progress updates reported per course
+RECENT_ACTIVITY_LIMIT = 3
+
+
+def student_progress(
+    user, course_ids: Optional[Iterable[int]] = None
+) -> Dict[str, Any]:
+    """
+    Build the cross-course progress payload for a student.
+
+    Runs four queries regardless of how many courses the student is enrolled
+    in: the enrollments, one grouped query over the courses' tasks
+    left-joined to the student's own progress, one window query for the
+    most recent activity per course and one grouped query for quiz scores.
+
+    Args:
+        user: Student whose progress is reported
+        course_ids: Optional subset of enrolled courses to report. When given
+            only ``user_info`` and the matching ``courses`` are returned, so a
+            single course card can be refreshed cheaply.
+    """
+    enrollments = CourseEnrollment.objects.filter(user=user)
+    if course_ids is not None:
+        enrollments = enrollments.filter(course_id__in=course_ids)
+    enrollments = list(
+        enrollments.values("course_id", "course__title", "status", "enrollment_date")
+    )
+    ids = [enrollment["course_id"] for enrollment in enrollments]
+
+    own_progress = FilteredRelation("progress", condition=Q(progress__user=user))
+    task_counts = {
+        row["course_id"]: row
+        for row in LearningTask.objects.filter(COUNTED_TASK_FILTER, course_id__in=ids)
+        .annotate(own_progress=own_progress)
+        .values("course_id")
+        .annotate(
+            total=Count("id"),
+            completed=Count("own_progress", filter=Q(own_progress__status="completed")),
+        )
+        .order_by()
+    }
+
+    recent_activity: Dict[int, List[Dict[str, Any]]] = {}
+    recent_rows = (
+        TaskProgress.objects.filter(user=user, task__course_id__in=ids)
+        .annotate(
+            position=Window(
+                RowNumber(),
+                partition_by=F("task__course_id"),
+                order_by=[F("updated_at").desc(), F("id").desc()],
+            )
+        )
+        .filter(position__lte=RECENT_ACTIVITY_LIMIT)
+        .values("task__course_id", "task__title", "status", "updated_at")
+        .order_by("task__course_id", "-updated_at", "-id")
+    )
+    for row in recent_rows:
+        recent_activity.setdefault(row.pop("task__course_id"), []).append(row)
+
+    quiz_rows = (
+        QuizAttempt.objects.filter(user=user, completion_status="completed")
+        .values("quiz__course_id")
+        .annotate(average=Avg("score"), attempts=Count("id"))
+        .order_by()
+    )
+    quiz_scores = {row["quiz__course_id"]: row for row in quiz_rows}
+
+    courses = []
+    for enrollment in enrollments:
+        course_id = enrollment["course_id"]
+        counts = task_counts.get(course_id, {})
+        total = counts.get("total", 0)
+        completed = counts.get("completed", 0)
+        quiz = quiz_scores.get(course_id, {})
+        activity = recent_activity.get(course_id, [])
+        courses.append(
+            {
+                "course_id": course_id,
+                "course_title": enrollment["course__title"],
+                "enrollment_status": enrollment["status"],
+                "enrollment_date": enrollment["enrollment_date"],
+                "progress_summary": {
+                    "completion_percentage": round(
+                        calculate_percentage(completed, total), 2
+                    ),
+                    "completed_tasks": completed,
+                    "total_tasks": total,
+                },
+                "assessment_performance": {
+                    "average_quiz_score": round(quiz.get("average") or 0, 2),
+                    "quiz_attempts": quiz.get("attempts", 0),
+                },
+                "recent_activity": activity,
+                "last_access": activity[0]["updated_at"] if activity else None,
+            }
+        )
+    courses.sort(key=lambda x: x["enrollment_date"], reverse=True)
+
+    if course_ids is not None:
+        return {"user_info": _user_info(user), "courses": courses}
+
+    total_tasks = sum(course["progress_summary"]["total_tasks"] for course in courses)
+    completed_tasks = sum(
+        course["progress_summary"]["completed_tasks"] for course in courses
+    )
+    statuses = [enrollment["status"] for enrollment in enrollments]
+    total_attempts = sum(row["attempts"] for row in quiz_scores.values())
+    average_quiz_score = (
+        sum(row["average"] * row["attempts"] for row in quiz_scores.values())
+        / total_attempts
+        if total_attempts
+        else 0
+    )
+    return {
+        "user_info": _user_info(user),
+        "overall_stats": {
+            "total_courses": len(enrollments),
+            "completed_courses": statuses.count("completed"),
+            "active_courses": statuses.count("active"),
+            "dropped_courses": statuses.count("dropped"),
+            "overall_completion": round(
+                calculate_percentage(completed_tasks, total_tasks), 2
+            ),
+            "total_tasks_completed": completed_tasks,
+            "total_tasks": total_tasks,
+            "average_quiz_score": round(average_quiz_score, 2),
+        },
+        "courses": courses,
+    }
@@ -13,6 +13,7 @@ database models, business logic, and API interfaces.
 """
 
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class CoreConfig(AppConfig):
@@ -35,8 +36,14 @@ class CoreConfig(AppConfig):
 
         This method:
         - Registers signal handlers
+        - Starts query shape capture when INDEX_ADVISOR_CAPTURE is set
         - Initializes custom model fields
         - Sets up logging configuration
         """
         # Import signals here to avoid import cycle
         import core.signals  # noqa
+
+        if settings.INDEX_ADVISOR_CAPTURE:
+            from core.index_advisor import install_capture
+
+            install_capture(settings.INDEX_ADVISOR_CAPTURE)
@@ -0,0 +1,332 @@
+"""
+In-process prefix index for search-as-you-type suggestions.
+
+Each worker keeps a sorted array of ``(key, kind, id)`` entries over course
+titles and learning task titles, where the keys are the lowercased title
+starting at each word. A prefix lookup is a binary search followed by a
+short scan, so suggestions cost no database query.
+
+Lifecycle:
+- The index is built lazily on the first lookup in each process
+- Course and task writes are recorded by the signal handlers in
+  ``core.signals`` in a numbered change log kept in the cache
+- Before each lookup a process replays new log entries, reloading only the
+  changed rows; it rebuilds when the log cannot be replayed (entries expired
+  or too far behind)
+
+Suggestions are filtered by the caller's visibility with the rules of
+``CourseViewSet.get_queryset``; tasks additionally need to be published
+unless the caller manages their course. Soft-deleted tasks are not indexed.
+
+The index is bounded by ``MEMORY_BUDGET`` (an estimate of the bytes held by
+its entries); rows that do not fit are left out and a warning is logged.
+"""
+
+import logging
+import re
+import sys
+import threading
+import time
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import Course, LearningTask
+
+logger = logging.getLogger(__name__)
+
+COURSE = "course"
+TASK = "task"
+
+# Keys of the change log; the sequence skips the two-tier cache's L1
+SEQUENCE_KEY = "generation:autocomplete"
+CHANGE_KEY = "autocomplete:change:{}"
+CHANGE_TIMEOUT = 60 * 60
+MAX_REPLAY = 500
+
+MEMORY_BUDGET = 64 * 1024 * 1024
+# Keys are cut to this length; longer prefixes only match on their start
+MAX_KEY_LENGTH = 48
+# Entries scanned per lookup, bounding lookups for very short prefixes
+MAX_SCAN = 5000
+# Rough size of an entry tuple and its slot in the array, excluding the key
+ENTRY_OVERHEAD = 72
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+Entry = Tuple[str, str, int]
+Ref = Tuple[str, int]
+
+
+class Suggestion(NamedTuple):
+    """An indexed course or task with what visibility checks need."""
+
+    kind: str
+    id: int
+    title: str
+    course_id: int
+    course_status: str
+    creator_id: int
+    is_published: bool = True
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "type": self.kind,
+            "id": self.id,
+            "title": self.title,
+            "course_id": self.course_id,
+        }
+
+
+def normalize(text: str) -> str:
+    """Lowercase text and collapse it to single-spaced words."""
+    return " ".join(_WORD_RE.findall(text.lower()))
+
+
+def title_keys(title: str) -> List[str]:
+    """Return the keys a title is indexed under: one per word start."""
+    normalized = normalize(title)
+    keys = []
+    for match in _WORD_RE.finditer(normalized):
+        key = normalized[match.start() :][:MAX_KEY_LENGTH]
+        if key not in keys:
+            keys.append(key)
+    return keys
+
+
+def can_see(user, item: Suggestion) -> bool:
+    """Apply the course (and task) visibility rules to an indexed item."""
+    manages = user.is_staff or user.is_superuser
+    owns = getattr(user, "role", None) == "instructor" and item.creator_id == user.pk
+    if not (manages or owns or item.course_status == "published"):
+        return False
+    return item.is_published or manages or owns
+
+
+def _course_rows(course_ids: Optional[Iterable[int]] = None) -> List[Suggestion]:
+    queryset = Course.objects.all()
+    if course_ids is not None:
+        queryset = queryset.filter(id__in=list(course_ids))
+    return [
+        Suggestion(COURSE, id, title, id, status, creator_id)
+        for id, title, status, creator_id in queryset.values_list(
+            "id", "title", "status", "creator_id"
+        )
+    ]
+
+
+def _task_rows(
+    task_ids: Optional[Iterable[int]] = None,
+    course_ids: Optional[Iterable[int]] = None,
+) -> List[Suggestion]:
+    queryset = LearningTask.objects.filter(is_deleted=False)
+    if task_ids is not None:
+        queryset = queryset.filter(id__in=list(task_ids))
+    if course_ids is not None:
+        queryset = queryset.filter(course_id__in=list(course_ids))
+    return [
+        Suggestion(TASK, *row)
+        for row in queryset.values_list(
+            "id",
+            "title",
+            "course_id",
+            "course__status",
+            "course__creator_id",
+            "is_published",
+        )
+    ]
+
+
+class PrefixIndex:
+    """Sorted array of title keys with incremental updates."""
+
+    def __init__(self, memory_budget: int = MEMORY_BUDGET):
+        self.memory_budget = memory_budget
+        self.sequence: Optional[int] = None
+        self._lock = threading.RLock()
+        self._clear()
+
+    def _clear(self) -> None:
+        self.memory_used = 0
+        self.truncated = False
+        self._entries: List[Entry] = []
+        self._items: Dict[Ref, Suggestion] = {}
+        self._tasks_by_course: Dict[int, Set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _entry_size(self, key: str) -> int:
+        return sys.getsizeof(key) + ENTRY_OVERHEAD
+
+    def add(self, item: Suggestion, sort: bool = True) -> bool:
+        """Index an item; returns False when it does not fit the budget."""
+        keys = title_keys(item.title)
+        size = sum(self._entry_size(key) for key in keys)
+        if self.memory_used + size > self.memory_budget:
+            if not self.truncated:
+                logger.warning(
+                    "Autocomplete index reached its memory budget of %d bytes; "
+                    "further titles are not suggested",
+                    self.memory_budget,
+                )
+            self.truncated = True
+            return False
+        for key in keys:
+            if sort:
+                insort(self._entries, (key, item.kind, item.id))
+            else:
+                self._entries.append((key, item.kind, item.id))
+        self.memory_used += size
+        self._items[(item.kind, item.id)] = item
+        if item.kind == TASK:
+            self._tasks_by_course.setdefault(item.course_id, set()).add(item.id)
+        return True
+
+    def remove(self, kind: str, obj_id: int) -> None:
+        item = self._items.pop((kind, obj_id), None)
+        if item is None:
+            return
+        for key in title_keys(item.title):
+            entry = (key, kind, obj_id)
+            position = bisect_left(self._entries, entry)
+            if position < len(self._entries) and self._entries[position] == entry:
+                del self._entries[position]
+                self.memory_used -= self._entry_size(key)
+        if kind == TASK:
+            self._tasks_by_course.get(item.course_id, set()).discard(obj_id)
+
+    def build(self) -> None:
+        """Load every course and task title."""
+        with self._lock:
+            # Read before loading rows so changes made meanwhile are replayed
+            self.sequence = current_sequence()
+            self._clear()
+            started = time.perf_counter()
+            for item in _course_rows() + _task_rows():
+                self.add(item, sort=False)
+            self._entries.sort()
+            logger.info(
+                "Built the autocomplete index: %d titles, %d keys, ~%d KiB in %.2fs",
+                len(self._items),
+                len(self._entries),
+                self.memory_used // 1024,
+                time.perf_counter() - started,
+            )
+
+    def apply_changes(self, changes: Iterable[Ref]) -> None:
+        """Reload the given courses and tasks from the database."""
+        course_ids = {obj_id for kind, obj_id in changes if kind == COURSE}
+        task_ids = {obj_id for kind, obj_id in changes if kind == TASK}
+        with self._lock:
+            # A course change also refreshes the course fields of its tasks
+            for course_id in course_ids:
+                task_ids |= self._tasks_by_course.pop(course_id, set())
+                self.remove(COURSE, course_id)
+            for task_id in task_ids:
+                self.remove(TASK, task_id)
+            items = []
+            if course_ids:
+                items += _course_rows(course_ids) + _task_rows(course_ids=course_ids)
+            if task_ids:
+                items += _task_rows(task_ids=task_ids)
+            for item in items:
+                if (item.kind, item.id) not in self._items:
+                    self.add(item)
+
+    def sync(self) -> None:
+        """Replay the change log, rebuilding when it cannot be replayed."""
+        with self._lock:
+            current = current_sequence()
+            if self.sequence is None or current == self.sequence:
+                return
+            missed = current - self.sequence
+            if missed < 0 or missed > MAX_REPLAY:
+                self.build()
+                return
+            keys = [CHANGE_KEY.format(n) for n in range(self.sequence + 1, current + 1)]
+            changes = cache.get_many(keys)
+            if len(changes) < len(keys):
+                self.build()
+                return
+            self.apply_changes(changes.values())
+            self.sequence = current
+
+    def suggest(self, query: str, user, limit: int = 10) -> List[Suggestion]:
+        """Return up to ``limit`` visible items with a word starting with query."""
+        prefix = normalize(query)[:MAX_KEY_LENGTH]
+        if not prefix:
+            return []
+        results: List[Suggestion] = []
+        seen: Set[Ref] = set()
+        with self._lock:
+            start = bisect_left(self._entries, (prefix,))
+            stop = min(start + MAX_SCAN, len(self._entries))
+            for position in range(start, stop):
+                key, kind, obj_id = self._entries[position]
+                if not key.startswith(prefix):
+                    break
+                item = self._items[(kind, obj_id)]
+                if (kind, obj_id) in seen or not can_see(user, item):
+                    continue
+                seen.add((kind, obj_id))
+                results.append(item)
+                if len(results) >= limit:
+                    break
+        return results
+
+
+def current_sequence() -> int:
+    """Return the change log position, initializing it when missing."""
+    sequence = cache.get(SEQUENCE_KEY)
+    if sequence is None:
+        # Seeded from the clock so a restarted log is always far ahead
+        cache.add(SEQUENCE_KEY, time.time_ns() // 1000, timeout=None)
+        sequence = cache.get(SEQUENCE_KEY)
+    return sequence
+
+
+def _record(kind: str, obj_id: int) -> None:
+    try:
+        sequence = cache.incr(SEQUENCE_KEY)
+    except ValueError:
+        current_sequence()
+        sequence = cache.incr(SEQUENCE_KEY)
+    cache.set(CHANGE_KEY.format(sequence), (kind, obj_id), CHANGE_TIMEOUT)
+
+
+def record_change(kind: str, obj_id: Optional[int]) -> None:
+    """Add a course or task write to the change log once it is committed."""
+    if obj_id is not None:
+        transaction.on_commit(lambda: _record(kind, obj_id))
+
+
+_index: Optional[PrefixIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_index() -> PrefixIndex:
+    """Return this process's index, building or syncing it as needed."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            index = PrefixIndex()
+            index.build()
+            _index = index
+            return index
+    _index.sync()
+    return _index
+
+
+def reset_index() -> None:
+    """Drop this process's index; the next lookup rebuilds it."""
+    global _index
+    with _index_lock:
+        _index = None
+
+
+def suggest(query: str, user, limit: int = 10) -> List[Suggestion]:
+    """Return course and task suggestions for a search box prefix."""
+    return get_index().suggest(query, user, limit)
@@ -0,0 +1,174 @@
+"""
+In-process execution of batched GET requests.
+
+Dashboard pages fan out into several API calls, each paying for JWT
+decoding, the logging middleware and a user lookup. ``run_batch`` runs a
+list of GET sub-requests through the URL resolver and the existing views
+inside one HTTP request instead:
+- Sub-requests share the batch request's authenticated user; they are not
+  authenticated again and skip the middleware
+- Views read DRF ``Response.data`` directly, so results are rendered once,
+  as part of the batch response
+- A per-batch memo shares ORM lookups between sub-requests; views fetch
+  instances through ``get_instance`` / ``get_instance_or_404``, which only
+  memoize while a batch is running
+
+Memoized instances are shared between the views of a batch, so views must
+treat them as read-only. Sub-requests never carry the batch request's
+conditional headers, so every result is a full 2xx/4xx/5xx response.
+"""
+
+import contextvars
+import json
+import logging
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from django.http import Http404, HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+MAX_SUB_REQUESTS = 20
+# Only API endpoints can be batched
+ALLOWED_PREFIX = "/api/v1/"
+BATCH_URL_NAME = "batch_requests"
+
+# Request headers that describe the batch request itself
+_DROPPED_META = (
+    "CONTENT_LENGTH",
+    "CONTENT_TYPE",
+    "HTTP_IF_MATCH",
+    "HTTP_IF_MODIFIED_SINCE",
+    "HTTP_IF_NONE_MATCH",
+    "HTTP_IF_UNMODIFIED_SINCE",
+)
+
+_memo: contextvars.ContextVar[Optional[Dict[Any, Any]]] = contextvars.ContextVar(
+    "batch_memo", default=None
+)
+
+
+def memoized(key: Any, compute: Callable[[], Any]) -> Any:
+    """Return ``compute()``, shared across the sub-requests of a batch."""
+    memo = _memo.get()
+    if memo is None:
+        return compute()
+    if key not in memo:
+        memo[key] = compute()
+    return memo[key]
+
+
+def _instance_key(model, pk: Any) -> tuple:
+    return ("instance", model._meta.label_lower, str(pk))
+
+
+def get_instance(model, pk: Any):
+    """
+    Return the instance of ``model`` with primary key ``pk``.
+
+    Raises:
+        model.DoesNotExist: If there is no such instance
+    """
+    return memoized(_instance_key(model, pk), lambda: model.objects.get(pk=pk))
+
+
+def get_instance_or_404(model, pk: Any):
+    """Like ``get_instance``, raising Http404 for a missing instance."""
+    try:
+        return get_instance(model, pk)
+    except model.DoesNotExist:
+        raise Http404(f"No {model._meta.object_name} matches the given query.")
+
+
+def _error(path: Any, status: int, message: str) -> Dict[str, Any]:
+    return {"path": path, "status": status, "body": {"error": message}}
+
+
+def _sub_request(request, path: str, query: str) -> HttpRequest:
+    sub = HttpRequest()
+    sub.method = "GET"
+    sub.path = sub.path_info = path
+    sub.META = {
+        key: value for key, value in request.META.items() if key not in _DROPPED_META
+    }
+    sub.META.update(REQUEST_METHOD="GET", PATH_INFO=path, QUERY_STRING=query)
+    sub.GET = QueryDict(query)
+    sub.COOKIES = request.COOKIES
+    sub.user = request.user
+    # Picked up by DRF's Request in place of the configured authenticators
+    sub._force_auth_user = request.user
+    sub._force_auth_token = request.auth
+    return sub
+
+
+def _body(response) -> Any:
+    if isinstance(response, Response):
+        return response.data
+    if response.streaming:
+        content = b"".join(response.streaming_content)
+    else:
+        content = response.content
+    if response.get("Content-Type", "").startswith("application/json"):
+        return json.loads(content or b"null")
+    return content.decode(response.charset or "utf-8")
+
+
+def run_sub_request(request, spec: Any) -> Dict[str, Any]:
+    """Resolve and run one sub-request; errors become its status code."""
+    if not isinstance(spec, dict) or not isinstance(spec.get("path"), str):
+        return _error(None, 400, "Each request must be an object with a path.")
+    path = spec["path"]
+    if spec.get("method", "GET").upper() != "GET":
+        return _error(path, 405, "Only GET requests can be batched.")
+    url = urlsplit(path)
+    if url.scheme or url.netloc or not url.path.startswith(ALLOWED_PREFIX):
+        return _error(path, 400, f"Path must start with {ALLOWED_PREFIX}")
+    try:
+        match = resolve(url.path)
+    except Resolver404:
+        return _error(path, 404, "Not found.")
+    if match.url_name == BATCH_URL_NAME:
+        return _error(path, 400, "Batches cannot be nested.")
+
+    sub = _sub_request(request, url.path, url.query)
+    sub.resolver_match = match
+    try:
+        response = match.func(sub, *match.args, **match.kwargs)
+        body = _body(response)
+    except Exception:
+        logger.exception("Batched request to %s failed", path)
+        return _error(path, 500, "An unexpected error occurred")
+    headers = {
+        name: value
+        for name, value in response.items()
+        if name.lower() not in ("content-type", "vary", "allow")
+    }
+    return {
+        "path": path,
+        "status": response.status_code,
+        "headers": headers,
+        "body": body,
+    }
+
+
+def run_batch(request, specs: List[Any]) -> List[Dict[str, Any]]:
+    """
+    Run GET sub-requests in order with the batch request's user.
+
+    Args:
+        request: The authenticated DRF request carrying the batch
+        specs: List of {"path": "/api/v1/...?query", "method": "GET"}
+
+    Returns:
+        list: One {"path", "status", "headers", "body"} per sub-request
+    """
+    memo: Dict[Any, Any] = {}
+    # The batch's own user serves lookups of that user by primary key
+    memo[_instance_key(type(request.user), request.user.pk)] = request.user
+    token = _memo.set(memo)
+    try:
+        return [run_sub_request(request, spec) for spec in specs]
+    finally:
+        _memo.reset(token)
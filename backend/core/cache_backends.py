@@ -0,0 +1,323 @@
+"""
+Two-tier cache backend for the Learning Platform.
+
+``TwoTierCache`` puts a small per-process LRU (L1) in front of a shared cache
+backend such as Redis or memcached (L2), configured as another alias in
+``CACHES``:
+- Reads are served from L1 when possible and fall back to L2, filling L1
+- Writes go to L2 and are broadcast so other processes drop their L1 copy
+- L1 is bounded by entry count and by a short TTL
+- Per-prefix hit/miss counters are kept for each tier
+
+The invalidation broadcast is stored in L2 itself as a numbered log of
+changed keys. Each process replays new log entries at most once per
+``L1_SYNC_INTERVAL`` seconds, so L1 copies are at most that stale; when the
+log cannot be replayed (entries expired or too far behind) L1 is cleared.
+Keys matching ``L1_BYPASS_PREFIXES`` are never held in L1, which suits
+counters such as cache generations that must be read fresh.
+
+Broadcasting makes writes of keys held in L1 cost three L2 round trips
+instead of one: the write itself, incrementing the log sequence and storing
+the log entry. The entry is keyed by the new sequence number, so it cannot
+be batched with the write. ``set_many`` and ``delete_many`` log all their
+keys in one entry, so they also cost three. Writes of bypassed keys cost
+one, so frequently written keys that gain little from L1 belong there.
+
+Options:
+    L2_ALIAS: CACHES alias of the shared backend (default: "shared")
+    L1_MAX_ENTRIES: Maximum number of L1 entries (default: 1000)
+    L1_TIMEOUT: Maximum lifetime of an L1 entry in seconds (default: 30)
+    L1_SYNC_INTERVAL: Seconds between invalidation log checks (default: 1)
+    L1_BYPASS_PREFIXES: Key prefixes that skip L1 (default: none)
+"""
+
+import logging
+import pickle
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, Iterable, List
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+logger = logging.getLogger(__name__)
+
+# Keys of the invalidation log kept in L2
+SEQUENCE_KEY = "__l1_invalidation_seq"
+LOG_KEY = "__l1_invalidation:{}"
+# Marker broadcast by clear() to drop every L1 entry
+CLEAR_ALL = "*"
+# How long invalidation log entries are kept, and how far a process may fall
+# behind before it clears its L1 instead of replaying the log
+LOG_TIMEOUT = 5 * 60
+MAX_REPLAY = 500
+
+_MISSING = object()
+
+
+def key_prefix(key: str) -> str:
+    """Return the stats prefix of a cache key: the part before the first ':'."""
+    return str(key).split(":", 1)[0]
+
+
+class LocalLRU:
+    """Thread-safe LRU of pickled values with per-entry expiry."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return _MISSING
+            expires_at, payload = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return _MISSING
+            self._data.move_to_end(key)
+        return pickle.loads(payload)
+
+    def set(self, key: str, value: Any, timeout: float) -> None:
+        if timeout <= 0 or self.max_entries <= 0:
+            self.delete(key)
+            return
+        payload = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._data[key] = (time.monotonic() + timeout, payload)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class TwoTierCache(BaseCache):
+    """Django cache backend with a per-process L1 in front of a shared L2."""
+
+    def __init__(self, location: str, params: Dict[str, Any]):
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self._l2_alias = options.get("L2_ALIAS", "shared")
+        self._l1 = LocalLRU(int(options.get("L1_MAX_ENTRIES", 1000)))
+        self._l1_timeout = float(options.get("L1_TIMEOUT", 30))
+        self._sync_interval = float(options.get("L1_SYNC_INTERVAL", 1))
+        self._bypass = tuple(options.get("L1_BYPASS_PREFIXES", ()))
+        self._seen_sequence = None
+        self._last_sync = 0.0
+        self._own_sequences: set = set()
+        self._sync_lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"l1_hits": 0, "l2_hits": 0, "misses": 0}
+        )
+
+    @property
+    def l2(self) -> BaseCache:
+        return caches[self._l2_alias]
+
+    # Statistics
+
+    def _record(self, key: str, outcome: str) -> None:
+        self._stats[key_prefix(key)][outcome] += 1
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return hit/miss counters and hit rate per key prefix."""
+        result = {}
+        for prefix, counts in self._stats.items():
+            total = sum(counts.values())
+            hits = counts["l1_hits"] + counts["l2_hits"]
+            result[prefix] = {**counts, "hit_rate": hits / total if total else 0}
+        return result
+
+    def reset_stats(self) -> None:
+        self._stats.clear()
+
+    # L1 bookkeeping
+
+    def _uses_l1(self, key: str) -> bool:
+        return not (self._bypass and str(key).startswith(self._bypass))
+
+    def _l1_timeout_for(self, timeout) -> float:
+        timeout = self.get_backend_timeout(timeout)
+        return self._l1_timeout if timeout is None else min(timeout, self._l1_timeout)
+
+    def _broadcast(self, full_keys: List[str]) -> None:
+        """Append changed keys to the invalidation log in L2."""
+        if not full_keys:
+            return
+        try:
+            sequence = self.l2.incr(SEQUENCE_KEY)
+        except ValueError:
+            self.l2.add(SEQUENCE_KEY, 0, timeout=None)
+            sequence = self.l2.incr(SEQUENCE_KEY)
+        self.l2.set(LOG_KEY.format(sequence), full_keys, timeout=LOG_TIMEOUT)
+        self._own_sequences.add(sequence)
+
+    def _sync(self) -> None:
+        """Replay invalidations broadcast by other processes."""
+        now = time.monotonic()
+        if now - self._last_sync < self._sync_interval:
+            return
+        with self._sync_lock:
+            if now - self._last_sync < self._sync_interval:
+                return
+            self._last_sync = now
+            current = self.l2.get(SEQUENCE_KEY, 0)
+            seen = self._seen_sequence
+            self._seen_sequence = current
+            if seen is None or current == seen:
+                return
+            if current < seen or current - seen > MAX_REPLAY:
+                self._l1.clear()
+                return
+            pending = [
+                sequence
+                for sequence in range(seen + 1, current + 1)
+                if sequence not in self._own_sequences
+            ]
+            self._own_sequences.difference_update(range(seen + 1, current + 1))
+            entries = self.l2.get_many([LOG_KEY.format(n) for n in pending])
+            if len(entries) < len(pending):
+                self._l1.clear()
+                return
+            for full_keys in entries.values():
+                if CLEAR_ALL in full_keys:
+                    self._l1.clear()
+                    return
+                for full_key in full_keys:
+                    self._l1.delete(full_key)
+
+    # Cache API
+
+    def get(self, key, default=None, version=None):
+        full_key = self.make_and_validate_key(key, version=version)
+        if self._uses_l1(key):
+            self._sync()
+            value = self._l1.get(full_key)
+            if value is not _MISSING:
+                self._record(key, "l1_hits")
+                return value
+        value = self.l2.get(key, _MISSING, version=version)
+        if value is _MISSING:
+            self._record(key, "misses")
+            return default
+        self._record(key, "l2_hits")
+        if self._uses_l1(key):
+            self._l1.set(full_key, value, self._l1_timeout)
+        return value
+
+    def get_many(self, keys: Iterable, version=None) -> Dict[str, Any]:
+        keys = list(keys)
+        found = {}
+        remaining = []
+        self._sync()
+        for key in keys:
+            full_key = self.make_and_validate_key(key, version=version)
+            value = self._l1.get(full_key) if self._uses_l1(key) else _MISSING
+            if value is _MISSING:
+                remaining.append(key)
+            else:
+                self._record(key, "l1_hits")
+                found[key] = value
+        if remaining:
+            from_l2 = self.l2.get_many(remaining, version=version)
+            for key in remaining:
+                if key not in from_l2:
+                    self._record(key, "misses")
+                    continue
+                self._record(key, "l2_hits")
+                found[key] = from_l2[key]
+                if self._uses_l1(key):
+                    self._l1.set(
+                        self.make_key(key, version=version),
+                        from_l2[key],
+                        self._l1_timeout,
+                    )
+        return found
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        full_key = self.make_and_validate_key(key, version=version)
+        self.l2.set(key, value, timeout=timeout, version=version)
+        if self._uses_l1(key):
+            self._l1.set(full_key, value, self._l1_timeout_for(timeout))
+            self._broadcast([full_key])
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = self.l2.add(key, value, timeout=timeout, version=version)
+        if added and self._uses_l1(key):
+            full_key = self.make_and_validate_key(key, version=version)
+            self._l1.set(full_key, value, self._l1_timeout_for(timeout))
+            self._broadcast([full_key])
+        return added
+
+    def set_many(self, data: Dict, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = self.l2.set_many(data, timeout=timeout, version=version)
+        changed = []
+        for key, value in data.items():
+            if key in failed or not self._uses_l1(key):
+                continue
+            full_key = self.make_and_validate_key(key, version=version)
+            self._l1.set(full_key, value, self._l1_timeout_for(timeout))
+            changed.append(full_key)
+        self._broadcast(changed)
+        return failed
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.l2.touch(key, timeout=timeout, version=version)
+
+    def _invalidate(self, keys: Iterable, version=None) -> None:
+        changed = []
+        for key in keys:
+            if self._uses_l1(key):
+                full_key = self.make_and_validate_key(key, version=version)
+                self._l1.delete(full_key)
+                changed.append(full_key)
+        self._broadcast(changed)
+
+    def delete(self, key, version=None):
+        deleted = self.l2.delete(key, version=version)
+        self._invalidate([key], version=version)
+        return deleted
+
+    def delete_many(self, keys: Iterable, version=None):
+        keys = list(keys)
+        self.l2.delete_many(keys, version=version)
+        self._invalidate(keys, version=version)
+
+    def has_key(self, key, version=None):
+        full_key = self.make_and_validate_key(key, version=version)
+        if self._uses_l1(key):
+            self._sync()
+            if self._l1.get(full_key) is not _MISSING:
+                return True
+        return self.l2.has_key(key, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        value = self.l2.incr(key, delta, version=version)
+        self._invalidate([key], version=version)
+        return value
+
+    def decr(self, key, delta=1, version=None):
+        value = self.l2.decr(key, delta, version=version)
+        self._invalidate([key], version=version)
+        return value
+
+    def clear(self):
+        self.l2.clear()
+        self._l1.clear()
+        self._broadcast([CLEAR_ALL])
+
+    def close(self, **kwargs):
+        self.l2.close(**kwargs)
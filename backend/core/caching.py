@@ -0,0 +1,543 @@
+"""
+Generation-based cache invalidation for dashboard and analytics payloads.
+
+Every user and course has a generation counter stored in the cache. Cache
+keys embed the generations of the user or course they were computed for, so
+bumping a counter invalidates every dependent entry in O(1) without tracking
+or deleting individual keys.
+
+Courses have two counters: the course generation changes on any write to
+the course, its content or its learners' activity, while the course content
+generation only changes with the course and its tasks. Per-user payloads
+(e.g. a student's dashboard) read the user's own rows plus course content,
+so they record the content generations of their courses inside the cached
+entry, and a classmate's progress does not evict them; a read is only a hit
+while all recorded generations are unchanged.
+
+Counters are bumped from the signal handlers in ``core.signals`` on writes
+to TaskProgress, QuizAttempt, CourseEnrollment, LearningTask and Course.
+
+``get_or_compute`` wraps a lookup and its recompute with stampede protection:
+only the request holding a short-lived lock recomputes a missing entry while
+concurrent requests wait for its result, and hot entries are refreshed
+shortly before they expire (probabilistic early expiry) while the current
+value keeps being served.
+
+``serve_cached`` is what views use. It serves payloads past a soft TTL
+immediately and refreshes them in the background (stale-while-revalidate),
+and recomputes misses through ``get_or_compute``; when a last good copy
+exists, that recompute runs in the background and the copy is served (marked
+as degraded) if it fails or takes longer than a time budget.
+
+Background work runs on a pool of ``CACHE_REFRESH_WORKERS`` threads with
+room for ``CACHE_REFRESH_QUEUE_SIZE`` more waiting tasks. When the pool is
+full new work is dropped rather than queued: the refresh is left to a later
+request (releasing its lock), and a budgeted recompute serves the last good
+copy right away.
+"""
+
+import logging
+import math
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as RecomputeTimeout
+from typing import Any, Callable, Dict, Iterable, NamedTuple, Optional, Tuple, Union
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, connections
+
+from .models import LearningTask
+
+logger = logging.getLogger(__name__)
+
+USER = "user"
+COURSE = "course"
+# Course and task content only, for payloads that read no other learners' rows
+CONTENT = "content"
+# Per-model counters (keyed by model label) for endpoints that list content
+MODEL = "model"
+# MODEL counter for the user fields course payloads show about their creator;
+# "core.user" itself changes with every login
+COURSE_CREATOR = "core.user.course_creator"
+
+# Default lifetime of generation-keyed entries; stale entries are never
+# served, so this only bounds how long unreachable entries occupy the cache.
+DEFAULT_TIMEOUT = 6 * 60 * 60
+
+# Single-flight recompute: how long the recompute lock is held at most, how
+# long concurrent requests wait for its result, and how often they check
+LOCK_TIMEOUT = 30
+WAIT_TIMEOUT = 10
+POLL_INTERVAL = 0.05
+
+# Early expiry: larger values refresh earlier (1.0 is the usual choice)
+EARLY_EXPIRY_BETA = 1.0
+
+# serve_cached: entries older than SOFT_TTL are refreshed in the background;
+# the last good copy of a payload is kept for HARD_TTL and served when a
+# recompute fails or has not finished within RECOMPUTE_BUDGET seconds
+SOFT_TTL = 5 * 60
+HARD_TTL = 24 * 60 * 60
+RECOMPUTE_BUDGET = 2
+
+FRESH = "fresh"
+STALE = "stale"
+DEGRADED = "degraded"
+CACHE_STATUS_HEADER = "X-Cache-Status"
+
+_MISSING = object()
+
+_refresh_executor = ThreadPoolExecutor(
+    max_workers=settings.CACHE_REFRESH_WORKERS, thread_name_prefix="cache-refresh"
+)
+# Running plus waiting background tasks; more are dropped (see _in_background)
+_refresh_slots = threading.BoundedSemaphore(
+    settings.CACHE_REFRESH_WORKERS + settings.CACHE_REFRESH_QUEUE_SIZE
+)
+
+
+def _generation_key(scope: str, obj_id: int) -> str:
+    return f"generation:{scope}:{obj_id}"
+
+
+def _lock_key(key: str) -> str:
+    return f"lock:{key}"
+
+
+def _initial_generation() -> int:
+    # Seeded from the clock so a counter that was evicted from the cache never
+    # restarts at a value an older entry was stored under.
+    return time.time_ns() // 1000
+
+
+def get_generations(scope: str, ids: Iterable[Any]) -> Dict[Any, int]:
+    """
+    Return the current generation of each object, initializing missing ones.
+
+    Uses a single ``get_many`` round trip when every counter exists.
+    """
+    keys = {_generation_key(scope, obj_id): obj_id for obj_id in set(ids)}
+    if not keys:
+        return {}
+    found = cache.get_many(keys)
+    generations = {keys[key]: value for key, value in found.items()}
+    for key in keys.keys() - found.keys():
+        value = _initial_generation()
+        if not cache.add(key, value, timeout=None):
+            value = cache.get(key, value)
+        generations[keys[key]] = value
+    return generations
+
+
+def bump_generation(scope: str, obj_id: Optional[Any]) -> None:
+    """Invalidate every cache entry that depends on the given object."""
+    if obj_id is None:
+        return
+    key = _generation_key(scope, obj_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Not initialized yet: nothing can depend on it, so just create it
+        cache.add(key, _initial_generation(), timeout=None)
+
+
+def versioned_key(
+    base: str, users: Iterable[int] = (), courses: Iterable[int] = ()
+) -> str:
+    """Return ``base`` with the current user and course generations embedded."""
+    parts = [base]
+    for scope, ids in ((USER, users), (COURSE, courses)):
+        generations = get_generations(scope, ids)
+        parts.extend(
+            f"{scope[0]}{obj_id}.{generation}"
+            for obj_id, generation in sorted(generations.items())
+        )
+    return ":".join(parts)
+
+
+def _read_entry(key: str) -> Optional[Dict[str, Any]]:
+    entry = cache.get(key, _MISSING)
+    if entry is _MISSING or not isinstance(entry, dict) or "data" not in entry:
+        return None
+    for scope, field in ((COURSE, "courses"), (CONTENT, "content")):
+        recorded = entry.get(field) or {}
+        if recorded and get_generations(scope, recorded) != recorded:
+            return None
+    return entry
+
+
+def get_cached(key: str) -> Tuple[bool, Any]:
+    """
+    Look up an entry stored with ``set_cached``.
+
+    Returns:
+        tuple: (hit, data); a hit requires every course and course content
+        generation recorded with the entry to still be current
+    """
+    entry = _read_entry(key)
+    if entry is None:
+        return False, None
+    return True, entry["data"]
+
+
+def set_cached(
+    key: str,
+    data: Any,
+    timeout: int = DEFAULT_TIMEOUT,
+    courses: Iterable[int] = (),
+    compute_time: float = 0.0,
+    content: Iterable[int] = (),
+) -> None:
+    """
+    Store ``data`` under ``key``, recording the generations it depends on.
+
+    Args:
+        key: Usually built with ``versioned_key``
+        data: The payload to cache
+        timeout: Lifetime in seconds
+        courses: Courses the payload depends on beyond those in the key
+        compute_time: Seconds it took to compute ``data``; used for early expiry
+        content: Courses whose content (but not activity) the payload depends on
+    """
+    cache.set(
+        key,
+        {
+            "data": data,
+            "courses": get_generations(COURSE, courses),
+            "content": get_generations(CONTENT, content),
+            "expires": time.time() + timeout if timeout else None,
+            "compute_time": compute_time,
+            "computed_at": time.time(),
+        },
+        timeout,
+    )
+
+
+def _refresh_early(entry: Dict[str, Any]) -> bool:
+    # XFetch: the chance of refreshing grows as expiry approaches, and
+    # entries that are expensive to compute are refreshed earlier
+    expires, compute_time = entry.get("expires"), entry.get("compute_time")
+    if not expires or not compute_time:
+        return False
+    jitter = -math.log(1.0 - random.random())
+    return time.time() + compute_time * EARLY_EXPIRY_BETA * jitter >= expires
+
+
+def _acquire_lock(key: str) -> bool:
+    return cache.add(_lock_key(key), 1, LOCK_TIMEOUT)
+
+
+def _compute_and_store(
+    key: str,
+    compute: Callable[[], Any],
+    timeout: int,
+    courses: Any,
+    locked: bool,
+    fallback_key: Optional[str] = None,
+    content: Any = (),
+) -> Any:
+    started = time.monotonic()
+    try:
+        data = compute()
+        set_cached(
+            key,
+            data,
+            timeout,
+            courses(data) if callable(courses) else courses,
+            compute_time=time.monotonic() - started,
+            content=content(data) if callable(content) else content,
+        )
+        if fallback_key is not None:
+            cache.set(
+                fallback_key, {"data": data, "computed_at": time.time()}, HARD_TTL
+            )
+    finally:
+        if locked:
+            cache.delete(_lock_key(key))
+    return data
+
+
+def _await_entry(key: str, wait: float) -> Tuple[Optional[Dict[str, Any]], bool]:
+    """
+    Poll for an entry another caller is computing.
+
+    Returns:
+        tuple: (entry, locked); ``locked`` is True when the other caller gave
+        up without storing a result and this caller took over the lock
+    """
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL)
+        entry = _read_entry(key)
+        if entry is not None:
+            return entry, False
+        if _acquire_lock(key):
+            return None, True
+    return None, False
+
+
+def get_or_compute(
+    key: str,
+    compute: Callable[[], Any],
+    timeout: int = DEFAULT_TIMEOUT,
+    courses: Union[Iterable[int], Callable[[Any], Iterable[int]]] = (),
+    content: Union[Iterable[int], Callable[[Any], Iterable[int]]] = (),
+    fallback_key: Optional[str] = None,
+) -> Any:
+    """
+    Return the entry cached under ``key``, computing it at most once at a time.
+
+    On a miss one caller takes a short-lived lock and recomputes; concurrent
+    callers poll for its result for up to ``WAIT_TIMEOUT`` seconds and then
+    compute it themselves. Entries close to expiry are refreshed early by a
+    single caller while the others keep receiving the current value.
+
+    Args:
+        key: Usually built with ``versioned_key``
+        compute: Callable returning the payload
+        timeout: Lifetime in seconds
+        courses: Courses the payload depends on, or a callable deriving
+            them from the computed payload
+        content: Courses whose content the payload depends on, likewise
+        fallback_key: Where to also keep a computed payload as the last
+            good copy
+
+    Returns:
+        The cached or freshly computed payload
+    """
+
+    def compute_and_store(locked: bool) -> Any:
+        return _compute_and_store(
+            key, compute, timeout, courses, locked, fallback_key, content
+        )
+
+    entry = _read_entry(key)
+    if entry is not None:
+        if _refresh_early(entry) and _acquire_lock(key):
+            return compute_and_store(locked=True)
+        return entry["data"]
+
+    locked = _acquire_lock(key)
+    if not locked:
+        entry, locked = _await_entry(key, WAIT_TIMEOUT)
+        if entry is not None:
+            return entry["data"]
+        if not locked:
+            logger.warning("Timed out waiting for %s to be computed", key)
+    return compute_and_store(locked=locked)
+
+
+class CachedPayload(NamedTuple):
+    """A payload returned by ``serve_cached`` with its freshness."""
+
+    data: Any
+    status: str
+    age: float
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        """Response headers describing the freshness of the payload."""
+        return {CACHE_STATUS_HEADER: self.status, "Age": str(int(self.age))}
+
+
+def _last_good_key(base: str, users: Iterable[int], courses: Iterable[int]) -> str:
+    ids = [f"u{obj_id}" for obj_id in sorted(users)]
+    ids += [f"c{obj_id}" for obj_id in sorted(courses)]
+    return ":".join(["last_good", base, *ids])
+
+
+def _in_background(func: Callable[[], Any]) -> Optional[Future]:
+    """Run ``func`` on the refresh pool; returns None when the pool is full."""
+    if not _refresh_slots.acquire(blocking=False):
+        return None
+
+    def run() -> Any:
+        try:
+            return func()
+        finally:
+            connections.close_all()
+            _refresh_slots.release()
+
+    try:
+        return _refresh_executor.submit(run)
+    except BaseException:
+        _refresh_slots.release()
+        raise
+
+
+def _refresh_in_background(
+    key: str, compute: Callable[[], Any], content: Any, fallback_key: str
+) -> None:
+    def refresh() -> None:
+        try:
+            _compute_and_store(
+                key, compute, DEFAULT_TIMEOUT, (), True, fallback_key, content
+            )
+        except Exception:
+            logger.exception("Background refresh of %s failed", key)
+
+    if _in_background(refresh) is None:
+        logger.warning("Cache refresh pool is full; not refreshing %s", key)
+        cache.delete(_lock_key(key))
+
+
+def _within_budget(recompute: Callable[[], Any]) -> Any:
+    """
+    Run ``recompute`` in the background and wait up to ``RECOMPUTE_BUDGET``.
+
+    Raises ``RecomputeTimeout`` when it takes longer; it keeps running and
+    stores its result. Also raises it, without running ``recompute``, when
+    the refresh pool is full. Inside a transaction it runs inline, since
+    another thread would not see the transaction's uncommitted writes.
+    """
+    if connection.in_atomic_block:
+        return recompute()
+    future = _in_background(recompute)
+    if future is None:
+        raise RecomputeTimeout("cache refresh pool is full")
+    return future.result(timeout=RECOMPUTE_BUDGET)
+
+
+def serve_cached(
+    base: str,
+    compute: Callable[[], Any],
+    users: Iterable[int] = (),
+    courses: Iterable[int] = (),
+    depends_on: Union[Iterable[int], Callable[[Any], Iterable[int]]] = (),
+) -> CachedPayload:
+    """
+    Serve a payload with stale-while-revalidate and degraded-mode fallback.
+
+    - Entries younger than ``SOFT_TTL`` are served as fresh
+    - Older entries are served as stale and refreshed in the background
+    - After a write invalidated the entry it is recomputed through
+      ``get_or_compute``; if that fails or takes longer than
+      ``RECOMPUTE_BUDGET`` seconds, the last good copy (kept for up to
+      ``HARD_TTL`` seconds) is served as degraded while the recompute
+      finishes in the background
+
+    Args:
+        base: Key prefix, as passed to ``versioned_key``
+        compute: Callable returning the payload
+        users: Users the key is versioned on
+        courses: Courses the key is versioned on
+        depends_on: Courses whose content (not activity) the payload depends
+            on, or a callable deriving them from the computed payload
+
+    Returns:
+        CachedPayload: the payload with its freshness status and age
+    """
+    users, courses = list(users), list(courses)
+    key = versioned_key(base, users, courses)
+    fallback_key = _last_good_key(base, users, courses)
+
+    entry = _read_entry(key)
+    if entry is not None:
+        age = max(time.time() - entry.get("computed_at", 0), 0)
+        if age < SOFT_TTL:
+            return CachedPayload(entry["data"], FRESH, age)
+        if _acquire_lock(key):
+            _refresh_in_background(key, compute, depends_on, fallback_key)
+        return CachedPayload(entry["data"], STALE, age)
+
+    def recompute() -> Any:
+        return get_or_compute(
+            key, compute, content=depends_on, fallback_key=fallback_key
+        )
+
+    last_good = cache.get(fallback_key)
+    if last_good is None:
+        return CachedPayload(recompute(), FRESH, 0)
+    try:
+        data = _within_budget(recompute)
+    except RecomputeTimeout:
+        logger.warning("Recomputing %s is over budget; serving the last good copy", key)
+        return _degraded(last_good)
+    except Exception:
+        logger.exception("Recomputing %s failed; serving the last good copy", key)
+        return _degraded(last_good)
+    return CachedPayload(data, FRESH, 0)
+
+
+def _degraded(last_good: Dict[str, Any]) -> CachedPayload:
+    age = max(time.time() - last_good["computed_at"], 0)
+    return CachedPayload(last_good["data"], DEGRADED, age)
+
+
+def cached_version(
+    base: str, users: Iterable[int] = (), courses: Iterable[int] = ()
+) -> Optional[Tuple[str, float]]:
+    """
+    Identify the payload ``serve_cached`` would currently serve, without computing it.
+
+    Returns:
+        tuple: (version, computed_at) of the current entry, or None when the
+        payload would have to be recomputed
+    """
+    key = versioned_key(base, users, courses)
+    entry = _read_entry(key)
+    if entry is None or "computed_at" not in entry:
+        return None
+    return f"{key}:{entry['computed_at']}", entry["computed_at"]
+
+
+def _task_course_id(task_id: int, task=None) -> Optional[int]:
+    if task is not None:
+        return task.course_id
+    return (
+        LearningTask.objects.filter(pk=task_id)
+        .values_list("course_id", flat=True)
+        .first()
+    )
+
+
+def progress_changed(progress) -> None:
+    """Invalidate caches after a TaskProgress row is written or deleted."""
+    task_field = progress._meta.get_field("task")
+    task = progress.task if task_field.is_cached(progress) else None
+    bump_generation(USER, progress.user_id)
+    bump_generation(COURSE, _task_course_id(progress.task_id, task))
+
+
+def attempt_changed(attempt) -> None:
+    """Invalidate caches after a QuizAttempt is written or deleted."""
+    quiz_field = attempt._meta.get_field("quiz")
+    quiz = attempt.quiz if quiz_field.is_cached(attempt) else None
+    bump_generation(USER, attempt.user_id)
+    bump_generation(COURSE, _task_course_id(attempt.quiz_id, quiz))
+
+
+def enrollment_changed(enrollment) -> None:
+    """Invalidate caches after a CourseEnrollment is written or deleted."""
+    bump_generation(USER, enrollment.user_id)
+    bump_generation(COURSE, enrollment.course_id)
+
+
+def task_changed(task) -> None:
+    """Invalidate caches after a LearningTask is written or deleted."""
+    previous = getattr(task, "_summary_state", None)
+    course_ids = {task.course_id}
+    if isinstance(previous, tuple):
+        course_ids.add(previous[0])
+    for course_id in course_ids:
+        bump_generation(COURSE, course_id)
+        bump_generation(CONTENT, course_id)
+
+
+def course_changed(course) -> None:
+    """Invalidate caches after a Course is written or deleted."""
+    bump_generation(COURSE, course.pk)
+    bump_generation(CONTENT, course.pk)
+
+
+def creator_changed() -> None:
+    """Invalidate validators of course payloads that show creator details."""
+    bump_generation(MODEL, COURSE_CREATOR)
+
+
+def model_changed(model) -> None:
+    """Invalidate validators that depend on any row of ``model``."""
+    bump_generation(MODEL, model._meta.label_lower)
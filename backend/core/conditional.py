@@ -0,0 +1,137 @@
+"""
+Conditional GET support for read endpoints.
+
+``ConditionalGetMixin`` adds ETag and Last-Modified validators to DRF views
+and answers matching ``If-None-Match`` / ``If-Modified-Since`` requests with
+304 Not Modified right after authentication and permission checks, before
+the handler queries or serializes anything.
+
+Validators are computed cheaply:
+- ETag from cache generation counters (``core.caching``) of the models the
+  response is built from, bumped by the signal handlers on every write
+- Last-Modified from a single ``Max`` aggregate over a timestamp field, for
+  querysets whose rows keep one up to date
+
+Views can override ``get_conditional_validators`` for other sources, e.g.
+the version of a cached payload.
+"""
+
+import hashlib
+from typing import Any, Optional, Tuple
+
+from django.db.models import Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.response import Response
+
+from . import caching
+
+Validators = Tuple[Optional[str], Optional[float]]
+
+
+class NotModified(APIException):
+    """Raised to short-circuit a request whose validators match."""
+
+    status_code = status.HTTP_304_NOT_MODIFIED
+    default_detail = "Not modified."
+    default_code = "not_modified"
+
+
+def make_etag(*parts: Any) -> str:
+    """Return a weak ETag identifying the given parts."""
+    digest = hashlib.md5(repr(parts).encode()).hexdigest()
+    return f"W/{quote_etag(digest)}"
+
+
+class ConditionalGetMixin:
+    """
+    Add ETag/Last-Modified validators and 304 responses to a DRF view.
+
+    Attributes:
+        conditional_actions: Viewset actions the validators apply to
+        conditional_models: Model labels (e.g. "core.course") the response
+            is built from; their generation counters make up the ETag
+        conditional_per_user: Include the requesting user's generation, for
+            responses with per-user fields (enrollment, progress)
+        last_modified_field: Timestamp field aggregated for Last-Modified
+    """
+
+    conditional_actions: Tuple[str, ...] = ("list", "retrieve")
+    conditional_models: Tuple[str, ...] = ()
+    conditional_per_user = False
+    last_modified_field: Optional[str] = None
+
+    def get_conditional_queryset(self):
+        """Return the rows the response is built from, for Last-Modified."""
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if lookup_url_kwarg in self.kwargs:
+            queryset = queryset.filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+        return queryset
+
+    def get_conditional_validators(self, request, *args, **kwargs) -> Validators:
+        """
+        Return (etag, last_modified timestamp) for the current request.
+
+        Either may be None; (None, None) disables conditional handling.
+        """
+        if (
+            getattr(self, "action", None) not in self.conditional_actions
+            or not self.conditional_models
+        ):
+            return None, None
+        generations = caching.get_generations(caching.MODEL, self.conditional_models)
+        if self.conditional_per_user:
+            generations.update(caching.get_generations(caching.USER, [request.user.pk]))
+        etag = make_etag(
+            request.get_full_path(),
+            request.accepted_media_type,
+            request.user.pk,
+            sorted(generations.items(), key=str),
+        )
+        last_modified = None
+        if self.last_modified_field:
+            latest = self.get_conditional_queryset().aggregate(
+                latest=Max(self.last_modified_field)
+            )["latest"]
+            last_modified = latest.timestamp() if latest else None
+        return etag, last_modified
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._conditional_validators = (None, None)
+        if request.method not in ("GET", "HEAD"):
+            return
+        etag, last_modified = self.get_conditional_validators(request, *args, **kwargs)
+        self._conditional_validators = (etag, last_modified)
+        if (etag or last_modified) and get_conditional_response(
+            request._request,
+            etag=etag,
+            last_modified=int(last_modified) if last_modified else None,
+        ):
+            raise NotModified()
+
+    def _validator_headers(self) -> dict:
+        etag, last_modified = getattr(self, "_conditional_validators", (None, None))
+        headers = {}
+        if etag:
+            headers["ETag"] = etag
+        if last_modified:
+            headers["Last-Modified"] = http_date(last_modified)
+        return headers
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return Response(status=exc.status_code, headers=self._validator_headers())
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            for header, value in self._validator_headers().items():
+                response.setdefault(header, value)
+        return response
@@ -0,0 +1,212 @@
+"""
+Eager loading derived from the serializer tree.
+
+``eager_loading_plan`` walks a ModelSerializer's fields, following nested
+serializers, dotted ``source=`` paths and many-related fields, and records
+every relation the serializer reads:
+- Single-valued relations (forward foreign keys, one-to-one) reached from the
+  root or from a prefetched level are joined with ``select_related``
+- Many-valued relations (reverse foreign keys, many-to-many) become
+  ``Prefetch`` objects whose querysets carry the loading of the levels below
+
+The plan is computed once per serializer class. Each relation remembers the
+serializer fields that read it, so ``eager_load`` only loads the relations
+whose fields survive the request's ``?fields=`` / ``?expand=`` selection
+(see ``core.sparse_fields``).
+
+Primary key fields read the foreign key column and need no loading. Method
+fields are opaque to the walk; views keep loading what they read by hand,
+e.g. by giving a relation an annotated queryset in ``get_eager_querysets``.
+"""
+
+import functools
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+from .sparse_fields import (
+    Path,
+    Selection,
+    SparseFieldsMixin,
+    is_selected,
+    selection_from_context,
+)
+
+# Serializer field names leading to a field, each with whether it is expandable
+FieldPath = Tuple[Tuple[str, bool], ...]
+
+
+class Relation:
+    """A relation read by a serializer tree and the fields that read it."""
+
+    def __init__(self, model, many: bool) -> None:
+        self.model = model
+        self.many = many
+        self.children: Dict[str, "Relation"] = {}
+        self.field_paths: Set[FieldPath] = set()
+
+    def child(self, name: str, model, many: bool) -> "Relation":
+        if name not in self.children:
+            self.children[name] = Relation(model, many)
+        return self.children[name]
+
+
+def _declared_fields(serializer) -> Dict[str, serializers.Field]:
+    # Every field the serializer can render, before any sparse selection
+    if isinstance(serializer, SparseFieldsMixin):
+        return super(SparseFieldsMixin, serializer).get_fields()
+    return serializer.get_fields()
+
+
+def _walk(serializer, node: Relation, path: FieldPath) -> None:
+    expandable = set(getattr(serializer.Meta, "expandable_fields", ()))
+    for name, field in _declared_fields(serializer).items():
+        # Fields are unbound here, so an omitted source is still None
+        source = field.source or name
+        if source == "*":
+            continue
+        nested = field.child if isinstance(field, serializers.ListSerializer) else field
+        reads_relation = isinstance(nested, serializers.BaseSerializer) or isinstance(
+            field, serializers.ManyRelatedField
+        )
+        parts = source.split(".")
+        if not reads_relation:
+            # The last part is an attribute of the related instance
+            parts = parts[:-1]
+        if not parts:
+            continue
+
+        field_path = path + ((name, name in expandable),)
+        current = node
+        for part in parts:
+            try:
+                model_field = current.model._meta.get_field(part)
+            except FieldDoesNotExist:
+                break
+            if not model_field.is_relation or model_field.related_model is None:
+                break
+            many = model_field.one_to_many or model_field.many_to_many
+            current = current.child(part, model_field.related_model, many)
+            current.field_paths.add(field_path)
+        else:
+            if isinstance(nested, serializers.ModelSerializer):
+                _walk(nested, current, field_path)
+
+
+@functools.lru_cache(maxsize=None)
+def eager_loading_plan(serializer_class) -> Relation:
+    """Return the relations read by ``serializer_class``, computed once."""
+    root = Relation(serializer_class.Meta.model, many=True)
+    _walk(serializer_class(), root, ())
+    return root
+
+
+def _selected(node: Relation, selection: Selection) -> bool:
+    for field_path in node.field_paths:
+        names: Path = ()
+        for name, expandable in field_path:
+            if not is_selected(selection, names, name, expandable):
+                break
+            names += (name,)
+        else:
+            return True
+    return False
+
+
+def _lookups(
+    node: Relation, selection: Selection, querysets: Dict[str, Any], prefix: str
+) -> Tuple[List[str], List[Tuple[str, object]]]:
+    """Return the select_related names and (lookup, queryset) prefetches."""
+    select: List[str] = []
+    prefetch: List[Tuple[str, object]] = []
+    for name, child in node.children.items():
+        if not _selected(child, selection):
+            continue
+        lookup = f"{prefix}{name}"
+        if lookup in querysets:
+            # Prefetched so that the given queryset's annotations are kept
+            related = _apply(querysets[lookup], child, selection, querysets, lookup)
+            prefetch.append((name, related))
+            continue
+        if child.many:
+            related = child.model._default_manager.all()
+            prefetch.append(
+                (name, _apply(related, child, selection, querysets, lookup))
+            )
+            continue
+        child_select, child_prefetch = _lookups(
+            child, selection, querysets, f"{lookup}__"
+        )
+        select.append(name)
+        select.extend(f"{name}__{nested}" for nested in child_select)
+        prefetch.extend(
+            (f"{name}__{nested}", queryset) for nested, queryset in child_prefetch
+        )
+    return select, prefetch
+
+
+def _apply(
+    queryset, node: Relation, selection: Selection, querysets: Dict[str, Any], path: str
+):
+    select, prefetch = _lookups(node, selection, querysets, f"{path}__" if path else "")
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(
+            *(Prefetch(lookup, queryset=related) for lookup, related in prefetch)
+        )
+    return queryset
+
+
+def eager_load(
+    queryset,
+    serializer_class,
+    selection: Optional[Selection] = None,
+    querysets: Optional[Dict[str, Any]] = None,
+):
+    """
+    Load the relations ``serializer_class`` reads with ``queryset``.
+
+    Args:
+        queryset: Queryset of the serializer's model (or a subclass)
+        serializer_class: ModelSerializer class the rows are rendered with
+        selection: Sparse field selection; all default fields when omitted
+        querysets: Querysets to prefetch relations with, by lookup (e.g.
+            ``{"course": annotated_courses}``); the levels below are still
+            loaded from the plan
+    """
+    if selection is None:
+        selection = Selection(frozenset(), frozenset())
+    plan = eager_loading_plan(serializer_class)
+    return _apply(queryset, plan, selection, querysets or {}, "")
+
+
+class EagerLoadingMixin:
+    """
+    Loads the relations the viewset's serializer reads with its queryset.
+
+    Hooks ``filter_queryset``, which ``get_object`` and the list action call
+    after ``get_queryset``, because viewsets override ``get_queryset`` freely.
+    Applies when the serializer is a ModelSerializer of the queryset's model.
+    ``get_eager_querysets`` can give relations their own querysets.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if getattr(self, "swagger_fake_view", False):
+            return queryset
+        serializer_class = self.get_serializer_class()
+        if not issubclass(serializer_class, serializers.ModelSerializer):
+            return queryset
+        if not issubclass(queryset.model, serializer_class.Meta.model):
+            return queryset
+        selection = selection_from_context(self.get_serializer_context())
+        return eager_load(
+            queryset, serializer_class, selection, self.get_eager_querysets()
+        )
+
+    def get_eager_querysets(self) -> Dict[str, Any]:
+        """Return querysets to prefetch relations with; see ``eager_load``."""
+        return {}
@@ -0,0 +1,309 @@
+"""
+Fast-path serialization of read-only list responses.
+
+``ModelSerializer`` renders a list by instantiating every row as a model,
+then dispatching ``get_attribute`` and ``to_representation`` field by field.
+``compile_serializer`` turns a serializer, with its ``?fields=`` /
+``?expand=`` selection applied, into a ``values_list()`` column list and a
+set of row getters that build the output dicts from the row tuples directly:
+- Scalar fields whose representation is the column value are read as is;
+  booleans, datetimes and durations are converted the way DRF does
+- Nested serializers of forward foreign keys read joined columns
+- Method fields are computed for a whole page at once by a
+  ``get_<field>_from_rows(rows)`` method on the serializer, which receives
+  the columns listed for the field in ``Meta.field_columns``
+
+A serializer with any other field (or a DRF setting that changes the output
+of a supported one) does not compile, and its views keep the regular path;
+compiled output is the same JSON, byte for byte. Compiled serializers are
+cached per serializer class and selection.
+
+Views opt in with ``FastListMixin``.
+"""
+
+import datetime
+import operator
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.utils import timezone
+from django.utils.duration import duration_string
+from rest_framework import serializers
+from rest_framework.response import Response
+from rest_framework.settings import ISO_8601, api_settings
+
+from .sparse_fields import get_selection
+
+# How a column value becomes its representation
+IDENTITY = "identity"
+BOOLEAN = "boolean"
+DATETIME = "datetime"
+DURATION = "duration"
+NESTED = "nested"
+
+# Fields whose representation of a column value is the value itself
+_IDENTITY_FIELDS = (
+    serializers.IntegerField,
+    serializers.CharField,
+    serializers.EmailField,
+    serializers.ReadOnlyField,
+)
+
+
+class Unsupported(Exception):
+    """A field the fast path cannot reproduce exactly."""
+
+
+class FieldPlan(NamedTuple):
+    name: str
+    kind: str
+    # Row index of the value; for nested fields, of the foreign key
+    index: int
+    children: Tuple["FieldPlan", ...] = ()
+
+
+class MethodPlan(NamedTuple):
+    path: Tuple[str, ...]
+    method: Callable
+    columns: Dict[str, int]
+    # Foreign keys that must be set for the method's serializer to be present
+    guards: Tuple[int, ...]
+
+
+def _datetime(value: datetime.datetime, tz) -> str:
+    # DRF's DateTimeField.enforce_timezone followed by ISO 8601 output
+    if tz is not None:
+        if timezone.is_aware(value):
+            value = value.astimezone(tz)
+        else:
+            value = timezone.make_aware(value, tz)
+    elif timezone.is_aware(value):
+        value = timezone.make_naive(value, datetime.timezone.utc)
+    value = value.isoformat()
+    if value.endswith("+00:00"):
+        value = value[:-6] + "Z"
+    return value
+
+
+def _scalar_kind(field: serializers.Field) -> str:
+    field_type = type(field)
+    if field_type in _IDENTITY_FIELDS:
+        return IDENTITY
+    if field_type is serializers.ChoiceField:
+        if all(isinstance(key, str) for key in field.choices):
+            return IDENTITY
+    elif field_type is serializers.BooleanField:
+        return BOOLEAN
+    elif field_type is serializers.DateTimeField:
+        output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+        if (
+            output_format is not None
+            and output_format.lower() == ISO_8601
+            and not hasattr(field, "timezone")
+        ):
+            return DATETIME
+    elif field_type is serializers.DurationField:
+        return DURATION
+    elif field_type is serializers.JSONField:
+        if not field.binary:
+            return IDENTITY
+    elif field_type is serializers.PrimaryKeyRelatedField:
+        if field.pk_field is None:
+            return IDENTITY
+    raise Unsupported(field)
+
+
+class CompiledSerializer:
+    """
+    A serializer compiled into ``values_list()`` columns and row getters.
+
+    Attributes:
+        columns: Lookups to fetch, in row order
+        fields: Plan of the output fields
+        methods: Method fields computed per page, appended to the rows
+    """
+
+    def __init__(self, serializer: serializers.ModelSerializer) -> None:
+        self.columns: List[str] = []
+        self._indexes: Dict[str, int] = {}
+        self.methods: List[MethodPlan] = []
+        self.fields = self._compile(serializer, (), (), ())
+
+    def _column(self, lookup: str) -> int:
+        if lookup not in self._indexes:
+            self._indexes[lookup] = len(self.columns)
+            self.columns.append(lookup)
+        return self._indexes[lookup]
+
+    def _compile(
+        self,
+        serializer: serializers.ModelSerializer,
+        path: Tuple[str, ...],
+        prefix: Tuple[str, ...],
+        guards: Tuple[int, ...],
+    ) -> Tuple[FieldPlan, ...]:
+        model = serializer.Meta.model
+        plans = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if isinstance(field, serializers.SerializerMethodField):
+                plans.append(self._method(serializer, name, path, prefix, guards))
+                continue
+            if "." in field.source or field.source == "*":
+                raise Unsupported(field)
+            try:
+                model_field = model._meta.get_field(field.source)
+            except FieldDoesNotExist:
+                raise Unsupported(field)
+            if getattr(model_field, "column", None) is None:
+                raise Unsupported(field)
+            index = self._column("__".join(prefix + (field.source,)))
+            if isinstance(field, serializers.ModelSerializer):
+                if not (model_field.many_to_one or model_field.one_to_one):
+                    raise Unsupported(field)
+                children = self._compile(
+                    field,
+                    path + (name,),
+                    prefix + (field.source,),
+                    guards + (index,),
+                )
+                plans.append(FieldPlan(name, NESTED, index, children))
+            else:
+                plans.append(FieldPlan(name, _scalar_kind(field), index))
+        return tuple(plans)
+
+    def _method(self, serializer, name, path, prefix, guards) -> FieldPlan:
+        method = getattr(type(serializer), f"get_{name}_from_rows", None)
+        field_columns = getattr(serializer.Meta, "field_columns", {})
+        if method is None or name not in field_columns:
+            raise Unsupported(name)
+        columns = {
+            column: self._column("__".join(prefix + (column,)))
+            for column in field_columns[name]
+        }
+        self.methods.append(MethodPlan(path + (name,), method, columns, guards))
+        # Method values are appended to each row after the fetched columns
+        return FieldPlan(name, IDENTITY, -len(self.methods))
+
+    def values(self, queryset, extra_columns: Sequence[str] = ()):
+        """Return the queryset's rows as named tuples of the needed columns."""
+        columns = self.columns + [
+            column for column in extra_columns if column not in self._indexes
+        ]
+        return queryset.prefetch_related(None).values_list(*columns, named=True)
+
+    def _method_values(self, root, plan: MethodPlan, rows: List[tuple]) -> List[Any]:
+        serializer = root
+        for name in plan.path[:-1]:
+            serializer = serializer.fields[name]
+        present = [all(row[i] is not None for i in plan.guards) for row in rows]
+        computed = iter(
+            plan.method(
+                serializer,
+                [
+                    {column: row[i] for column, i in plan.columns.items()}
+                    for row, is_present in zip(rows, present)
+                    if is_present
+                ],
+            )
+        )
+        return [next(computed) if is_present else None for is_present in present]
+
+    def serialize(self, rows: Sequence[tuple], root) -> List[Dict[str, Any]]:
+        """
+        Build the representation of ``rows`` fetched with ``values()``.
+
+        Args:
+            rows: Rows of this serializer's columns
+            root: The serializer instance the output stands in for
+        """
+        rows = list(rows)
+        if self.methods:
+            extra = zip(
+                *[self._method_values(root, plan, rows) for plan in self.methods]
+            )
+            # Negative indexes count back from the end of the widened rows
+            rows = [
+                tuple(row) + tuple(reversed(values)) for row, values in zip(rows, extra)
+            ]
+        tz = timezone.get_current_timezone() if settings.USE_TZ else None
+        build = _builder(self.fields, tz)
+        return [build(row) for row in rows]
+
+
+def _builder(fields: Tuple[FieldPlan, ...], tz) -> Callable[[tuple], Dict[str, Any]]:
+    converters: Dict[str, Callable[[Any], Any]] = {
+        BOOLEAN: bool,
+        DATETIME: lambda value: _datetime(value, tz),
+        DURATION: duration_string,
+    }
+    getters = []
+    for plan in fields:
+        if plan.kind == IDENTITY:
+            getter = operator.itemgetter(plan.index)
+        elif plan.kind == NESTED:
+            getter = _optional(plan.index, _builder(plan.children, tz), whole_row=True)
+        else:
+            getter = _optional(plan.index, converters[plan.kind])
+        getters.append((plan.name, getter))
+
+    def build(row: tuple) -> Dict[str, Any]:
+        return {name: get(row) for name, get in getters}
+
+    return build
+
+
+def _optional(index: int, convert: Callable, whole_row: bool = False) -> Callable:
+    # DRF renders a missing value as None without calling to_representation
+    if whole_row:
+        return lambda row: None if row[index] is None else convert(row)
+    return lambda row: None if row[index] is None else convert(row[index])
+
+
+# Selections come from query parameters, so the cache is bounded
+MAX_COMPILED = 256
+
+_compiled: Dict[Tuple[type, Any], Optional[CompiledSerializer]] = {}
+
+
+def compile_serializer(serializer) -> Optional[CompiledSerializer]:
+    """
+    Return the compiled form of a serializer instance, or None if unsupported.
+
+    Compiled serializers are cached per serializer class and selection.
+    """
+    key = (type(serializer), get_selection(serializer))
+    if key not in _compiled:
+        if len(_compiled) >= MAX_COMPILED:
+            _compiled.clear()
+        try:
+            _compiled[key] = CompiledSerializer(serializer)
+        except Unsupported:
+            _compiled[key] = None
+    return _compiled[key]
+
+
+class FastListMixin:
+    """
+    Serves the list action from ``values()`` rows when the serializer compiles.
+
+    Pagination applies to the rows; keyset pagination reads its cursor
+    position from them, so the ordering columns are always fetched.
+    """
+
+    def list(self, request, *args, **kwargs):
+        serializer = self.get_serializer()
+        compiled = compile_serializer(serializer)
+        if compiled is None:
+            return super().list(request, *args, **kwargs)
+
+        ordering = [name.lstrip("-") for name in getattr(self, "keyset_ordering", ())]
+        rows = compiled.values(
+            self.filter_queryset(self.get_queryset()), extra_columns=ordering
+        )
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(compiled.serialize(page, serializer))
+        return Response(compiled.serialize(rows, serializer))
@@ -0,0 +1,342 @@
+"""
+Query shape capture and index advice.
+
+Captures the SQL statements an application run actually issues, runs
+EXPLAIN on each distinct shape and reports full table scans together with
+the composite index that would serve the scan's predicates.
+
+Capturing:
+- ``capture()`` records the queries of a block of code (tests, benchmarks)
+- Setting ``INDEX_ADVISOR_CAPTURE`` to a file path records every query of
+  the process (e.g. a pytest or runserver session) and writes the shapes to
+  that file at exit, merged with any shapes already there
+
+Shapes are the parametrized SQL Django generates, so values never split a
+shape; one sample of parameters is kept per shape to run EXPLAIN with.
+Samples may contain user data, so capture files should stay local.
+
+Analysis (``advise``) uses ``EXPLAIN QUERY PLAN`` on SQLite and
+``EXPLAIN (FORMAT JSON)`` on PostgreSQL against the database the caller
+points it to. Plans depend on table statistics, so on PostgreSQL the
+advice is most useful against a database with realistic data.
+"""
+
+import atexit
+import json
+import logging
+import re
+import time
+from contextlib import ExitStack, contextmanager
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from django.apps import apps
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DatabaseError, connections, models
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger(__name__)
+
+# Statements worth explaining; others (transactions, DDL) are ignored
+CAPTURED_STATEMENTS = ("SELECT", "UPDATE", "DELETE")
+# Columns suggested per index
+MAX_INDEX_COLUMNS = 3
+
+_TABLE_RE = re.compile(r'(?:FROM|JOIN)\s+"(\w+)"(?:\s+(?:AS\s+)?"?([A-Z]\d+)"?)?')
+_COLUMN_RE = r'"{alias}"\."(\w+)"'
+_EQUALITY_RE = r"{column}\s*(?:=|IN\s*\(|IS\s)|=\s*{column}"
+_RANGE_RE = r"{column}\s*(?:<|>|BETWEEN\s)"
+_SQLITE_SCAN_RE = re.compile(r"^SCAN (\w+)(?: AS (\w+))?$")
+_SQLITE_SEARCH_RE = re.compile(
+    r"^SEARCH (\w+)(?: AS (\w+))? USING (?:COVERING )?INDEX \w+ \((.*)\)$"
+)
+
+# Plan steps: (table alias, plan detail, whether the whole table is read)
+PlanStep = Tuple[str, str, bool]
+
+
+class QueryShape(NamedTuple):
+    """A distinct SQL statement, how often it ran and a sample of params."""
+
+    sql: str
+    params: Any
+    count: int
+    total_time: float
+
+
+class IndexSuggestion(NamedTuple):
+    """A composite index for a model, in migration operation form."""
+
+    model: Any
+    fields: Tuple[str, ...]
+
+    def index(self) -> models.Index:
+        index = models.Index(fields=list(self.fields))
+        index.set_name_with_model(self.model)
+        return index
+
+    def operation(self) -> str:
+        index = self.index()
+        return (
+            "migrations.AddIndex(\n"
+            f'    model_name="{self.model._meta.model_name}",\n'
+            f"    index=models.Index(fields={list(self.fields)!r}, "
+            f'name="{index.name}"),\n'
+            ")"
+        )
+
+
+class Finding(NamedTuple):
+    """A problem found in the plan of a query shape."""
+
+    shape: QueryShape
+    table: str
+    detail: str
+    suggestion: Optional[IndexSuggestion]
+
+
+class QueryRecorder:
+    """Execute wrapper that aggregates the statements it sees by shape."""
+
+    def __init__(self):
+        self.shapes: Dict[str, List[Any]] = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            if sql.lstrip().upper().startswith(CAPTURED_STATEMENTS) and not many:
+                self.record(sql, params, time.perf_counter() - started)
+
+    def record(self, sql: str, params: Any, elapsed: float, count: int = 1) -> None:
+        entry = self.shapes.setdefault(sql, [params, 0, 0.0])
+        entry[1] += count
+        entry[2] += elapsed
+
+    def results(self) -> List[QueryShape]:
+        """Return the shapes, most frequent first."""
+        shapes = [
+            QueryShape(sql, params, count, total_time)
+            for sql, (params, count, total_time) in self.shapes.items()
+        ]
+        return sorted(shapes, key=lambda shape: (-shape.count, shape.sql))
+
+    def load(self, path: str) -> None:
+        try:
+            with open(path) as handle:
+                stored = json.load(handle)
+        except FileNotFoundError:
+            return
+        for shape in stored:
+            self.record(
+                shape["sql"], shape["params"], shape["total_time"], shape["count"]
+            )
+
+    def dump(self, path: str) -> None:
+        with open(path, "w") as handle:
+            json.dump(
+                [shape._asdict() for shape in self.results()],
+                handle,
+                cls=DjangoJSONEncoder,
+                indent=1,
+            )
+
+
+@contextmanager
+def capture(*aliases: str) -> Iterator[QueryRecorder]:
+    """Record the queries run on the given databases (default: all)."""
+    recorder = QueryRecorder()
+    with ExitStack() as stack:
+        for alias in aliases or connections:
+            stack.enter_context(connections[alias].execute_wrapper(recorder))
+        yield recorder
+
+
+def install_capture(path: str) -> QueryRecorder:
+    """Record every query of this process and write the shapes at exit."""
+    recorder = QueryRecorder()
+
+    def wrap(sender, connection, **kwargs):
+        if recorder not in connection.execute_wrappers:
+            connection.execute_wrappers.append(recorder)
+
+    def dump():
+        merged = QueryRecorder()
+        merged.load(path)
+        for shape in recorder.results():
+            merged.record(shape.sql, shape.params, shape.total_time, shape.count)
+        merged.dump(path)
+
+    connection_created.connect(wrap, weak=False)
+    atexit.register(dump)
+    return recorder
+
+
+def load_shapes(path: str) -> List[QueryShape]:
+    """Read the shapes written by ``install_capture`` or ``QueryRecorder.dump``."""
+    recorder = QueryRecorder()
+    recorder.load(path)
+    return recorder.results()
+
+
+def _table_aliases(sql: str) -> Dict[str, str]:
+    aliases = {}
+    for table, alias in _TABLE_RE.findall(sql):
+        aliases[alias or table] = table
+    return aliases
+
+
+def _model_for_table(table: str) -> Optional[Any]:
+    for model in apps.get_models():
+        if model._meta.db_table == table:
+            return model
+    return None
+
+
+def _field_name(model, column: str) -> Optional[str]:
+    for field in model._meta.concrete_fields:
+        if field.column == column:
+            return field.name
+    return None
+
+
+def _is_indexed(model, fields: Tuple[str, ...]) -> bool:
+    """Whether an existing index starts with the suggested fields, in any order."""
+    candidates = [list(index.fields) for index in model._meta.indexes]
+    candidates += [list(fields) for fields in model._meta.unique_together]
+    candidates += [
+        [field.name]
+        for field in model._meta.concrete_fields
+        if field.db_index or field.unique or field.primary_key
+    ]
+    for constraint in model._meta.constraints:
+        candidates.append(list(getattr(constraint, "fields", ())))
+    wanted = set(fields)
+    return any(
+        {name.lstrip("-") for name in candidate[: len(wanted)]} == wanted
+        for candidate in candidates
+    )
+
+
+def predicate_fields(sql: str, alias: str) -> Tuple[Optional[Any], List[str]]:
+    """
+    Return the model behind ``alias`` and the fields the SQL filters it on.
+
+    Equality columns (``=``, ``IN``, ``IS``, join conditions) come first in
+    order of appearance, followed by at most one range column.
+    """
+    table = _table_aliases(sql).get(alias, alias)
+    model = _model_for_table(table)
+    if model is None:
+        return None, []
+    column = _COLUMN_RE.format(alias=re.escape(alias))
+    # Only predicates count, not the selected columns
+    where = re.split(r"\bFROM\b", sql, maxsplit=1)[-1]
+    equality = re.findall(_EQUALITY_RE.format(column=column), where)
+    ranges = re.findall(_RANGE_RE.format(column=column), where)
+    fields: List[str] = []
+    for name in [a or b for a, b in equality] + ranges[:1]:
+        field = _field_name(model, name)
+        if field and field not in fields and field != model._meta.pk.name:
+            fields.append(field)
+    return model, fields[:MAX_INDEX_COLUMNS]
+
+
+def suggest_index(sql: str, alias: str) -> Optional[IndexSuggestion]:
+    """Suggest an index serving the predicates on ``alias``, unless one exists."""
+    model, fields = predicate_fields(sql, alias)
+    if not fields or _is_indexed(model, tuple(fields)):
+        return None
+    return IndexSuggestion(model, tuple(fields))
+
+
+def _explain_sqlite(cursor, shape: QueryShape) -> List[PlanStep]:
+    cursor.execute(f"EXPLAIN QUERY PLAN {shape.sql}", shape.params)
+    steps = []
+    for row in cursor.fetchall():
+        detail = row[-1]
+        if match := _SQLITE_SCAN_RE.match(detail):
+            steps.append((match.group(2) or match.group(1), detail, True))
+        elif match := _SQLITE_SEARCH_RE.match(detail):
+            steps.append((match.group(2) or match.group(1), detail, False))
+    return steps
+
+
+def _plan_nodes(plan: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from _plan_nodes(child)
+
+
+def _explain_postgresql(cursor, shape: QueryShape) -> List[PlanStep]:
+    cursor.execute(f"EXPLAIN (FORMAT JSON) {shape.sql}", shape.params)
+    plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    steps = []
+    for node in _plan_nodes(plan[0]["Plan"]):
+        if "Relation Name" not in node:
+            continue
+        detail = f"{node['Node Type']} on {node['Relation Name']}"
+        if node.get("Filter"):
+            detail += f" (Filter: {node['Filter']})"
+        full_scan = node["Node Type"] == "Seq Scan"
+        steps.append((node.get("Alias", node["Relation Name"]), detail, full_scan))
+    return steps
+
+
+def advise(shapes: List[QueryShape], using: str = "default") -> List[Finding]:
+    """
+    Explain each shape and report the tables it reads inefficiently.
+
+    Reported are full scans of filtered tables, and index lookups that
+    leave predicates to be checked row by row where a composite index
+    would serve them all.
+    """
+    connection = connections[using]
+    explain = {
+        "sqlite": _explain_sqlite,
+        "postgresql": _explain_postgresql,
+    }.get(connection.vendor)
+    if explain is None:
+        raise NotImplementedError(f"EXPLAIN is not supported on {connection.vendor}")
+    findings = []
+    for shape in shapes:
+        try:
+            with connection.cursor() as cursor:
+                steps = explain(cursor, shape)
+        except DatabaseError as e:
+            logger.warning("Could not explain %s: %s", shape.sql[:80], e)
+            continue
+        aliases = _table_aliases(shape.sql)
+        for alias, detail, full_scan in steps:
+            suggestion = suggest_index(shape.sql, alias)
+            # Unfiltered scans read the whole table by design; subqueries and
+            # constant rows are not table scans
+            if full_scan and not predicate_fields(shape.sql, alias)[1]:
+                continue
+            if not full_scan and suggestion is None:
+                continue
+            table = aliases.get(alias, alias)
+            findings.append(Finding(shape, table, detail, suggestion))
+    return findings
+
+
+def unique_suggestions(findings: List[Finding]) -> List[IndexSuggestion]:
+    """Return the distinct suggestions, most frequently needed first."""
+    weights: Dict[Tuple[Any, Tuple[str, ...]], int] = {}
+    for finding in findings:
+        if finding.suggestion:
+            key = (finding.suggestion.model, finding.suggestion.fields)
+            weights[key] = weights.get(key, 0) + finding.shape.count
+    # A suggestion that is a prefix of another is served by it
+    keys = [
+        key
+        for key in weights
+        if not any(
+            other != key and other[0] == key[0] and other[1][: len(key[1])] == key[1]
+            for other in weights
+        )
+    ]
+    keys.sort(key=lambda key: -weights[key])
+    return [IndexSuggestion(model, fields) for model, fields in keys]
@@ -0,0 +1,71 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.index_advisor import advise, load_shapes, unique_suggestions
+
+
+class Command(BaseCommand):
+    help = (
+        "Explains captured query shapes and reports table scans and missing "
+        "composite indexes. Capture shapes by running the tests or a "
+        "benchmark with INDEX_ADVISOR_CAPTURE=<file>."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "capture_file", help="Shapes file written by INDEX_ADVISOR_CAPTURE"
+        )
+        parser.add_argument(
+            "--database",
+            default="default",
+            help="Database to run EXPLAIN against (default: default)",
+        )
+        parser.add_argument(
+            "--min-count",
+            type=int,
+            default=1,
+            help="Ignore shapes captured fewer times than this (default: 1)",
+        )
+
+    def handle(self, *args, **options):
+        shapes = [
+            shape
+            for shape in load_shapes(options["capture_file"])
+            if shape.count >= options["min_count"]
+        ]
+        if not shapes:
+            raise CommandError(f"No query shapes in {options['capture_file']}")
+        try:
+            findings = advise(shapes, using=options["database"])
+        except NotImplementedError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(f"Explained {len(shapes)} query shapes")
+        for finding in findings:
+            self.stdout.write(
+                f"\n{finding.detail} ({finding.shape.count} runs, "
+                f"{finding.shape.total_time * 1000:.1f} ms)"
+            )
+            self.stdout.write(f"  {finding.shape.sql[:200]}")
+            if finding.suggestion:
+                fields = ", ".join(finding.suggestion.fields)
+                self.stdout.write(
+                    self.style.WARNING(f"  Missing index: {finding.table} ({fields})")
+                )
+
+        suggestions = unique_suggestions(findings)
+        if not suggestions:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"\n{len(findings)} inefficient table reads, "
+                    "no missing indexes found"
+                )
+            )
+            return
+        self.stdout.write(
+            self.style.WARNING(
+                f"\n{len(findings)} inefficient table reads, "
+                f"{len(suggestions)} suggested indexes. Migration operations:\n"
+            )
+        )
+        for suggestion in suggestions:
+            self.stdout.write(suggestion.operation())
@@ -0,0 +1,65 @@
+from django.core.management.base import BaseCommand
+
+from core.models import CourseEnrollment
+from core.progress_summary import rebuild_summaries
+
+
+class Command(BaseCommand):
+    help = "Rebuilds materialized course progress summaries and reports drift"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="Number of enrollments to rebuild per batch (default: 500)",
+        )
+        parser.add_argument(
+            "--course",
+            type=int,
+            action="append",
+            dest="course_ids",
+            help="Only rebuild summaries for this course ID (repeatable)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report drift without writing any changes",
+        )
+
+    def _chunks(self, enrollments, chunk_size):
+        chunk = []
+        for pair in enrollments.iterator(chunk_size=chunk_size):
+            chunk.append(pair)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def handle(self, *args, **options):
+        chunk_size = max(options["chunk_size"], 1)
+        enrollments = CourseEnrollment.objects.order_by("id").values_list(
+            "user_id", "course_id"
+        )
+        if options["course_ids"]:
+            enrollments = enrollments.filter(course_id__in=options["course_ids"])
+
+        totals = {"checked": 0, "created": 0, "drifted": 0}
+        for chunk in self._chunks(enrollments, chunk_size):
+            result = rebuild_summaries(chunk, dry_run=options["dry_run"])
+            for key in totals:
+                totals[key] += result[key]
+            self.stdout.write(
+                f"Processed {totals['checked']} enrollments "
+                f"({result['drifted']} drifted in this batch)"
+            )
+
+        action = "would be corrected" if options["dry_run"] else "corrected"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Checked {totals['checked']} summaries: "
+                f"{totals['created']} missing, {totals['drifted']} drifted "
+                f"({action})"
+            )
+        )
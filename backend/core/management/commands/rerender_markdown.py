@@ -0,0 +1,64 @@
+from django.core.management.base import BaseCommand
+
+from core import caching
+from core.models import Course, LearningTask
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-renders stored description HTML for courses and tasks whose markdown "
+        "or sanitizer allow-list changed"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="Number of rows to write per batch (default: 500)",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Re-render every row, even if its stored HTML is current",
+        )
+
+    def _rerender(self, model, chunk_size, force):
+        checked = 0
+        rendered = 0
+        batch = []
+        rows = model.objects.order_by("id").only(
+            "id", "description", "description_hash"
+        )
+        for obj in rows.iterator(chunk_size=chunk_size):
+            checked += 1
+            if force:
+                obj.description_hash = ""
+            if obj.render_description():
+                batch.append(obj)
+            if len(batch) >= chunk_size:
+                model.objects.bulk_update(
+                    batch, ["description_html_cache", "description_hash"]
+                )
+                rendered += len(batch)
+                batch = []
+        if batch:
+            model.objects.bulk_update(
+                batch, ["description_html_cache", "description_hash"]
+            )
+            rendered += len(batch)
+        if rendered:
+            # bulk_update sends no signals; invalidate conditional GET validators
+            caching.model_changed(model)
+        return checked, rendered
+
+    def handle(self, *args, **options):
+        chunk_size = max(options["chunk_size"], 1)
+        for model in (Course, LearningTask):
+            checked, rendered = self._rerender(model, chunk_size, options["force"])
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{model._meta.verbose_name_plural.capitalize()}: "
+                    f"re-rendered {rendered} of {checked}"
+                )
+            )
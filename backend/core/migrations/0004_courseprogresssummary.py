@@ -0,0 +1,55 @@
+# Generated by Django 4.2.23 on 2026-10-17 00:59
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0003_learningtask_deleted_at_learningtask_is_deleted_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CourseProgressSummary",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("total_tasks", models.PositiveIntegerField(default=0)),
+                ("completed_tasks", models.PositiveIntegerField(default=0)),
+                ("in_progress_tasks", models.PositiveIntegerField(default=0)),
+                ("completion_percentage", models.FloatField(default=0)),
+                ("last_activity", models.DateTimeField(blank=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "course",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="progress_summaries",
+                        to="core.course",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="progress_summaries",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Course Progress Summary",
+                "verbose_name_plural": "Course Progress Summaries",
+                "unique_together": {("user", "course")},
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.23 on 2026-10-17 01:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0004_courseprogresssummary"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="course",
+            name="description_hash",
+            field=models.CharField(
+                blank=True, default="", editable=False, max_length=64
+            ),
+        ),
+        migrations.AddField(
+            model_name="course",
+            name="description_html_cache",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.AddField(
+            model_name="learningtask",
+            name="description_hash",
+            field=models.CharField(
+                blank=True, default="", editable=False, max_length=64
+            ),
+        ),
+        migrations.AddField(
+            model_name="learningtask",
+            name="description_html_cache",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.23 on 2026-10-17 01:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0005_rendered_description_cache"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="courseenrollment",
+            index=models.Index(
+                fields=["-enrollment_date", "-id"],
+                name="core_course_enrollm_b33302_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="quizattempt",
+            index=models.Index(
+                fields=["user", "-attempt_date", "-id"],
+                name="core_quizat_user_id_255bde_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="quizattempt",
+            index=models.Index(
+                fields=["-attempt_date", "-id"], name="core_quizat_attempt_aff7fd_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,78 @@
+from django.db import migrations
+
+SQLITE_CREATE = """
+CREATE VIRTUAL TABLE core_course_search USING fts5(
+    title, creator_name, learning_objectives, description,
+    tokenize = 'porter unicode61 remove_diacritics 2'
+)
+"""
+
+POSTGRESQL_CREATE = [
+    """
+    CREATE TABLE core_course_search (
+        course_id bigint PRIMARY KEY
+            REFERENCES core_course (id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED,
+        content text NOT NULL,
+        document tsvector NOT NULL
+    )
+    """,
+    "CREATE INDEX core_course_search_document_gin"
+    " ON core_course_search USING GIN (document)",
+]
+
+
+# Index population, inlined so the migration does not depend on core.search
+SQLITE_POPULATE = """
+INSERT INTO core_course_search
+    (rowid, title, creator_name, learning_objectives, description)
+SELECT c.id, c.title, TRIM(u.first_name || ' ' || u.last_name),
+       c.learning_objectives, c.description
+FROM {course} c JOIN {user} u ON u.id = c.creator_id
+"""
+
+POSTGRESQL_POPULATE = """
+INSERT INTO core_course_search (course_id, content, document)
+SELECT c.id,
+       concat_ws(' ', c.title, c.learning_objectives, c.description),
+       setweight(to_tsvector('english', c.title), 'A')
+       || setweight(to_tsvector('english',
+            concat_ws(' ', u.first_name, u.last_name)), 'B')
+       || setweight(to_tsvector('english', c.learning_objectives), 'C')
+       || setweight(to_tsvector('english', c.description), 'D')
+FROM {course} c JOIN {user} u ON u.id = c.creator_id
+ON CONFLICT (course_id) DO UPDATE
+SET content = EXCLUDED.content, document = EXCLUDED.document
+"""
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        statements, populate = [SQLITE_CREATE], SQLITE_POPULATE
+    elif vendor == "postgresql":
+        statements, populate = POSTGRESQL_CREATE, POSTGRESQL_POPULATE
+    else:
+        return
+    quote = schema_editor.quote_name
+    tables = {
+        "course": quote(apps.get_model("core", "Course")._meta.db_table),
+        "user": quote(apps.get_model("core", "User")._meta.db_table),
+    }
+    for statement in statements:
+        schema_editor.execute(statement)
+    schema_editor.execute(populate.format(**tables))
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor in ("sqlite", "postgresql"):
+        schema_editor.execute("DROP TABLE IF EXISTS core_course_search")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0006_keyset_pagination_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
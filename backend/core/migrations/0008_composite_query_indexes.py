@@ -0,0 +1,53 @@
+# Generated by Django 4.2.23 on 2026-10-17 01:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0007_course_search_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="learningtask",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["course", "order"],
+                name="core_task_live_order_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="learningtask",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False), ("is_published", True)),
+                fields=["course"],
+                name="core_task_counted_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="quizattempt",
+            index=models.Index(
+                fields=["user", "quiz", "completion_status"],
+                name="core_quizat_user_id_beffcc_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="quizresponse",
+            index=models.Index(
+                fields=["question", "is_correct"], name="core_quizre_questio_f0ef52_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="taskprogress",
+            index=models.Index(
+                fields=["user", "task", "status"], name="core_taskpr_user_id_4742c9_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="taskprogress",
+            index=models.Index(
+                fields=["task", "status"], name="core_taskpr_task_id_dcdbfe_idx"
+            ),
+        ),
+    ]
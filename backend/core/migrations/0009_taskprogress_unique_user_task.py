@@ -0,0 +1,63 @@
+# Generated by Django 4.2.23 on 2026-10-17 01:57
+
+import datetime
+
+from django.db import migrations, models
+
+
+def merge_duplicate_progress(apps, schema_editor):
+    """
+    Keep one progress row per (user, task) before adding the constraint.
+
+    The most recently updated row survives; it takes the summed time spent
+    and the earliest start and completion dates of its duplicates.
+    """
+    TaskProgress = apps.get_model("core", "TaskProgress")
+    alias = schema_editor.connection.alias
+    duplicates = (
+        TaskProgress.objects.using(alias)
+        .values("user_id", "task_id")
+        .annotate(rows=models.Count("id"))
+        .filter(rows__gt=1)
+        .order_by()
+    )
+    for pair in duplicates:
+        rows = list(
+            TaskProgress.objects.using(alias)
+            .filter(user_id=pair["user_id"], task_id=pair["task_id"])
+            .order_by("-updated_at", "-id")
+        )
+        keep = rows[0]
+        keep.time_spent = sum((row.time_spent for row in rows), datetime.timedelta(0))
+        for field in ("start_date", "completion_date"):
+            dates = [getattr(row, field) for row in rows if getattr(row, field)]
+            setattr(keep, field, min(dates) if dates else None)
+        TaskProgress.objects.using(alias).filter(pk=keep.pk).update(
+            time_spent=keep.time_spent,
+            start_date=keep.start_date,
+            completion_date=keep.completion_date,
+        )
+        TaskProgress.objects.using(alias).filter(
+            pk__in=[row.pk for row in rows[1:]]
+        ).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0008_composite_query_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_progress, migrations.RunPython.noop),
+        migrations.AddField(
+            model_name="taskprogress",
+            name="client_updated_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name="taskprogress",
+            constraint=models.UniqueConstraint(
+                fields=("user", "task"), name="core_taskprogress_unique_user_task"
+            ),
+        ),
+    ]
@@ -1,13 +1,14 @@
 import datetime
-from typing import TYPE_CHECKING, Any, Dict
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
 from django.contrib.auth.models import AbstractUser, UserManager
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 from django.db.models import QuerySet
 from django.utils import timezone
+from django.utils.safestring import mark_safe
 
-from utils.markdown_utils import convert_markdown_to_html
+from utils.markdown_utils import convert_markdown_to_html, markdown_content_hash
 
 if TYPE_CHECKING:
     # Use string literals for forward references to avoid circular imports
@@ -107,7 +108,84 @@ class InstructorRole(models.Model):
     can_grade_submissions = models.BooleanField(default=False)
 
 
-class Course(models.Model):
+def stored_description_html(
+    description: str,
+    html_cache: str,
+    content_hash: str,
+    fingerprint: Optional[str] = None,
+) -> str:
+    """
+    Return the stored HTML of a description, rendering it if it is stale.
+
+    ``fingerprint`` is passed on to ``markdown_content_hash``.
+    """
+    if content_hash == markdown_content_hash(description, fingerprint):
+        return mark_safe(html_cache)
+    return convert_markdown_to_html(description) if description else ""
+
+
+class RenderedDescriptionMixin(models.Model):
+    """
+    Stores the rendered HTML of ``description`` alongside the markdown source.
+
+    The HTML is regenerated on save only when the content hash changes, i.e.
+    when the markdown or the sanitizer allow-list changed. Reads serve the
+    stored HTML and only render on the fly when the stored copy is stale,
+    e.g. for rows written with ``bulk_create`` or ``QuerySet.update()``.
+    Run the ``rerender_markdown`` command after changing the allow-list.
+    """
+
+    description_html_cache = models.TextField(blank=True, default="", editable=False)
+    description_hash = models.CharField(
+        max_length=64, blank=True, default="", editable=False
+    )
+
+    class Meta:
+        abstract = True
+
+    def render_description(self) -> bool:
+        """
+        Refresh the stored HTML if the description changed.
+
+        Returns:
+            bool: True if the HTML was re-rendered
+        """
+        content_hash = markdown_content_hash(self.description)
+        if content_hash == self.description_hash:
+            return False
+        self.description_html_cache = (
+            convert_markdown_to_html(self.description) if self.description else ""
+        )
+        self.description_hash = content_hash
+        return True
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if "description" not in self.get_deferred_fields() and (
+            update_fields is None or "description" in update_fields
+        ):
+            if self.render_description() and update_fields is not None:
+                kwargs["update_fields"] = {
+                    *update_fields,
+                    "description_html_cache",
+                    "description_hash",
+                }
+        super().save(*args, **kwargs)
+
+    @property
+    def description_html(self):
+        """Returns the HTML rendered version of the markdown description."""
+        return stored_description_html(
+            self.description, self.description_html_cache, self.description_hash
+        )
+
+    @property
+    def safe_description(self) -> str:
+        """Returns a sanitized HTML version of the description."""
+        return self.description_html
+
+
+class Course(RenderedDescriptionMixin):
     """
     Represents a course in the learning platform.
 
@@ -128,16 +206,6 @@ class Course(models.Model):
     created_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(default=timezone.now)
 
-    @property
-    def description_html(self):
-        """Returns the HTML rendered version of the markdown description."""
-        return convert_markdown_to_html(self.description)
-
-    @property
-    def safe_description(self) -> str:
-        """Returns a sanitized HTML version of the description."""
-        return convert_markdown_to_html(self.description)
-
     def __str__(self):
         return str(self.title)
 
@@ -181,7 +249,7 @@ class StatusTransition(models.Model):
         return f"{self.course.title}: {self.from_status} → {self.to_status}"
 
 
-class LearningTask(models.Model):
+class LearningTask(RenderedDescriptionMixin):
     """
     Represents a learning task within a course.
 
@@ -202,16 +270,6 @@ class LearningTask(models.Model):
     is_deleted = models.BooleanField(default=False)
     deleted_at = models.DateTimeField(null=True, blank=True)
 
-    @property
-    def description_html(self):
-        """Returns the HTML rendered version of the markdown description."""
-        return convert_markdown_to_html(self.description)
-
-    @property
-    def safe_description(self) -> str:
-        """Returns a sanitized HTML version of the task description."""
-        return convert_markdown_to_html(self.description)
-
     @property
     def course_title(self) -> str:
         """Returns the title of the associated course."""
@@ -226,6 +284,19 @@ class LearningTask(models.Model):
         ordering = ["course", "order"]
         verbose_name = "Learning Task"
         verbose_name_plural = "Learning Tasks"
+        # Task lists skip soft-deleted rows; progress counts published ones
+        indexes = [
+            models.Index(
+                fields=["course", "order"],
+                condition=models.Q(is_deleted=False),
+                name="core_task_live_order_idx",
+            ),
+            models.Index(
+                fields=["course"],
+                condition=models.Q(is_published=True, is_deleted=False),
+                name="core_task_counted_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.course.title} - {self.title}"
@@ -365,19 +436,31 @@ class CourseEnrollment(models.Model):
     class Meta:
         unique_together = ["user", "course"]
         ordering = ["-enrollment_date"]  # Add default ordering by enrollment date
+        indexes = [models.Index(fields=["-enrollment_date", "-id"])]
 
     def __str__(self):
         return f"{self.user.username} enrolled in {self.course.title}"
 
-    def is_course_completed(self) -> bool:
-        """Check if all tasks in the course are completed by the user."""
-        course_tasks = self.course.learning_tasks.all()
-        user_progress = self.user.task_progress.filter(task__in=course_tasks)
+    def get_progress_summary(self) -> "CourseProgressSummary":
+        """
+        Return the materialized progress summary for this enrollment.
 
-        if user_progress.count() < course_tasks.count():
-            return False
+        Uses the summary attached by ``attach_progress_summaries`` when the
+        enrollment was loaded as part of a list, otherwise loads (or builds)
+        the row for this (user, course) pair.
+        """
+        from .progress_summary import get_or_build_summary  # Avoid import cycle
 
-        return all(progress.status == "completed" for progress in user_progress)
+        summary = getattr(self, "_progress_summary", None)
+        if summary is None:
+            summary = get_or_build_summary(self.user_id, self.course_id)
+            self._progress_summary = summary
+        return summary
+
+    def is_course_completed(self) -> bool:
+        """Check if all tasks in the course are completed by the user."""
+        summary = self.get_progress_summary()
+        return summary.completed_tasks >= summary.total_tasks
 
     def calculate_course_progress(self) -> float:
         """Simplified method that returns just the percentage"""
@@ -386,38 +469,60 @@ class CourseEnrollment(models.Model):
 
     def get_progress_stats(self) -> Dict[str, int | float]:
         """
-        Calculate current progress statistics for this enrollment.
+        Return current progress statistics for this enrollment.
+
+        Reads the incrementally maintained ``CourseProgressSummary`` row
+        instead of aggregating over the course's tasks on every call.
         Returns dict with counts and percentages.
         """
-        from django.db.models import Count, Q  # Import where used
-
-        # Get all tasks and their counts in a single query
-        task_stats = self.course.learning_tasks.aggregate(
-            total=Count("id"),
-            completed=Count(
-                "progress",
-                filter=Q(progress__user=self.user, progress__status="completed"),
-            ),
-            in_progress=Count(
-                "progress",
-                filter=Q(progress__user=self.user, progress__status="in_progress"),
-            ),
-        )
-
-        total = task_stats["total"]
-        completed = task_stats["completed"]
-        in_progress = task_stats["in_progress"]
-        not_started = total - (completed + in_progress)
+        summary = self.get_progress_summary()
+        total = summary.total_tasks
+        completed = summary.completed_tasks
+        in_progress = summary.in_progress_tasks
 
         return {
             "total_tasks": total,
             "completed": completed,
             "in_progress": in_progress,
-            "not_started": not_started,
-            "completion_percentage": (completed / total * 100) if total > 0 else 0,
+            "not_started": max(total - (completed + in_progress), 0),
+            "completion_percentage": summary.completion_percentage,
         }
 
 
+class CourseProgressSummary(models.Model):
+    """
+    Materialized progress counters for a (user, course) pair.
+
+    Only published, non-deleted tasks are counted. Rows are kept current
+    incrementally by the signal handlers in ``core.signals`` and can be
+    rebuilt with the ``rebuild_progress_summaries`` management command.
+    """
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="progress_summaries"
+    )
+    course = models.ForeignKey(
+        Course, on_delete=models.CASCADE, related_name="progress_summaries"
+    )
+    total_tasks = models.PositiveIntegerField(default=0)
+    completed_tasks = models.PositiveIntegerField(default=0)
+    in_progress_tasks = models.PositiveIntegerField(default=0)
+    completion_percentage = models.FloatField(default=0)
+    last_activity = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ["user", "course"]
+        verbose_name = "Course Progress Summary"
+        verbose_name_plural = "Course Progress Summaries"
+
+    def __str__(self):
+        return (
+            f"{self.user_id} - {self.course_id}: "
+            f"{self.completed_tasks}/{self.total_tasks}"
+        )
+
+
 class AuditLog(models.Model):
     """
     Audit log for tracking important actions in the system.
@@ -463,6 +568,20 @@ class TaskProgress(models.Model):
     start_date = models.DateTimeField(null=True, blank=True)  # Added field
     completion_date = models.DateTimeField(null=True, blank=True)
     updated_at = models.DateTimeField(auto_now=True)  # Automatically updates on save
+    # Client time of the last status change applied by a bulk upsert
+    client_updated_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        # A learner's progress in a course, and per-task status counts
+        indexes = [
+            models.Index(fields=["user", "task", "status"]),
+            models.Index(fields=["task", "status"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "task"], name="core_taskprogress_unique_user_task"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.task.title} - {self.status}"
@@ -514,6 +633,13 @@ class QuizAttempt(models.Model):
     class Meta:
         ordering = ["-attempt_date"]
         get_latest_by = "attempt_date"
+        # Keyset pagination orderings, for a learner and across all attempts,
+        # and a learner's attempts at a quiz
+        indexes = [
+            models.Index(fields=["user", "-attempt_date", "-id"]),
+            models.Index(fields=["-attempt_date", "-id"]),
+            models.Index(fields=["user", "quiz", "completion_status"]),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.quiz_title} - Attempt {self.id}"
@@ -548,5 +674,9 @@ class QuizResponse(models.Model):
     is_correct = models.BooleanField()
     time_spent = models.DurationField()
 
+    class Meta:
+        # Per-question correctness in quiz analytics
+        indexes = [models.Index(fields=["question", "is_correct"])]
+
     def __str__(self):
         return f"{self.attempt.user.username} - {self.question.text[:20]} - {'Correct' if self.is_correct else 'Incorrect'}"
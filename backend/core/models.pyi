@@ -13,6 +13,13 @@ from django.db import models
 
 # Type stubs for Django models to help IDE understand dynamic model relationships
 
+def stored_description_html(
+    description: str,
+    html_cache: str,
+    content_hash: str,
+    fingerprint: Optional[str] = None,
+) -> str: ...
+
 class User(models.Model):
     """
     Represents a user in the learning platform.
@@ -57,6 +64,8 @@ class Course(models.Model):
         prerequisites: Course prerequisites
         created_at: Timestamp of course creation
         updated_at: Timestamp of last update
+        description_html_cache: Rendered, sanitized HTML of the description
+        description_hash: Content hash the stored HTML was rendered from
     """
 
     id: int
@@ -70,6 +79,8 @@ class Course(models.Model):
     prerequisites: str
     created_at: datetime
     updated_at: datetime
+    description_html_cache: str
+    description_hash: str
 
 class LearningTask(models.Model):
     """
@@ -87,6 +98,8 @@ class LearningTask(models.Model):
         created_at: Timestamp of task creation
         updated_at: Timestamp of last update
         is_published: Whether the task is published
+        description_html_cache: Rendered, sanitized HTML of the description
+        description_hash: Content hash the stored HTML was rendered from
     """
 
     id: int
@@ -97,6 +110,8 @@ class LearningTask(models.Model):
     created_at: datetime
     updated_at: datetime
     is_published: bool
+    description_html_cache: str
+    description_hash: str
 
     def get_course(self) -> Course:
         """Returns the course this task belongs to."""
@@ -193,6 +208,35 @@ class CourseEnrollment(models.Model):
     status: str
     settings: dict
 
+class CourseProgressSummary(models.Model):
+    """
+    Materialized progress counters for a user's enrollment in a course.
+
+    Maintained incrementally from task progress and task changes so that
+    progress reads do not aggregate over the course's tasks.
+
+    Attributes:
+        id: Unique identifier for the summary
+        user: Reference to the User
+        course: Reference to the Course
+        total_tasks: Number of published, non-deleted tasks in the course
+        completed_tasks: Number of those tasks the user completed
+        in_progress_tasks: Number of those tasks the user has in progress
+        completion_percentage: Completed tasks as a percentage of total tasks
+        last_activity: When the user last updated progress in the course
+        updated_at: Last update timestamp
+    """
+
+    id: int
+    user: User
+    course: Course
+    total_tasks: int
+    completed_tasks: int
+    in_progress_tasks: int
+    completion_percentage: float
+    last_activity: Optional[datetime]
+    updated_at: datetime
+
 class TaskProgress(models.Model):
     """
     Tracks a student's progress on a learning task.
@@ -209,6 +253,7 @@ class TaskProgress(models.Model):
         start_date: When the user started the task
         completion_date: When the user completed the task
         updated_at: Last update timestamp
+        client_updated_at: Client time of the last bulk-applied status change
     """
 
     id: int
@@ -219,6 +264,7 @@ class TaskProgress(models.Model):
     start_date: Optional[datetime]
     completion_date: Optional[datetime]
     updated_at: datetime
+    client_updated_at: Optional[datetime]
 
 class QuizAttempt(models.Model):
     """
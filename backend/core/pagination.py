@@ -11,16 +11,143 @@ Features:
 - Safe handling of invalid page numbers
 - Consistent response format
 - Performance optimizations for large datasets
+- Keyset (cursor) pagination for high-volume tables
+- Cached and planner-estimated total counts for large querysets
 """
 
+import base64
+import binascii
+import hashlib
+import json
 import logging
+from typing import Any, List, Optional, Tuple
 
-from django.core.paginator import EmptyPage
-from rest_framework.pagination import PageNumberPagination
+from django.apps import apps
+from django.core.cache import cache
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.paginator import EmptyPage, Paginator
+from django.db import DatabaseError, connections
+from django.db.models import Q, QuerySet
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from . import caching
 
 logger = logging.getLogger(__name__)
 
+# Cached counts are keyed on model generations; the timeout bounds how long
+# writes those don't see (bulk updates, related tables) can go unnoticed.
+COUNT_CACHE_TIMEOUT = 5 * 60
+
+
+def _queryset_models(queryset: QuerySet) -> List[str]:
+    """Return the labels of the models whose tables the queryset reads."""
+    tables = {join.table_name for join in queryset.query.alias_map.values()}
+    labels = {queryset.model._meta.label_lower}
+    for model in apps.get_models():
+        if model._meta.db_table in tables:
+            labels.add(model._meta.label_lower)
+    return sorted(labels)
+
+
+def _count_cache_key(queryset: QuerySet) -> str:
+    """Key a count on the queryset's SQL and the generations of its models."""
+    sql, params = queryset.query.get_compiler(using=queryset.db).as_sql()
+    generations = caching.get_generations(caching.MODEL, _queryset_models(queryset))
+    fingerprint = repr((queryset.db, sql, params, sorted(generations.items())))
+    return f"count:{hashlib.md5(fingerprint.encode()).hexdigest()}"
+
+
+def _planner_estimate(queryset: QuerySet) -> Optional[int]:
+    """Return PostgreSQL's row estimate for the queryset, without running it."""
+    sql, params = queryset.query.get_compiler(using=queryset.db).as_sql()
+    try:
+        with connections[queryset.db].cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+    except DatabaseError:
+        logger.warning("Could not estimate count for %s", queryset.model.__name__)
+        return None
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class CountingPaginator(Paginator):
+    """
+    Paginator that only counts large querysets exactly when it has to.
+
+    Counting strategy:
+    - Up to ``exact_count_threshold`` rows: an exact count, bounded with
+      ``LIMIT`` so large querysets stop counting at the threshold
+    - Above it on PostgreSQL: the query planner's row estimate
+    - Above it elsewhere (SQLite): an exact count cached per queryset
+      fingerprint and model generation
+
+    ``count_exact`` tells whether ``count`` was computed exactly for this
+    request; estimates and cached counts are approximate. Pages past an
+    approximate count are still served as long as they have rows.
+    """
+
+    def __init__(self, *args, exact_count_threshold: int = 1000, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.exact_count_threshold = exact_count_threshold
+        self._count_exact = True
+
+    @cached_property
+    def count(self) -> int:
+        if not isinstance(self.object_list, QuerySet):
+            return super().count
+        queryset = self.object_list.order_by()
+        bounded = queryset[: self.exact_count_threshold + 1].count()
+        if bounded <= self.exact_count_threshold:
+            return bounded
+
+        if connections[queryset.db].vendor == "postgresql":
+            estimate = _planner_estimate(queryset)
+            if estimate is not None:
+                self._count_exact = False
+                return max(estimate, bounded)
+
+        key = _count_cache_key(queryset)
+        count = cache.get(key)
+        if count is not None:
+            self._count_exact = False
+            return count
+        count = queryset.count()
+        cache.set(key, count, COUNT_CACHE_TIMEOUT)
+        return count
+
+    @property
+    def count_exact(self) -> bool:
+        self.count
+        return self._count_exact
+
+    def validate_number(self, number):
+        if self.count_exact:
+            return super().validate_number(number)
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            return super().validate_number(number)
+        if number < 1:
+            return super().validate_number(number)
+        return number
+
+    def page(self, number):
+        if self.count_exact:
+            return super().page(number)
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        items = list(self.object_list[bottom : bottom + self.per_page])
+        # Only past the estimate is an empty page out of range
+        if not items and number > max(self.num_pages, 1):
+            raise EmptyPage(self.error_messages["no_results"])
+        return self._get_page(items, number, self)
+
 
 class SafePageNumberPagination(PageNumberPagination):
     """
@@ -31,6 +158,7 @@ class SafePageNumberPagination(PageNumberPagination):
     - Maximum page size limits
     - Graceful handling of out-of-range page numbers
     - Consistent response format with metadata
+    - Approximate counts above ``exact_count_threshold`` (see CountingPaginator)
 
     Query Parameters:
         page_size: Number of items per page (default: 10, max: 100)
@@ -43,13 +171,16 @@ class SafePageNumberPagination(PageNumberPagination):
             "previous": URL for previous page,
             "results": List of items for current page,
             "current_page": Current page number,
-            "total_pages": Total number of pages
+            "total_pages": Total number of pages,
+            "count_exact": Whether count is exact or approximate
         }
     """
 
     page_size = 10
     page_size_query_param = "page_size"
     max_page_size = 100
+    django_paginator_class = CountingPaginator
+    exact_count_threshold = 1000
 
     def paginate_queryset(self, queryset, request, view=None):
         """
@@ -68,7 +199,9 @@ class SafePageNumberPagination(PageNumberPagination):
             return None
 
         # Create a paginator instance
-        paginator = self.django_paginator_class(queryset, page_size)
+        paginator = self.django_paginator_class(
+            queryset, page_size, exact_count_threshold=self.exact_count_threshold
+        )
 
         try:
             # Try to get the requested page
@@ -112,6 +245,7 @@ class SafePageNumberPagination(PageNumberPagination):
                 "results": data,
                 "current_page": self.page.number,
                 "total_pages": self.page.paginator.num_pages,
+                "count_exact": self.page.paginator.count_exact,
             }
         )
 
@@ -148,3 +282,182 @@ class SmallSetPagination(SafePageNumberPagination):
 
     page_size = 5
     max_page_size = 20
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination that seeks on an indexed ordering instead of counting.
+
+    Pages are fetched with a ``WHERE (ordering) > (last row)`` condition, so
+    every page costs the same single query regardless of depth and no
+    ``COUNT(*)`` is run. Cursors are opaque tokens encoding the position of
+    the first or last row of the current page.
+
+    Viewsets select it with ``pagination_class`` and declare the ordering in
+    ``keyset_ordering``; the ordering's fields must be non-null and end with
+    a unique field (usually ``id``), e.g. ``("-attempt_date", "-id")``.
+
+    Keyset pagination is opt-in: it is used for requests with ``cursor`` or
+    ``pagination=cursor``. Other requests, and any using ``page`` or
+    ``ordering``, get page number pagination (SafePageNumberPagination) with
+    its ``count`` and default page size of 10.
+
+    Query Parameters:
+        pagination: ``cursor`` to request the first keyset page
+        cursor: Opaque cursor from a previous response
+        page_size: Number of items per page (default: 50, max: 200)
+
+    Response Format:
+        {
+            "next": URL for next page,
+            "previous": URL for previous page,
+            "results": List of items for current page
+        }
+    """
+
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+    cursor_query_param = "cursor"
+    pagination_query_param = "pagination"
+    ordering: Tuple[str, ...] = ("-id",)
+    fallback_class = SafePageNumberPagination
+    fallback_query_params = ("page", "ordering")
+    invalid_cursor_message = "Invalid cursor"
+
+    def get_page_size(self, request) -> int:
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    def use_keyset(self, request) -> bool:
+        params = request.query_params
+        if any(param in params for param in self.fallback_query_params):
+            return False
+        return (
+            self.cursor_query_param in params
+            or params.get(self.pagination_query_param) == "cursor"
+        )
+
+    def get_ordering(self, view) -> Tuple[str, ...]:
+        return tuple(getattr(view, "keyset_ordering", self.ordering))
+
+    def encode_cursor(self, position: List[Any], reverse: bool) -> str:
+        # Full-precision ISO timestamps; DjangoJSONEncoder truncates to milliseconds
+        payload = json.dumps(
+            {"p": position, "r": int(reverse)},
+            default=lambda value: (
+                value.isoformat() if hasattr(value, "isoformat") else str(value)
+            ),
+        )
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def decode_cursor(self, request, model) -> Optional[Tuple[List[Any], bool]]:
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode()))
+            raw_position, reverse = payload["p"], bool(payload["r"])
+            if len(raw_position) != len(self.ordering_fields):
+                raise ValueError(token)
+            position = [
+                model._meta.get_field(name).to_python(value)
+                for name, value in zip(self.ordering_fields, raw_position)
+            ]
+        except (
+            binascii.Error,
+            DjangoValidationError,
+            KeyError,
+            TypeError,
+            ValueError,
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def _seek(self, position: List[Any], reverse: bool) -> Q:
+        # Rows strictly after ``position`` in the (possibly reversed) ordering
+        condition = Q()
+        for index, (name, descending) in enumerate(
+            zip(self.ordering_fields, self.descending)
+        ):
+            lookup = "lt" if descending != reverse else "gt"
+            equal = {
+                field: value
+                for field, value in zip(self.ordering_fields[:index], position)
+            }
+            condition |= Q(**equal, **{f"{name}__{lookup}": position[index]})
+        # Redundant bound on the leading field so the index serves a range scan
+        first, descending = self.ordering_fields[0], self.descending[0]
+        bound = "lte" if descending != reverse else "gte"
+        return Q(**{f"{first}__{bound}": position[0]}) & condition
+
+    def _position(self, obj) -> List[Any]:
+        return [getattr(obj, name) for name in self.ordering_fields]
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.use_keyset(request):
+            self.fallback = self.fallback_class()
+            return self.fallback.paginate_queryset(queryset, request, view)
+        self.fallback = None
+        self.request = request
+
+        ordering = self.get_ordering(view)
+        self.ordering_fields = [field.lstrip("-") for field in ordering]
+        self.descending = [field.startswith("-") for field in ordering]
+        page_size = self.get_page_size(request)
+
+        cursor = self.decode_cursor(request, queryset.model)
+        reverse = bool(cursor and cursor[1])
+        if reverse:
+            ordering = tuple(
+                name if descending else f"-{name}"
+                for name, descending in zip(self.ordering_fields, self.descending)
+            )
+        queryset = queryset.order_by(*ordering)
+        if cursor:
+            queryset = queryset.filter(self._seek(*cursor))
+
+        rows = list(queryset[: page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+        self.page = rows
+        return rows
+
+    def _link(self, obj, reverse: bool) -> str:
+        url = self.request.build_absolute_uri()
+        cursor = self.encode_cursor(self._position(obj), reverse)
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next or not self.page:
+            return None
+        return self._link(self.page[-1], reverse=False)
+
+    def get_previous_link(self) -> Optional[str]:
+        if not self.has_previous:
+            return None
+        if not self.page:
+            # First page, which needs the opt-in without a cursor
+            url = self.request.build_absolute_uri()
+            url = remove_query_param(url, self.cursor_query_param)
+            return replace_query_param(url, self.pagination_query_param, "cursor")
+        return self._link(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        if self.fallback is not None:
+            return self.fallback.get_paginated_response(data)
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
@@ -1,7 +1,7 @@
+import hashlib
 import logging  # Add a logger for this module
 
-from django.core.cache import cache
-from django.db.models import Avg
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404  # Used in analytics methods
 from django.utils import timezone
 from rest_framework import filters, permissions
@@ -13,8 +13,19 @@ from rest_framework.permissions import IsAuthenticated  # Ensure correct import
 from rest_framework.response import Response
 from rest_framework.views import APIView  # Base class for analytics views
 
+from .analytics import (
+    attempt_payload,
+    attempt_statistics,
+    course_analytics,
+    student_progress,
+    student_quiz_performance,
+    task_analytics,
+)
 from .base_viewset import BaseViewSet  # Import the base viewset
-from .models import QuizQuestion  # Added QuizQuestion import
+from .batch import get_instance_or_404
+from .caching import serve_cached
+from .eager_loading import EagerLoadingMixin
+from .fast_serializers import FastListMixin
 from .models import (
     Course,
     CourseEnrollment,
@@ -25,12 +36,17 @@ from .models import (
     TaskProgress,
     User,
 )
+from .pagination import KeysetPagination, LargeSetPagination
+from .progress_batch import MAX_BATCH_SIZE, apply_progress_events
+from .progress_matrix import ProgressMatrix
+from .quiz_grading import grade_attempt
 from .serializers import (
     CourseEnrollmentSerializer,
     QuizAttemptSerializer,
     QuizResponseSerializer,
     TaskProgressSerializer,
 )
+from .sparse_fields import SparseFieldsViewMixin
 
 
 # Custom permissions
@@ -103,7 +119,9 @@ class IsEnrolledInCourse(permissions.BasePermission):
 
 
 # Enhanced viewsets with filtering
-class EnhancedCourseEnrollmentViewSet(BaseViewSet):
+class EnhancedCourseEnrollmentViewSet(
+    EagerLoadingMixin, SparseFieldsViewMixin, BaseViewSet
+):
     """
     API endpoint for course enrollments with enhanced filtering and analytics.
     """
@@ -138,7 +156,9 @@ class EnhancedCourseEnrollmentViewSet(BaseViewSet):
         return Response(serializer.data)
 
 
-class EnhancedTaskProgressViewSet(BaseViewSet):
+class EnhancedTaskProgressViewSet(
+    FastListMixin, EagerLoadingMixin, SparseFieldsViewMixin, BaseViewSet
+):
     """
     API endpoint for task progress tracking.
     """
@@ -146,6 +166,8 @@ class EnhancedTaskProgressViewSet(BaseViewSet):
     queryset = TaskProgress.objects.select_related("user", "task").all()
     serializer_class = TaskProgressSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset_ordering = ("-id",)
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
@@ -173,13 +195,34 @@ class EnhancedTaskProgressViewSet(BaseViewSet):
         if status == "completed" and not progress.completion_date:
             progress.completion_date = timezone.now()
 
+        # Later bulk events are compared with this server-side change
+        progress.client_updated_at = None
         progress.save()
 
         serializer = self.get_serializer(progress)
         return Response(serializer.data)
 
+    @action(detail=False, methods=["post"])
+    def bulk(self, request):
+        """
+        Apply a batch of queued progress events for the current user.
+
+        Expects {"events": [{"task_id", "status", "time_spent_delta",
+        "client_timestamp"}, ...]} and returns a result per event: applied,
+        stale (an older change than the stored one; only its time counts) or
+        error. Valid events are applied even when others fail.
+        """
+        events = request.data.get("events")
+        if not isinstance(events, list):
+            raise ValidationError({"events": "Expected a list of events."})
+        if len(events) > MAX_BATCH_SIZE:
+            raise ValidationError(
+                {"events": f"At most {MAX_BATCH_SIZE} events per request."}
+            )
+        return Response(apply_progress_events(request.user, events))
+
 
-class EnhancedQuizAttemptViewSet(BaseViewSet):
+class EnhancedQuizAttemptViewSet(EagerLoadingMixin, SparseFieldsViewMixin, BaseViewSet):
     """
     API endpoint for quiz attempts with enhanced filtering and analytics.
     """
@@ -187,6 +230,8 @@ class EnhancedQuizAttemptViewSet(BaseViewSet):
     queryset = QuizAttempt.objects.select_related("user", "quiz").all()
     serializer_class = QuizAttemptSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset_ordering = ("-attempt_date", "-id")
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ["quiz__title"]
     ordering_fields = ["attempt_date", "score"]
@@ -227,48 +272,19 @@ class EnhancedQuizAttemptViewSet(BaseViewSet):
                 {"error": "This quiz attempt has already been submitted"}, status=400
             )
 
-        # Get the responses from the request
-        responses_data = request.data.get("responses", [])
-
-        # Create QuizResponse objects for each response
-        for response_data in responses_data:
-            question_id = response_data.get("question")
-            selected_option_id = response_data.get("selected_option")
-
-            # Get the question to check if the answer is correct
-            question = get_object_or_404(QuizQuestion, id=question_id)
-
-            # Find the correct option for this question
-            correct_option = question.options.filter(is_correct=True).first()
-
-            # Create the response
-            QuizResponse.objects.create(
-                quiz_attempt=quiz_attempt,
-                question_id=question_id,
-                selected_option_id=selected_option_id,
-                is_correct=(
-                    selected_option_id == correct_option.id if correct_option else False
-                ),
-            )
-
-        # Calculate the score
-        total_responses = QuizResponse.objects.filter(quiz_attempt=quiz_attempt).count()
-        correct_responses = QuizResponse.objects.filter(
-            quiz_attempt=quiz_attempt, is_correct=True
-        ).count()
-
-        if total_responses > 0:
-            score_percentage = (correct_responses / total_responses) * 100
-        else:
-            score_percentage = 0
-
-        # Update the quiz attempt
-        quiz_attempt.score = score_percentage
-        quiz_attempt.completion_status = "completed"
-        quiz_attempt.attempt_date = timezone.now()
-        quiz_attempt.save()
+        # Grade every response against the quiz's answer key in one pass
+        grade_attempt(quiz_attempt.pk, request.data.get("responses", []))
 
         # Return the updated quiz attempt
+        quiz_attempt = (
+            self.get_queryset()
+            .prefetch_related(
+                "quiz__questions__options",
+                "responses__question__options",
+                "responses__selected_option",
+            )
+            .get(pk=quiz_attempt.pk)
+        )
         serializer = self.get_serializer(quiz_attempt)
         return Response(serializer.data)
 
@@ -290,8 +306,10 @@ class EnhancedQuizAttemptViewSet(BaseViewSet):
             )
 
         # Get the responses
-        responses = QuizResponse.objects.filter(quiz_attempt=quiz_attempt)
-        serializer = QuizResponseSerializer(responses, many=True)
+        responses = QuizResponse.objects.filter(attempt=quiz_attempt)
+        serializer = QuizResponseSerializer(
+            responses, many=True, context=self.get_serializer_context()
+        )
 
         return Response(serializer.data)
 
@@ -317,150 +335,15 @@ class CourseAnalyticsAPI(APIView):
             - time_distribution: how students distribute their time across modules
             - difficulty_assessment: identification of challenging content
         """
-        course = get_object_or_404(Course, pk=pk)
-
-        # Try to get cached data first
-        cache_key = f"course_analytics_{pk}"
-        cached_data = cache.get(cache_key)
-
-        if cached_data:
-            return Response(cached_data)
-
-        # Calculate enrollment statistics
-        total_enrollments = CourseEnrollment.objects.filter(course=course).count()
-        active_enrollments = CourseEnrollment.objects.filter(
-            course=course, status="active"
-        ).count()
-        completed_enrollments = CourseEnrollment.objects.filter(
-            course=course, status="completed"
-        ).count()
-        dropped_enrollments = CourseEnrollment.objects.filter(
-            course=course, status="dropped"
-        ).count()
-
-        # Calculate completion rates
-        all_tasks = LearningTask.objects.filter(course=course)
-        total_tasks = all_tasks.count()
-
-        # Get all task progress records for this course
-        task_progress_records = TaskProgress.objects.filter(
-            task__course=course
-        ).select_related("user", "task")
-
-        # Group task progress by user to calculate completion rate per student
-        user_progress = {}
-        for progress in task_progress_records:
-            user_id = progress.user_id
-            if user_id not in user_progress:
-                user_progress[user_id] = {"completed": 0, "total": total_tasks}
-
-            if progress.status == "completed":
-                user_progress[user_id]["completed"] += 1
-
-        # Calculate average completion rate
-        completion_rates = []
-        for user_id, progress in user_progress.items():
-            if progress["total"] > 0:
-                completion_rate = (progress["completed"] / progress["total"]) * 100
-                completion_rates.append(completion_rate)
-
-        avg_completion_rate = (
-            sum(completion_rates) / len(completion_rates) if completion_rates else 0
-        )
+        course = get_instance_or_404(Course, pk)
 
-        # Calculate average scores for quiz tasks
-        quiz_attempts = QuizAttempt.objects.filter(
-            quiz__course=course, completion_status="completed"
+        # Aggregate everything with a fixed number of grouped queries; cached,
+        # and recomputed by one request at a time
+        analytics = serve_cached(
+            "course_analytics", lambda: course_analytics(course), courses=[course.id]
         )
 
-        avg_quiz_score = quiz_attempts.aggregate(Avg("score"))["score__avg"] or 0
-
-        # Task type distribution
-        task_types = {
-            "reading": LearningTask.objects.filter(
-                course=course, type="reading"
-            ).count(),
-            "video": LearningTask.objects.filter(course=course, type="video").count(),
-            "quiz": QuizTask.objects.filter(course=course).count(),
-            "assignment": LearningTask.objects.filter(
-                course=course, type="assignment"
-            ).count(),
-            "discussion": LearningTask.objects.filter(
-                course=course, type="discussion"
-            ).count(),
-        }
-
-        # Identify challenging content
-        # Get questions with low success rates
-        challenging_questions = []
-        quiz_tasks = QuizTask.objects.filter(course=course)
-
-        for quiz in quiz_tasks:
-            questions = QuizQuestion.objects.filter(quiz=quiz)
-
-            for question in questions:
-                # Calculate success rate for this question
-                total_responses = QuizResponse.objects.filter(question=question).count()
-
-                correct_responses = QuizResponse.objects.filter(
-                    question=question, is_correct=True
-                ).count()
-
-                if total_responses > 0:
-                    success_rate = (correct_responses / total_responses) * 100
-
-                    # If success rate is below 50%, consider it challenging
-                    if (
-                        success_rate < 50 and total_responses >= 5
-                    ):  # Only consider questions with sufficient attempts
-                        challenging_questions.append(
-                            {
-                                "id": question.id,
-                                "text": question.text,
-                                "quiz": quiz.title,
-                                "success_rate": round(success_rate, 2),
-                                "total_attempts": total_responses,
-                            }
-                        )
-
-        # Sort challenging questions by success rate (ascending)
-        challenging_questions.sort(key=lambda x: x["success_rate"])
-
-        # Compile results
-        analytics_data = {
-            "enrollment_stats": {
-                "total": total_enrollments,
-                "active": active_enrollments,
-                "completed": completed_enrollments,
-                "dropped": dropped_enrollments,
-                "completion_percentage": (
-                    round((completed_enrollments / total_enrollments * 100), 2)
-                    if total_enrollments > 0
-                    else 0
-                ),
-            },
-            "completion_rates": {
-                "average": round(avg_completion_rate, 2),
-                "distribution": {
-                    "below_25": len([r for r in completion_rates if r < 25]),
-                    "25_to_50": len([r for r in completion_rates if 25 <= r < 50]),
-                    "50_to_75": len([r for r in completion_rates if 50 <= r < 75]),
-                    "above_75": len([r for r in completion_rates if r >= 75]),
-                },
-            },
-            "average_scores": {"quizzes": round(avg_quiz_score, 2)},
-            "content_distribution": task_types,
-            "challenging_content": {
-                "questions": challenging_questions[
-                    :10
-                ]  # Top 10 most challenging questions
-            },
-        }
-
-        # Cache the analytics data for 1 hour
-        cache.set(cache_key, analytics_data, 60 * 60)
-
-        return Response(analytics_data)
+        return Response(analytics.data, headers=analytics.headers)
 
 
 logger = logging.getLogger(__name__)  # Add a logger for this module
@@ -471,6 +354,12 @@ class CourseStudentProgressAPI(APIView):
     API endpoint for retrieving detailed progress data for all students in a specific course.
     Provides individualized statistics about student performance, task completion,
     and engagement levels for instructors and administrators.
+
+    Query Parameters (instructors/admins):
+        ordering: "-completion" (default) or "completion"
+        view: "matrix" for the compact student x task status grid
+        page, page_size: Pagination over students in matrix mode
+        stream: "true" to stream the whole matrix instead of paginating
     """
 
     permission_classes = [permissions.IsAuthenticated]
@@ -494,7 +383,7 @@ class CourseStudentProgressAPI(APIView):
             f"[CourseStudentProgressAPI] Received request for course progress. User: {request.user.id}, Course ID: {pk}"
         )
         try:
-            course = get_object_or_404(Course, pk=pk)
+            course = get_instance_or_404(Course, pk)
             logger.info(
                 f"[CourseStudentProgressAPI] Course found: {course.title} (ID: {course.id})"
             )
@@ -522,41 +411,8 @@ class CourseStudentProgressAPI(APIView):
                     f"[CourseStudentProgressAPI] User {request.user.id} is enrolled in course {course.id}. Retrieving progress."
                 )
                 # Return only the student's own progress
-                user_task_progress = TaskProgress.objects.filter(
-                    user=request.user, task__course=course
-                ).select_related("task")
-                total_tasks = LearningTask.objects.filter(course=course).count()
-                completed_tasks = user_task_progress.filter(status="completed").count()
-                completion_percentage = (
-                    (completed_tasks / total_tasks) * 100 if total_tasks > 0 else 0
-                )
-
-                student_progress_data = {
-                    "student_info": {
-                        "id": request.user.id,
-                        "username": request.user.username,
-                        "email": request.user.email,
-                        "full_name": f"{getattr(request.user, 'first_name', '')} {getattr(request.user, 'last_name', '')}".strip(),
-                    },
-                    "progress_summary": {
-                        "completion_percentage": round(completion_percentage, 2),
-                        "completed_tasks": completed_tasks,
-                        "total_tasks": total_tasks,
-                    },
-                    "task_completion": [
-                        {
-                            "task_id": task.id,
-                            "task_title": task.title,
-                            "task_type": task.type,
-                            "status": progress.status if progress else "not_started",
-                            "completion_date": (
-                                progress.completion_date if progress else None
-                            ),
-                        }
-                        for task in LearningTask.objects.filter(course=course)
-                        for progress in [user_task_progress.filter(task=task).first()]
-                    ],
-                }
+                matrix = ProgressMatrix(course, user_ids=[request.user.id])
+                student_progress_data = matrix.student_payload(matrix.students[0])
 
                 logger.info(
                     f"[CourseStudentProgressAPI] Progress data retrieved successfully for user {request.user.id}."
@@ -567,56 +423,21 @@ class CourseStudentProgressAPI(APIView):
             logger.info(
                 f"[CourseStudentProgressAPI] User {request.user.id} is an instructor/admin. Retrieving progress for all students."
             )
-            enrollments = CourseEnrollment.objects.filter(course=course).select_related(
-                "user"
-            )
-            student_progress_data = []
-
-            for enrollment in enrollments:
-                user = enrollment.user
-                user_task_progress = TaskProgress.objects.filter(
-                    user=user, task__course=course
-                ).select_related("task")
-                total_tasks = LearningTask.objects.filter(course=course).count()
-                completed_tasks = user_task_progress.filter(status="completed").count()
-                completion_percentage = (
-                    (completed_tasks / total_tasks) * 100 if total_tasks > 0 else 0
+            matrix = ProgressMatrix(course)
+            ordering = request.query_params.get("ordering", "-completion")
+            if ordering not in ("completion", "-completion"):
+                return Response(
+                    {"error": "ordering must be 'completion' or '-completion'."},
+                    status=400,
                 )
+            students = matrix.ordered_students(descending=ordering == "-completion")
 
-                student_data = {
-                    "student_info": {
-                        "id": user.id,
-                        "username": user.username,
-                        "email": user.email,
-                        "full_name": f"{getattr(user, 'first_name', '')} {getattr(user, 'last_name', '')}".strip(),
-                    },
-                    "progress_summary": {
-                        "completion_percentage": round(completion_percentage, 2),
-                        "completed_tasks": completed_tasks,
-                        "total_tasks": total_tasks,
-                    },
-                    "task_completion": [
-                        {
-                            "task_id": task.id,
-                            "task_title": task.title,
-                            "task_type": task.type,
-                            "status": progress.status if progress else "not_started",
-                            "completion_date": (
-                                progress.completion_date if progress else None
-                            ),
-                        }
-                        for task in LearningTask.objects.filter(course=course)
-                        for progress in [user_task_progress.filter(task=task).first()]
-                    ],
-                }
-
-                student_progress_data.append(student_data)
+            if request.query_params.get("view") == "matrix":
+                return self._matrix_response(request, matrix, students)
 
-            # Sort by completion percentage (descending)
-            student_progress_data.sort(
-                key=lambda x: x["progress_summary"]["completion_percentage"],
-                reverse=True,
-            )
+            student_progress_data = [
+                matrix.student_payload(student) for student in students
+            ]
 
             logger.info(
                 f"[CourseStudentProgressAPI] Progress data retrieved successfully for course {course.id}."
@@ -635,6 +456,26 @@ class CourseStudentProgressAPI(APIView):
                 {"error": f"An unexpected error occurred: {str(e)}"}, status=500
             )
 
+    def _matrix_response(self, request, matrix, students):
+        """
+        Return the compact student x task matrix.
+
+        Streams every student row when ``stream=true`` is passed, otherwise
+        returns a page of students with the usual pagination metadata.
+        """
+        if request.query_params.get("stream", "").lower() in ("1", "true"):
+            return StreamingHttpResponse(
+                matrix.stream(students), content_type="application/json"
+            )
+
+        paginator = LargeSetPagination()
+        page = paginator.paginate_queryset(students, request, view=self)
+        response = paginator.get_paginated_response(
+            [matrix.matrix_row(student) for student in page]
+        )
+        response.data.update(matrix.header())
+        return response
+
 
 class CourseTaskAnalyticsAPI(APIView):
     """
@@ -650,6 +491,7 @@ class CourseTaskAnalyticsAPI(APIView):
 
         Parameters:
             pk (int): The course ID
+            task_ids (query, optional): Comma-separated IDs to restrict the tasks
 
         Returns:
             - tasks: List of tasks with analytics data
@@ -657,138 +499,29 @@ class CourseTaskAnalyticsAPI(APIView):
               - difficulty_assessment: estimated difficulty based on completion time
               - student_performance: aggregated performance metrics
         """
-        course = get_object_or_404(Course, pk=pk)
-
-        # Try to get cached data first
-        cache_key = f"course_task_analytics_{pk}"
-        cached_data = cache.get(cache_key)
-
-        if cached_data:
-            return Response(cached_data)
-
-        # Get all tasks for this course
-        tasks = LearningTask.objects.filter(course=course)
-
-        task_analytics = []
-
-        for task in tasks:
-            # Get all progress records for this task
-            task_progress_records = TaskProgress.objects.filter(task=task)
-
-            # Calculate completion statistics
-            total_attempts = task_progress_records.count()
-            completed = task_progress_records.filter(status="completed").count()
-            in_progress = task_progress_records.filter(status="in_progress").count()
-            not_started = task_progress_records.filter(status="not_started").count()
-
-            completion_rate = (
-                (completed / total_attempts) * 100 if total_attempts > 0 else 0
-            )
-
-            # Average time to completion (for completed tasks with both start and completion dates)
-            avg_completion_time = None
-            completion_times = []
-
-            for progress in task_progress_records.filter(
-                status="completed",
-                start_date__isnull=False,
-                completion_date__isnull=False,
-            ):
-                completion_time = (
-                    progress.completion_date - progress.start_date
-                ).total_seconds() / 3600  # in hours
-                completion_times.append(completion_time)
-
-            if completion_times:
-                avg_completion_time = sum(completion_times) / len(completion_times)
-
-            # Additional analytics for quiz tasks
-            quiz_data = None
-
-            if task.type == "quiz":
-                try:
-                    quiz_task = QuizTask.objects.get(id=task.id)
-                    quiz_attempts = QuizAttempt.objects.filter(
-                        quiz=quiz_task, completion_status="completed"
-                    )
-                    avg_quiz_score = (
-                        quiz_attempts.aggregate(Avg("score"))["score__avg"] or 0
-                    )
-
-                    # Question-level analysis
-                    question_analysis = []
-
-                    for question in QuizQuestion.objects.filter(quiz=quiz_task):
-                        responses = QuizResponse.objects.filter(question=question)
-                        total_responses = responses.count()
-                        correct_responses = responses.filter(is_correct=True).count()
-
-                        success_rate = (
-                            (correct_responses / total_responses) * 100
-                            if total_responses > 0
-                            else 0
-                        )
-
-                        question_analysis.append(
-                            {
-                                "question_id": question.id,
-                                "text": question.text,
-                                "success_rate": round(success_rate, 2),
-                                "total_responses": total_responses,
-                            }
-                        )
-
-                    quiz_data = {
-                        "average_score": round(avg_quiz_score, 2),
-                        "total_attempts": quiz_attempts.count(),
-                        "question_analysis": sorted(
-                            question_analysis, key=lambda x: x["success_rate"]
-                        ),
-                    }
-
-                except QuizTask.DoesNotExist:
-                    pass
-
-            # Compile task analytics
-            task_data = {
-                "task_id": task.id,
-                "title": task.title,
-                "type": task.type,
-                "completion_stats": {
-                    "total_students": total_attempts,
-                    "completed": completed,
-                    "in_progress": in_progress,
-                    "not_started": not_started,
-                    "completion_rate": round(completion_rate, 2),
-                    "avg_completion_time_hours": (
-                        round(avg_completion_time, 2) if avg_completion_time else None
-                    ),
-                },
-                "difficulty_assessment": {
-                    "estimated_difficulty": (
-                        "high"
-                        if completion_rate < 50
-                        else ("medium" if completion_rate < 80 else "low")
-                    ),
-                    "avg_attempts_to_complete": (
-                        round(total_attempts / completed, 2) if completed > 0 else None
-                    ),
-                },
-            }
-
-            # Add quiz data if available
-            if quiz_data:
-                task_data["quiz_analysis"] = quiz_data
+        course = get_instance_or_404(Course, pk)
 
-            task_analytics.append(task_data)
-
-        # Sort by completion rate (ascending, to highlight problematic tasks)
-        task_analytics.sort(key=lambda x: x["completion_stats"]["completion_rate"])
+        task_ids = None
+        if request.query_params.get("task_ids"):
+            try:
+                task_ids = sorted(
+                    {int(i) for i in request.query_params["task_ids"].split(",")}
+                )
+            except ValueError:
+                return Response(
+                    {"error": "task_ids must be a comma-separated list of IDs."},
+                    status=400,
+                )
 
-        # Cache the analytics data for 1 hour
-        cache.set(cache_key, task_analytics, 60 * 60)
+        cache_base = "course_task_analytics"
+        if task_ids is not None:
+            ids_key = ",".join(map(str, task_ids)).encode()
+            cache_base += f"_{hashlib.md5(ids_key).hexdigest()}"
+        analytics = serve_cached(
+            cache_base, lambda: task_analytics(course, task_ids), courses=[course.id]
+        )
 
-        return Response(task_analytics)
+        return Response(analytics.data, headers=analytics.headers)
 
 
 class StudentProgressAPI(APIView):
@@ -805,6 +538,8 @@ class StudentProgressAPI(APIView):
 
         Parameters:
             pk (int): The user ID (optional for students viewing their own progress)
+            course_ids (query, optional): Comma-separated course IDs; returns
+                only those courses (without overall_stats) for partial refresh
 
         Returns:
             - overall_stats: aggregated statistics across all courses
@@ -819,7 +554,7 @@ class StudentProgressAPI(APIView):
             )
         else:
             # User ID provided, check permissions
-            user = get_object_or_404(User, pk=pk)
+            user = get_instance_or_404(User, pk)
 
             # Check if the requesting user has permission to view this user's progress
             if request.user.id != user.id:
@@ -835,133 +570,27 @@ class StudentProgressAPI(APIView):
                         status=403,
                     )
 
-        # Try to get cached data first
-        cache_key = f"student_progress_{user.id}"
-        cached_data = cache.get(cache_key)
-
-        if cached_data:
-            return Response(cached_data)
-
-        # Get all course enrollments for this user
-        enrollments = CourseEnrollment.objects.filter(user=user).select_related(
-            "course"
-        )
-
-        # Initialize aggregated statistics
-        total_courses = enrollments.count()
-        completed_courses = enrollments.filter(status="completed").count()
-        active_courses = enrollments.filter(status="active").count()
-        dropped_courses = enrollments.filter(status="dropped").count()
-
-        total_tasks = 0
-        completed_tasks = 0
-
-        # Detailed progress for each course
-        course_progress = []
-
-        for enrollment in enrollments:
-            course = enrollment.course
-
-            # Get task progress for this course
-            course_task_progress = TaskProgress.objects.filter(
-                user=user, task__course=course
-            ).select_related("task")
-
-            # Course-specific task counts
-            course_total_tasks = LearningTask.objects.filter(course=course).count()
-            course_completed_tasks = course_task_progress.filter(
-                status="completed"
-            ).count()
-
-            # Update aggregated counts
-            total_tasks += course_total_tasks
-            completed_tasks += course_completed_tasks
-
-            # Calculate completion percentage
-            completion_percentage = (
-                (course_completed_tasks / course_total_tasks) * 100
-                if course_total_tasks > 0
-                else 0
-            )
-
-            # Get quiz performance
-            quiz_attempts = QuizAttempt.objects.filter(
-                user=user, quiz__course=course, completion_status="completed"
-            )
-
-            avg_quiz_score = quiz_attempts.aggregate(Avg("score"))["score__avg"] or 0
-
-            # Recent activity in this course
-            recent_activity = course_task_progress.order_by("-updated_at")[:3].values(
-                "task__title", "status", "updated_at"
-            )
-
-            # Compile course data
-            course_data = {
-                "course_id": course.id,
-                "course_title": course.title,
-                "enrollment_status": enrollment.status,
-                "enrollment_date": enrollment.enrollment_date,
-                "progress_summary": {
-                    "completion_percentage": round(completion_percentage, 2),
-                    "completed_tasks": course_completed_tasks,
-                    "total_tasks": course_total_tasks,
-                },
-                "assessment_performance": {
-                    "average_quiz_score": round(avg_quiz_score, 2),
-                    "quiz_attempts": quiz_attempts.count(),
-                },
-                "recent_activity": list(recent_activity),
-                "last_access": (
-                    course_task_progress.order_by("-updated_at").first().updated_at
-                    if course_task_progress.exists()
-                    else None
-                ),
-            }
-
-            course_progress.append(course_data)
-
-        # Calculate overall completion percentage
-        overall_completion_percentage = (
-            (completed_tasks / total_tasks) * 100 if total_tasks > 0 else 0
-        )
-
-        # Get overall quiz performance"completed")
-        all_quiz_attempts = QuizAttempt.objects.filter(
-            user=user, completion_status="completed"
-        )
+        # Partial refresh of specific course cards, computed without the cache
+        if request.query_params.get("course_ids"):
+            try:
+                course_ids = {
+                    int(i) for i in request.query_params["course_ids"].split(",")
+                }
+            except ValueError:
+                return Response(
+                    {"error": "course_ids must be a comma-separated list of IDs."},
+                    status=400,
+                )
+            return Response(student_progress(user, course_ids))
 
-        overall_avg_quiz_score = (
-            all_quiz_attempts.aggregate(Avg("score"))["score__avg"] or 0
+        progress = serve_cached(
+            "student_progress",
+            lambda: student_progress(user),
+            users=[user.id],
+            depends_on=lambda data: [course["course_id"] for course in data["courses"]],
         )
 
-        # Compile results
-        student_progress_data = {
-            "user_info": {
-                "id": user.id,
-                "username": user.username,
-                "email": user.email,
-                "full_name": f"{getattr(user, 'first_name', '')} {getattr(user, 'last_name', '')}".strip(),
-            },
-            "overall_stats": {
-                "total_courses": total_courses,
-                "completed_courses": completed_courses,
-                "active_courses": active_courses,
-                "dropped_courses": dropped_courses,
-                "overall_completion": round(overall_completion_percentage, 2),
-                "total_tasks_completed": completed_tasks,
-                "total_tasks": total_tasks,
-                "average_quiz_score": round(overall_avg_quiz_score, 2),
-            },
-            "courses": sorted(
-                course_progress, key=lambda x: x["enrollment_date"], reverse=True
-            ),
-        }
-
-        # Cache the data for 15 minutes
-        cache.set(cache_key, student_progress_data, 15 * 60)
-
-        return Response(student_progress_data)
+        return Response(progress.data, headers=progress.headers)
 
 
 class StudentQuizPerformanceAPI(APIView):
@@ -984,6 +613,9 @@ class StudentQuizPerformanceAPI(APIView):
             - course_breakdown: quiz performance by course
             - recent_attempts: details of recent quiz attempts
             - performance_by_category: analysis by question category/tag
+
+        With ``?view=attempts`` returns the paginated history of every
+        completed attempt with its correct/total response counts instead.
         """
         # Determine which user's performance to retrieve
         if pk is None:
@@ -991,7 +623,7 @@ class StudentQuizPerformanceAPI(APIView):
             user = request.user
         else:
             # User ID provided, check permissions
-            user = get_object_or_404(User, pk=pk)
+            user = get_instance_or_404(User, pk)
 
             # Check if the requesting user has permission to view this user's performance
             if request.user.id != user.id:
@@ -1007,191 +639,26 @@ class StudentQuizPerformanceAPI(APIView):
                         status=403,
                     )
 
-        # Try to get cached data first
-        cache_key = f"student_quiz_performance_{user.id}"
-        cached_data = cache.get(cache_key)
-
-        if cached_data:
-            return Response(cached_data)
-
-        # Get all quiz attempts for this user
-        quiz_attempts = QuizAttempt.objects.filter(
-            user=user, completion_status="completed"
-        ).select_related("quiz", "quiz__course")
-
-        # Calculate overall statistics
-        total_attempts = quiz_attempts.count()
-
-        if total_attempts == 0:
-            # No quiz attempts yet
-            return Response(
-                {
-                    "user_info": {
-                        "id": user.id,
-                        "username": user.username,
-                        "email": user.email,
-                        "full_name": f"{getattr(user, 'first_name', '')} {getattr(user, 'last_name', '')}".strip(),
-                    },
-                    "overall_stats": {
-                        "total_attempts": 0,
-                        "average_score": 0,
-                        "quizzes_passed": 0,
-                        "quizzes_failed": 0,
-                    },
-                    "course_breakdown": [],
-                    "recent_attempts": [],
-                    "performance_by_category": [],
-                }
+        # Full attempt history, paginated so memory stays bounded
+        if request.query_params.get("view") == "attempts":
+            paginator = LargeSetPagination()
+            page = paginator.paginate_queryset(
+                attempt_statistics(user), request, view=self
             )
-
-        # Calculate average score
-        avg_score = quiz_attempts.aggregate(Avg("score"))["score__avg"] or 0
-
-        # Count passed/failed quizzes (assuming 60% is passing)
-        passed_quizzes = quiz_attempts.filter(score__gte=60).count()
-        failed_quizzes = quiz_attempts.filter(score__lt=60).count()
-
-        # Get quiz responses for detailed analysis
-        quiz_responses = QuizResponse.objects.filter(
-            quiz_attempt__in=quiz_attempts
-        ).select_related("question", "selected_option", "quiz_attempt")
-
-        # Performance by course
-        course_breakdown = []
-
-        # Group attempts by course
-        course_attempts = {}
-        for attempt in quiz_attempts:
-            course_id = attempt.quiz.course.id
-            course_title = attempt.quiz.course.title
-
-            if course_id not in course_attempts:
-                course_attempts[course_id] = {
-                    "course_id": course_id,
-                    "course_title": course_title,
-                    "attempts": [],
-                    "quizzes": set(),
-                }
-
-            course_attempts[course_id]["attempts"].append(attempt)
-            course_attempts[course_id]["quizzes"].add(attempt.quiz.id)
-
-        # Calculate course-specific statistics
-        for course_id, data in course_attempts.items():
-            attempts = data["attempts"]
-            course_avg_score = sum(a.score for a in attempts) / len(attempts)
-
-            course_breakdown.append(
-                {
-                    "course_id": data["course_id"],
-                    "course_title": data["course_title"],
-                    "total_quizzes": len(data["quizzes"]),
-                    "total_attempts": len(attempts),
-                    "average_score": round(course_avg_score, 2),
-                    "highest_score": round(max(a.score for a in attempts), 2),
-                    "lowest_score": round(min(a.score for a in attempts), 2),
-                }
+            return paginator.get_paginated_response(
+                [attempt_payload(row) for row in page]
             )
 
-        # Sort by average score (descending)
-        course_breakdown.sort(key=lambda x: x["average_score"], reverse=True)
-
-        # Recent quiz attempts (last 5)
-        recent_attempts = []
-
-        for attempt in quiz_attempts.order_by("-attempt_date")[:5]:
-            # Get responses for this attempt
-            attempt_responses = quiz_responses.filter(quiz_attempt=attempt)
-
-            # Count correct/incorrect responses
-            correct_responses = attempt_responses.filter(is_correct=True).count()
-            total_responses = attempt_responses.count()
-
-            recent_attempts.append(
-                {
-                    "attempt_id": attempt.id,
-                    "quiz_id": attempt.quiz.id,
-                    "quiz_title": attempt.quiz.title,
-                    "course_title": attempt.quiz.course.title,
-                    "score": round(attempt.score, 2),
-                    "correct_answers": correct_responses,
-                    "total_questions": total_responses,
-                    "submission_time": attempt.attempt_date,
-                    "time_spent": (
-                        str(attempt.attempt_date - attempt.started_at)
-                        if attempt.started_at
-                        else None
-                    ),
-                }
-            )
-
-        # Performance by question category/tag (if available)
-        performance_by_category = []
-
-        # Analyze question categories (assuming questions have categories/tags)
-        question_categories = {}
-
-        for response in quiz_responses:
-            # Get the question's category or tag (if available)
-            category = getattr(response.question, "category", None) or getattr(
-                response.question, "tag", None
-            )
-
-            if category:
-                if category not in question_categories:
-                    question_categories[category] = {"total": 0, "correct": 0}
-
-                question_categories[category]["total"] += 1
-
-                if response.is_correct:
-                    question_categories[category]["correct"] += 1
-
-        # Calculate success rate by category
-        for category, data in question_categories.items():
-            success_rate = (
-                (data["correct"] / data["total"]) * 100 if data["total"] > 0 else 0
-            )
-
-            performance_by_category.append(
-                {
-                    "category": category,
-                    "total_questions": data["total"],
-                    "correct_answers": data["correct"],
-                    "success_rate": round(success_rate, 2),
-                }
-            )
+        performance = serve_cached(
+            "student_quiz_performance",
+            lambda: student_quiz_performance(user),
+            users=[user.id],
+            depends_on=lambda data: [
+                row["course_id"] for row in data["course_breakdown"]
+            ],
+        )
 
-        # Sort by success rate (ascending, to highlight problematic categories)
-        performance_by_category.sort(key=lambda x: x["success_rate"])
-
-        # Compile results
-        performance_data = {
-            "user_info": {
-                "id": user.id,
-                "username": user.username,
-                "email": user.email,
-                "full_name": f"{getattr(user, 'first_name', '')} {getattr(user, 'last_name', '')}".strip(),
-            },
-            "overall_stats": {
-                "total_attempts": total_attempts,
-                "average_score": round(avg_score, 2),
-                "quizzes_passed": passed_quizzes,
-                "quizzes_failed": failed_quizzes,
-                "pass_rate": (
-                    round((passed_quizzes / total_attempts) * 100, 2)
-                    if total_attempts > 0
-                    else 0
-                ),
-            },
-            "course_breakdown": course_breakdown,
-            "recent_attempts": recent_attempts,
-            "performance_by_category": performance_by_category,
-        }
-
-        # Cache the data for 15 minutes
-        cache.set(cache_key, performance_data, 15 * 60)
-
-        return Response(performance_data)
+        return Response(performance.data, headers=performance.headers)
 
 
 class CourseProgressAPI(APIView):
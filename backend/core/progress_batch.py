@@ -0,0 +1,188 @@
+"""
+Bulk upsert of task progress events from batched and offline clients.
+
+A client queues ``(task_id, status, time_spent_delta, client_timestamp)``
+events while offline and sends them in one request. ``apply_progress_events``
+applies a whole batch in a constant number of queries:
+- Events are validated one by one; invalid events are reported, not applied
+- The learner's progress rows for the batch's tasks are locked and loaded
+  with one query, inside a single transaction
+- Events are folded per task in client time order, then written with one
+  bulk update and one bulk insert
+- Course progress summaries and cache generations are refreshed once per
+  batch instead of once per event
+
+Conflicts are resolved by timestamp: a status change applies only when its
+client timestamp is not older than the row's last change, so an offline
+client replaying old events cannot undo newer changes made elsewhere. The
+row's last change is the client time of the last bulk-applied change, or its
+server update time once a single-row endpoint has written it. Time spent is
+additive, so the delta of a stale event still counts.
+"""
+
+import datetime
+import logging
+from typing import Any, Dict, List, Optional
+
+from django.db import transaction
+from django.utils import timezone
+
+from . import caching
+from .models import LearningTask, TaskProgress
+from .progress_summary import rebuild_summaries
+from .serializers import TaskProgressEventSerializer
+
+logger = logging.getLogger(__name__)
+
+MAX_BATCH_SIZE = 500
+
+APPLIED = "applied"
+STALE = "stale"
+ERROR = "error"
+
+WRITTEN_FIELDS = [
+    "status",
+    "time_spent",
+    "start_date",
+    "completion_date",
+    "client_updated_at",
+    "updated_at",
+]
+
+
+def _last_change(progress: TaskProgress) -> Optional[datetime.datetime]:
+    return progress.client_updated_at or progress.updated_at
+
+
+def _apply_event(progress: TaskProgress, event: Dict[str, Any]) -> str:
+    """Fold one event into an unsaved progress row and return its outcome."""
+    progress.time_spent += event["time_spent_delta"]
+    timestamp = event["client_timestamp"]
+    last_change = _last_change(progress)
+    if last_change is not None and timestamp < last_change:
+        return STALE
+
+    progress.status = event["status"]
+    progress.client_updated_at = timestamp
+    if progress.status in ("in_progress", "completed") and not progress.start_date:
+        progress.start_date = timestamp
+    if progress.status == "completed" and not progress.completion_date:
+        progress.completion_date = timestamp
+    return APPLIED
+
+
+def apply_progress_events(user, events: List[Any]) -> Dict[str, Any]:
+    """
+    Validate and apply a batch of progress events for ``user``.
+
+    Args:
+        user: The learner the events belong to
+        events: List of {"task_id", "status", "time_spent_delta",
+            "client_timestamp"}
+
+    Returns:
+        dict: ``results`` with one entry per event, in request order, and the
+            number of applied, stale and failed events
+    """
+    results: List[Dict[str, Any]] = []
+    valid = []
+    for index, data in enumerate(events):
+        serializer = TaskProgressEventSerializer(data=data)
+        if serializer.is_valid():
+            event = serializer.validated_data
+            valid.append((index, event))
+            results.append({"index": index, "task_id": event["task_id"]})
+        else:
+            task_id = data.get("task_id") if isinstance(data, dict) else None
+            results.append(
+                {
+                    "index": index,
+                    "task_id": task_id,
+                    "result": ERROR,
+                    "errors": serializer.errors,
+                }
+            )
+
+    task_ids = {event["task_id"] for _, event in valid}
+    courses = dict(
+        LearningTask.objects.filter(id__in=task_ids, is_deleted=False).values_list(
+            "id", "course_id"
+        )
+    )
+    now = timezone.now()
+
+    with transaction.atomic():
+        rows = {
+            progress.task_id: progress
+            for progress in TaskProgress.objects.select_for_update().filter(
+                user=user, task_id__in=courses.keys()
+            )
+        }
+        existing = set(rows)
+        # Client order; ties keep request order
+        valid.sort(key=lambda item: (item[1]["client_timestamp"], item[0]))
+        for index, event in valid:
+            task_id = event["task_id"]
+            if task_id not in courses:
+                results[index].update(
+                    result=ERROR, errors={"task_id": ["Task not found."]}
+                )
+                continue
+            progress = rows.get(task_id)
+            if progress is None:
+                progress = rows[task_id] = TaskProgress(
+                    user=user, task_id=task_id, status="not_started"
+                )
+            results[index]["result"] = _apply_event(progress, event)
+
+        for progress in rows.values():
+            progress.updated_at = now
+        TaskProgress.objects.bulk_update(
+            [rows[task_id] for task_id in existing], WRITTEN_FIELDS
+        )
+        created = [
+            progress for task_id, progress in rows.items() if task_id not in existing
+        ]
+        # A concurrent first write of the same row is resolved in our favour
+        TaskProgress.objects.bulk_create(
+            created,
+            update_conflicts=True,
+            unique_fields=["user", "task"],
+            update_fields=WRITTEN_FIELDS,
+        )
+
+        stored = dict(
+            TaskProgress.objects.filter(user=user, task_id__in=rows.keys()).values_list(
+                "task_id", "id"
+            )
+        )
+        affected_courses = {courses[task_id] for task_id in rows}
+        rebuild_summaries((user.pk, course_id) for course_id in affected_courses)
+
+    if rows:
+        caching.bump_generation(caching.USER, user.pk)
+        for course_id in affected_courses:
+            caching.bump_generation(caching.COURSE, course_id)
+        caching.model_changed(TaskProgress)
+
+    for result in results:
+        if result["result"] != ERROR:
+            progress = rows[result["task_id"]]
+            result.update(progress_id=stored[progress.task_id], status=progress.status)
+
+    counts = {outcome: 0 for outcome in (APPLIED, STALE, ERROR)}
+    for result in results:
+        counts[result["result"]] += 1
+    logger.info(
+        "Applied progress batch for user %s: %d applied, %d stale, %d failed",
+        user.pk,
+        counts[APPLIED],
+        counts[STALE],
+        counts[ERROR],
+    )
+    return {
+        "results": results,
+        "applied": counts[APPLIED],
+        "stale": counts[STALE],
+        "failed": counts[ERROR],
+    }
@@ -0,0 +1,166 @@
+"""
+Student-by-task progress matrix for a course.
+
+Builds the full status grid for a course from a fixed number of queries
+(tasks, enrolled students and progress rows) into a compact in-memory
+structure: one ``bytearray`` of status codes per student, indexed by task
+column. Completion dates are only kept for cells that have one.
+
+The matrix backs both response shapes of ``CourseStudentProgressAPI``:
+- The per-student payload (student info, progress summary, task list)
+- The compact matrix mode, which can be paginated, sorted by completion
+  and streamed row by row
+
+Only published, non-deleted tasks are part of the grid, matching the tasks
+counted by the materialized progress summaries.
+"""
+
+import json
+import logging
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from rest_framework.utils.encoders import JSONEncoder
+
+from .models import Course, CourseEnrollment, LearningTask, TaskProgress
+from .progress_summary import COUNTED_TASK_FILTER, calculate_percentage
+
+logger = logging.getLogger(__name__)
+
+# Status codes stored in the grid; the index is the code
+STATUS_CODES = ("not_started", "in_progress", "completed")
+_STATUS_INDEX = {status: code for code, status in enumerate(STATUS_CODES)}
+COMPLETED = _STATUS_INDEX["completed"]
+
+
+class ProgressMatrix:
+    """
+    Status grid of every enrolled student against every counted task.
+
+    Attributes:
+        tasks: Task columns, in course order, as dicts (id, title, type)
+        students: Enrolled students, in enrollment order, as dicts
+        rows: Mapping of user ID to a bytearray of status codes per column
+        completion_dates: Mapping of (user ID, column) to completion date
+        completed: Mapping of user ID to the number of completed tasks
+    """
+
+    def __init__(self, course: Course, user_ids: Optional[Iterable[int]] = None):
+        enrollments = CourseEnrollment.objects.filter(course=course)
+        progress = TaskProgress.objects.filter(task__course=course)
+        if user_ids is not None:
+            user_ids = list(user_ids)
+            enrollments = enrollments.filter(user_id__in=user_ids)
+            progress = progress.filter(user_id__in=user_ids)
+
+        self.tasks: List[Dict[str, Any]] = [
+            {
+                "id": task["id"],
+                "title": task["title"],
+                "type": "quiz" if task["quiztask"] is not None else "task",
+            }
+            for task in LearningTask.objects.filter(COUNTED_TASK_FILTER, course=course)
+            .order_by("order", "id")
+            .values("id", "title", "quiztask")
+        ]
+        columns = {task["id"]: column for column, task in enumerate(self.tasks)}
+
+        self.students: List[Dict[str, Any]] = [
+            {
+                "id": row["user_id"],
+                "username": row["user__username"],
+                "email": row["user__email"],
+                "full_name": f"{row['user__first_name']} {row['user__last_name']}".strip(),
+            }
+            for row in enrollments.values(
+                "user_id",
+                "user__username",
+                "user__email",
+                "user__first_name",
+                "user__last_name",
+            )
+        ]
+        self.rows: Dict[int, bytearray] = {
+            student["id"]: bytearray(len(self.tasks)) for student in self.students
+        }
+        self.completion_dates: Dict[tuple, Any] = {}
+        self.completed: Dict[int, int] = dict.fromkeys(self.rows, 0)
+
+        progress_rows = progress.values_list(
+            "user_id", "task_id", "status", "completion_date"
+        ).order_by()
+        for user_id, task_id, status, completion_date in progress_rows.iterator(
+            chunk_size=2000
+        ):
+            row = self.rows.get(user_id)
+            column = columns.get(task_id)
+            if row is None or column is None:
+                continue
+            code = _STATUS_INDEX.get(status, 0)
+            row[column] = code
+            if code == COMPLETED:
+                self.completed[user_id] += 1
+            if completion_date is not None:
+                self.completion_dates[(user_id, column)] = completion_date
+
+    def percentage(self, user_id: int) -> float:
+        """Return the completion percentage of a student, rounded to 2 places."""
+        return round(calculate_percentage(self.completed[user_id], len(self.tasks)), 2)
+
+    def ordered_students(self, descending: bool = True) -> List[Dict[str, Any]]:
+        """Return students sorted by completion, keeping enrollment order on ties."""
+        return sorted(
+            self.students,
+            key=lambda student: self.completed[student["id"]],
+            reverse=descending,
+        )
+
+    def student_payload(self, student: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the detailed per-student progress payload."""
+        user_id = student["id"]
+        row = self.rows[user_id]
+        return {
+            "student_info": student,
+            "progress_summary": {
+                "completion_percentage": self.percentage(user_id),
+                "completed_tasks": self.completed[user_id],
+                "total_tasks": len(self.tasks),
+            },
+            "task_completion": [
+                {
+                    "task_id": task["id"],
+                    "task_title": task["title"],
+                    "task_type": task["type"],
+                    "status": STATUS_CODES[row[column]],
+                    "completion_date": self.completion_dates.get((user_id, column)),
+                }
+                for column, task in enumerate(self.tasks)
+            ],
+        }
+
+    def matrix_row(self, student: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the compact matrix row of a student."""
+        user_id = student["id"]
+        return {
+            "student": student,
+            "completed_tasks": self.completed[user_id],
+            "completion_percentage": self.percentage(user_id),
+            "statuses": list(self.rows[user_id]),
+        }
+
+    def header(self) -> Dict[str, Any]:
+        """Return the matrix legend: task columns and status codes."""
+        return {"tasks": self.tasks, "status_codes": list(STATUS_CODES)}
+
+    def stream(self, students: List[Dict[str, Any]]) -> Iterator[str]:
+        """
+        Yield the matrix for the given students as JSON text chunks.
+
+        The header is emitted first, then one chunk per student row, so the
+        serialized response never has to be held in memory at once.
+        """
+        header = json.dumps({**self.header(), "count": len(students)}, cls=JSONEncoder)
+        yield header[:-1] + ', "results": ['
+        for index, student in enumerate(students):
+            prefix = "," if index else ""
+            yield prefix + json.dumps(self.matrix_row(student), cls=JSONEncoder)
+        yield "]}"
@@ -0,0 +1,475 @@
+"""
+Materialized per-enrollment progress summaries.
+
+This module maintains ``CourseProgressSummary`` rows so that progress reads
+(enrollment lists, dashboards, completion checks) cost a single indexed
+lookup instead of an aggregate over the course's tasks. It provides:
+- Set-based computation of summaries for many (user, course) pairs
+- Incremental updates applied from the signal handlers in ``core.signals``
+- Batch loading for list serializers and dashboards
+- Per-user progress annotations for course querysets
+- A chunked rebuild with drift reporting for the management command
+
+Only published, non-deleted tasks are counted. Writes made through
+``QuerySet.update()`` or ``bulk_create`` bypass the signal handlers; callers
+doing bulk writes should call ``rebuild_summaries`` for the affected pairs.
+"""
+
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import (
+    Case,
+    Count,
+    Exists,
+    F,
+    FloatField,
+    Max,
+    OuterRef,
+    Q,
+    Subquery,
+    Value,
+    When,
+)
+from django.db.models.functions import Cast, Coalesce, Greatest
+from django.db.models.lookups import GreaterThan
+from django.utils import timezone
+
+from .models import (
+    CourseEnrollment,
+    CourseProgressSummary,
+    LearningTask,
+    TaskProgress,
+)
+
+logger = logging.getLogger(__name__)
+
+Pair = Tuple[int, int]
+
+# Tasks that contribute to a learner's progress
+COUNTED_TASK_FILTER = Q(is_published=True, is_deleted=False)
+
+# Progress statuses that have a dedicated counter column
+STATUS_FIELDS = (
+    ("completed", "completed_tasks"),
+    ("in_progress", "in_progress_tasks"),
+)
+
+SUMMARY_FIELDS = [
+    "total_tasks",
+    "completed_tasks",
+    "in_progress_tasks",
+    "completion_percentage",
+    "last_activity",
+    "updated_at",
+]
+
+# Marker for state that was not loaded (e.g. deferred fields)
+UNKNOWN = object()
+
+
+def calculate_percentage(completed: int, total: int) -> float:
+    """Return the completion percentage for the given counts."""
+    return (completed / total * 100) if total > 0 else 0
+
+
+def _shift(field: str, delta: int):
+    """Expression adding ``delta`` to a counter column without going negative."""
+    return Greatest(F(field) + delta, Value(0))
+
+
+def _percentage_expression(completed_delta: int = 0, total_delta: int = 0):
+    """Expression recomputing ``completion_percentage`` from the counters."""
+    completed = Cast(F("completed_tasks") + completed_delta, FloatField())
+    total = F("total_tasks") + total_delta
+    return Case(
+        When(GreaterThan(total, 0), then=completed / total * 100),
+        default=Value(0.0),
+        output_field=FloatField(),
+    )
+
+
+def compute_summaries(pairs: Iterable[Pair]) -> Dict[Pair, dict]:
+    """
+    Compute summary values for many (user, course) pairs from scratch.
+
+    Runs two grouped queries regardless of how many pairs are requested.
+
+    Returns:
+        dict: Mapping of (user_id, course_id) to summary field values
+    """
+    pairs = set(pairs)
+    if not pairs:
+        return {}
+    user_ids = {user_id for user_id, _ in pairs}
+    course_ids = {course_id for _, course_id in pairs}
+
+    totals = dict(
+        LearningTask.objects.filter(COUNTED_TASK_FILTER, course_id__in=course_ids)
+        .values("course_id")
+        .annotate(total=Count("id"))
+        .order_by()
+        .values_list("course_id", "total")
+    )
+    counted = Q(task__is_published=True, task__is_deleted=False)
+    progress_rows = (
+        TaskProgress.objects.filter(
+            user_id__in=user_ids, task__course_id__in=course_ids
+        )
+        .values("user_id", "task__course_id")
+        .annotate(
+            completed=Count("id", filter=counted & Q(status="completed")),
+            in_progress=Count("id", filter=counted & Q(status="in_progress")),
+            last_activity=Max("updated_at"),
+        )
+        .order_by()
+    )
+    progress = {(row["user_id"], row["task__course_id"]): row for row in progress_rows}
+
+    results = {}
+    for pair in pairs:
+        total = totals.get(pair[1], 0)
+        row = progress.get(pair, {})
+        completed = row.get("completed", 0)
+        results[pair] = {
+            "total_tasks": total,
+            "completed_tasks": completed,
+            "in_progress_tasks": row.get("in_progress", 0),
+            "completion_percentage": calculate_percentage(completed, total),
+            "last_activity": row.get("last_activity"),
+        }
+    return results
+
+
+def _count_subquery(queryset, field: str):
+    """Correlated subquery counting the rows of ``queryset`` per outer course."""
+    counts = (
+        queryset.filter(**{field: OuterRef("pk")})
+        .values(field)
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    return Coalesce(Subquery(counts), 0)
+
+
+def annotate_course_progress(queryset, user):
+    """
+    Annotate a Course queryset with the progress of ``user`` in each course.
+
+    Adds ``user_is_enrolled`` (active enrollment), ``counted_tasks`` and
+    ``user_completed_tasks`` using correlated subqueries, so serializing a
+    page of courses needs no per-course queries.
+    """
+    return queryset.annotate(
+        user_is_enrolled=Exists(
+            CourseEnrollment.objects.filter(
+                user=user, course=OuterRef("pk"), status="active"
+            )
+        ),
+        counted_tasks=_count_subquery(
+            LearningTask.objects.filter(COUNTED_TASK_FILTER), "course"
+        ),
+        user_completed_tasks=_count_subquery(
+            TaskProgress.objects.filter(
+                user=user,
+                status="completed",
+                task__is_published=True,
+                task__is_deleted=False,
+            ),
+            "task__course",
+        ),
+    )
+
+
+def _existing_summaries(pairs: Iterable[Pair]) -> Dict[Pair, CourseProgressSummary]:
+    pairs = set(pairs)
+    if not pairs:
+        return {}
+    summaries = CourseProgressSummary.objects.filter(
+        user_id__in={user_id for user_id, _ in pairs},
+        course_id__in={course_id for _, course_id in pairs},
+    )
+    return {
+        (summary.user_id, summary.course_id): summary
+        for summary in summaries
+        if (summary.user_id, summary.course_id) in pairs
+    }
+
+
+def load_summaries(pairs: Iterable[Pair]) -> Dict[Pair, CourseProgressSummary]:
+    """
+    Load summaries for the given pairs, building any that are missing.
+
+    Returns:
+        dict: Mapping of (user_id, course_id) to CourseProgressSummary
+    """
+    pairs = set(pairs)
+    summaries = _existing_summaries(pairs)
+    missing = pairs - summaries.keys()
+    if missing:
+        built = [
+            CourseProgressSummary(user_id=pair[0], course_id=pair[1], **values)
+            for pair, values in compute_summaries(missing).items()
+        ]
+        CourseProgressSummary.objects.bulk_create(built, ignore_conflicts=True)
+        summaries.update(
+            {(summary.user_id, summary.course_id): summary for summary in built}
+        )
+    return summaries
+
+
+def get_or_build_summary(user_id: int, course_id: int) -> CourseProgressSummary:
+    """Return the summary for a single (user, course) pair."""
+    return load_summaries([(user_id, course_id)])[(user_id, course_id)]
+
+
+def attach_progress_summaries(enrollments: List) -> None:
+    """
+    Attach summaries to a list of enrollments with a single lookup query.
+
+    ``CourseEnrollment.get_progress_summary`` reuses the attached summary,
+    so serializing the list does not issue a query per row.
+    """
+    pending = [e for e in enrollments if getattr(e, "_progress_summary", None) is None]
+    if not pending:
+        return
+    summaries = load_summaries((e.user_id, e.course_id) for e in pending)
+    for enrollment in pending:
+        enrollment._progress_summary = summaries[
+            (enrollment.user_id, enrollment.course_id)
+        ]
+
+
+def rebuild_summaries(pairs: Iterable[Pair], dry_run: bool = False) -> Dict[str, int]:
+    """
+    Recompute summaries for the given pairs and correct any drift.
+
+    A summary has drifted when its counters differ from a fresh computation.
+    ``last_activity`` is refreshed but does not count as drift.
+
+    Args:
+        pairs: (user_id, course_id) pairs to check
+        dry_run: Report drift without writing anything
+
+    Returns:
+        dict: Counts of checked, created and drifted summaries
+    """
+    expected = compute_summaries(pairs)
+    existing = _existing_summaries(expected.keys())
+    now = timezone.now()
+
+    to_create, to_update, drifted = [], [], 0
+    for pair, values in expected.items():
+        summary = existing.get(pair)
+        if summary is None:
+            to_create.append(
+                CourseProgressSummary(user_id=pair[0], course_id=pair[1], **values)
+            )
+            continue
+        if (
+            summary.total_tasks != values["total_tasks"]
+            or summary.completed_tasks != values["completed_tasks"]
+            or summary.in_progress_tasks != values["in_progress_tasks"]
+            or round(summary.completion_percentage, 6)
+            != round(values["completion_percentage"], 6)
+        ):
+            drifted += 1
+            logger.warning(
+                "Progress summary drift for user %s course %s: stored %s/%s/%s, "
+                "expected %s/%s/%s",
+                pair[0],
+                pair[1],
+                summary.total_tasks,
+                summary.completed_tasks,
+                summary.in_progress_tasks,
+                values["total_tasks"],
+                values["completed_tasks"],
+                values["in_progress_tasks"],
+            )
+        for field, value in values.items():
+            setattr(summary, field, value)
+        summary.updated_at = now
+        to_update.append(summary)
+
+    if not dry_run:
+        with transaction.atomic():
+            CourseProgressSummary.objects.bulk_create(to_create, ignore_conflicts=True)
+            CourseProgressSummary.objects.bulk_update(to_update, SUMMARY_FIELDS)
+
+    return {"checked": len(expected), "created": len(to_create), "drifted": drifted}
+
+
+def _task_state(task) -> Tuple[Optional[int], bool]:
+    """Return (course_id, counted) for a task instance or task ID."""
+    if isinstance(task, LearningTask):
+        loaded = task.__dict__
+        if "is_published" in loaded and "is_deleted" in loaded:
+            return task.course_id, task.is_published and not task.is_deleted
+        task = task.pk
+    state = (
+        LearningTask.objects.filter(pk=task)
+        .values_list("course_id", "is_published", "is_deleted")
+        .first()
+    )
+    if state is None:
+        return None, False
+    return state[0], state[1] and not state[2]
+
+
+def record_progress_change(
+    user_id: int,
+    task,
+    old_status: Optional[str],
+    new_status: Optional[str],
+    activity_at=None,
+) -> None:
+    """
+    Apply a single progress status change to the affected summary.
+
+    Args:
+        user_id: The learner whose progress changed
+        task: The LearningTask instance or its ID
+        old_status: Status before the change (None for a new row)
+        new_status: Status after the change (None for a deleted row)
+        activity_at: Timestamp to record as the summary's last activity
+    """
+    course_id, counted = _task_state(task)
+    if course_id is None:
+        return
+
+    updates = {}
+    if counted:
+        completed_delta = (new_status == "completed") - (old_status == "completed")
+        in_progress_delta = (new_status == "in_progress") - (
+            old_status == "in_progress"
+        )
+        if completed_delta or in_progress_delta:
+            updates["completed_tasks"] = _shift("completed_tasks", completed_delta)
+            updates["in_progress_tasks"] = _shift(
+                "in_progress_tasks", in_progress_delta
+            )
+            updates["completion_percentage"] = _percentage_expression(
+                completed_delta=completed_delta
+            )
+    if activity_at is not None:
+        updates["last_activity"] = activity_at
+    if updates:
+        updates["updated_at"] = timezone.now()
+        CourseProgressSummary.objects.filter(
+            user_id=user_id, course_id=course_id
+        ).update(**updates)
+
+
+def _shift_task(task_id: int, course_id: int, sign: int) -> None:
+    """Add (sign=1) or remove (sign=-1) one counted task from a course."""
+    summaries = CourseProgressSummary.objects.filter(course_id=course_id)
+    with transaction.atomic():
+        summaries.update(
+            total_tasks=_shift("total_tasks", sign), updated_at=timezone.now()
+        )
+        for status, field in STATUS_FIELDS:
+            learners = TaskProgress.objects.filter(
+                task_id=task_id, status=status
+            ).values("user_id")
+            summaries.filter(user_id__in=learners).update(
+                **{field: _shift(field, sign)}
+            )
+        summaries.update(completion_percentage=_percentage_expression())
+
+
+def record_task_change(task_id: int, old_state, new_state) -> None:
+    """
+    Apply a task being added, published, unpublished, moved or deleted.
+
+    States are (course_id, counted) tuples, or None when the task did not
+    exist before (or no longer exists after) the change.
+    """
+    if old_state == new_state:
+        return
+    if old_state and old_state[1]:
+        _shift_task(task_id, old_state[0], -1)
+    if new_state and new_state[1]:
+        _shift_task(task_id, new_state[0], 1)
+
+
+def remember_progress_state(progress: TaskProgress) -> None:
+    """Remember the loaded (user, task, status) so saves apply as deltas."""
+    loaded = progress.__dict__
+    if "status" in loaded:
+        progress._summary_state = (
+            loaded.get("user_id"),
+            loaded.get("task_id"),
+            loaded["status"],
+        )
+    else:
+        progress._summary_state = UNKNOWN
+
+
+def progress_saved(progress: TaskProgress, created: bool) -> None:
+    """Update summaries after a TaskProgress row is saved."""
+    previous = None if created else getattr(progress, "_summary_state", UNKNOWN)
+    current = (progress.user_id, progress.task_id, progress.status)
+    task_field = TaskProgress._meta.get_field("task")
+    task = progress.task if task_field.is_cached(progress) else progress.task_id
+
+    if previous is UNKNOWN:
+        course_id, _ = _task_state(task)
+        if course_id is not None:
+            rebuild_summaries([(progress.user_id, course_id)])
+    elif previous and previous[:2] != current[:2]:
+        record_progress_change(previous[0], previous[1], previous[2], None)
+        record_progress_change(
+            progress.user_id, task, None, progress.status, progress.updated_at
+        )
+    else:
+        record_progress_change(
+            progress.user_id,
+            task,
+            previous[2] if previous else None,
+            progress.status,
+            progress.updated_at,
+        )
+    progress._summary_state = current
+
+
+def progress_deleted(progress: TaskProgress) -> None:
+    """Update summaries after a TaskProgress row is deleted."""
+    previous = getattr(progress, "_summary_state", UNKNOWN)
+    status = progress.__dict__.get("status") if previous is UNKNOWN else previous[2]
+    record_progress_change(progress.user_id, progress.task_id, status, None)
+
+
+def remember_task_state(task: LearningTask) -> None:
+    """Remember whether a loaded task counts towards progress, and where."""
+    loaded = task.__dict__
+    if "is_published" in loaded and "is_deleted" in loaded:
+        task._summary_state = (
+            loaded.get("course_id"),
+            loaded["is_published"] and not loaded["is_deleted"],
+        )
+    else:
+        task._summary_state = UNKNOWN
+
+
+def task_saved(task: LearningTask, created: bool) -> None:
+    """Update summaries after a LearningTask is created or changed."""
+    previous = None if created else getattr(task, "_summary_state", UNKNOWN)
+    current = (task.course_id, task.is_published and not task.is_deleted)
+    if previous is UNKNOWN:
+        rebuild_summaries(
+            CourseProgressSummary.objects.filter(course_id=task.course_id).values_list(
+                "user_id", "course_id"
+            )
+        )
+    else:
+        record_task_change(task.pk, previous, current)
+    task._summary_state = current
+
+
+def task_deleted(task: LearningTask) -> None:
+    """Update summaries after a LearningTask is hard-deleted."""
+    previous = getattr(task, "_summary_state", UNKNOWN)
+    if previous is UNKNOWN:
+        previous = (task.course_id, task.is_published and not task.is_deleted)
+    record_task_change(task.pk, previous, None)
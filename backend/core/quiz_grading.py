@@ -0,0 +1,164 @@
+"""
+Bulk grading engine for quiz submissions.
+
+Grades a whole quiz attempt in a constant number of queries, independent of
+how many questions the quiz has:
+- The quiz's answer key (questions, points and options) is loaded once
+- Every submitted answer is validated against the attempt's own quiz
+- The points-weighted score is computed in memory
+- All QuizResponse rows are written with one bulk insert, inside a single
+  transaction that also locks and completes the attempt
+"""
+
+import datetime
+import logging
+from typing import Any, Dict, Iterable, List
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_duration
+
+from .exception_handler import QuizSubmissionException
+from .models import QuizAttempt, QuizQuestion, QuizResponse
+
+logger = logging.getLogger(__name__)
+
+
+class AnswerKey:
+    """
+    In-memory answer key for a single quiz.
+
+    Attributes:
+        points: Mapping of question ID to the points it is worth
+        options: Mapping of option ID to (question ID, is_correct)
+        total_points: Sum of the points of every question in the quiz
+    """
+
+    def __init__(self, quiz_id: int):
+        self.points: Dict[int, int] = {}
+        self.options: Dict[int, tuple] = {}
+        rows = QuizQuestion.objects.filter(quiz_id=quiz_id).values_list(
+            "id", "points", "options__id", "options__is_correct"
+        )
+        for question_id, points, option_id, is_correct in rows:
+            self.points[question_id] = points
+            if option_id is not None:
+                self.options[option_id] = (question_id, is_correct)
+        self.total_points = sum(self.points.values())
+
+
+def _to_int(value: Any) -> int | None:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_duration(value: Any) -> datetime.timedelta | None:
+    if value in (None, ""):
+        return datetime.timedelta(0)
+    if isinstance(value, (int, float)):
+        return datetime.timedelta(seconds=value) if value >= 0 else None
+    return parse_duration(str(value))
+
+
+def build_responses(
+    attempt: QuizAttempt, key: AnswerKey, responses_data: Iterable[Dict[str, Any]]
+) -> List[QuizResponse]:
+    """
+    Validate submitted answers and build unsaved QuizResponse objects.
+
+    Raises:
+        QuizSubmissionException: If any answer references a question or option
+            outside the attempt's quiz, answers a question twice, or is malformed
+    """
+    if not isinstance(responses_data, list):
+        raise QuizSubmissionException("Responses must be a list.")
+
+    errors = {}
+    responses = []
+    answered = set()
+    for index, data in enumerate(responses_data):
+        if not isinstance(data, dict):
+            errors[index] = "Each response must be an object."
+            continue
+        question_id = _to_int(data.get("question"))
+        option_id = _to_int(data.get("selected_option"))
+        time_spent = _to_duration(data.get("time_spent"))
+
+        if question_id not in key.points:
+            errors[index] = "Question does not belong to this quiz."
+        elif question_id in answered:
+            errors[index] = "Question was answered more than once."
+        elif key.options.get(option_id, (None,))[0] != question_id:
+            errors[index] = "Selected option does not belong to the question."
+        elif time_spent is None:
+            errors[index] = "Invalid time_spent value."
+        else:
+            answered.add(question_id)
+            responses.append(
+                QuizResponse(
+                    attempt=attempt,
+                    question_id=question_id,
+                    selected_option_id=option_id,
+                    is_correct=key.options[option_id][1],
+                    time_spent=time_spent,
+                )
+            )
+
+    if errors:
+        raise QuizSubmissionException({"responses": errors})
+    return responses
+
+
+def calculate_score(key: AnswerKey, responses: Iterable[QuizResponse]) -> int:
+    """Return the points-weighted score (0-100) for graded responses."""
+    if key.total_points <= 0:
+        return 0
+    earned = sum(key.points[r.question_id] for r in responses if r.is_correct)
+    return round(earned / key.total_points * 100)
+
+
+def grade_attempt(
+    attempt_id: int, responses_data: Iterable[Dict[str, Any]]
+) -> QuizAttempt:
+    """
+    Grade and complete a quiz attempt in a single transaction.
+
+    The attempt row is locked so concurrent submissions of the same attempt
+    cannot both be graded.
+
+    Args:
+        attempt_id: ID of the attempt being submitted
+        responses_data: List of {"question", "selected_option", "time_spent"}
+
+    Returns:
+        QuizAttempt: The completed attempt
+
+    Raises:
+        QuizSubmissionException: If the attempt was already submitted or the
+            responses are invalid
+    """
+    with transaction.atomic():
+        attempt = QuizAttempt.objects.select_for_update().get(pk=attempt_id)
+        if attempt.completion_status == "completed":
+            raise QuizSubmissionException(
+                "This quiz attempt has already been submitted"
+            )
+
+        key = AnswerKey(attempt.quiz_id)
+        responses = build_responses(attempt, key, responses_data)
+        QuizResponse.objects.bulk_create(responses)
+
+        attempt.score = calculate_score(key, responses)
+        attempt.completion_status = "completed"
+        attempt.attempt_date = timezone.now()
+        attempt.save(update_fields=["score", "completion_status", "attempt_date"])
+
+    logger.info(
+        "Graded quiz attempt %s: %d responses, score %s",
+        attempt.id,
+        len(responses),
+        attempt.score,
+    )
+    return attempt
@@ -0,0 +1,171 @@
+"""
+Fast renderers and parsers: orjson for JSON, MessagePack for binary clients.
+
+``ORJSONRenderer`` and ``ORJSONParser`` replace DRF's JSON renderer and
+parser. Their output matches DRF's byte for byte except for float notation:
+- Datetimes, dates, times and UUIDs are encoded natively by orjson in the
+  format of DRF's ``JSONEncoder`` (``Z`` for UTC, microseconds when set)
+- Values orjson cannot encode natively (timedelta as seconds, Decimal as a
+  number, lazy strings, sets, querysets, bytes) go through
+  ``encode_default``, i.e. DRF's own ``JSONEncoder.default``
+- Indented responses (``Accept: application/json; indent=4`` and the
+  browsable API) and payloads orjson rejects fall back to DRF's renderer
+- orjson writes NaN and infinity as ``null``, so payloads whose output
+  contains ``null`` are checked for them and fall back to DRF's renderer,
+  which raises ``ValueError`` as before
+- Floats use orjson's shortest notation (``0.00001``, ``3e-7`` and ``1e16``
+  where DRF writes ``1e-05``, ``3e-07`` and ``1e+16``)
+
+``MessagePackRenderer`` and ``MessagePackParser`` serve
+``application/msgpack`` to clients that ask for it with ``Accept`` (or
+``?format=msgpack``). Values are converted by ``encode_default`` as well, so
+a MessagePack response decodes to the same data as its JSON form (map keys
+keep their type). They need the optional ``msgpack`` package.
+
+Which renderers and parsers are active is configured in settings with
+``API_JSON_BACKEND`` and ``API_MSGPACK``.
+"""
+
+import datetime
+import decimal
+import math
+import uuid
+from typing import Any
+
+import orjson
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import msgpack
+except ImportError:  # Optional: MessagePack is only offered when installed
+    msgpack = None
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+# Match DRF's compact, UTF-8 JSON with "Z" for UTC and str() of int keys
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+_encoder = JSONEncoder()
+
+# Values _all_finite need not look into
+_FLOATLESS_TYPES = (
+    str,
+    int,
+    datetime.date,
+    datetime.time,
+    datetime.timedelta,
+    uuid.UUID,
+)
+
+# Line and paragraph separators, which DRF escapes for embedding in JavaScript
+_UNSAFE_SEPARATORS = (
+    (b"\xe2\x80\xa8", b"\\u2028"),
+    (b"\xe2\x80\xa9", b"\\u2029"),
+)
+
+
+def encode_default(obj: Any) -> Any:
+    """Convert a value the encoders do not support, as DRF's JSON encoder does."""
+    return _encoder.default(obj)
+
+
+def _all_finite(data: Any) -> bool:
+    """Whether ``data`` holds no NaN or infinite floats (or Decimals)."""
+    stack = [[data]]
+    while stack:
+        obj = stack.pop()
+        for value in obj.values() if isinstance(obj, dict) else obj:
+            cls = type(value)
+            if cls is str or cls is int or value is None:
+                continue
+            if isinstance(value, float):
+                if not math.isfinite(value):
+                    return False
+            elif isinstance(value, (dict, list, tuple)):
+                stack.append(value)
+            elif isinstance(value, decimal.Decimal):
+                if not value.is_finite():
+                    return False
+            elif not isinstance(value, _FLOATLESS_TYPES):
+                # e.g. sets and querysets, checked in their encoded form
+                stack.append([encode_default(value)])
+    return True
+
+
+def _require_msgpack() -> None:
+    if msgpack is None:
+        raise ImproperlyConfigured("MessagePack support requires the msgpack package")
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSON renderer built on orjson; see the module docstring for differences."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=encode_default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits; DRF renders or reports them
+            return super().render(data, accepted_media_type, renderer_context)
+        if b"null" in ret and not _all_finite(data):
+            # NaN or infinity, which orjson writes as null; DRF raises
+            return super().render(data, accepted_media_type, renderer_context)
+        for separator, escaped in _UNSAFE_SEPARATORS:
+            if separator in ret:
+                ret = ret.replace(separator, escaped)
+        return ret
+
+
+class ORJSONParser(JSONParser):
+    """JSON parser built on orjson."""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", "utf-8")
+        if encoding.lower().replace("_", "-") not in ("utf-8", "utf8"):
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
+
+
+class MessagePackRenderer(BaseRenderer):
+    """MessagePack renderer for clients that accept ``application/msgpack``."""
+
+    media_type = MSGPACK_MEDIA_TYPE
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        _require_msgpack()
+        if data is None:
+            return b""
+        return msgpack.packb(
+            data, default=encode_default, use_bin_type=True, datetime=False
+        )
+
+
+class MessagePackParser(BaseParser):
+    """Parses ``application/msgpack`` request bodies."""
+
+    media_type = MSGPACK_MEDIA_TYPE
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        _require_msgpack()
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except (ValueError, TypeError) as exc:
+            # msgpack's format errors carry no message
+            raise ParseError(
+                f"MessagePack parse error - {str(exc) or type(exc).__name__}"
+            )
@@ -0,0 +1,249 @@
+"""
+Full-text search over the course catalog.
+
+Courses are indexed in a side table, ``core_course_search``, holding their
+title, creator name, learning objectives and description:
+- SQLite: an FTS5 virtual table (rowid = course id), ranked with bm25
+- PostgreSQL: a weighted tsvector column with a GIN index, ranked with
+  ts_rank
+- Other databases fall back to ``icontains`` predicates without ranking
+
+The table is created by migration ``0007_course_search_index`` and kept
+current by the signal handlers in ``core.signals``: a course is reindexed
+when it is saved and when its creator's name changes. Writes made through
+``QuerySet.update()`` or ``bulk_create`` bypass the signals; callers doing
+bulk writes should call ``index_courses`` (or ``rebuild_index``) afterwards.
+
+Search terms are matched as whole words, except the last one, which is
+matched as a prefix so results follow the user's typing.
+"""
+
+import html
+import logging
+import re
+from typing import Iterable, List
+
+from django.db import connections
+from django.db.models import Q, QuerySet
+from django.db.models.expressions import RawSQL
+
+from .models import Course
+
+logger = logging.getLogger(__name__)
+
+SEARCH_TABLE = "core_course_search"
+
+# Highlight markers placed by the database; replaced after HTML escaping
+_MARK_START = "\x02"
+_MARK_END = "\x03"
+SNIPPET_TOKENS = 16
+
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def search_terms(query: str) -> List[str]:
+    """Split a search box query into the words to match."""
+    return _TERM_RE.findall(query.lower())
+
+
+class CourseSearchBackend:
+    """Fallback engine for databases without a full-text index."""
+
+    def search(self, queryset: QuerySet, terms: List[str]) -> QuerySet:
+        condition = Q()
+        for term in terms:
+            condition &= (
+                Q(title__icontains=term)
+                | Q(description__icontains=term)
+                | Q(learning_objectives__icontains=term)
+                | Q(creator__first_name__icontains=term)
+                | Q(creator__last_name__icontains=term)
+            )
+        return queryset.filter(condition)
+
+    def index(self, cursor, course_ids: List[int]) -> None:
+        pass
+
+    def remove(self, cursor, course_ids: List[int]) -> None:
+        pass
+
+
+class SQLiteCourseSearch(CourseSearchBackend):
+    """FTS5 engine; columns are weighted title > creator > objectives > text."""
+
+    weights = "10.0, 5.0, 2.0, 1.0"
+
+    def match_expression(self, terms: List[str]) -> str:
+        quoted = [f'"{term}"' for term in terms]
+        quoted[-1] += "*"
+        return " ".join(quoted)
+
+    def search(self, queryset: QuerySet, terms: List[str]) -> QuerySet:
+        match = self.match_expression(terms)
+        correlated = (
+            f"FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s"
+            f' AND {SEARCH_TABLE}.rowid = "core_course"."id"'
+        )
+        return queryset.filter(
+            id__in=RawSQL(
+                f"SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s",
+                [match],
+            )
+        ).annotate(
+            # bm25 is lower for better matches
+            search_rank=RawSQL(
+                f"(SELECT -bm25({SEARCH_TABLE}, {self.weights}) {correlated})",
+                [match],
+            ),
+            search_snippet=RawSQL(
+                f"(SELECT snippet({SEARCH_TABLE}, -1, %s, %s, '…', %s) {correlated})",
+                [_MARK_START, _MARK_END, SNIPPET_TOKENS, match],
+            ),
+        )
+
+    def index(self, cursor, course_ids: List[int]) -> None:
+        self.remove(cursor, course_ids)
+        placeholders = ", ".join(["%s"] * len(course_ids))
+        cursor.execute(
+            f"""
+            INSERT INTO {SEARCH_TABLE}
+                (rowid, title, creator_name, learning_objectives, description)
+            SELECT c.id, c.title, TRIM(u.first_name || ' ' || u.last_name),
+                   c.learning_objectives, c.description
+            FROM core_course c JOIN core_user u ON u.id = c.creator_id
+            WHERE c.id IN ({placeholders})
+            """,
+            course_ids,
+        )
+
+    def remove(self, cursor, course_ids: List[int]) -> None:
+        placeholders = ", ".join(["%s"] * len(course_ids))
+        cursor.execute(
+            f"DELETE FROM {SEARCH_TABLE} WHERE rowid IN ({placeholders})", course_ids
+        )
+
+
+class PostgreSQLCourseSearch(CourseSearchBackend):
+    """tsvector engine with weights A (title) to D (description)."""
+
+    config = "english"
+
+    def tsquery(self, terms: List[str]) -> str:
+        # Terms only contain word characters, so they need no quoting
+        return " & ".join(terms[:-1] + [f"{terms[-1]}:*"])
+
+    def search(self, queryset: QuerySet, terms: List[str]) -> QuerySet:
+        query = f"to_tsquery('{self.config}', %s)"
+        correlated = f'FROM {SEARCH_TABLE} s WHERE s.course_id = "core_course"."id"'
+        tsquery = self.tsquery(terms)
+        return queryset.filter(
+            id__in=RawSQL(
+                f"SELECT course_id FROM {SEARCH_TABLE} WHERE document @@ {query}",
+                [tsquery],
+            )
+        ).annotate(
+            search_rank=RawSQL(
+                f"(SELECT ts_rank(s.document, {query}) {correlated})", [tsquery]
+            ),
+            search_snippet=RawSQL(
+                f"(SELECT ts_headline('{self.config}', s.content, {query}, %s)"
+                f" {correlated})",
+                [
+                    tsquery,
+                    f"StartSel={_MARK_START}, StopSel={_MARK_END}, "
+                    f"MaxWords={SNIPPET_TOKENS}, MinWords=5",
+                ],
+            ),
+        )
+
+    def index(self, cursor, course_ids: List[int]) -> None:
+        cursor.execute(
+            f"""
+            INSERT INTO {SEARCH_TABLE} (course_id, content, document)
+            SELECT c.id,
+                   concat_ws(' ', c.title, c.learning_objectives, c.description),
+                   setweight(to_tsvector('{self.config}', c.title), 'A')
+                   || setweight(to_tsvector('{self.config}',
+                        concat_ws(' ', u.first_name, u.last_name)), 'B')
+                   || setweight(to_tsvector('{self.config}',
+                        c.learning_objectives), 'C')
+                   || setweight(to_tsvector('{self.config}', c.description), 'D')
+            FROM core_course c JOIN core_user u ON u.id = c.creator_id
+            WHERE c.id = ANY(%s)
+            ON CONFLICT (course_id) DO UPDATE
+            SET content = EXCLUDED.content, document = EXCLUDED.document
+            """,
+            [course_ids],
+        )
+
+    def remove(self, cursor, course_ids: List[int]) -> None:
+        cursor.execute(
+            f"DELETE FROM {SEARCH_TABLE} WHERE course_id = ANY(%s)", [course_ids]
+        )
+
+
+BACKENDS = {
+    "sqlite": SQLiteCourseSearch(),
+    "postgresql": PostgreSQLCourseSearch(),
+}
+
+
+def get_backend(using: str = "default") -> CourseSearchBackend:
+    """Return the search engine for a database connection."""
+    return BACKENDS.get(connections[using].vendor, CourseSearchBackend())
+
+
+def search_courses(queryset: QuerySet, query: str) -> QuerySet:
+    """
+    Restrict a course queryset to full-text matches for ``query``.
+
+    Indexed engines annotate ``search_rank`` (higher is better) and
+    ``search_snippet`` (see ``render_snippet``) and order by relevance.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return queryset
+    backend = get_backend(queryset.db)
+    results = backend.search(queryset, terms)
+    if "search_rank" in results.query.annotations:
+        return results.order_by("-search_rank", "id")
+    return results
+
+
+def render_snippet(snippet: str) -> str:
+    """Escape a search snippet and mark its matches with ``<mark>``."""
+    return (
+        html.escape(snippet)
+        .replace(_MARK_START, "<mark>")
+        .replace(_MARK_END, "</mark>")
+    )
+
+
+def _chunks(ids: Iterable[int], size: int = 500) -> Iterable[List[int]]:
+    ids = list(ids)
+    for start in range(0, len(ids), size):
+        yield ids[start : start + size]
+
+
+def index_courses(course_ids: Iterable[int], using: str = "default") -> None:
+    """Add or refresh the index entries of the given courses."""
+    backend = get_backend(using)
+    with connections[using].cursor() as cursor:
+        for chunk in _chunks(course_ids):
+            backend.index(cursor, chunk)
+
+
+def remove_courses(course_ids: Iterable[int], using: str = "default") -> None:
+    """Remove the index entries of deleted courses."""
+    backend = get_backend(using)
+    with connections[using].cursor() as cursor:
+        for chunk in _chunks(course_ids):
+            backend.remove(cursor, chunk)
+
+
+def rebuild_index(using: str = "default") -> int:
+    """Reindex every course; returns the number of courses indexed."""
+    course_ids = list(Course.objects.using(using).values_list("id", flat=True))
+    index_courses(course_ids, using)
+    logger.info("Rebuilt the course search index for %d courses", len(course_ids))
+    return len(course_ids)
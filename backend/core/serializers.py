@@ -10,12 +10,21 @@ Key serializer categories:
 - Course management (courses, versions, enrollment)
 - Learning content (tasks, quizzes, progress)
 - Assessment (quiz attempts, responses)
+
+Model serializers support ``?fields=`` (see ``core.sparse_fields``);
+responses keep every field unless the request trims them.
 """
 
+import datetime
+
 from django.contrib.auth.password_validation import validate_password
+from django.db.models.manager import BaseManager
+from django.utils import timezone
 from rest_framework import serializers
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
+from utils.markdown_utils import markdown_render_fingerprint
+
 from .models import (
     Course,
     CourseEnrollment,
@@ -29,10 +38,21 @@ from .models import (
     StatusTransition,
     TaskProgress,
     User,
+    stored_description_html,
+)
+from .progress_summary import (
+    COUNTED_TASK_FILTER,
+    attach_progress_summaries,
+    load_summaries,
 )
+from .search import render_snippet
+from .sparse_fields import SparseFieldsMixin
 
+# Columns read by RenderedDescriptionMixin.description_html
+DESCRIPTION_COLUMNS = ("description", "description_html_cache", "description_hash")
 
-class UserSerializer(serializers.ModelSerializer):
+
+class UserSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for user profiles.
 
@@ -120,7 +140,7 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         return data
 
 
-class CourseSerializer(serializers.ModelSerializer):
+class CourseSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for courses.
 
@@ -137,12 +157,16 @@ class CourseSerializer(serializers.ModelSerializer):
         visibility: Course visibility setting
         learning_objectives: Course learning objectives
         prerequisites: Course prerequisites
+        search_rank: Relevance of a search result (null outside searches)
+        search_snippet: Highlighted search excerpt (null outside searches)
     """
 
     isEnrolled = serializers.SerializerMethodField()
     isCompleted = serializers.SerializerMethodField()
     creator_details = UserSerializer(source="creator", read_only=True)
     description_html = serializers.SerializerMethodField()
+    search_rank = serializers.SerializerMethodField()
+    search_snippet = serializers.SerializerMethodField()
 
     class Meta:
         model = Course
@@ -162,6 +186,8 @@ class CourseSerializer(serializers.ModelSerializer):
             "creator_details",
             "isEnrolled",
             "isCompleted",
+            "search_rank",
+            "search_snippet",
         ]
         read_only_fields = [
             "id",
@@ -171,8 +197,20 @@ class CourseSerializer(serializers.ModelSerializer):
             "creator_details",
             "description_html",
         ]
+        field_columns = {"description_html": DESCRIPTION_COLUMNS}
+
+    def get_search_rank(self, obj):
+        # Annotated by search.search_courses
+        return getattr(obj, "search_rank", None)
+
+    def get_search_snippet(self, obj):
+        snippet = getattr(obj, "search_snippet", None)
+        return render_snippet(snippet) if snippet else None
 
     def get_isEnrolled(self, obj):
+        # Prefer the annotation added by annotate_course_progress
+        if hasattr(obj, "user_is_enrolled"):
+            return obj.user_is_enrolled
         request = self.context.get("request")
         if request and request.user.is_authenticated:
             return CourseEnrollment.objects.filter(
@@ -181,6 +219,12 @@ class CourseSerializer(serializers.ModelSerializer):
         return False
 
     def get_isCompleted(self, obj):
+        if hasattr(obj, "user_completed_tasks"):
+            return (
+                obj.user_is_enrolled
+                and obj.counted_tasks > 0
+                and obj.user_completed_tasks >= obj.counted_tasks
+            )
         request = self.context.get("request")
         if not request or not request.user.is_authenticated:
             return False
@@ -189,22 +233,28 @@ class CourseSerializer(serializers.ModelSerializer):
         if not is_enrolled:
             return False
 
-        total_tasks = LearningTask.objects.filter(course=obj).count()
+        total_tasks = LearningTask.objects.filter(
+            COUNTED_TASK_FILTER, course=obj
+        ).count()
         if total_tasks == 0:
             return False
 
         completed_tasks = TaskProgress.objects.filter(
-            user=request.user, task__course=obj, status="completed"
+            user=request.user,
+            task__course=obj,
+            task__is_published=True,
+            task__is_deleted=False,
+            status="completed",
         ).count()
 
-        return total_tasks == completed_tasks
+        return completed_tasks >= total_tasks
 
     def get_description_html(self, obj):
         """Return HTML-rendered markdown content"""
         return obj.description_html
 
 
-class CourseVersionSerializer(serializers.ModelSerializer):
+class CourseVersionSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for course versions.
 
@@ -229,7 +279,7 @@ class CourseVersionSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "created_at", "created_by_details"]
 
 
-class StatusTransitionSerializer(serializers.ModelSerializer):
+class StatusTransitionSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for status transitions.
 
@@ -254,7 +304,7 @@ class StatusTransitionSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "changed_at", "changed_by_details"]
 
 
-class LearningTaskSerializer(serializers.ModelSerializer):
+class LearningTaskSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for learning tasks.
 
@@ -278,13 +328,27 @@ class LearningTaskSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
         read_only_fields = ["id", "created_at", "updated_at", "description_html"]
+        field_columns = {"description_html": DESCRIPTION_COLUMNS}
 
     def get_description_html(self, obj):
         """Return HTML-rendered markdown content"""
         return obj.description_html
 
+    def get_description_html_from_rows(self, rows):
+        # Fast list path (see core.fast_serializers)
+        fingerprint = markdown_render_fingerprint()
+        return [
+            stored_description_html(
+                row["description"],
+                row["description_html_cache"],
+                row["description_hash"],
+                fingerprint,
+            )
+            for row in rows
+        ]
 
-class QuizOptionSerializer(serializers.ModelSerializer):
+
+class QuizOptionSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for quiz options.
 
@@ -297,7 +361,7 @@ class QuizOptionSerializer(serializers.ModelSerializer):
         read_only_fields = ["id"]
 
 
-class QuizQuestionSerializer(serializers.ModelSerializer):
+class QuizQuestionSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for quiz questions.
 
@@ -312,7 +376,7 @@ class QuizQuestionSerializer(serializers.ModelSerializer):
         read_only_fields = ["id"]
 
 
-class QuizTaskSerializer(serializers.ModelSerializer):
+class QuizTaskSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for quiz tasks.
 
@@ -342,7 +406,23 @@ class QuizTaskSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "created_at", "updated_at"]
 
 
-class CourseEnrollmentSerializer(serializers.ModelSerializer):
+class CourseEnrollmentListSerializer(serializers.ListSerializer):
+    """
+    List serializer for course enrollments.
+
+    Loads the progress summaries for every enrollment in the list with one
+    query before the rows are serialized.
+    """
+
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, BaseManager) else data
+        enrollments = list(iterable)
+        if "progress_percentage" in self.child.fields:
+            attach_progress_summaries(enrollments)
+        return super().to_representation(enrollments)
+
+
+class CourseEnrollmentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for course enrollments.
 
@@ -374,12 +454,20 @@ class CourseEnrollmentSerializer(serializers.ModelSerializer):
             "course_details",
             "progress_percentage",
         ]
+        field_columns = {"progress_percentage": ("user", "course")}
+        list_serializer_class = CourseEnrollmentListSerializer
 
     def get_progress_percentage(self, obj):
         return obj.calculate_course_progress()
 
+    def get_progress_percentage_from_rows(self, rows):
+        # Fast list path (see core.fast_serializers)
+        pairs = [(row["user"], row["course"]) for row in rows]
+        summaries = load_summaries(pairs)
+        return [summaries[pair].completion_percentage for pair in pairs]
 
-class TaskProgressSerializer(serializers.ModelSerializer):
+
+class TaskProgressSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for task progress.
 
@@ -405,7 +493,29 @@ class TaskProgressSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "user_details", "task_details"]
 
 
-class QuizResponseSerializer(serializers.ModelSerializer):
+class TaskProgressEventSerializer(serializers.Serializer):
+    """
+    Serializer for one queued progress change of a bulk upsert.
+
+    ``time_spent_delta`` accepts seconds or a duration string and is added to
+    the time spent; ``client_timestamp`` is when the change happened on the
+    client, capped at the server's current time.
+    """
+
+    task_id = serializers.IntegerField()
+    status = serializers.ChoiceField(
+        choices=["not_started", "in_progress", "completed"]
+    )
+    time_spent_delta = serializers.DurationField(
+        default=datetime.timedelta(0), min_value=datetime.timedelta(0)
+    )
+    client_timestamp = serializers.DateTimeField()
+
+    def validate_client_timestamp(self, value):
+        return min(value, timezone.now())
+
+
+class QuizResponseSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for quiz responses.
 
@@ -433,7 +543,7 @@ class QuizResponseSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "question_details", "selected_option_details"]
 
 
-class QuizAttemptSerializer(serializers.ModelSerializer):
+class QuizAttemptSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for quiz attempts.
 
@@ -467,7 +577,7 @@ class QuizAttemptSerializer(serializers.ModelSerializer):
         ]
 
 
-class NestedQuizAttemptSerializer(serializers.ModelSerializer):
+class NestedQuizAttemptSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """A simplified serializer for QuizAttempt when nested in other serializers"""
 
     class Meta:
@@ -1,14 +1,37 @@
 """Signal handlers for the core app."""
 
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_init, post_save
 from django.dispatch import receiver
 
-from core.models import Course, User
+from core import autocomplete, caching, progress_summary, search
+from core.models import (
+    Course,
+    CourseEnrollment,
+    LearningTask,
+    QuizAttempt,
+    QuizOption,
+    QuizQuestion,
+    QuizTask,
+    TaskProgress,
+    User,
+)
+
+
+# User fields shown as a course's creator details
+CREATOR_FIELDS = {"username", "email", "display_name", "role"}
 
 
 @receiver(post_save, sender=User)
-def user_post_save(sender, instance, created, **kwargs):
+def user_post_save(sender, instance, created, update_fields=None, **kwargs):
     """Handle post-save signal for User model."""
+    caching.model_changed(sender)
+    # Logins only touch last_login, which course payloads do not show
+    fields = None if update_fields is None else set(update_fields)
+    if not created and (fields is None or CREATOR_FIELDS & fields):
+        caching.creator_changed()
+    # Creator names are indexed for course search
+    if not created and (fields is None or {"first_name", "last_name"} & fields):
+        search.index_courses(instance.courses.values_list("id", flat=True))
     if created:
         # Add any user post-creation logic here if needed
         pass
@@ -17,6 +40,105 @@ def user_post_save(sender, instance, created, **kwargs):
 @receiver(post_save, sender=Course)
 def course_post_save(sender, instance, created, **kwargs):
     """Handle post-save signal for Course model."""
-    if created:
-        # Add any course post-creation logic here if needed
-        pass
+    caching.course_changed(instance)
+    caching.model_changed(sender)
+    search.index_courses([instance.pk])
+    autocomplete.record_change(autocomplete.COURSE, instance.pk)
+
+
+@receiver(post_delete, sender=Course)
+def course_post_delete(sender, instance, **kwargs):
+    """Invalidate caches that depend on a removed course."""
+    caching.course_changed(instance)
+    caching.model_changed(sender)
+    search.remove_courses([instance.pk])
+    autocomplete.record_change(autocomplete.COURSE, instance.pk)
+
+
+@receiver(post_save, sender=CourseEnrollment)
+def enrollment_post_save(sender, instance, created, raw=False, **kwargs):
+    """Build the progress summary for a new enrollment."""
+    caching.enrollment_changed(instance)
+    caching.model_changed(sender)
+    if created and not raw:
+        progress_summary.get_or_build_summary(instance.user_id, instance.course_id)
+
+
+@receiver(post_delete, sender=CourseEnrollment)
+def enrollment_post_delete(sender, instance, **kwargs):
+    """Invalidate caches that depend on a removed enrollment."""
+    caching.enrollment_changed(instance)
+    caching.model_changed(sender)
+
+
+@receiver(post_save, sender=QuizAttempt)
+@receiver(post_delete, sender=QuizAttempt)
+def quiz_attempt_changed(sender, instance, **kwargs):
+    """Invalidate the learner's and course's caches after a quiz attempt."""
+    caching.attempt_changed(instance)
+    caching.model_changed(sender)
+
+
+@receiver(post_init, sender=TaskProgress)
+def task_progress_post_init(sender, instance, **kwargs):
+    """Remember the loaded progress state for incremental summary updates."""
+    progress_summary.remember_progress_state(instance)
+
+
+@receiver(post_save, sender=TaskProgress)
+def task_progress_post_save(sender, instance, created, raw=False, **kwargs):
+    """Apply a progress status change to the learner's course summary."""
+    caching.progress_changed(instance)
+    caching.model_changed(sender)
+    if not raw:
+        progress_summary.progress_saved(instance, created)
+
+
+@receiver(post_delete, sender=TaskProgress)
+def task_progress_post_delete(sender, instance, **kwargs):
+    """Remove a deleted progress row from the learner's course summary."""
+    caching.progress_changed(instance)
+    caching.model_changed(sender)
+    progress_summary.progress_deleted(instance)
+
+
+@receiver(post_init, sender=LearningTask)
+@receiver(post_init, sender=QuizTask)
+def learning_task_post_init(sender, instance, **kwargs):
+    """Remember whether a loaded task counts towards course progress."""
+    progress_summary.remember_task_state(instance)
+
+
+@receiver(post_save, sender=LearningTask)
+@receiver(post_save, sender=QuizTask)
+def learning_task_post_save(sender, instance, created, raw=False, **kwargs):
+    """Update course summaries when a task is added, published or soft-deleted."""
+    # Runs before the summary update, which replaces the remembered state
+    caching.task_changed(instance)
+    caching.model_changed(sender)
+    autocomplete.record_change(autocomplete.TASK, instance.pk)
+    if not raw:
+        progress_summary.task_saved(instance, created)
+
+
+@receiver(post_delete, sender=LearningTask)
+def learning_task_post_delete(sender, instance, **kwargs):
+    """
+    Update course summaries when a task is removed.
+
+    Deleting a QuizTask also deletes its LearningTask parent row, so only the
+    parent is handled to avoid counting the removal twice.
+    """
+    caching.task_changed(instance)
+    caching.model_changed(sender)
+    autocomplete.record_change(autocomplete.TASK, instance.pk)
+    progress_summary.task_deleted(instance)
+
+
+@receiver(post_save, sender=QuizQuestion)
+@receiver(post_delete, sender=QuizQuestion)
+@receiver(post_save, sender=QuizOption)
+@receiver(post_delete, sender=QuizOption)
+def quiz_content_changed(sender, instance, **kwargs):
+    """Invalidate validators of endpoints that serve quiz content."""
+    caching.model_changed(sender)
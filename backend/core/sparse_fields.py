@@ -0,0 +1,192 @@
+"""
+Sparse fieldsets and opt-in expansion for serializers.
+
+Clients choose what a response contains with two query parameters:
+- ``?fields=id,title,course_details.title`` keeps only the named fields;
+  dotted names select fields inside nested serializers, and a nested
+  serializer that is named without a dotted field keeps all its fields
+- ``?expand=`` adds nested blocks listed in a serializer's
+  ``Meta.expandable_fields``; these are left out unless expanded (or named
+  in ``fields``). Only new fields should be made expandable: an existing
+  field listed there would silently disappear from the default payload
+
+Fields that are left out are removed before serialization, so nested
+serializers and method fields that are not selected cost nothing.
+``SparseFieldsViewMixin`` also defers the large text and JSON columns the
+selected fields do not read, so they are not loaded from the database.
+
+Selections can be set by views through the ``fields`` and ``expand``
+serializer context keys, which take precedence over the query parameters.
+``fields`` only narrows reads; writes always see every writable field.
+"""
+
+from typing import Any, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple
+
+from django.db import models
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_PARAM = "fields"
+EXPAND_PARAM = "expand"
+
+# Column types worth not loading when no selected field reads them
+DEFERRABLE_FIELDS = (models.TextField, models.JSONField)
+
+Path = Tuple[str, ...]
+
+
+class Selection(NamedTuple):
+    """The fields and expansions requested for a serializer tree."""
+
+    fields: FrozenSet[Path]
+    expand: FrozenSet[Path]
+
+
+def parse_paths(value: Any) -> FrozenSet[Path]:
+    """Parse ``"a,b.c"`` (or a list of such names) into field paths."""
+    if not value:
+        return frozenset()
+    names = value.split(",") if isinstance(value, str) else value
+    return frozenset(
+        tuple(part for part in name.strip().split(".") if part)
+        for name in names
+        if name.strip()
+    )
+
+
+def _prefixes(paths: Iterable[Path]) -> FrozenSet[Path]:
+    return frozenset(path[:end] for path in paths for end in range(1, len(path) + 1))
+
+
+def selection_from_context(context: Dict[str, Any]) -> Selection:
+    """Read the selection from serializer context keys or query parameters."""
+    request = context.get("request")
+    params = getattr(request, "query_params", getattr(request, "GET", {}))
+    fields = context.get(FIELDS_PARAM)
+    if fields is None and getattr(request, "method", None) in SAFE_METHODS:
+        fields = params.get(FIELDS_PARAM)
+    expand = context.get(EXPAND_PARAM)
+    if expand is None:
+        expand = params.get(EXPAND_PARAM)
+    requested = parse_paths(fields)
+    # Naming a nested field, or a field inside it, expands it
+    return Selection(requested, _prefixes(parse_paths(expand) | requested))
+
+
+def get_selection(root) -> Selection:
+    """Return the selection for a serializer tree, parsed once per root."""
+    selection = getattr(root, "_sparse_selection", None)
+    if selection is None:
+        selection = root._sparse_selection = selection_from_context(root.context)
+    return selection
+
+
+def field_path(serializer) -> Path:
+    """Return the names of the fields leading from the root to ``serializer``."""
+    names: List[str] = []
+    node = serializer
+    while node.parent is not None:
+        if node.field_name:
+            names.append(node.field_name)
+        node = node.parent
+    return tuple(reversed(names))
+
+
+def is_selected(selection: Selection, path: Path, name: str, expandable: bool) -> bool:
+    """Whether the field ``name`` of the serializer at ``path`` is selected."""
+    if expandable and path + (name,) not in selection.expand:
+        return False
+    depth = len(path)
+    named = {
+        requested[depth]
+        for requested in selection.fields
+        if len(requested) > depth and requested[:depth] == path
+    }
+    # Levels the client did not name keep their default fields
+    return not named or name in named
+
+
+def select_fields(
+    fields: Dict[str, Any], path: Path, selection: Selection, expandable: Iterable[str]
+) -> Dict[str, Any]:
+    """Remove the fields of the serializer at ``path`` that were not selected."""
+    expandable = set(expandable)
+    for name in list(fields):
+        if not is_selected(selection, path, name, name in expandable):
+            del fields[name]
+    return fields
+
+
+class SparseFieldsMixin:
+    """
+    ``?fields=`` / ``?expand=`` support for a serializer and its nested
+    serializers.
+
+    Meta options:
+        expandable_fields: Nested fields left out unless expanded
+        field_columns: Model columns read by method or property fields, e.g.
+            ``{"description_html": ("description", "description_html_cache")}``;
+            used to decide which columns can be deferred
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        expandable = getattr(self.Meta, "expandable_fields", ())
+        return select_fields(
+            fields, field_path(self), get_selection(self.root), expandable
+        )
+
+
+def unused_columns(serializer) -> List[str]:
+    """
+    Return the deferrable columns of the serializer's model it does not read.
+
+    A field reads the column its source names; method and property fields
+    read the columns listed for them in ``Meta.field_columns`` and are
+    otherwise assumed to read no deferrable column.
+    """
+    field_columns = getattr(serializer.Meta, "field_columns", {})
+    needed = set()
+    for name, field in serializer.fields.items():
+        if name in field_columns:
+            needed.update(field_columns[name])
+        elif field.source != "*":
+            needed.add(field.source.split(".")[0])
+    return [
+        field.name
+        for field in serializer.Meta.model._meta.concrete_fields
+        if isinstance(field, DEFERRABLE_FIELDS) and field.name not in needed
+    ]
+
+
+class SparseFieldsViewMixin:
+    """
+    Defers the large columns that the selected serializer fields do not read.
+
+    Applies to safe requests of the actions in ``sparse_actions`` that
+    serialize the viewset's queryset with its ``SparseFieldsMixin``
+    serializer. Hooks ``filter_queryset`` because viewsets override
+    ``get_queryset`` freely.
+    """
+
+    sparse_actions: Tuple[str, ...] = ("list", "retrieve")
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        deferred = self.get_deferred_columns(queryset.model)
+        return queryset.defer(*deferred) if deferred else queryset
+
+    def get_deferred_columns(self, model) -> Optional[List[str]]:
+        request = getattr(self, "request", None)
+        if (
+            request is None
+            or request.method not in SAFE_METHODS
+            or getattr(self, "action", None) not in self.sparse_actions
+            or getattr(self, "swagger_fake_view", False)
+        ):
+            return None
+        serializer_class = self.get_serializer_class()
+        if not issubclass(serializer_class, SparseFieldsMixin):
+            return None
+        if not issubclass(model, serializer_class.Meta.model):
+            return None
+        return unused_columns(serializer_class(context=self.get_serializer_context()))
@@ -18,19 +18,27 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
 
+from ..caching import COURSE_CREATOR
+from ..conditional import ConditionalGetMixin
+from ..eager_loading import EagerLoadingMixin
 from ..models import Course, CourseEnrollment, CourseVersion, LearningTask, TaskProgress
 from ..pagination import SafePageNumberPagination
 from ..permissions import IsInstructorOrAdmin
+from ..progress_summary import annotate_course_progress
+from ..search import search_courses
 from ..serializers import (
     CourseSerializer,
     CourseVersionSerializer,
     TaskProgressSerializer,
 )
+from ..sparse_fields import SparseFieldsViewMixin
 
 logger = logging.getLogger(__name__)
 
 
-class CourseViewSet(viewsets.ModelViewSet):
+class CourseViewSet(
+    ConditionalGetMixin, EagerLoadingMixin, SparseFieldsViewMixin, viewsets.ModelViewSet
+):
     """
     API endpoint for courses
     """
@@ -39,6 +47,14 @@ class CourseViewSet(viewsets.ModelViewSet):
     serializer_class = CourseSerializer
     permission_classes = [IsAuthenticated]
     pagination_class = SafePageNumberPagination
+    # Course.updated_at is not maintained, so only an ETag is offered
+    conditional_models = (
+        "core.course",
+        "core.learningtask",
+        "core.quiztask",
+        COURSE_CREATOR,
+    )
+    conditional_per_user = True
 
     def perform_create(self, serializer: CourseSerializer) -> None:
         """Create a new course with the current user as creator"""
@@ -62,15 +78,12 @@ class CourseViewSet(viewsets.ModelViewSet):
             )
         else:
             queryset = queryset.filter(status="published")
+        queryset = annotate_course_progress(queryset.order_by("id"), self.request.user)
         search_query = self.request.query_params.get("search", "").strip()
         if search_query:
-            queryset = queryset.filter(
-                models.Q(title__icontains=search_query)
-                | models.Q(description__icontains=search_query)
-                | models.Q(creator__first_name__icontains=search_query)
-                | models.Q(creator__last_name__icontains=search_query)
-            )
-        return queryset.order_by("id")
+            # Ordered by relevance
+            queryset = search_courses(queryset, search_query)
+        return queryset
 
     @action(
         detail=False,
@@ -82,7 +95,7 @@ class CourseViewSet(viewsets.ModelViewSet):
         """
         Fetch courses created by the instructor or all courses for admin.
         Supports filtering through query parameters:
-        - search: Text search in title and description
+        - search: Full-text search, ordered by relevance
         - status: Filter by course status (draft/published/archived)
         """
         try:
@@ -100,7 +113,10 @@ class CourseViewSet(viewsets.ModelViewSet):
             )
 
             # Start with base queryset of all courses created by this instructor
-            queryset = Course.objects.filter(creator=request.user)
+            queryset = annotate_course_progress(
+                Course.objects.select_related("creator").filter(creator=request.user),
+                request.user,
+            )
 
             # Handle status filter
             status_filter = request.query_params.get("status", None)
@@ -121,10 +137,7 @@ class CourseViewSet(viewsets.ModelViewSet):
                 logger.info(
                     "Applying search filter '%s' for instructor courses", search_query
                 )
-                queryset = queryset.filter(
-                    models.Q(title__icontains=search_query)
-                    | models.Q(description__icontains=search_query)
-                )
+                queryset = search_courses(queryset, search_query)
 
             course_count = queryset.count()
             logger.info(
@@ -269,7 +282,9 @@ class CourseViewSet(viewsets.ModelViewSet):
         return [IsAuthenticated()]
 
 
-class CourseVersionViewSet(viewsets.ModelViewSet):
+class CourseVersionViewSet(
+    EagerLoadingMixin, SparseFieldsViewMixin, viewsets.ModelViewSet
+):
     """
     API endpoint for course versions
     """
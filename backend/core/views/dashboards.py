@@ -8,15 +8,18 @@ Includes:
 
 import logging
 
-from django.core.cache import cache
 from django.db import models
-from django.db.models import Avg, Case, Count, Prefetch, When
+from django.db.models import Avg, Case, Count, When
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from ..batch import get_instance
+from ..caching import cached_version, serve_cached
+from ..conditional import ConditionalGetMixin, make_etag
 from ..models import Course, CourseEnrollment, QuizAttempt, TaskProgress
+from ..progress_summary import attach_progress_summaries
 from ..serializers import UserSerializer
 
 logger = logging.getLogger(__name__)
@@ -114,7 +117,105 @@ def admin_dashboard_summary(request):
     return Response(data)
 
 
-class StudentDashboardAPI(APIView):
+def student_dashboard_data(user):
+    """Build the dashboard payload for a student."""
+    enrolled_courses = list(
+        CourseEnrollment.objects.filter(user=user)
+        .select_related("course")
+        .order_by("-enrollment_date")
+    )
+    attach_progress_summaries(enrolled_courses)
+    quiz_performance = (
+        QuizAttempt.objects.filter(user=user, completion_status="completed")
+        .values("quiz__course")
+        .annotate(
+            avg_score=Avg("score"),
+            total_attempts=Count("id"),
+            passed_count=Count(Case(When(completion_status="completed", then=1))),
+        )
+    )
+    courses_data = []
+    total_tasks = 0
+    completed_tasks = 0
+    for enrollment in enrolled_courses:
+        course = enrollment.course
+        summary = enrollment.get_progress_summary()
+        course_total_tasks = summary.total_tasks
+        total_tasks += course_total_tasks
+        course_completed_tasks = summary.completed_tasks
+        completed_tasks += course_completed_tasks
+        course_quiz_perf = next(
+            (qp for qp in quiz_performance if qp["quiz__course"] == course.id),
+            {"avg_score": 0, "total_attempts": 0, "passed_count": 0},
+        )
+        courses_data.append(
+            {
+                "course_id": course.id,
+                "course_title": course.title,
+                "enrollment_date": enrollment.enrollment_date,
+                "enrollment_status": enrollment.status,
+                "progress": {
+                    "completed_tasks": course_completed_tasks,
+                    "total_tasks": course_total_tasks,
+                    "completion_percentage": round(
+                        (
+                            (course_completed_tasks / course_total_tasks * 100)
+                            if course_total_tasks > 0
+                            else 0
+                        ),
+                        2,
+                    ),
+                },
+                "quiz_performance": {
+                    "average_score": round(course_quiz_perf["avg_score"] or 0, 2),
+                    "total_attempts": course_quiz_perf["total_attempts"],
+                    "passed_count": course_quiz_perf["passed_count"],
+                },
+            }
+        )
+    recent_activity = (
+        TaskProgress.objects.filter(user=user)
+        .select_related("task", "task__course")
+        .order_by("-updated_at")[:5]
+    )
+    dashboard_data = {
+        "user_info": {
+            "id": user.id,
+            "username": user.username,
+            "email": user.email,
+            "full_name": f"{user.first_name} {user.last_name}".strip(),
+        },
+        "courses": courses_data,
+        "progress": {
+            "overall_progress": round(
+                (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0,
+                2,
+            ),
+            "total_tasks": total_tasks,
+            "completed_tasks": completed_tasks,
+        },
+        "quiz_performance": {
+            "average_score": round(
+                quiz_performance.aggregate(Avg("avg_score"))["avg_score__avg"] or 0,
+                2,
+            ),
+            "total_attempts": quiz_performance.count(),
+        },
+        "recent_activity": [
+            {
+                "task_id": activity.task.id,
+                "task_title": activity.task.title,
+                "course_title": activity.task.course.title,
+                "status": activity.status,
+                "updated_at": activity.updated_at,
+            }
+            for activity in recent_activity
+        ],
+    }
+    return dashboard_data
+
+
+class StudentDashboardAPI(ConditionalGetMixin, APIView):
     """
     API endpoint for student-specific dashboard data.
     Returns a comprehensive overview of student's courses, progress, and recent activity.
@@ -122,12 +223,22 @@ class StudentDashboardAPI(APIView):
 
     permission_classes = [IsAuthenticated]
 
+    def get_conditional_validators(self, request, pk=None):
+        # Other users' dashboards need a permission check in the handler first
+        if pk is not None and pk != request.user.pk:
+            return None, None
+        version = cached_version("student_dashboard", users=[request.user.pk])
+        if version is None:
+            return None, None
+        key, computed_at = version
+        return make_etag(key, request.accepted_media_type), computed_at
+
     def get(self, request, pk=None):
         try:
             user = (
                 request.user
                 if pk is None
-                else UserSerializer.Meta.model.objects.get(id=pk)
+                else get_instance(UserSerializer.Meta.model, pk)
             )
             if user != request.user and not (
                 request.user.is_staff
@@ -137,124 +248,16 @@ class StudentDashboardAPI(APIView):
                     {"error": "You do not have permission to view this dashboard"},
                     status=403,
                 )
-            cache_key = f"student_dashboard_{user.id}"
-            cached_data = cache.get(cache_key)
-            if cached_data:
-                return Response(cached_data)
-            enrolled_courses = (
-                CourseEnrollment.objects.filter(user=user)
-                .select_related("course")
-                .prefetch_related(
-                    "course__learning_tasks",
-                    Prefetch(
-                        "course__learning_tasks__progress",
-                        queryset=TaskProgress.objects.filter(user=user),
-                        to_attr="user_progress",
-                    ),
-                )
-                .order_by("-enrollment_date")
-            )
-            quiz_performance = (
-                QuizAttempt.objects.filter(user=user, completion_status="completed")
-                .values("quiz__course")
-                .annotate(
-                    avg_score=Avg("score"),
-                    total_attempts=Count("id"),
-                    passed_count=Count(
-                        Case(When(completion_status="completed", then=1))
-                    ),
-                )
-            )
-            courses_data = []
-            total_tasks = 0
-            completed_tasks = 0
-            for enrollment in enrolled_courses:
-                course = enrollment.course
-                course_tasks = course.learning_tasks.all()
-                course_total_tasks = len(course_tasks)
-                total_tasks += course_total_tasks
-                course_completed_tasks = sum(
-                    1
-                    for task in course_tasks
-                    if any(
-                        p.status == "completed"
-                        for p in getattr(task, "user_progress", [])
-                    )
-                )
-                completed_tasks += course_completed_tasks
-                course_quiz_perf = next(
-                    (qp for qp in quiz_performance if qp["quiz__course"] == course.id),
-                    {"avg_score": 0, "total_attempts": 0, "passed_count": 0},
-                )
-                courses_data.append(
-                    {
-                        "course_id": course.id,
-                        "course_title": course.title,
-                        "enrollment_date": enrollment.enrollment_date,
-                        "enrollment_status": enrollment.status,
-                        "progress": {
-                            "completed_tasks": course_completed_tasks,
-                            "total_tasks": course_total_tasks,
-                            "completion_percentage": round(
-                                (
-                                    (course_completed_tasks / course_total_tasks * 100)
-                                    if course_total_tasks > 0
-                                    else 0
-                                ),
-                                2,
-                            ),
-                        },
-                        "quiz_performance": {
-                            "average_score": round(
-                                course_quiz_perf["avg_score"] or 0, 2
-                            ),
-                            "total_attempts": course_quiz_perf["total_attempts"],
-                            "passed_count": course_quiz_perf["passed_count"],
-                        },
-                    }
-                )
-            recent_activity = (
-                TaskProgress.objects.filter(user=user)
-                .select_related("task", "task__course")
-                .order_by("-updated_at")[:5]
-            )
-            dashboard_data = {
-                "user_info": {
-                    "id": user.id,
-                    "username": user.username,
-                    "email": user.email,
-                    "full_name": f"{user.first_name} {user.last_name}".strip(),
-                },
-                "courses": courses_data,
-                "progress": {
-                    "overall_progress": round(
-                        (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0,
-                        2,
-                    ),
-                    "total_tasks": total_tasks,
-                    "completed_tasks": completed_tasks,
-                },
-                "quiz_performance": {
-                    "average_score": round(
-                        quiz_performance.aggregate(Avg("avg_score"))["avg_score__avg"]
-                        or 0,
-                        2,
-                    ),
-                    "total_attempts": quiz_performance.count(),
-                },
-                "recent_activity": [
-                    {
-                        "task_id": activity.task.id,
-                        "task_title": activity.task.title,
-                        "course_title": activity.task.course.title,
-                        "status": activity.status,
-                        "updated_at": activity.updated_at,
-                    }
-                    for activity in recent_activity
+            # Falls back to the last good dashboard when the recompute fails
+            dashboard = serve_cached(
+                "student_dashboard",
+                lambda: student_dashboard_data(user),
+                users=[user.id],
+                depends_on=lambda data: [
+                    course["course_id"] for course in data["courses"]
                 ],
-            }
-            cache.set(cache_key, dashboard_data, 15 * 60)
-            return Response(dashboard_data)
+            )
+            return Response(dashboard.data, headers=dashboard.headers)
         except UserSerializer.Meta.model.DoesNotExist:
             return Response({"error": "User not found"}, status=404)
         except Exception as e:
@@ -14,13 +14,20 @@ from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from ..models import CourseEnrollment
+from ..eager_loading import EagerLoadingMixin
+from ..fast_serializers import FastListMixin
+from ..models import Course, CourseEnrollment
+from ..pagination import KeysetPagination
+from ..progress_summary import annotate_course_progress
 from ..serializers import CourseEnrollmentSerializer
+from ..sparse_fields import SparseFieldsViewMixin
 
 logger = logging.getLogger(__name__)
 
 
-class EnrollmentViewSet(viewsets.ModelViewSet):
+class EnrollmentViewSet(
+    FastListMixin, EagerLoadingMixin, SparseFieldsViewMixin, viewsets.ModelViewSet
+):
     """
     API endpoint for course enrollments
 
@@ -35,6 +42,8 @@ class EnrollmentViewSet(viewsets.ModelViewSet):
     queryset = CourseEnrollment.objects.all().order_by("id")
     serializer_class = CourseEnrollmentSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset_ordering = ("-enrollment_date", "-id")
 
     def get_queryset(self):
         # Handle schema generation for Swagger
@@ -50,6 +59,11 @@ class EnrollmentViewSet(viewsets.ModelViewSet):
             return queryset
         return queryset.filter(user=self.request.user)
 
+    def get_eager_querysets(self):
+        # course_details reads the user's progress from these annotations
+        courses = annotate_course_progress(Course.objects.all(), self.request.user)
+        return {"course": courses}
+
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
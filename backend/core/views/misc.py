@@ -3,6 +3,8 @@ Miscellaneous and utility API views for the Learning Platform backend.
 
 Includes:
 - Health check
+- Search-as-you-type suggestions
+- Batched GET requests
 - Any endpoints not fitting other modules
 """
 
@@ -13,6 +15,7 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from .. import autocomplete, batch
 from ..permissions import IsEnrolledInCourse
 
 logger = logging.getLogger(__name__)
@@ -28,6 +31,48 @@ def health_check(request):
     return Response({"status": "healthy"})
 
 
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def autocomplete_suggestions(request):
+    """
+    Suggest course and task titles with a word starting with ``q``.
+
+    Query Parameters:
+        q: The text typed so far
+        limit: Maximum number of suggestions (default: 10, max: 50)
+    """
+    try:
+        limit = min(max(int(request.query_params.get("limit", 10)), 1), 50)
+    except ValueError:
+        return Response({"error": "limit must be an integer"}, status=400)
+    suggestions = autocomplete.suggest(
+        request.query_params.get("q", ""), request.user, limit
+    )
+    return Response({"results": [item.as_dict() for item in suggestions]})
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def batch_requests(request):
+    """
+    Run several GET requests in one round trip.
+
+    Expects {"requests": [{"path": "/api/v1/..."}, ...]} and returns
+    {"responses": [{"path", "status", "headers", "body"}, ...]} in the same
+    order. Each sub-request has its own status code; the batch itself only
+    fails when it is malformed or larger than ``batch.MAX_SUB_REQUESTS``.
+    """
+    specs = request.data.get("requests")
+    if not isinstance(specs, list) or not specs:
+        return Response({"error": "requests must be a non-empty list"}, status=400)
+    if len(specs) > batch.MAX_SUB_REQUESTS:
+        return Response(
+            {"error": f"At most {batch.MAX_SUB_REQUESTS} requests per batch"},
+            status=400,
+        )
+    return Response({"responses": batch.run_batch(request, specs)})
+
+
 class StudentProgressView(APIView):
     permission_classes = [IsAuthenticated, IsEnrolledInCourse]
 
@@ -9,6 +9,8 @@ import logging
 
 from rest_framework import permissions, viewsets
 
+from ..conditional import ConditionalGetMixin
+from ..eager_loading import EagerLoadingMixin
 from ..models import QuizAttempt, QuizOption, QuizQuestion, QuizResponse, QuizTask
 from ..serializers import (
     QuizAttemptSerializer,
@@ -17,11 +19,14 @@ from ..serializers import (
     QuizResponseSerializer,
     QuizTaskSerializer,
 )
+from ..sparse_fields import SparseFieldsViewMixin
 
 logger = logging.getLogger(__name__)
 
 
-class QuizTaskViewSet(viewsets.ModelViewSet):
+class QuizTaskViewSet(
+    ConditionalGetMixin, EagerLoadingMixin, SparseFieldsViewMixin, viewsets.ModelViewSet
+):
     """
     API endpoint for quiz tasks
     """
@@ -29,9 +34,18 @@ class QuizTaskViewSet(viewsets.ModelViewSet):
     queryset = QuizTask.objects.all()
     serializer_class = QuizTaskSerializer
     permission_classes = [permissions.IsAuthenticated]
-
-
-class QuizQuestionViewSet(viewsets.ModelViewSet):
+    # Questions and options carry no timestamps, so only an ETag is offered
+    conditional_models = (
+        "core.learningtask",
+        "core.quiztask",
+        "core.quizquestion",
+        "core.quizoption",
+    )
+
+
+class QuizQuestionViewSet(
+    EagerLoadingMixin, SparseFieldsViewMixin, viewsets.ModelViewSet
+):
     """
     API endpoint for quiz questions
     """
@@ -41,7 +55,9 @@ class QuizQuestionViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
 
 
-class QuizOptionViewSet(viewsets.ModelViewSet):
+class QuizOptionViewSet(
+    EagerLoadingMixin, SparseFieldsViewMixin, viewsets.ModelViewSet
+):
     """
     API endpoint for quiz options
     """
@@ -51,7 +67,9 @@ class QuizOptionViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
 
 
-class QuizAttemptViewSet(viewsets.ModelViewSet):
+class QuizAttemptViewSet(
+    EagerLoadingMixin, SparseFieldsViewMixin, viewsets.ModelViewSet
+):
     """
     API endpoint for quiz attempts
     """
@@ -76,7 +94,9 @@ class QuizAttemptViewSet(viewsets.ModelViewSet):
         serializer.save(user=self.request.user)
 
 
-class QuizResponseViewSet(viewsets.ModelViewSet):
+class QuizResponseViewSet(
+    EagerLoadingMixin, SparseFieldsViewMixin, viewsets.ModelViewSet
+):
     """
     API endpoint for quiz responses
     """
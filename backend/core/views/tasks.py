@@ -17,8 +17,12 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from ..conditional import ConditionalGetMixin
+from ..eager_loading import EagerLoadingMixin
+from ..fast_serializers import FastListMixin
 from ..models import AuditLog, LearningTask, TaskProgress
 from ..serializers import LearningTaskSerializer, TaskProgressSerializer
+from ..sparse_fields import SparseFieldsViewMixin
 
 logger = logging.getLogger(__name__)
 
@@ -48,7 +52,13 @@ def create_audit_log(
     )
 
 
-class LearningTaskViewSet(viewsets.ModelViewSet):
+class LearningTaskViewSet(
+    ConditionalGetMixin,
+    FastListMixin,
+    EagerLoadingMixin,
+    SparseFieldsViewMixin,
+    viewsets.ModelViewSet,
+):
     """
     API endpoint for learning tasks
     """
@@ -56,6 +66,9 @@ class LearningTaskViewSet(viewsets.ModelViewSet):
     queryset = LearningTask.objects.all()
     serializer_class = LearningTaskSerializer
     permission_classes = [permissions.IsAuthenticated]
+    conditional_actions = ("list", "retrieve", "tasks_by_course")
+    conditional_models = ("core.learningtask", "core.quiztask")
+    last_modified_field = "updated_at"
 
     def get_queryset(self):
         """
@@ -77,6 +90,11 @@ class LearningTaskViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(is_published=True)
         return queryset
 
+    def get_conditional_queryset(self):
+        if self.action == "tasks_by_course":
+            return self.get_queryset().filter(course_id=self.kwargs["course_id"])
+        return super().get_conditional_queryset()
+
     def destroy(self, request, *args, **kwargs):
         """
         Override destroy to check if task has student progress before deletion.
@@ -212,7 +230,9 @@ class LearningTaskViewSet(viewsets.ModelViewSet):
             )
 
 
-class TaskProgressViewSet(viewsets.ModelViewSet):
+class TaskProgressViewSet(
+    EagerLoadingMixin, SparseFieldsViewMixin, viewsets.ModelViewSet
+):
     """
     API endpoint for task progress
     """
@@ -229,6 +249,7 @@ class TaskProgressViewSet(viewsets.ModelViewSet):
         # Allow updating the status of a task
         instance = self.get_object()
         instance.status = request.data.get("status", instance.status)
+        instance.client_updated_at = None
         instance.save()
         return Response({"status": "Task progress updated"})
 
@@ -15,12 +15,14 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from ..eager_loading import EagerLoadingMixin
 from ..serializers import UserSerializer
+from ..sparse_fields import SparseFieldsViewMixin
 
 logger = logging.getLogger(__name__)
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(EagerLoadingMixin, SparseFieldsViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing user resources.
 
@@ -141,7 +141,12 @@ def log_request(request, logger=None, log_headers=True):
 
     # Log the body only for methods that typically include a payload
     if request.method in {"POST", "PUT", "PATCH"}:
-        request_data["body"] = request.body.decode("utf-8") if request.body else None
+        # Binary bodies (e.g. MessagePack) are logged with escaped bytes
+        request_data["body"] = (
+            request.body.decode("utf-8", errors="backslashreplace")
+            if request.body
+            else None
+        )
 
     if log_headers:
         sensitive_headers = {"Authorization", "Cookie"}
@@ -0,0 +1,57 @@
+"""
+Shared fixtures and helpers for the test suite.
+"""
+
+import datetime
+from typing import Any, Callable, List
+
+import pytest
+from django.core.cache import cache
+
+from core.models import CourseEnrollment, TaskProgress, User
+
+
+@pytest.fixture
+def clean_cache() -> Any:
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _add_students(
+    course: Any,
+    tasks: list,
+    count: int,
+    prefix: str,
+    time_spent: datetime.timedelta = datetime.timedelta(0),
+) -> List[User]:
+    """
+    Enroll students in bulk; student i completes i % (len(tasks) + 1) tasks.
+
+    Each completed task records ``time_spent * i`` as the time student i spent.
+    """
+    users = User.objects.bulk_create(
+        [
+            User(username=f"{prefix}{i}", email=f"{prefix}{i}@test.com")
+            for i in range(count)
+        ]
+    )
+    CourseEnrollment.objects.bulk_create(
+        [CourseEnrollment(user=user, course=course, status="active") for user in users]
+    )
+    TaskProgress.objects.bulk_create(
+        [
+            TaskProgress(
+                user=user, task=task, status="completed", time_spent=time_spent * i
+            )
+            for i, user in enumerate(users)
+            for task in tasks[: i % (len(tasks) + 1)]
+        ]
+    )
+    return users
+
+
+@pytest.fixture
+def add_students() -> Callable[..., List[User]]:
+    """The bulk enrollment helper, ``add_students(course, tasks, count, prefix)``."""
+    return _add_students
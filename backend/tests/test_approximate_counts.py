@@ -0,0 +1,119 @@
+"""
+Test suite for cached and approximate pagination counts.
+
+Test cases:
+- Counts up to the threshold are exact
+- Counts above the threshold are cached and flagged approximate
+- Writes change the model generation and the cached count with it
+- Pages past an approximate count are served while they have rows
+"""
+
+import datetime
+from typing import Any, Dict
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.models import Course, QuizAttempt, QuizTask, User
+from core.pagination import SafePageNumberPagination
+
+ATTEMPTS_URL = "/api/v1/quiz-attempts/?page_size=2"
+
+
+def _attempts(data: Dict[str, Any], count: int) -> None:
+    # bulk_create skips the signals, like writes the generations don't see
+    QuizAttempt.objects.bulk_create(
+        [
+            QuizAttempt(
+                user=data["student"],
+                quiz=data["quiz"],
+                score=50,
+                time_taken=datetime.timedelta(minutes=1),
+                completion_status="completed",
+                attempt_date=timezone.now(),
+            )
+            for _ in range(count)
+        ]
+    )
+
+
+@pytest.fixture
+def count_data(db: Any) -> Dict[str, Any]:
+    cache.clear()
+    admin = User.objects.create_user(
+        username="count_admin", email="count_admin@test.com", password="x", role="admin"
+    )
+    student = User.objects.create_user(
+        username="count_student", email="count_student@test.com", password="x"
+    )
+    course = Course.objects.create(title="Counts", description="C", creator=admin)
+    quiz = QuizTask.objects.create(course=course, title="Quiz")
+    client = APIClient()
+    client.force_authenticate(user=student)
+    with mock.patch.object(SafePageNumberPagination, "exact_count_threshold", 5):
+        yield {"student": student, "quiz": quiz, "client": client}
+
+
+def _page(client: APIClient, page: int) -> Any:
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(f"{ATTEMPTS_URL}&page={page}")
+    assert response.status_code == 200
+    response.counts = [q["sql"] for q in ctx.captured_queries if "COUNT(" in q["sql"]]
+    return response
+
+
+@pytest.mark.django_db
+class TestApproximateCounts:
+    """Test cases for CountingPaginator through SafePageNumberPagination."""
+
+    def test_exact_below_threshold(self, count_data: Dict[str, Any]) -> None:
+        _attempts(count_data, 5)
+        response = _page(count_data["client"], 1)
+
+        assert response.data["count"] == 5
+        assert response.data["total_pages"] == 3
+        assert response.data["count_exact"] is True
+        # Only the bounded count runs
+        assert len(response.counts) == 1
+        assert "LIMIT" in response.counts[0]
+
+    def test_cached_above_threshold(self, count_data: Dict[str, Any]) -> None:
+        _attempts(count_data, 8)
+        first = _page(count_data["client"], 1)
+        assert (first.data["count"], first.data["count_exact"]) == (8, True)
+        assert len(first.counts) == 2
+
+        cached = _page(count_data["client"], 1)
+        assert (cached.data["count"], cached.data["count_exact"]) == (8, False)
+        assert len(cached.counts) == 1
+        assert "LIMIT" in cached.counts[0]
+
+    def test_write_changes_generation(self, count_data: Dict[str, Any]) -> None:
+        _attempts(count_data, 8)
+        _page(count_data["client"], 1)
+
+        QuizAttempt.objects.create(
+            user=count_data["student"],
+            quiz=count_data["quiz"],
+            score=10,
+            time_taken=datetime.timedelta(minutes=1),
+        )
+        response = _page(count_data["client"], 1)
+
+        assert (response.data["count"], response.data["count_exact"]) == (9, True)
+
+    def test_pages_past_approximate_count(self, count_data: Dict[str, Any]) -> None:
+        _attempts(count_data, 8)
+        _page(count_data["client"], 1)
+        _attempts(count_data, 2)
+
+        response = _page(count_data["client"], 5)
+
+        assert response.data["count"] == 8
+        assert response.data["current_page"] == 5
+        assert len(response.data["results"]) == 2
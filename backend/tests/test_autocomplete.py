@@ -0,0 +1,210 @@
+"""
+Test suite for the in-process autocomplete index.
+
+Test cases:
+- Any word of a title matches as a prefix, once per title
+- Suggestions follow the course and task visibility rules
+- Committed writes are replayed incrementally; a lost log rebuilds
+- Titles beyond the memory budget are left out
+- Index rebuild time, size and lookup latency for 100k titles (benchmark)
+"""
+
+import time
+from typing import Any, Dict, List
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from core import autocomplete
+from core.models import Course, LearningTask, User
+
+URL = "/api/v1/autocomplete/"
+
+
+@pytest.fixture
+def fresh_index() -> Any:
+    cache.clear()
+    autocomplete.reset_index()
+    yield
+    autocomplete.reset_index()
+
+
+@pytest.fixture
+def suggest_data(db: Any, fresh_index: Any) -> Dict[str, Any]:
+    instructor = User.objects.create_user(
+        username="suggest_instructor",
+        email="suggest_instructor@test.com",
+        password="testpass123",
+        role="instructor",
+    )
+    student = User.objects.create_user(
+        username="suggest_student", email="suggest_student@test.com", password="x"
+    )
+    published = Course.objects.create(
+        title="Python for Data Science",
+        description="C",
+        creator=instructor,
+        status="published",
+    )
+    draft = Course.objects.create(
+        title="Python Internals", description="C", creator=instructor, status="draft"
+    )
+    LearningTask.objects.create(
+        course=published, title="Pandas data frames", is_published=True
+    )
+    LearningTask.objects.create(
+        course=published, title="Data cleaning draft", is_published=False
+    )
+    clients = {}
+    for user in (instructor, student):
+        clients[user.username] = APIClient()
+        clients[user.username].force_authenticate(user=user)
+    return {
+        "instructor": clients["suggest_instructor"],
+        "student": clients["suggest_student"],
+        "published": published,
+        "draft": draft,
+    }
+
+
+def _titles(client: APIClient, query: str) -> List[str]:
+    response = client.get(URL, {"q": query})
+    assert response.status_code == 200
+    return [item["title"] for item in response.data["results"]]
+
+
+@pytest.mark.django_db
+class TestAutocomplete:
+    """Test cases for autocomplete.PrefixIndex and the endpoint."""
+
+    def test_word_prefixes(self, suggest_data: Dict[str, Any]) -> None:
+        client = suggest_data["student"]
+
+        assert _titles(client, "Pyt") == ["Python for Data Science"]
+        assert _titles(client, "  SCIEN") == ["Python for Data Science"]
+        # Matches two words of the same title once; ordered by matched text
+        assert _titles(client, "data") == [
+            "Pandas data frames",
+            "Python for Data Science",
+        ]
+        assert _titles(client, "") == []
+
+    def test_visibility(self, suggest_data: Dict[str, Any]) -> None:
+        assert _titles(suggest_data["student"], "python") == ["Python for Data Science"]
+        assert _titles(suggest_data["student"], "clean") == []
+        assert sorted(_titles(suggest_data["instructor"], "python")) == [
+            "Python Internals",
+            "Python for Data Science",
+        ]
+        assert _titles(suggest_data["instructor"], "clean") == ["Data cleaning draft"]
+
+    def test_incremental_refresh(
+        self, suggest_data: Dict[str, Any], django_capture_on_commit_callbacks: Any
+    ) -> None:
+        client = suggest_data["student"]
+        assert _titles(client, "rust") == []
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Course.objects.create(
+                title="Rust basics",
+                description="C",
+                creator=suggest_data["published"].creator,
+                status="published",
+            )
+            draft = suggest_data["draft"]
+            draft.status = "published"
+            draft.save()
+
+        with (
+            mock.patch.object(autocomplete.PrefixIndex, "build") as build,
+            CaptureQueriesContext(connection) as ctx,
+        ):
+            assert _titles(client, "rust") == ["Rust basics"]
+        build.assert_not_called()
+        # Only the changed courses and their tasks are reloaded
+        assert len(ctx.captured_queries) == 2
+        assert sorted(_titles(client, "python")) == [
+            "Python Internals",
+            "Python for Data Science",
+        ]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            LearningTask.objects.filter(title__startswith="Pandas").get().delete()
+        assert _titles(client, "pandas") == []
+
+    def test_lost_log_rebuilds(
+        self, suggest_data: Dict[str, Any], django_capture_on_commit_callbacks: Any
+    ) -> None:
+        client = suggest_data["student"]
+        _titles(client, "python")
+        with django_capture_on_commit_callbacks(execute=True):
+            course = suggest_data["published"]
+            course.title = "Go for Data Science"
+            course.save()
+        cache.delete(
+            autocomplete.CHANGE_KEY.format(cache.get(autocomplete.SEQUENCE_KEY))
+        )
+
+        assert _titles(client, "go") == ["Go for Data Science"]
+        assert _titles(client, "python") == []
+
+    def test_memory_budget(self, suggest_data: Dict[str, Any]) -> None:
+        index = autocomplete.PrefixIndex(memory_budget=500)
+        index.build()
+
+        assert index.truncated
+        assert index.memory_used <= 500
+        assert 0 < len(index) < 4
+
+    @pytest.mark.slow
+    def test_rebuild_benchmark(self, suggest_data: Dict[str, Any]) -> None:
+        """Benchmark: build time, size and lookups for 100k titles."""
+        words = ["intro", "advanced", "python", "data", "web", "design", "cloud"]
+        creator = suggest_data["published"].creator
+        courses = Course.objects.bulk_create(
+            [
+                Course(
+                    title=f"{words[i % 7]} {words[(i // 7) % 7]} course {i}",
+                    description="C",
+                    creator=creator,
+                    status="published",
+                )
+                for i in range(50_000)
+            ],
+            batch_size=5000,
+        )
+        LearningTask.objects.bulk_create(
+            [
+                LearningTask(
+                    course=courses[i],
+                    title=f"{words[(i * 3) % 7]} exercise {i}",
+                    is_published=True,
+                )
+                for i in range(50_000)
+            ],
+            batch_size=5000,
+        )
+
+        index = autocomplete.PrefixIndex()
+        started = time.perf_counter()
+        index.build()
+        build_time = time.perf_counter() - started
+        assert not index.truncated
+        assert len(index) >= 100_000
+
+        student = User.objects.get(username="suggest_student")
+        queries = ["p", "py", "pyth", "data w", "course 4999", "exercise 12", "zzz"]
+        started = time.perf_counter()
+        for query in queries * 100:
+            index.suggest(query, student)
+        lookup_time = (time.perf_counter() - started) / (len(queries) * 100)
+
+        assert lookup_time < 0.01
+        print()
+        print(f"build: {build_time * 1000:.0f} ms for {len(index)} titles")
+        print(f"memory: ~{index.memory_used // (1024 * 1024)} MiB")
+        print(f"lookup: {lookup_time * 1000:.3f} ms")
@@ -0,0 +1,147 @@
+"""
+Test suite for the batch request endpoint.
+
+Test cases:
+- Sub-requests return the same status and body as separate requests
+- Each sub-request has its own status code
+- The batch is authenticated once and shares user lookups
+- Oversized, empty and unauthenticated batches are rejected
+"""
+
+from typing import Any, Dict, List
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core.batch import MAX_SUB_REQUESTS
+from core.models import Course, CourseEnrollment, LearningTask, User
+
+URL = "/api/v1/batch/"
+
+
+@pytest.fixture
+def batch_data(db: Any) -> Dict[str, Any]:
+    cache.clear()
+    instructor = User.objects.create_user(
+        username="batch_instructor",
+        email="batch_instructor@test.com",
+        password="testpass123",
+        role="instructor",
+    )
+    student = User.objects.create_user(
+        username="batch_student", email="batch_student@test.com", password="x"
+    )
+    other = User.objects.create_user(
+        username="batch_other", email="batch_other@test.com", password="x"
+    )
+    course = Course.objects.create(
+        title="Batching", description="C", creator=instructor, status="published"
+    )
+    LearningTask.objects.create(course=course, title="Task", is_published=True)
+    CourseEnrollment.objects.create(user=student, course=course, status="active")
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(student)}")
+    return {"student": student, "other": other, "course": course, "client": client}
+
+
+def _batch(client: APIClient, paths: List[Any]) -> Any:
+    requests = [{"path": path} if isinstance(path, str) else path for path in paths]
+    return client.post(URL, {"requests": requests}, format="json")
+
+
+@pytest.mark.django_db
+class TestBatchRequests:
+    """Test cases for batch.run_batch and the endpoint."""
+
+    def test_matches_separate_requests(self, batch_data: Dict[str, Any]) -> None:
+        client, student = batch_data["client"], batch_data["student"]
+        paths = [
+            "/api/v1/students/progress/",
+            f"/api/v1/students/{student.id}/dashboard/",
+            "/api/v1/courses/?page_size=5",
+            f"/api/v1/learning-tasks/course/{batch_data['course'].id}/",
+        ]
+        separate = [client.get(path) for path in paths]
+
+        response = _batch(client, paths)
+
+        assert response.status_code == 200
+        results = response.json()["responses"]
+        assert [r["path"] for r in results] == paths
+        for result, expected in zip(results, separate):
+            assert result["status"] == expected.status_code == 200
+            assert result["body"] == expected.json()
+
+    def test_sub_request_statuses(self, batch_data: Dict[str, Any]) -> None:
+        other = batch_data["other"]
+
+        response = _batch(
+            batch_data["client"],
+            [
+                "/api/v1/courses/",
+                f"/api/v1/students/{other.id}/progress/",
+                "/api/v1/students/999999/progress/",
+                "/api/v1/no-such-endpoint/",
+                "/admin/",
+                "https://example.com/api/v1/courses/",
+                {"path": "/api/v1/courses/", "method": "POST"},
+                URL,
+                {"url": "/api/v1/courses/"},
+            ],
+        )
+
+        assert response.status_code == 200
+        assert [r["status"] for r in response.data["responses"]] == [
+            200,
+            403,
+            404,
+            404,
+            400,
+            400,
+            405,
+            400,
+            400,
+        ]
+
+    def test_shared_authentication(self, batch_data: Dict[str, Any]) -> None:
+        student = batch_data["student"]
+        paths = [
+            f"/api/v1/students/{student.id}/progress/",
+            f"/api/v1/students/{student.id}/quiz-performance/",
+            f"/api/v1/students/{student.id}/dashboard/",
+        ]
+
+        with (
+            mock.patch.object(
+                JWTAuthentication,
+                "get_user",
+                autospec=True,
+                side_effect=JWTAuthentication.get_user,
+            ) as get_user,
+            CaptureQueriesContext(connection) as ctx,
+        ):
+            response = _batch(batch_data["client"], paths)
+
+        assert [r["status"] for r in response.data["responses"]] == [200] * 3
+        assert get_user.call_count == 1
+        user_lookups = [
+            query
+            for query in ctx.captured_queries
+            if query["sql"].startswith('SELECT "core_user"')
+        ]
+        assert len(user_lookups) == 1
+
+    def test_rejected_batches(self, batch_data: Dict[str, Any]) -> None:
+        client = batch_data["client"]
+
+        paths = ["/api/v1/courses/"] * (MAX_SUB_REQUESTS + 1)
+        assert _batch(client, paths).status_code == 400
+        assert _batch(client, []).status_code == 400
+        assert client.post(URL, {"requests": "x"}, format="json").status_code == 400
+        assert _batch(APIClient(), ["/api/v1/courses/"]).status_code == 401
@@ -0,0 +1,188 @@
+"""
+Test suite for the two-tier cache backend.
+
+Test cases:
+- L1 LRU eviction and TTL expiry
+- Writes in one process invalidate L1 copies in another
+- Generation counters bypass L1
+- Per-prefix hit/miss statistics
+- L2 round trips per write, with and without L1
+- Dashboard hit rate across 4 workers with and without a shared L2
+"""
+
+import random
+import time
+from typing import Any, List
+from unittest import mock
+
+import pytest
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core import caching
+from core.cache_backends import TwoTierCache
+from core.models import Course, CourseEnrollment, LearningTask, User
+from core.views import dashboards
+
+
+def _two_tier(**options: Any) -> TwoTierCache:
+    return TwoTierCache(
+        "",
+        {
+            "OPTIONS": {
+                "L2_ALIAS": "shared",
+                "L1_SYNC_INTERVAL": 0,
+                "L1_BYPASS_PREFIXES": ["generation:", "lock:"],
+                **options,
+            }
+        },
+    )
+
+
+@pytest.fixture
+def shared() -> Any:
+    caches["shared"].clear()
+    yield caches["shared"]
+    caches["shared"].clear()
+
+
+class TestTwoTierCache:
+    """Test cases for the L1/L2 cache backend."""
+
+    def test_lru_eviction(self, shared: Any) -> None:
+        cache = _two_tier(L1_MAX_ENTRIES=2)
+        cache.set("a", "a")
+        cache.set("b", "b")
+        cache.get("a")
+        cache.set("c", "c")
+
+        # "a" was refreshed by the read, so "b" was evicted from L1
+        assert cache.get("a") == "a" and cache.get("c") == "c"
+        assert cache.stats()["a"]["l1_hits"] == 2
+        assert cache.get("b") == "b"
+        assert cache.stats()["b"] == {
+            "l1_hits": 0,
+            "l2_hits": 1,
+            "misses": 0,
+            "hit_rate": 1.0,
+        }
+
+    def test_l1_ttl(self, shared: Any) -> None:
+        cache = _two_tier(L1_TIMEOUT=30)
+        cache.set("ttl", 1)
+        later = time.monotonic() + 31
+        with mock.patch("core.cache_backends.time.monotonic", return_value=later):
+            assert cache.get("ttl") == 1
+        assert cache.stats()["ttl"]["l2_hits"] == 1
+
+    def test_invalidation_broadcast(self, shared: Any) -> None:
+        worker_a, worker_b = _two_tier(), _two_tier()
+        worker_a.set("course:1", "old")
+        assert worker_b.get("course:1") == "old"
+
+        worker_a.set("course:1", "new")
+        assert worker_b.get("course:1") == "new"
+
+        worker_a.delete("course:1")
+        assert worker_b.get("course:1") is None
+
+        worker_a.set("course:2", "kept")
+        assert worker_b.get("course:2") == "kept"
+        worker_a.clear()
+        assert worker_b.get("course:2") is None
+
+    def test_generation_bypass(self, shared: Any) -> None:
+        worker_a, worker_b = _two_tier(), _two_tier()
+        worker_a.add("generation:course:1", 1)
+        assert worker_b.get("generation:course:1") == 1
+
+        worker_a.incr("generation:course:1")
+        assert worker_b.get("generation:course:1") == 2
+        assert worker_b.stats()["generation"]["l1_hits"] == 0
+
+    def test_write_round_trips(self, shared: Any) -> None:
+        cache = _two_tier()
+        cache.set("warm", 0)  # Creates the log sequence
+        writes = ("set", "set_many", "add", "incr", "delete", "delete_many")
+        with mock.patch.multiple(
+            shared, **{name: mock.DEFAULT for name in writes}
+        ) as calls:
+            calls["set_many"].return_value = []
+            cache.set("course:1", 1)
+            trips = sum(calls[name].call_count for name in writes)
+            cache.set("generation:course:1", 1)
+            bypass_trips = sum(calls[name].call_count for name in writes) - trips
+
+        # The write, the sequence increment and the log entry
+        assert trips == 3
+        assert bypass_trips == 1
+
+
+@pytest.fixture
+def dashboard_students(db: Any) -> List[Any]:
+    instructor = User.objects.create_user(
+        username="tier_instructor",
+        email="tier_instructor@test.com",
+        password="testpass123",
+        role="instructor",
+    )
+    course = Course.objects.create(title="Tiers", description="C", creator=instructor)
+    LearningTask.objects.create(course=course, title="Task", is_published=True)
+    clients = []
+    for i in range(10):
+        student = User.objects.create_user(
+            username=f"tier_student_{i}",
+            email=f"tier_student_{i}@test.com",
+            password="x",
+        )
+        CourseEnrollment.objects.create(user=student, course=course, status="active")
+        client = APIClient()
+        client.force_authenticate(user=student)
+        clients.append((student, client))
+    return clients
+
+
+REQUESTS = 200
+
+
+def _dashboard_hit_rate(workers: List[Any], students: List[Any]) -> float:
+    """Replay random dashboard requests round-robin over the given worker caches."""
+    requests = REQUESTS
+    rng = random.Random(0)
+    with mock.patch.object(
+        dashboards,
+        "student_dashboard_data",
+        wraps=dashboards.student_dashboard_data,
+    ) as compute:
+        for request_number in range(requests):
+            student, client = rng.choice(students)
+            worker = workers[request_number % len(workers)]
+            with mock.patch.object(caching, "cache", worker):
+                url = reverse("student-dashboard-detail", kwargs={"pk": student.id})
+                assert client.get(url).status_code == 200
+    return 1 - compute.call_count / requests
+
+
+@pytest.mark.slow
+@pytest.mark.django_db
+class TestTwoTierHitRate:
+    """Dashboard cache hit rate with 4 simulated worker processes."""
+
+    def test_dashboard_hit_rate(
+        self, shared: Any, dashboard_students: List[Any]
+    ) -> None:
+        local_only = [LocMemCache(f"worker-{i}", {}) for i in range(4)]
+        for worker in local_only:
+            worker.clear()
+        before = _dashboard_hit_rate(local_only, dashboard_students)
+
+        two_tier = [_two_tier() for _ in range(4)]
+        after = _dashboard_hit_rate(two_tier, dashboard_students)
+        stats = [worker.stats()["student_dashboard"] for worker in two_tier]
+
+        # Each dashboard is computed once in total instead of once per worker
+        assert after > before
+        assert round((1 - after) * REQUESTS) == len(dashboard_students)
+        assert sum(s["l1_hits"] for s in stats) > 0
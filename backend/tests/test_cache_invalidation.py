@@ -0,0 +1,165 @@
+"""
+Test suite for generation-based cache invalidation.
+
+Test cases:
+- Generation bumps change versioned keys
+- Entries depending on course generations are rejected once a course changes
+- Analytics and dashboard responses refresh after relevant writes
+- A classmate's activity does not evict a student's cached payloads
+"""
+
+import datetime
+from typing import Any, Dict
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core import caching
+from core.models import (
+    Course,
+    CourseEnrollment,
+    LearningTask,
+    QuizAttempt,
+    QuizTask,
+    TaskProgress,
+    User,
+)
+
+
+@pytest.fixture
+def cache_data(db: Any) -> Dict[str, Any]:
+    cache.clear()
+    instructor = User.objects.create_user(
+        username="cache_instructor",
+        email="cache_instructor@test.com",
+        password="testpass123",
+        role="instructor",
+    )
+    student = User.objects.create_user(
+        username="cache_student", email="cache_student@test.com", password="x"
+    )
+    course = Course.objects.create(
+        title="Caching", description="Course", creator=instructor
+    )
+    task = LearningTask.objects.create(course=course, title="Task", is_published=True)
+    CourseEnrollment.objects.create(user=student, course=course, status="active")
+    instructor_client = APIClient()
+    instructor_client.force_authenticate(user=instructor)
+    student_client = APIClient()
+    student_client.force_authenticate(user=student)
+    return {
+        "student": student,
+        "course": course,
+        "task": task,
+        "instructor_client": instructor_client,
+        "student_client": student_client,
+    }
+
+
+@pytest.mark.django_db
+class TestGenerationCache:
+    """Test cases for the generation counter helpers."""
+
+    def test_bump_changes_key(self, cache_data: Dict[str, Any]) -> None:
+        course_id = cache_data["course"].id
+        key = caching.versioned_key("example", courses=[course_id])
+        assert caching.versioned_key("example", courses=[course_id]) == key
+
+        caching.bump_generation(caching.COURSE, course_id)
+        assert caching.versioned_key("example", courses=[course_id]) != key
+
+    def test_recorded_course_dependencies(self, cache_data: Dict[str, Any]) -> None:
+        course_id = cache_data["course"].id
+        caching.set_cached("payload", {"value": 1}, courses=[course_id])
+        assert caching.get_cached("payload") == (True, {"value": 1})
+
+        caching.bump_generation(caching.COURSE, course_id)
+        assert caching.get_cached("payload") == (False, None)
+
+    def test_course_analytics_refresh(self, cache_data: Dict[str, Any]) -> None:
+        client, course = cache_data["instructor_client"], cache_data["course"]
+        url = reverse("course_analytics", kwargs={"pk": course.id})
+        assert client.get(url).data["enrollment_stats"]["total"] == 1
+
+        newcomer = User.objects.create_user(
+            username="cache_newcomer", email="cache_newcomer@test.com", password="x"
+        )
+        CourseEnrollment.objects.create(user=newcomer, course=course, status="active")
+
+        assert client.get(url).data["enrollment_stats"]["total"] == 2
+
+    def test_student_views_refresh(self, cache_data: Dict[str, Any]) -> None:
+        client, student = cache_data["student_client"], cache_data["student"]
+        progress_url = reverse("student_personal_progress")
+        dashboard_url = reverse("student-dashboard-detail", kwargs={"pk": student.id})
+        quiz_url = reverse("student_quiz_performance", kwargs={"pk": student.id})
+        assert client.get(progress_url).data["overall_stats"]["total_tasks"] == 1
+        assert client.get(dashboard_url).data["progress"]["completed_tasks"] == 0
+        assert client.get(quiz_url).data["overall_stats"]["total_attempts"] == 0
+
+        # A course-level change invalidates the student's cached payloads
+        LearningTask.objects.create(
+            course=cache_data["course"], title="New", is_published=True
+        )
+        assert client.get(progress_url).data["overall_stats"]["total_tasks"] == 2
+
+        # A write by the student invalidates their own payloads
+        TaskProgress.objects.create(
+            user=student, task=cache_data["task"], status="completed"
+        )
+        assert client.get(dashboard_url).data["progress"]["completed_tasks"] == 1
+
+        quiz = QuizTask.objects.create(course=cache_data["course"], title="Quiz")
+        QuizAttempt.objects.create(
+            user=student,
+            quiz=quiz,
+            score=90,
+            time_taken=datetime.timedelta(minutes=1),
+            completion_status="completed",
+        )
+        assert client.get(quiz_url).data["overall_stats"]["total_attempts"] == 1
+
+    def test_classmate_activity_keeps_student_views(
+        self, cache_data: Dict[str, Any]
+    ) -> None:
+        client, student = cache_data["student_client"], cache_data["student"]
+        course, task = cache_data["course"], cache_data["task"]
+        quiz = QuizTask.objects.create(course=course, title="Quiz")
+        client.get(reverse("student_personal_progress"))
+        client.get(reverse("student-dashboard-detail", kwargs={"pk": student.id}))
+        client.get(reverse("student_quiz_performance", kwargs={"pk": student.id}))
+        keys = [
+            caching.versioned_key(base, users=[student.id])
+            for base in (
+                "student_progress",
+                "student_dashboard",
+                "student_quiz_performance",
+            )
+        ]
+        analytics_key = caching.versioned_key("course_analytics", courses=[course.id])
+
+        classmate = User.objects.create_user(
+            username="cache_classmate", email="cache_classmate@test.com", password="x"
+        )
+        CourseEnrollment.objects.create(user=classmate, course=course, status="active")
+        TaskProgress.objects.create(user=classmate, task=task, status="completed")
+        QuizAttempt.objects.create(
+            user=classmate,
+            quiz=quiz,
+            score=50,
+            time_taken=datetime.timedelta(minutes=1),
+            completion_status="completed",
+        )
+
+        assert all(caching.get_cached(key)[0] for key in keys)
+        # Course analytics read every learner's rows and are invalidated
+        assert (
+            caching.versioned_key("course_analytics", courses=[course.id])
+            != analytics_key
+        )
+
+        # New content invalidates the payloads that count the course's tasks
+        LearningTask.objects.create(course=course, title="New", is_published=True)
+        assert not any(caching.get_cached(key)[0] for key in keys[:2])
@@ -0,0 +1,119 @@
+"""
+Test suite for single-flight recomputation of cached payloads.
+
+Test cases:
+- Concurrent misses compute the payload once
+- Waiters compute themselves after the wait timeout
+- Early expiry refreshes hot entries while others receive the current value
+- Course analytics are served through the wrapper
+"""
+
+import threading
+import time
+from typing import Any, Dict, List
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core import caching
+from core.analytics import course_analytics
+from core.models import Course, User
+
+
+def _slow_compute(calls: List[int], value: Any, delay: float = 0.2) -> Any:
+    def compute() -> Any:
+        calls.append(1)
+        time.sleep(delay)
+        return value
+
+    return compute
+
+
+class TestSingleFlight:
+    """Test cases for caching.get_or_compute."""
+
+    def test_concurrent_misses_compute_once(self, clean_cache: Any) -> None:
+        calls: List[int] = []
+        results: List[Any] = []
+        compute = _slow_compute(calls, {"value": 1})
+
+        def request() -> None:
+            results.append(caching.get_or_compute("stampede:once", compute))
+
+        threads = [threading.Thread(target=request) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert results == [{"value": 1}] * 8
+        assert not cache.has_key("lock:stampede:once")
+
+    def test_wait_timeout(self, clean_cache: Any) -> None:
+        calls: List[int] = []
+        cache.add("lock:stampede:stuck", 1, caching.LOCK_TIMEOUT)
+
+        with mock.patch.object(caching, "WAIT_TIMEOUT", 0.1):
+            value = caching.get_or_compute(
+                "stampede:stuck", _slow_compute(calls, "computed", delay=0)
+            )
+
+        assert value == "computed" and len(calls) == 1
+
+    def test_early_expiry(self, clean_cache: Any) -> None:
+        calls: List[int] = []
+        caching.set_cached("stampede:hot", "old", timeout=60, compute_time=30)
+        compute = _slow_compute(calls, "new", delay=0)
+
+        # Far from expiry: served as is
+        with mock.patch.object(caching.random, "random", return_value=0.0):
+            assert caching.get_or_compute("stampede:hot", compute) == "old"
+        assert calls == []
+
+        # Close to expiry while another request holds the lock: current value
+        with mock.patch.object(caching.random, "random", return_value=0.99):
+            cache.add("lock:stampede:hot", 1, caching.LOCK_TIMEOUT)
+            assert caching.get_or_compute("stampede:hot", compute) == "old"
+            cache.delete("lock:stampede:hot")
+
+            # The request that gets the lock refreshes the entry
+            assert caching.get_or_compute("stampede:hot", compute) == "new"
+        assert len(calls) == 1
+        assert caching.get_cached("stampede:hot") == (True, "new")
+
+
+@pytest.fixture
+def analytics_client(db: Any, clean_cache: Any) -> Dict[str, Any]:
+    instructor = User.objects.create_user(
+        username="stampede_instructor",
+        email="stampede_instructor@test.com",
+        password="testpass123",
+        role="instructor",
+    )
+    course = Course.objects.create(
+        title="Stampede", description="Course", creator=instructor
+    )
+    client = APIClient()
+    client.force_authenticate(user=instructor)
+    return {"client": client, "course": course}
+
+
+@pytest.mark.django_db
+class TestAnalyticsSingleFlight:
+    """Test cases for the analytics views using the wrapper."""
+
+    def test_course_analytics_computed_once(
+        self, analytics_client: Dict[str, Any]
+    ) -> None:
+        url = reverse("course_analytics", kwargs={"pk": analytics_client["course"].id})
+        with mock.patch(
+            "core.progress_api.course_analytics", wraps=course_analytics
+        ) as compute:
+            for _ in range(3):
+                assert analytics_client["client"].get(url).status_code == 200
+
+        assert compute.call_count == 1
@@ -0,0 +1,176 @@
+"""
+Test suite for conditional GET (ETag / Last-Modified) support.
+
+Test cases:
+- Course list answers 304 without queries and changes with writes
+- Per-user validators change when the user's enrollments change
+- Logins keep the course list validators; creator detail edits change them
+- Tasks by course carry Last-Modified and answer If-Modified-Since
+- Quiz content validators change with question options
+- Student dashboard validators follow the cached payload
+"""
+
+from typing import Any, Dict
+
+import pytest
+from django.contrib.auth.models import update_last_login
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core.models import (
+    Course,
+    CourseEnrollment,
+    LearningTask,
+    QuizOption,
+    QuizQuestion,
+    QuizTask,
+    User,
+)
+
+
+@pytest.fixture
+def conditional_data(db: Any) -> Dict[str, Any]:
+    cache.clear()
+    instructor = User.objects.create_user(
+        username="conditional_instructor",
+        email="conditional_instructor@test.com",
+        password="testpass123",
+        role="instructor",
+    )
+    student = User.objects.create_user(
+        username="conditional_student",
+        email="conditional_student@test.com",
+        password="testpass123",
+    )
+    course = Course.objects.create(
+        title="Conditional",
+        description="Course",
+        creator=instructor,
+        status="published",
+    )
+    task = LearningTask.objects.create(course=course, title="Task", is_published=True)
+    quiz = QuizTask.objects.create(course=course, title="Quiz", is_published=True)
+    question = QuizQuestion.objects.create(quiz=quiz, text="Question")
+    client = APIClient()
+    client.force_authenticate(user=student)
+    return {
+        "student": student,
+        "course": course,
+        "task": task,
+        "quiz": quiz,
+        "question": question,
+        "client": client,
+    }
+
+
+def _revalidate(client: APIClient, url: str, **headers: str) -> Any:
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url, **headers)
+    response.query_count = len(ctx.captured_queries)
+    return response
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+    """Test cases for ConditionalGetMixin on read endpoints."""
+
+    def test_course_list(self, conditional_data: Dict[str, Any]) -> None:
+        client, course = conditional_data["client"], conditional_data["course"]
+        response = client.get("/api/v1/courses/")
+        etag = response["ETag"]
+        assert response.status_code == 200
+
+        response = _revalidate(client, "/api/v1/courses/", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        assert response["ETag"] == etag
+        assert response.query_count <= 1
+
+        course.title = "Renamed"
+        course.save()
+        response = client.get("/api/v1/courses/", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response.data["results"][0]["title"] == "Renamed"
+
+    def test_per_user_validators(self, conditional_data: Dict[str, Any]) -> None:
+        client = conditional_data["client"]
+        etag = client.get("/api/v1/courses/")["ETag"]
+
+        CourseEnrollment.objects.create(
+            user=conditional_data["student"],
+            course=conditional_data["course"],
+            status="active",
+        )
+        response = client.get("/api/v1/courses/", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response.data["results"][0]["isEnrolled"] is True
+
+    def test_course_list_creator_changes(
+        self, conditional_data: Dict[str, Any]
+    ) -> None:
+        client = conditional_data["client"]
+        creator = conditional_data["course"].creator
+        etag = client.get("/api/v1/courses/")["ETag"]
+
+        update_last_login(None, conditional_data["student"])
+        update_last_login(None, creator)
+        response = client.get("/api/v1/courses/", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+
+        creator.display_name = "Renamed Instructor"
+        creator.save()
+        response = client.get("/api/v1/courses/", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        details = response.data["results"][0]["creator_details"]
+        assert details["display_name"] == "Renamed Instructor"
+
+    def test_tasks_by_course(self, conditional_data: Dict[str, Any]) -> None:
+        client, task = conditional_data["client"], conditional_data["task"]
+        url = f"/api/v1/learning-tasks/course/{conditional_data['course'].id}/"
+        response = client.get(url)
+        etag, last_modified = response["ETag"], response["Last-Modified"]
+
+        response = _revalidate(client, url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        assert response.query_count <= 1
+        response = _revalidate(client, url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == 304
+        assert response.query_count <= 1
+
+        task.title = "Edited"
+        task.save()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+
+    def test_quiz_content(self, conditional_data: Dict[str, Any]) -> None:
+        client = conditional_data["client"]
+        url = f"/api/v1/quiz-tasks/{conditional_data['quiz'].id}/"
+        etag = client.get(url)["ETag"]
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+        QuizOption.objects.create(
+            question=conditional_data["question"], text="Option", is_correct=True
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert len(response.data["questions"][0]["options"]) == 1
+
+    def test_student_dashboard(self, conditional_data: Dict[str, Any]) -> None:
+        client, student = conditional_data["client"], conditional_data["student"]
+        url = reverse("student-dashboard-detail", kwargs={"pk": student.id})
+        # Validators become available once the payload is cached
+        client.get(url)
+        etag = client.get(url)["ETag"]
+
+        response = _revalidate(client, url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        assert response.query_count <= 1
+
+        CourseEnrollment.objects.create(
+            user=student, course=conditional_data["course"], status="active"
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert len(response.data["courses"]) == 1
@@ -0,0 +1,170 @@
+"""
+Test suite for the Course Analytics API endpoint.
+
+Test cases:
+- Response schema and aggregated values
+- Challenging question detection
+- Constant query count for small and very large courses
+"""
+
+import datetime
+from typing import Any, Dict
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core.models import (
+    Course,
+    CourseEnrollment,
+    LearningTask,
+    QuizAttempt,
+    QuizOption,
+    QuizQuestion,
+    QuizResponse,
+    QuizTask,
+    TaskProgress,
+    User,
+)
+
+
+def _populate_course(course: Course, students: int, prefix: str) -> None:
+    """Create students with enrollments, progress and quiz responses in bulk."""
+    tasks = [
+        LearningTask.objects.create(
+            course=course, title=f"{prefix} task {i}", order=i, is_published=True
+        )
+        for i in range(3)
+    ]
+    quiz = QuizTask.objects.create(
+        course=course, title=f"{prefix} quiz", order=3, is_published=True
+    )
+    question = QuizQuestion.objects.create(quiz=quiz, text="Hard question")
+    right = QuizOption.objects.create(question=question, text="A", is_correct=True)
+    wrong = QuizOption.objects.create(question=question, text="B", is_correct=False)
+
+    users = User.objects.bulk_create(
+        [
+            User(username=f"{prefix}{i}", email=f"{prefix}{i}@test.com")
+            for i in range(students)
+        ]
+    )
+    CourseEnrollment.objects.bulk_create(
+        [
+            CourseEnrollment(
+                user=user, course=course, status="completed" if i % 2 else "active"
+            )
+            for i, user in enumerate(users)
+        ]
+    )
+    TaskProgress.objects.bulk_create(
+        [
+            TaskProgress(user=user, task=task, status="completed")
+            for i, user in enumerate(users)
+            for task in tasks[: i % 4]
+        ]
+    )
+    attempts = QuizAttempt.objects.bulk_create(
+        [
+            QuizAttempt(
+                user=user,
+                quiz=quiz,
+                score=40,
+                time_taken=datetime.timedelta(minutes=5),
+                completion_status="completed",
+            )
+            for user in users
+        ]
+    )
+    QuizResponse.objects.bulk_create(
+        [
+            QuizResponse(
+                attempt=attempt,
+                question=question,
+                selected_option=right if i % 4 == 0 else wrong,
+                is_correct=i % 4 == 0,
+                time_spent=datetime.timedelta(seconds=10),
+            )
+            for i, attempt in enumerate(attempts)
+        ]
+    )
+
+
+@pytest.fixture
+def analytics_data(db: Any) -> Dict[str, Any]:
+    cache.clear()
+    instructor = User.objects.create_user(
+        username="analytics_instructor",
+        email="analytics_instructor@test.com",
+        password="testpass123",
+        role="instructor",
+    )
+    client = APIClient()
+    client.force_authenticate(user=instructor)
+    return {"instructor": instructor, "client": client}
+
+
+def _new_course(instructor: User, title: str) -> Course:
+    return Course.objects.create(title=title, description="Course", creator=instructor)
+
+
+@pytest.mark.django_db
+class TestCourseAnalyticsAPI:
+    """Test cases for the Course Analytics API."""
+
+    def test_analytics_payload(self, analytics_data: Dict[str, Any]) -> None:
+        course = _new_course(analytics_data["instructor"], "Payload")
+        _populate_course(course, 8, "payload")
+
+        url = reverse("course_analytics", kwargs={"pk": course.id})
+        response = analytics_data["client"].get(url)
+
+        assert response.status_code == 200
+        data = response.data
+        assert data["enrollment_stats"] == {
+            "total": 8,
+            "active": 4,
+            "completed": 4,
+            "dropped": 0,
+            "completion_percentage": 50.0,
+        }
+        # Students with progress complete 1, 2 or 3 of 4 published tasks
+        assert data["completion_rates"]["distribution"] == {
+            "below_25": 0,
+            "25_to_50": 2,
+            "50_to_75": 2,
+            "above_75": 2,
+        }
+        assert data["completion_rates"]["average"] == 50.0
+        assert data["average_scores"] == {"quizzes": 40.0}
+        assert data["content_distribution"]["quiz"] == 1
+        assert set(data["content_distribution"]) == {
+            "reading",
+            "video",
+            "quiz",
+            "assignment",
+            "discussion",
+        }
+        [question] = data["challenging_content"]["questions"]
+        assert question["success_rate"] == 25.0
+        assert question["total_attempts"] == 8
+        assert question["quiz"] == "payload quiz"
+
+    @pytest.mark.slow
+    def test_constant_query_count(self, analytics_data: Dict[str, Any]) -> None:
+        """Benchmark: a 10,000 student course costs the same queries as 10."""
+        counts = {}
+        for students in (10, 10_000):
+            course = _new_course(analytics_data["instructor"], f"Size {students}")
+            _populate_course(course, students, f"s{students}_")
+            url = reverse("course_analytics", kwargs={"pk": course.id})
+            with CaptureQueriesContext(connection) as ctx:
+                response = analytics_data["client"].get(url)
+            assert response.status_code == 200
+            assert response.data["enrollment_stats"]["total"] == students
+            counts[students] = len(ctx.captured_queries)
+
+        assert counts[10] == counts[10_000]
@@ -0,0 +1,127 @@
+"""
+Test suite for the per-user progress annotations on course listings.
+
+Test cases:
+- isEnrolled / isCompleted read from queryset annotations
+- Serializer fallback for unannotated courses
+- Constant query count for the course list at any page size
+"""
+
+from typing import Any, Dict
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient, APIRequestFactory
+
+from core.models import Course, CourseEnrollment, LearningTask, TaskProgress, User
+from core.serializers import CourseSerializer
+
+
+def _published_courses(creator: User, count: int, prefix: str) -> list:
+    courses = Course.objects.bulk_create(
+        [
+            Course(
+                title=f"{prefix} {i}",
+                description="C",
+                creator=creator,
+                status="published",
+            )
+            for i in range(count)
+        ]
+    )
+    LearningTask.objects.bulk_create(
+        [
+            LearningTask(course=course, title="Task", is_published=True)
+            for course in courses
+        ]
+    )
+    return courses
+
+
+@pytest.fixture
+def listing_data(db: Any) -> Dict[str, Any]:
+    instructor = User.objects.create_user(
+        username="listing_instructor",
+        email="listing_instructor@test.com",
+        password="testpass123",
+        role="instructor",
+    )
+    student = User.objects.create_user(
+        username="listing_student",
+        email="listing_student@test.com",
+        password="testpass123",
+    )
+    client = APIClient()
+    client.force_authenticate(user=student)
+    return {"instructor": instructor, "student": student, "client": client}
+
+
+@pytest.mark.django_db
+class TestCourseProgressAnnotations:
+    """Test cases for annotated course enrollment and completion flags."""
+
+    def test_flags_from_annotations(self, listing_data: Dict[str, Any]) -> None:
+        student = listing_data["student"]
+        done, started, other = _published_courses(
+            listing_data["instructor"], 3, "Flags"
+        )
+        for course in (done, started):
+            CourseEnrollment.objects.create(
+                user=student, course=course, status="active"
+            )
+        TaskProgress.objects.create(
+            user=student, task=done.learning_tasks.get(), status="completed"
+        )
+        LearningTask.objects.create(course=done, title="Draft")
+
+        response = listing_data["client"].get("/api/v1/courses/")
+
+        assert response.status_code == 200
+        flags = {
+            row["id"]: (row["isEnrolled"], row["isCompleted"])
+            for row in response.data["results"]
+        }
+        assert flags == {
+            done.id: (True, True),
+            started.id: (True, False),
+            other.id: (False, False),
+        }
+
+    def test_serializer_fallback(self, listing_data: Dict[str, Any]) -> None:
+        student = listing_data["student"]
+        [course] = _published_courses(listing_data["instructor"], 1, "Fallback")
+        CourseEnrollment.objects.create(user=student, course=course, status="active")
+        TaskProgress.objects.create(
+            user=student, task=course.learning_tasks.get(), status="completed"
+        )
+        request = APIRequestFactory().get("/")
+        request.user = student
+
+        data = CourseSerializer(
+            Course.objects.get(pk=course.pk), context={"request": request}
+        ).data
+
+        assert (data["isEnrolled"], data["isCompleted"]) == (True, True)
+
+    def test_list_query_count(self, listing_data: Dict[str, Any]) -> None:
+        student = listing_data["student"]
+        courses = _published_courses(listing_data["instructor"], 60, "Count")
+        CourseEnrollment.objects.bulk_create(
+            [
+                CourseEnrollment(user=student, course=course, status="active")
+                for course in courses[::2]
+            ]
+        )
+
+        counts = {}
+        for page_size in (5, 50):
+            with CaptureQueriesContext(connection) as ctx:
+                response = listing_data["client"].get(
+                    "/api/v1/courses/", {"page_size": page_size}
+                )
+            assert response.status_code == 200
+            assert len(response.data["results"]) == page_size
+            counts[page_size] = len(ctx.captured_queries)
+
+        assert counts[5] == counts[50]
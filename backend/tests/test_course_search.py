@@ -0,0 +1,177 @@
+"""
+Test suite for full-text course search.
+
+Test cases:
+- Results are ranked by relevance with title matches first
+- The last term matches as a prefix and all terms must match
+- Snippets are HTML-escaped with matches highlighted
+- The index follows course saves, deletes and creator renames
+- Instructor courses use the same search
+- Full-text search against icontains over 100k courses (benchmark)
+"""
+
+import time
+from typing import Any, Dict, List
+
+import pytest
+from django.db import connection
+from django.db.models import Q
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from core import search
+from core.models import Course, User
+
+COURSES_URL = "/api/v1/courses/"
+INSTRUCTOR_URL = "/api/v1/courses/instructor/courses/"
+
+
+@pytest.fixture
+def search_data(db: Any) -> Dict[str, Any]:
+    instructor = User.objects.create_user(
+        username="search_instructor",
+        email="search_instructor@test.com",
+        password="testpass123",
+        role="instructor",
+        first_name="Ada",
+        last_name="Lovelace",
+    )
+    client = APIClient()
+    client.force_authenticate(user=instructor)
+    return {"instructor": instructor, "client": client}
+
+
+def _course(
+    data: Dict[str, Any], title: str, description: str = "", **kwargs
+) -> Course:
+    return Course.objects.create(
+        title=title,
+        description=description,
+        creator=data["instructor"],
+        status="published",
+        **kwargs,
+    )
+
+
+def _titles(client: APIClient, query: str, url: str = COURSES_URL) -> List[str]:
+    response = client.get(url, {"search": query})
+    assert response.status_code == 200
+    return [course["title"] for course in response.data["results"]]
+
+
+@pytest.mark.django_db
+class TestCourseSearch:
+    """Test cases for search.search_courses through the course endpoints."""
+
+    def test_ranking(self, search_data: Dict[str, Any]) -> None:
+        _course(search_data, "Cooking", "A side note on python scripts")
+        _course(search_data, "Python basics", "Variables and loops")
+        _course(search_data, "Gardening", "Plants", learning_objectives="Python")
+        _course(search_data, "Unrelated", "Nothing here")
+
+        response = search_data["client"].get(COURSES_URL, {"search": "python"})
+
+        results = response.data["results"]
+        assert [course["title"] for course in results] == [
+            "Python basics",
+            "Gardening",
+            "Cooking",
+        ]
+        ranks = [course["search_rank"] for course in results]
+        assert ranks == sorted(ranks, reverse=True)
+
+    def test_prefix_and_all_terms(self, search_data: Dict[str, Any]) -> None:
+        _course(search_data, "Python basics", "Variables and loops")
+        _course(search_data, "Python web", "Django views")
+
+        client = search_data["client"]
+        assert sorted(_titles(client, "pyth")) == ["Python basics", "Python web"]
+        assert _titles(client, "python djan") == ["Python web"]
+        # Query syntax is not interpreted
+        assert _titles(client, 'python" "web') == ["Python web"]
+        assert sorted(_titles(client, "***")) == ["Python basics", "Python web"]
+
+    def test_snippet(self, search_data: Dict[str, Any]) -> None:
+        _course(search_data, "Markup", "Learn <b>HTML</b> and the DOM")
+
+        response = search_data["client"].get(COURSES_URL, {"search": "html"})
+
+        snippet = response.data["results"][0]["search_snippet"]
+        assert "<mark>HTML</mark>" in snippet
+        assert "&lt;b&gt;" in snippet
+        plain = search_data["client"].get(COURSES_URL).data["results"][0]
+        assert plain["search_snippet"] is None
+
+    def test_index_follows_writes(self, search_data: Dict[str, Any]) -> None:
+        client, instructor = search_data["client"], search_data["instructor"]
+        course = _course(search_data, "Algebra", "Equations")
+        assert _titles(client, "lovelace") == ["Algebra"]
+
+        course.title = "Geometry"
+        course.save()
+        assert _titles(client, "algebra") == []
+        assert _titles(client, "geometry") == ["Geometry"]
+
+        instructor.last_name = "Byron"
+        instructor.save()
+        assert _titles(client, "lovelace") == []
+        assert _titles(client, "byron") == ["Geometry"]
+
+        course.delete()
+        assert _titles(client, "geometry") == []
+
+    def test_instructor_courses(self, search_data: Dict[str, Any]) -> None:
+        _course(search_data, "Statistics", "Probability")
+        _course(search_data, "Biology", "Cells and probability theory")
+
+        titles = _titles(search_data["client"], "probab", INSTRUCTOR_URL)
+
+        assert titles == ["Statistics", "Biology"]
+
+    @pytest.mark.slow
+    def test_search_benchmark(self, search_data: Dict[str, Any]) -> None:
+        """Benchmark: full-text search against icontains over 100k courses."""
+        total = 100_000
+        words = ["alpha", "beta", "gamma", "delta", "epsilon", "zeta", "theta"]
+        Course.objects.bulk_create(
+            [
+                Course(
+                    title=f"Course {i} {words[i % len(words)]}",
+                    description=f"{words[(i * 3) % len(words)]} lesson {i}",
+                    creator=search_data["instructor"],
+                    status="published",
+                )
+                for i in range(total)
+            ],
+            batch_size=5000,
+        )
+        assert search.rebuild_index() == total
+        client = search_data["client"]
+        # Matches a single course
+        query = "lesson 99999"
+        expected = [Course.objects.get(description__endswith=query).id]
+
+        # The predicates the catalog used before the full-text index
+        legacy = Course.objects.filter(
+            Q(title__icontains=query)
+            | Q(description__icontains=query)
+            | Q(creator__first_name__icontains=query)
+            | Q(creator__last_name__icontains=query)
+        )
+        timings = {}
+        for label, queryset in (
+            ("icontains", legacy),
+            ("full-text", search.search_courses(Course.objects.all(), query)),
+        ):
+            started = time.perf_counter()
+            ids = list(queryset.values_list("id", flat=True)[:10])
+            timings[label] = time.perf_counter() - started
+            assert ids == expected
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(COURSES_URL, {"search": query})
+        assert [course["id"] for course in response.data["results"]] == expected
+        assert not any("LIKE" in q["sql"] for q in ctx.captured_queries)
+        print()
+        for label, seconds in timings.items():
+            print(f"{label}: {seconds * 1000:.1f} ms")
@@ -0,0 +1,199 @@
+"""
+Test suite for eager loading derived from the serializer tree.
+
+Test cases:
+- The plan follows nested serializers, source= paths and expansions
+- The plan is computed once per serializer class
+- The query count of each list endpoint does not grow with the rows
+"""
+
+import datetime
+from typing import Any, Callable, Dict
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+
+from core.eager_loading import eager_load, eager_loading_plan
+from core.models import (
+    Course,
+    CourseEnrollment,
+    CourseVersion,
+    LearningTask,
+    QuizAttempt,
+    QuizOption,
+    QuizQuestion,
+    QuizResponse,
+    QuizTask,
+    TaskProgress,
+    User,
+)
+from core.serializers import (
+    CourseEnrollmentSerializer,
+    QuizAttemptSerializer,
+    TaskProgressSerializer,
+)
+from core.sparse_fields import selection_from_context
+from core.views.quizzes import QuizResponseViewSet
+from core.views.tasks import TaskProgressViewSet
+
+LIST_URLS = [
+    "/api/v1/users/",
+    "/api/v1/courses/",
+    "/api/v1/course-versions/",
+    "/api/v1/learning-tasks/",
+    "/api/v1/quiz-tasks/",
+    "/api/v1/quiz-questions/",
+    "/api/v1/quiz-options/",
+    "/api/v1/enrollments/",
+    "/api/v1/task-progress/",
+    "/api/v1/quiz-attempts/",
+    "/api/v1/quiz-attempts/?fields=id,score,user_details",
+]
+
+# Viewsets that are not routed, listed through as_view()
+UNROUTED_VIEWSETS = [QuizResponseViewSet, TaskProgressViewSet]
+
+
+def _add_course(admin: User, number: int) -> None:
+    instructor = User.objects.create_user(
+        username=f"eager_instructor_{number}",
+        email=f"eager_instructor_{number}@test.com",
+        password="testpass123",
+        role="instructor",
+    )
+    course = Course.objects.create(
+        title=f"Eager {number}",
+        description="C",
+        creator=instructor,
+        status="published",
+    )
+    CourseVersion.objects.create(
+        course=course, version_number=1, content_snapshot={}, created_by=instructor
+    )
+    task = LearningTask.objects.create(course=course, title="Task", is_published=True)
+    quiz = QuizTask.objects.create(course=course, title="Quiz", is_published=True)
+    attempt = QuizAttempt.objects.create(
+        user=admin,
+        quiz=quiz,
+        score=50,
+        time_taken=datetime.timedelta(minutes=1),
+        completion_status="completed",
+    )
+    for order in range(2):
+        question = QuizQuestion.objects.create(
+            quiz=quiz, text=f"Q{order}?", points=1, order=order
+        )
+        options = [
+            QuizOption.objects.create(
+                question=question, text=text, is_correct=text == "A", order=index
+            )
+            for index, text in enumerate("AB")
+        ]
+        QuizResponse.objects.create(
+            attempt=attempt,
+            question=question,
+            selected_option=options[order],
+            is_correct=order == 0,
+            time_spent=datetime.timedelta(seconds=10),
+        )
+    CourseEnrollment.objects.create(user=admin, course=course, status="active")
+    TaskProgress.objects.create(user=admin, task=task, status="in_progress")
+
+
+@pytest.fixture
+def eager_data(db: Any) -> Dict[str, Any]:
+    admin = User.objects.create_user(
+        username="eager_admin",
+        email="eager_admin@test.com",
+        password="testpass123",
+        role="admin",
+        is_staff=True,
+    )
+    _add_course(admin, 0)
+    client = APIClient()
+    client.force_authenticate(user=admin)
+    return {"admin": admin, "client": client}
+
+
+def _count_queries(call: Callable[[], Any]) -> int:
+    cache.clear()
+    with CaptureQueriesContext(connection) as ctx:
+        response = call()
+    assert response.status_code == 200
+    return len(ctx.captured_queries)
+
+
+def _assert_constant_queries(data: Dict[str, Any], call: Callable[[], Any]) -> None:
+    small = _count_queries(call)
+    for number in (1, 2, 3):
+        _add_course(data["admin"], number)
+    large = _count_queries(call)
+    assert large == small
+
+
+@pytest.mark.django_db
+class TestEagerLoading:
+    """Test cases for eager_loading.EagerLoadingMixin and its plan."""
+
+    def test_plan(self) -> None:
+        queryset = eager_load(TaskProgress.objects.all(), TaskProgressSerializer)
+        assert set(queryset.query.select_related) == {"user", "task"}
+
+        selection = selection_from_context({"fields": "id,score,user_details"})
+        queryset = eager_load(
+            QuizAttempt.objects.all(), QuizAttemptSerializer, selection
+        )
+        assert set(queryset.query.select_related) == {"user"}
+        assert not queryset._prefetch_related_lookups
+
+        queryset = eager_load(QuizAttempt.objects.all(), QuizAttemptSerializer)
+        assert set(queryset.query.select_related) == {"user", "quiz"}
+        prefetches = {
+            prefetch.prefetch_through: prefetch.queryset
+            for prefetch in queryset._prefetch_related_lookups
+        }
+        assert set(prefetches) == {"quiz__questions", "responses"}
+        responses = prefetches["responses"]
+        assert set(responses.query.select_related) == {"question", "selected_option"}
+        assert [
+            prefetch.prefetch_through
+            for prefetch in responses._prefetch_related_lookups
+        ] == ["question__options"]
+
+    def test_plan_querysets(self) -> None:
+        courses = Course.objects.filter(status="published")
+        queryset = eager_load(
+            CourseEnrollment.objects.all(),
+            CourseEnrollmentSerializer,
+            querysets={"course": courses},
+        )
+        assert set(queryset.query.select_related) == {"user"}
+        (prefetch,) = queryset._prefetch_related_lookups
+        assert prefetch.prefetch_through == "course"
+        assert set(prefetch.queryset.query.select_related) == {"creator"}
+        assert "published" in str(prefetch.queryset.query)
+
+    def test_plan_cached(self) -> None:
+        plan = eager_loading_plan(QuizAttemptSerializer)
+        hits = eager_loading_plan.cache_info().hits
+
+        assert eager_loading_plan(QuizAttemptSerializer) is plan
+        assert eager_loading_plan.cache_info().hits == hits + 1
+
+    @pytest.mark.parametrize("url", LIST_URLS)
+    def test_list_queries(self, eager_data: Dict[str, Any], url: str) -> None:
+        _assert_constant_queries(eager_data, lambda: eager_data["client"].get(url))
+
+    @pytest.mark.parametrize("viewset", UNROUTED_VIEWSETS)
+    def test_unrouted_list_queries(self, eager_data: Dict[str, Any], viewset) -> None:
+        view = viewset.as_view({"get": "list"})
+
+        def call() -> Any:
+            request = APIRequestFactory().get("/")
+            force_authenticate(request, user=eager_data["admin"])
+            return view(request)
+
+        _assert_constant_queries(eager_data, call)
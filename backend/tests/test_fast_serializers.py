@@ -0,0 +1,251 @@
+"""
+Test suite for the fast-path list serializers.
+
+Test cases:
+- Fast list responses are byte-identical to the regular serializers
+- Pagination, sparse fieldsets and expansions keep working
+- Serializers with unsupported fields fall back to the regular path
+- The fast path does not instantiate models
+- Benchmark: regular vs compiled serializers
+"""
+
+import datetime
+import time
+from typing import Any, Dict
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+from django.db.models import Model
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from core import fast_serializers
+from core.eager_loading import eager_load
+from core.fast_serializers import compile_serializer
+from core.models import (
+    Course,
+    CourseEnrollment,
+    CourseProgressSummary,
+    LearningTask,
+    TaskProgress,
+    User,
+)
+from core.serializers import (
+    CourseEnrollmentSerializer,
+    CourseSerializer,
+    LearningTaskSerializer,
+    TaskProgressSerializer,
+)
+from core.sparse_fields import selection_from_context
+
+ENROLLMENTS_URL = "/api/v1/enrollments/"
+TASKS_URL = "/api/v1/learning-tasks/"
+PROGRESS_URL = "/api/v1/task-progress/"
+# Every enrollment field but course_details
+ENROLLMENT_FIELDS = (
+    "id,user,course,enrollment_date,status,settings,user_details,progress_percentage"
+)
+
+
+@pytest.fixture
+def fast_data(db: Any) -> Dict[str, Any]:
+    cache.clear()
+    instructor = User.objects.create_user(
+        username="fast_instructor",
+        email="fast_instructor@test.com",
+        password="testpass123",
+        role="instructor",
+    )
+    student = User.objects.create_user(
+        username="fast_student",
+        email="fast_student@test.com",
+        password="x",
+        display_name="Fast Student",
+    )
+    courses = [
+        Course.objects.create(
+            title=f"Fast {i}", description="C", creator=instructor, status="published"
+        )
+        for i in range(2)
+    ]
+    tasks = [
+        LearningTask.objects.create(
+            course=courses[i % 2],
+            title=f"Task {i}",
+            description=f"# Task {i}\n\n**Bold** text" if i else "",
+            order=i,
+            is_published=True,
+        )
+        for i in range(4)
+    ]
+    # Written without save(), so the stored HTML is stale and rendered on read
+    LearningTask.objects.filter(pk=tasks[1].pk).update(description="*changed*")
+    CourseEnrollment.objects.create(
+        user=student,
+        course=courses[0],
+        status="active",
+        settings={"notifications": [1, 2], "theme": None},
+    )
+    CourseEnrollment.objects.create(user=student, course=courses[1], status="active")
+    TaskProgress.objects.create(
+        user=student,
+        task=tasks[0],
+        status="completed",
+        time_spent=datetime.timedelta(minutes=3, microseconds=5),
+        completion_date=datetime.datetime(
+            2026, 3, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc
+        ),
+    )
+    TaskProgress.objects.create(user=student, task=tasks[1], status="in_progress")
+    # One enrollment without a summary row, built on read
+    CourseProgressSummary.objects.filter(course=courses[1]).delete()
+    client = APIClient()
+    client.force_authenticate(user=student)
+    return {"student": student, "courses": courses, "tasks": tasks, "client": client}
+
+
+def _get(client: APIClient, url: str, fast: bool) -> bytes:
+    cache.clear()
+    if fast:
+        response = client.get(url)
+    else:
+        with mock.patch.object(
+            fast_serializers, "compile_serializer", return_value=None
+        ):
+            response = client.get(url)
+    assert response.status_code == 200
+    return response.content
+
+
+def _assert_identical(client: APIClient, url: str) -> bytes:
+    fast = _get(client, url, fast=True)
+    assert fast == _get(client, url, fast=False)
+    return fast
+
+
+@pytest.mark.django_db
+class TestFastSerializers:
+    """Test cases for fast_serializers.CompiledSerializer and FastListMixin."""
+
+    @pytest.mark.parametrize(
+        "url",
+        [
+            ENROLLMENTS_URL,
+            f"{ENROLLMENTS_URL}?fields=id,progress_percentage,user_details.username",
+            f"{ENROLLMENTS_URL}?page=1",
+            TASKS_URL,
+            f"{TASKS_URL}?fields=id,description_html",
+            PROGRESS_URL,
+            f"{PROGRESS_URL}?fields=id,time_spent,task_details.description_html",
+        ],
+    )
+    def test_identical_output(self, fast_data: Dict[str, Any], url: str) -> None:
+        content = _assert_identical(fast_data["client"], url)
+        assert b'"results":[{' in content
+
+    def test_keyset_pages(self, fast_data: Dict[str, Any]) -> None:
+        client = fast_data["client"]
+
+        for base in (ENROLLMENTS_URL, PROGRESS_URL):
+            first = client.get(f"{base}?pagination=cursor&page_size=1")
+            next_url = first.data["next"]
+            assert next_url
+            _assert_identical(client, f"{base}?pagination=cursor&page_size=1")
+            _assert_identical(client, next_url)
+
+    def test_unsupported_fall_back(self, fast_data: Dict[str, Any]) -> None:
+        # The course block has method fields without a row form
+        assert compile_serializer(CourseSerializer()) is None
+        assert compile_serializer(CourseEnrollmentSerializer(context={})) is None
+
+        content = _assert_identical(fast_data["client"], ENROLLMENTS_URL)
+        assert b'"course_details":{' in content
+
+    def test_no_model_instances(self, fast_data: Dict[str, Any]) -> None:
+        client = fast_data["client"]
+
+        with mock.patch.object(
+            Model, "from_db", side_effect=AssertionError("model instantiated")
+        ):
+            assert client.get(TASKS_URL).status_code == 200
+            assert client.get(PROGRESS_URL).status_code == 200
+
+    @pytest.mark.slow
+    def test_benchmark(self, fast_data: Dict[str, Any]) -> None:
+        """Benchmark: regular vs compiled serializers over 5,000 rows each."""
+        student, courses = fast_data["student"], fast_data["courses"]
+        tasks = LearningTask.objects.bulk_create(
+            [
+                LearningTask(
+                    course=courses[i % 2],
+                    title=f"Bench task {i}",
+                    description=f"Step **{i}**",
+                    order=i,
+                    is_published=True,
+                )
+                for i in range(5000)
+            ]
+        )
+        for task in tasks:
+            task.render_description()
+        LearningTask.objects.bulk_update(
+            tasks, ["description_html_cache", "description_hash"]
+        )
+        TaskProgress.objects.bulk_create(
+            [
+                TaskProgress(
+                    user=student,
+                    task=task,
+                    status="completed",
+                    time_spent=datetime.timedelta(seconds=i),
+                    completion_date=datetime.datetime.now(datetime.timezone.utc),
+                )
+                for i, task in enumerate(tasks)
+            ]
+        )
+        extra_courses = Course.objects.bulk_create(
+            [
+                Course(title=f"Bench {i}", description="C", creator=courses[0].creator)
+                for i in range(5000)
+            ]
+        )
+        CourseEnrollment.objects.bulk_create(
+            [
+                CourseEnrollment(user=student, course=course, status="active")
+                for course in extra_courses
+            ]
+        )
+
+        renderer = JSONRenderer()
+        print()
+        for serializer_class, context in (
+            # The course block has no row form (see test_unsupported_fall_back)
+            (CourseEnrollmentSerializer, {"fields": ENROLLMENT_FIELDS}),
+            (LearningTaskSerializer, {}),
+            (TaskProgressSerializer, {}),
+        ):
+            queryset = serializer_class.Meta.model.objects.order_by("id")[:5000]
+            loaded = eager_load(
+                queryset, serializer_class, selection_from_context(context)
+            )
+            # Summaries are built by the first read; time both paths warm
+            serializer_class(loaded, many=True, context=context).data
+
+            started = time.perf_counter()
+            regular = serializer_class(loaded.all(), many=True, context=context).data
+            regular_time = time.perf_counter() - started
+
+            serializer = serializer_class(context=context)
+            started = time.perf_counter()
+            compiled = compile_serializer(serializer)
+            fast = compiled.serialize(compiled.values(queryset), serializer)
+            fast_time = time.perf_counter() - started
+
+            assert renderer.render(fast) == renderer.render(regular)
+            assert fast_time < regular_time
+            print(
+                f"{serializer_class.__name__}: regular {regular_time * 1000:.0f} ms, "
+                f"compiled {fast_time * 1000:.0f} ms "
+                f"({regular_time / fast_time:.1f}x)"
+            )
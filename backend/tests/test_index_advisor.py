@@ -0,0 +1,109 @@
+"""
+Test suite for the index advisor.
+
+Test cases:
+- Captured queries are grouped by shape
+- Table scans are reported with a composite index suggestion
+- The hot query shapes are served by the composite and partial indexes
+- The advise_indexes command reports scans and migration operations
+"""
+
+import datetime
+from io import StringIO
+from typing import Any, Dict
+
+import pytest
+from django.core.management import call_command
+
+from core import index_advisor
+from core.models import (
+    Course,
+    LearningTask,
+    QuizAttempt,
+    QuizResponse,
+    QuizTask,
+    TaskProgress,
+    User,
+)
+
+
+@pytest.fixture
+def advisor_data(db: Any) -> Dict[str, Any]:
+    user = User.objects.create_user(
+        username="advisor_user", email="advisor_user@test.com", password="x"
+    )
+    course = Course.objects.create(title="Advisor", description="C", creator=user)
+    quiz = QuizTask.objects.create(course=course, title="Quiz")
+    return {"user": user, "course": course, "quiz": quiz}
+
+
+def _unindexed_query() -> None:
+    list(Course.objects.filter(status="published", visibility="public"))
+
+
+@pytest.mark.django_db
+class TestIndexAdvisor:
+    """Test cases for index_advisor and the advise_indexes command."""
+
+    def test_capture_groups_shapes(self, advisor_data: Dict[str, Any]) -> None:
+        with index_advisor.capture() as recorder:
+            TaskProgress.objects.filter(user_id=1).count()
+            TaskProgress.objects.filter(user_id=2).count()
+
+        shapes = recorder.results()
+        assert len(shapes) == 1
+        assert shapes[0].count == 2
+        assert shapes[0].params == (1,)
+
+    def test_scan_suggestion(self, advisor_data: Dict[str, Any]) -> None:
+        with index_advisor.capture() as recorder:
+            _unindexed_query()
+
+        findings = index_advisor.advise(recorder.results())
+
+        assert [finding.table for finding in findings] == ["core_course"]
+        suggestion = findings[0].suggestion
+        assert suggestion.model is Course
+        assert suggestion.fields == ("status", "visibility")
+        assert 'model_name="course"' in suggestion.operation()
+
+    def test_hot_shapes_use_indexes(self, advisor_data: Dict[str, Any]) -> None:
+        user, course, quiz = (
+            advisor_data["user"],
+            advisor_data["course"],
+            advisor_data["quiz"],
+        )
+        with index_advisor.capture() as recorder:
+            TaskProgress.objects.filter(
+                user=user, task__course=course, status="completed"
+            ).count()
+            TaskProgress.objects.filter(task=quiz, status="completed").count()
+            QuizAttempt.objects.filter(
+                user=user, quiz=quiz, completion_status="completed"
+            ).exists()
+            QuizResponse.objects.filter(question_id=1, is_correct=True).count()
+            list(LearningTask.objects.filter(course=course, is_deleted=False))
+
+        findings = index_advisor.advise(recorder.results())
+
+        assert findings == []
+
+    def test_command(self, advisor_data: Dict[str, Any], tmp_path: Any) -> None:
+        with index_advisor.capture() as recorder:
+            _unindexed_query()
+            QuizAttempt.objects.create(
+                user=advisor_data["user"],
+                quiz=advisor_data["quiz"],
+                score=1,
+                time_taken=datetime.timedelta(minutes=1),
+            )
+        path = str(tmp_path / "shapes.json")
+        recorder.dump(path)
+        out = StringIO()
+
+        call_command("advise_indexes", path, stdout=out)
+
+        output = out.getvalue()
+        assert "Missing index: core_course (status, visibility)" in output
+        assert "migrations.AddIndex(" in output
+        assert "core_quizattempt" not in output
@@ -0,0 +1,182 @@
+"""
+Test suite for keyset (cursor) pagination.
+
+Test cases:
+- Walking forward and back visits every row once, ties broken by id
+- Invalid cursors are rejected
+- Keyset paging is opt-in; other requests get the counting paginator
+- Deep pages cost one query without COUNT or OFFSET (benchmark)
+"""
+
+import datetime
+import time
+from typing import Any, Dict, List
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.models import Course, CourseEnrollment, QuizAttempt, QuizTask, User
+from core.pagination import KeysetPagination
+
+ATTEMPTS_URL = "/api/v1/quiz-attempts/"
+
+
+def _attempts(user: User, quiz: QuizTask, count: int) -> List[QuizAttempt]:
+    # Pairs of attempts share a timestamp so the id tie-breaker is exercised
+    start = timezone.now()
+    return QuizAttempt.objects.bulk_create(
+        [
+            QuizAttempt(
+                user=user,
+                quiz=quiz,
+                score=i % 100,
+                time_taken=datetime.timedelta(minutes=1),
+                completion_status="completed",
+                attempt_date=start - datetime.timedelta(seconds=i // 2),
+            )
+            for i in range(count)
+        ]
+    )
+
+
+@pytest.fixture
+def keyset_data(db: Any) -> Dict[str, Any]:
+    admin = User.objects.create_user(
+        username="keyset_admin",
+        email="keyset_admin@test.com",
+        password="testpass123",
+        role="admin",
+    )
+    student = User.objects.create_user(
+        username="keyset_student", email="keyset_student@test.com", password="x"
+    )
+    course = Course.objects.create(title="Keyset", description="C", creator=admin)
+    quiz = QuizTask.objects.create(course=course, title="Quiz")
+    client = APIClient()
+    client.force_authenticate(user=student)
+    admin_client = APIClient()
+    admin_client.force_authenticate(user=admin)
+    return {
+        "admin": admin,
+        "student": student,
+        "course": course,
+        "quiz": quiz,
+        "client": client,
+        "admin_client": admin_client,
+    }
+
+
+def _walk(client: APIClient, url: str, link: str) -> List[Any]:
+    """Follow ``link`` from ``url``; returns the ids per page and the last page."""
+    pages = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        assert "count" not in response.data
+        pages.append([row["id"] for row in response.data["results"]])
+        url = response.data[link]
+    return pages, response.data
+
+
+@pytest.mark.django_db
+class TestKeysetPagination:
+    """Test cases for KeysetPagination."""
+
+    def test_walk_forward_and_back(self, keyset_data: Dict[str, Any]) -> None:
+        _attempts(keyset_data["student"], keyset_data["quiz"], 25)
+        expected = list(
+            QuizAttempt.objects.order_by("-attempt_date", "-id").values_list(
+                "id", flat=True
+            )
+        )
+
+        client = keyset_data["client"]
+        forward, last_page = _walk(
+            client, f"{ATTEMPTS_URL}?pagination=cursor&page_size=10", "next"
+        )
+        assert [len(page) for page in forward] == [10, 10, 5]
+        assert sum(forward, []) == expected
+
+        backward, first_page = _walk(client, last_page["previous"], "previous")
+        assert backward == forward[1::-1]
+        assert first_page["next"] is not None
+
+    def test_enrollments(self, keyset_data: Dict[str, Any]) -> None:
+        admin = keyset_data["admin"]
+        for i in range(3):
+            course = Course.objects.create(
+                title=f"Keyset {i}", description="C", creator=admin
+            )
+            CourseEnrollment.objects.create(
+                user=keyset_data["student"], course=course, status="active"
+            )
+
+        pages, _ = _walk(
+            keyset_data["client"],
+            "/api/v1/enrollments/?pagination=cursor&page_size=2",
+            "next",
+        )
+
+        assert sum(pages, []) == list(
+            CourseEnrollment.objects.order_by("-enrollment_date", "-id").values_list(
+                "id", flat=True
+            )
+        )
+
+    def test_invalid_cursor(self, keyset_data: Dict[str, Any]) -> None:
+        response = keyset_data["client"].get(f"{ATTEMPTS_URL}?cursor=not-a-cursor")
+        assert response.status_code == 404
+
+    @pytest.mark.parametrize("query", ["", "?page=1", "?pagination=cursor&page=1"])
+    def test_page_number_default(self, keyset_data: Dict[str, Any], query: str) -> None:
+        _attempts(keyset_data["student"], keyset_data["quiz"], 12)
+        response = keyset_data["client"].get(f"{ATTEMPTS_URL}{query}")
+        assert response.data["count"] == 12
+        assert response.data["total_pages"] == 2
+        assert len(response.data["results"]) == 10
+
+    @pytest.mark.slow
+    def test_deep_page_benchmark(self, keyset_data: Dict[str, Any]) -> None:
+        """Benchmark: page 1 vs page 10,000 against the page number paginator."""
+        page_size, deep_page = 10, 10_000
+        _attempts(keyset_data["student"], keyset_data["quiz"], page_size * deep_page)
+        client = keyset_data["admin_client"]
+        # Cursor of the last row before the deep page
+        boundary = QuizAttempt.objects.order_by("-attempt_date", "-id").values_list(
+            "attempt_date", "id"
+        )[(deep_page - 1) * page_size - 1]
+        deep_cursor = KeysetPagination().encode_cursor(list(boundary), reverse=False)
+
+        timings = {}
+        for label, query in (
+            ("offset page 1", "page=1"),
+            (f"offset page {deep_page}", f"page={deep_page}"),
+            ("keyset page 1", "pagination=cursor"),
+            (f"keyset page {deep_page}", f"cursor={deep_cursor}"),
+        ):
+            url = f"{ATTEMPTS_URL}?page_size={page_size}&{query}"
+            started = time.perf_counter()
+            with CaptureQueriesContext(connection) as ctx:
+                response = client.get(url)
+            timings[label] = time.perf_counter() - started
+            assert response.status_code == 200
+            assert len(response.data["results"]) == page_size
+            sql = [query["sql"] for query in ctx.captured_queries]
+            # The first query fetches the page; the rest come from the serializer
+            if label.startswith("keyset"):
+                assert "OFFSET" not in sql[0]
+                assert not any("COUNT(" in statement for statement in sql)
+            else:
+                assert any("COUNT(" in statement for statement in sql)
+
+        deep = client.get(f"{ATTEMPTS_URL}?page_size={page_size}&page={deep_page}")
+        keyset_deep = client.get(
+            f"{ATTEMPTS_URL}?page_size={page_size}&cursor={deep_cursor}"
+        )
+        assert deep.data["results"] == keyset_deep.data["results"]
+        print()
+        for label, seconds in timings.items():
+            print(f"{label}: {seconds * 1000:.1f} ms")
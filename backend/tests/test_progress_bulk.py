@@ -0,0 +1,230 @@
+"""
+Test suite for the bulk task progress upsert endpoint.
+
+Test cases:
+- New and existing rows are written in one batch with per-event results
+- Conflicts are resolved by client timestamp; stale events only add time
+- Invalid events are reported without failing the batch
+- Course progress summaries are refreshed once per batch
+- Query count does not grow with the batch size
+- Oversized and malformed batches are rejected
+"""
+
+import datetime
+from typing import Any, Dict, List
+
+import pytest
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.models import (
+    Course,
+    CourseEnrollment,
+    CourseProgressSummary,
+    LearningTask,
+    TaskProgress,
+    User,
+)
+from core.progress_batch import MAX_BATCH_SIZE
+
+URL = "/api/v1/task-progress/bulk/"
+
+
+@pytest.fixture
+def bulk_data(db: Any) -> Dict[str, Any]:
+    instructor = User.objects.create_user(
+        username="bulk_instructor",
+        email="bulk_instructor@test.com",
+        password="testpass123",
+        role="instructor",
+    )
+    student = User.objects.create_user(
+        username="bulk_student", email="bulk_student@test.com", password="x"
+    )
+    course = Course.objects.create(title="Bulk", description="C", creator=instructor)
+    tasks = [
+        LearningTask.objects.create(
+            course=course, title=f"Task {i}", order=i, is_published=True
+        )
+        for i in range(20)
+    ]
+    CourseEnrollment.objects.create(user=student, course=course, status="active")
+    client = APIClient()
+    client.force_authenticate(user=student)
+    return {"student": student, "course": course, "tasks": tasks, "client": client}
+
+
+def _event(task: LearningTask, status: str, minutes: int, **extra: Any) -> dict:
+    timestamp = timezone.now() - datetime.timedelta(minutes=minutes)
+    return {
+        "task_id": task.id,
+        "status": status,
+        "client_timestamp": timestamp.isoformat(),
+        **extra,
+    }
+
+
+def _post(data: Dict[str, Any], events: List[dict]) -> Any:
+    return data["client"].post(URL, {"events": events}, format="json")
+
+
+@pytest.mark.django_db
+class TestProgressBulk:
+    """Test cases for progress_batch.apply_progress_events and the endpoint."""
+
+    def test_upsert(self, bulk_data: Dict[str, Any]) -> None:
+        student, tasks = bulk_data["student"], bulk_data["tasks"]
+        existing = TaskProgress.objects.create(
+            user=student, task=tasks[0], status="in_progress"
+        )
+        TaskProgress.objects.filter(pk=existing.pk).update(
+            updated_at=timezone.now() - datetime.timedelta(hours=1)
+        )
+
+        response = _post(
+            bulk_data,
+            [
+                _event(tasks[0], "completed", 1, time_spent_delta=60),
+                _event(tasks[1], "in_progress", 5, time_spent_delta="00:02:00"),
+                _event(tasks[1], "completed", 2),
+            ],
+        )
+
+        assert response.status_code == 200
+        assert (response.data["applied"], response.data["stale"]) == (3, 0)
+        results = response.data["results"]
+        assert [r["index"] for r in results] == [0, 1, 2]
+        assert results[0]["progress_id"] == existing.id
+        assert [r["status"] for r in results] == ["completed"] * 3
+        existing.refresh_from_db()
+        assert existing.status == "completed"
+        assert existing.time_spent == datetime.timedelta(minutes=1)
+        assert existing.completion_date is not None
+        created = TaskProgress.objects.get(user=student, task=tasks[1])
+        assert created.time_spent == datetime.timedelta(minutes=2)
+        assert created.start_date < created.completion_date
+
+    def test_conflicts_by_timestamp(self, bulk_data: Dict[str, Any]) -> None:
+        tasks = bulk_data["tasks"]
+        _post(bulk_data, [_event(tasks[0], "completed", 10)])
+
+        # An offline client replays an older change; only its time counts
+        response = _post(
+            bulk_data, [_event(tasks[0], "in_progress", 20, time_spent_delta=30)]
+        )
+
+        assert response.data["results"][0]["result"] == "stale"
+        assert response.data["results"][0]["status"] == "completed"
+        progress = TaskProgress.objects.get(task=tasks[0])
+        assert progress.status == "completed"
+        assert progress.time_spent == datetime.timedelta(seconds=30)
+
+        # Events within a batch apply in client time order
+        response = _post(
+            bulk_data,
+            [
+                _event(tasks[1], "completed", 1),
+                _event(tasks[1], "in_progress", 3),
+            ],
+        )
+        assert [r["result"] for r in response.data["results"]] == ["applied"] * 2
+        assert TaskProgress.objects.get(task=tasks[1]).status == "completed"
+
+    def test_single_row_write_wins(self, bulk_data: Dict[str, Any]) -> None:
+        tasks, client = bulk_data["tasks"], bulk_data["client"]
+        _post(bulk_data, [_event(tasks[0], "in_progress", 10)])
+        progress = TaskProgress.objects.get(task=tasks[0])
+
+        client.patch(
+            f"/api/v1/task-progress/{progress.id}/update_status/",
+            {"status": "completed"},
+            format="json",
+        )
+        response = _post(bulk_data, [_event(tasks[0], "in_progress", 5)])
+
+        assert response.data["results"][0]["result"] == "stale"
+
+    def test_invalid_events(self, bulk_data: Dict[str, Any]) -> None:
+        tasks = bulk_data["tasks"]
+        tasks[2].is_deleted = True
+        tasks[2].save()
+
+        response = _post(
+            bulk_data,
+            [
+                _event(tasks[0], "done", 1),
+                _event(tasks[1], "completed", 1, time_spent_delta=-5),
+                _event(tasks[2], "completed", 1),
+                {"task_id": 999999, "status": "completed"},
+                "not an event",
+                _event(tasks[3], "completed", 1),
+            ],
+        )
+
+        assert response.status_code == 200
+        results = response.data["results"]
+        assert [r["result"] for r in results] == ["error"] * 5 + ["applied"]
+        assert "status" in results[0]["errors"]
+        assert "time_spent_delta" in results[1]["errors"]
+        assert results[2]["errors"] == {"task_id": ["Task not found."]}
+        assert "client_timestamp" in results[3]["errors"]
+        assert response.data["failed"] == 5
+        assert list(TaskProgress.objects.values_list("task_id", flat=True)) == [
+            tasks[3].id
+        ]
+
+    def test_future_timestamps_capped(self, bulk_data: Dict[str, Any]) -> None:
+        tasks = bulk_data["tasks"]
+        _post(bulk_data, [_event(tasks[0], "completed", -60 * 24)])
+
+        response = _post(bulk_data, [_event(tasks[0], "in_progress", 0)])
+
+        assert response.data["results"][0]["result"] == "applied"
+        progress = TaskProgress.objects.get(task=tasks[0])
+        assert progress.client_updated_at <= timezone.now()
+
+    def test_summary_refreshed(self, bulk_data: Dict[str, Any]) -> None:
+        tasks = bulk_data["tasks"]
+
+        _post(bulk_data, [_event(task, "completed", 1) for task in tasks[:5]])
+
+        summary = CourseProgressSummary.objects.get(
+            user=bulk_data["student"], course=bulk_data["course"]
+        )
+        assert summary.completed_tasks == 5
+        assert summary.completion_percentage == 25
+
+    def test_constant_queries(self, bulk_data: Dict[str, Any]) -> None:
+        tasks = bulk_data["tasks"]
+        TaskProgress.objects.create(
+            user=bulk_data["student"], task=tasks[0], status="in_progress"
+        )
+
+        def count(events: List[dict]) -> int:
+            with CaptureQueriesContext(connection) as ctx:
+                assert _post(bulk_data, events).status_code == 200
+            return len(ctx.captured_queries)
+
+        small = count(
+            [_event(tasks[0], "completed", 2), _event(tasks[1], "completed", 2)]
+        )
+        large = count([_event(task, "completed", 1) for task in tasks])
+
+        assert large == small
+
+    def test_rejected_batches(self, bulk_data: Dict[str, Any]) -> None:
+        event = _event(bulk_data["tasks"][0], "completed", 1)
+
+        assert _post(bulk_data, [event] * (MAX_BATCH_SIZE + 1)).status_code == 400
+        response = bulk_data["client"].post(URL, {"events": "x"}, format="json")
+        assert response.status_code == 400
+        assert not TaskProgress.objects.exists()
+
+    def test_unique_user_task(self, bulk_data: Dict[str, Any]) -> None:
+        student, task = bulk_data["student"], bulk_data["tasks"][0]
+        TaskProgress.objects.create(user=student, task=task, status="completed")
+
+        with pytest.raises(IntegrityError):
+            TaskProgress.objects.create(user=student, task=task, status="completed")
@@ -0,0 +1,174 @@
+"""
+Test suite for the course student progress matrix.
+
+Test cases:
+- Per-student payload for instructors and students
+- Matrix mode pagination and completion ordering
+- Streamed matrix response
+- Constant query count regardless of course size
+"""
+
+import json
+from typing import Any, Dict
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core.models import Course, LearningTask, QuizTask, TaskProgress, User
+
+
+@pytest.fixture
+def matrix_data(db: Any) -> Dict[str, Any]:
+    instructor = User.objects.create_user(
+        username="matrix_instructor",
+        email="matrix_instructor@test.com",
+        password="testpass123",
+        role="instructor",
+    )
+    course = Course.objects.create(
+        title="Matrix", description="Course", creator=instructor
+    )
+    tasks = [
+        LearningTask.objects.create(
+            course=course, title=f"Task {i}", order=i, is_published=True
+        )
+        for i in range(3)
+    ]
+    tasks.append(
+        QuizTask.objects.create(course=course, title="Quiz", order=3, is_published=True)
+    )
+    LearningTask.objects.create(course=course, title="Draft", order=4)
+    client = APIClient()
+    client.force_authenticate(user=instructor)
+    return {"course": course, "tasks": tasks, "client": client}
+
+
+@pytest.mark.django_db
+class TestCourseStudentProgressAPI:
+    """Test cases for the Course Student Progress API."""
+
+    def _url(self, course: Course) -> str:
+        return reverse("course_student_progress", kwargs={"pk": course.id})
+
+    def test_instructor_payload(
+        self, matrix_data: Dict[str, Any], add_students: Any
+    ) -> None:
+        course, tasks = matrix_data["course"], matrix_data["tasks"]
+        add_students(course, tasks, 3, "payload")
+        TaskProgress.objects.filter(user__username="payload1").update(
+            status="in_progress"
+        )
+
+        response = matrix_data["client"].get(self._url(course))
+
+        assert response.status_code == 200
+        assert [row["student_info"]["username"] for row in response.data] == [
+            "payload2",
+            "payload1",
+            "payload0",
+        ]
+        top = response.data[0]
+        assert top["progress_summary"] == {
+            "completion_percentage": 50.0,
+            "completed_tasks": 2,
+            "total_tasks": 4,
+        }
+        assert [task["status"] for task in top["task_completion"]] == [
+            "completed",
+            "completed",
+            "not_started",
+            "not_started",
+        ]
+        assert top["task_completion"][3]["task_type"] == "quiz"
+        assert response.data[1]["task_completion"][0]["status"] == "in_progress"
+
+    def test_student_sees_own_progress(
+        self, matrix_data: Dict[str, Any], add_students: Any
+    ) -> None:
+        course, tasks = matrix_data["course"], matrix_data["tasks"]
+        student = add_students(course, tasks, 2, "own")[1]
+        client = APIClient()
+        client.force_authenticate(user=User.objects.get(pk=student.pk))
+
+        response = client.get(self._url(course))
+
+        assert response.status_code == 200
+        assert response.data["student_info"]["id"] == student.id
+        assert response.data["progress_summary"]["completed_tasks"] == 1
+
+    def test_matrix_pagination_and_ordering(
+        self, matrix_data: Dict[str, Any], add_students: Any
+    ) -> None:
+        course, tasks = matrix_data["course"], matrix_data["tasks"]
+        add_students(course, tasks, 5, "page")
+
+        response = matrix_data["client"].get(
+            self._url(course),
+            {"view": "matrix", "ordering": "completion", "page_size": 2, "page": 2},
+        )
+
+        assert response.status_code == 200
+        data = response.data
+        assert data["count"] == 5
+        assert data["total_pages"] == 3
+        assert [task["title"] for task in data["tasks"]] == [
+            "Task 0",
+            "Task 1",
+            "Task 2",
+            "Quiz",
+        ]
+        assert data["status_codes"] == ["not_started", "in_progress", "completed"]
+        assert [row["completed_tasks"] for row in data["results"]] == [2, 3]
+        assert data["results"][0]["statuses"] == [2, 2, 0, 0]
+
+        invalid = matrix_data["client"].get(self._url(course), {"ordering": "name"})
+        assert invalid.status_code == 400
+
+    def test_streamed_matrix(
+        self, matrix_data: Dict[str, Any], add_students: Any
+    ) -> None:
+        course, tasks = matrix_data["course"], matrix_data["tasks"]
+        add_students(course, tasks, 5, "stream")
+
+        response = matrix_data["client"].get(
+            self._url(course), {"view": "matrix", "stream": "true"}
+        )
+
+        assert response.status_code == 200
+        assert response.streaming
+        data = json.loads(b"".join(response.streaming_content))
+        assert data["count"] == 5
+        assert len(data["tasks"]) == 4
+        assert [row["completed_tasks"] for row in data["results"]] == [4, 3, 2, 1, 0]
+
+    @pytest.mark.slow
+    def test_constant_query_count(
+        self, matrix_data: Dict[str, Any], add_students: Any
+    ) -> None:
+        """Benchmark: query count does not grow with students or tasks."""
+        counts = {}
+        for students, task_count in ((5, 4), (500, 40)):
+            course = Course.objects.create(
+                title=f"Size {students}",
+                description="Course",
+                creator=matrix_data["course"].creator,
+            )
+            tasks = LearningTask.objects.bulk_create(
+                [
+                    LearningTask(
+                        course=course, title=f"T{i}", order=i, is_published=True
+                    )
+                    for i in range(task_count)
+                ]
+            )
+            add_students(course, tasks, students, f"q{students}_")
+            with CaptureQueriesContext(connection) as ctx:
+                response = matrix_data["client"].get(self._url(course))
+            assert response.status_code == 200
+            assert len(response.data) == students
+            counts[students] = len(ctx.captured_queries)
+
+        assert counts[5] == counts[500]
@@ -0,0 +1,194 @@
+"""
+Test suite for the materialized course progress summaries.
+
+Test cases:
+- Incremental updates from task progress changes
+- Incremental updates from task publish / soft-delete / removal
+- Constant query count for enrollment lists
+- Rebuild command drift detection and correction
+"""
+
+from io import StringIO
+from typing import Any, Dict
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from core.models import (
+    Course,
+    CourseEnrollment,
+    CourseProgressSummary,
+    LearningTask,
+    TaskProgress,
+    User,
+)
+
+
+@pytest.fixture
+def course_data(db: Any) -> Dict[str, Any]:
+    instructor = User.objects.create_user(
+        username="summary_instructor",
+        email="summary_instructor@test.com",
+        password="testpass123",
+        role="instructor",
+    )
+    student = User.objects.create_user(
+        username="summary_student",
+        email="summary_student@test.com",
+        password="testpass123",
+    )
+    course = Course.objects.create(
+        title="Summaries", description="Course", creator=instructor
+    )
+    tasks = [
+        LearningTask.objects.create(
+            course=course, title=f"Task {i}", order=i, is_published=True
+        )
+        for i in range(4)
+    ]
+    enrollment = CourseEnrollment.objects.create(
+        user=student, course=course, status="active"
+    )
+    return {
+        "student": student,
+        "course": course,
+        "tasks": tasks,
+        "enrollment": enrollment,
+    }
+
+
+def _summary(data: Dict[str, Any]) -> CourseProgressSummary:
+    return CourseProgressSummary.objects.get(
+        user=data["student"], course=data["course"]
+    )
+
+
+@pytest.mark.django_db
+class TestProgressSummary:
+    """Test cases for incremental progress summary maintenance."""
+
+    def test_summary_created_on_enrollment(self, course_data: Dict[str, Any]) -> None:
+        summary = _summary(course_data)
+        assert summary.total_tasks == 4
+        assert summary.completed_tasks == 0
+        assert summary.completion_percentage == 0
+
+    def test_progress_status_changes(self, course_data: Dict[str, Any]) -> None:
+        student, tasks = course_data["student"], course_data["tasks"]
+        progress = TaskProgress.objects.create(
+            user=student, task=tasks[0], status="in_progress"
+        )
+        assert _summary(course_data).in_progress_tasks == 1
+
+        progress.status = "completed"
+        progress.save()
+        summary = _summary(course_data)
+        assert summary.in_progress_tasks == 0
+        assert summary.completed_tasks == 1
+        assert summary.completion_percentage == 25
+        assert summary.last_activity is not None
+
+        reloaded = TaskProgress.objects.get(pk=progress.pk)
+        reloaded.status = "in_progress"
+        reloaded.save()
+        summary = _summary(course_data)
+        assert (summary.completed_tasks, summary.in_progress_tasks) == (0, 1)
+
+        reloaded.delete()
+        assert _summary(course_data).in_progress_tasks == 0
+
+    def test_task_changes(self, course_data: Dict[str, Any]) -> None:
+        student, course, tasks = (
+            course_data["student"],
+            course_data["course"],
+            course_data["tasks"],
+        )
+        TaskProgress.objects.create(user=student, task=tasks[0], status="completed")
+
+        draft = LearningTask.objects.create(course=course, title="Draft")
+        assert _summary(course_data).total_tasks == 4
+
+        draft.is_published = True
+        draft.save()
+        assert _summary(course_data).total_tasks == 5
+
+        task = LearningTask.objects.get(pk=tasks[0].pk)
+        task.is_deleted = True
+        task.save()
+        summary = _summary(course_data)
+        assert (summary.total_tasks, summary.completed_tasks) == (4, 0)
+
+        draft.delete()
+        summary = _summary(course_data)
+        assert summary.total_tasks == 3
+        assert summary.completion_percentage == 0
+
+    def test_enrollment_stats_read_from_summary(
+        self, course_data: Dict[str, Any]
+    ) -> None:
+        student, tasks = course_data["student"], course_data["tasks"]
+        TaskProgress.objects.create(user=student, task=tasks[0], status="completed")
+        TaskProgress.objects.create(user=student, task=tasks[1], status="in_progress")
+        enrollment = CourseEnrollment.objects.get(pk=course_data["enrollment"].pk)
+
+        stats = enrollment.get_progress_stats()
+        assert stats == {
+            "total_tasks": 4,
+            "completed": 1,
+            "in_progress": 1,
+            "not_started": 2,
+            "completion_percentage": 25.0,
+        }
+        assert not enrollment.is_course_completed()
+
+    def test_enrollment_list_query_count(self, course_data: Dict[str, Any]) -> None:
+        admin = User.objects.create_superuser(
+            username="summary_admin", email="summary_admin@test.com", password="x"
+        )
+        client = APIClient()
+        client.force_authenticate(user=admin)
+
+        def count_list_queries() -> int:
+            with CaptureQueriesContext(connection) as ctx:
+                response = client.get("/api/v1/enrollments/?page_size=100")
+            assert response.status_code == 200
+            return sum(
+                "core_courseprogresssummary" in q["sql"] for q in ctx.captured_queries
+            )
+
+        few = count_list_queries()
+        for i in range(10):
+            learner = User.objects.create_user(
+                username=f"summary_learner{i}",
+                email=f"summary_learner{i}@test.com",
+                password="x",
+            )
+            CourseEnrollment.objects.create(
+                user=learner, course=course_data["course"], status="active"
+            )
+        assert count_list_queries() == few
+
+    def test_rebuild_command_reports_and_fixes_drift(
+        self, course_data: Dict[str, Any]
+    ) -> None:
+        TaskProgress.objects.create(
+            user=course_data["student"],
+            task=course_data["tasks"][0],
+            status="completed",
+        )
+        CourseProgressSummary.objects.update(completed_tasks=3)
+
+        out = StringIO()
+        call_command("rebuild_progress_summaries", "--dry-run", stdout=out)
+        assert "1 drifted" in out.getvalue()
+        assert _summary(course_data).completed_tasks == 3
+
+        out = StringIO()
+        call_command("rebuild_progress_summaries", "--chunk-size", "1", stdout=out)
+        assert "1 drifted" in out.getvalue()
+        summary = _summary(course_data)
+        assert summary.completed_tasks == 1
+        assert summary.completion_percentage == 25
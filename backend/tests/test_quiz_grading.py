@@ -0,0 +1,154 @@
+"""
+Test suite for the bulk quiz grading engine.
+
+Test cases:
+- Points-weighted scoring
+- Rejection of questions and options from other quizzes
+- Rejection of repeated submissions
+- Constant query count for submit_responses regardless of quiz size
+"""
+
+import datetime
+from typing import Any, Dict
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from core.models import (
+    Course,
+    QuizAttempt,
+    QuizOption,
+    QuizQuestion,
+    QuizResponse,
+    QuizTask,
+    User,
+)
+
+
+def _create_quiz(course: Course, questions: int, title: str = "Quiz") -> QuizTask:
+    quiz = QuizTask.objects.create(course=course, title=title, is_published=True)
+    for order in range(questions):
+        question = QuizQuestion.objects.create(
+            quiz=quiz, text=f"Question {order}", points=order % 3 + 1, order=order
+        )
+        QuizOption.objects.bulk_create(
+            [
+                QuizOption(question=question, text="Right", is_correct=True, order=0),
+                QuizOption(question=question, text="Wrong", is_correct=False, order=1),
+            ]
+        )
+    return quiz
+
+
+def _start_attempt(user: User, quiz: QuizTask) -> QuizAttempt:
+    return QuizAttempt.objects.create(
+        user=user, quiz=quiz, score=0, time_taken=datetime.timedelta(0)
+    )
+
+
+def _answers(quiz: QuizTask, correct: bool = True) -> list:
+    return [
+        {
+            "question": question.id,
+            "selected_option": question.options.get(is_correct=correct).id,
+            "time_spent": 30,
+        }
+        for question in quiz.questions.all()
+    ]
+
+
+@pytest.fixture
+def grading_data(db: Any) -> Dict[str, Any]:
+    student = User.objects.create_user(
+        username="grading_student", email="grading@test.com", password="testpass123"
+    )
+    course = Course.objects.create(
+        title="Grading", description="Course", creator=student
+    )
+    client = APIClient()
+    client.force_authenticate(user=student)
+    return {"student": student, "course": course, "client": client}
+
+
+def _submit(client: APIClient, attempt: QuizAttempt, responses: list):
+    return client.post(
+        f"/api/v1/quiz-attempts/{attempt.id}/submit_responses/",
+        {"responses": responses},
+        format="json",
+    )
+
+
+@pytest.mark.django_db
+class TestQuizGrading:
+    """Test cases for submit_responses grading."""
+
+    def test_points_weighted_score(self, grading_data: Dict[str, Any]) -> None:
+        quiz = _create_quiz(grading_data["course"], 3)  # worth 1, 2 and 3 points
+        attempt = _start_attempt(grading_data["student"], quiz)
+        responses = _answers(quiz)
+        # Answer the 3-point question wrong: 3 of 6 points earned
+        last = quiz.questions.get(order=2)
+        responses[2]["selected_option"] = last.options.get(is_correct=False).id
+
+        response = _submit(grading_data["client"], attempt, responses)
+
+        assert response.status_code == 200
+        assert response.data["score"] == 50
+        assert response.data["completion_status"] == "completed"
+        assert len(response.data["responses"]) == 3
+        assert (
+            QuizResponse.objects.filter(attempt=attempt, is_correct=True).count() == 2
+        )
+
+    def test_rejects_foreign_question_and_option(
+        self, grading_data: Dict[str, Any]
+    ) -> None:
+        quiz = _create_quiz(grading_data["course"], 2)
+        other = _create_quiz(grading_data["course"], 1, title="Other")
+        attempt = _start_attempt(grading_data["student"], quiz)
+        responses = _answers(quiz)
+        responses[1]["selected_option"] = other.questions.get().options.first().id
+
+        response = _submit(grading_data["client"], attempt, responses)
+
+        assert response.status_code == 400
+        assert not QuizResponse.objects.filter(attempt=attempt).exists()
+        attempt.refresh_from_db()
+        assert attempt.completion_status == "in_progress"
+
+        responses = _answers(quiz) + _answers(other)
+        assert _submit(grading_data["client"], attempt, responses).status_code == 400
+
+    def test_rejects_duplicate_and_repeat_submissions(
+        self, grading_data: Dict[str, Any]
+    ) -> None:
+        quiz = _create_quiz(grading_data["course"], 2)
+        attempt = _start_attempt(grading_data["student"], quiz)
+        duplicated = _answers(quiz) + _answers(quiz)[:1]
+        assert _submit(grading_data["client"], attempt, duplicated).status_code == 400
+
+        assert (
+            _submit(grading_data["client"], attempt, _answers(quiz)).status_code == 200
+        )
+        assert (
+            _submit(grading_data["client"], attempt, _answers(quiz)).status_code == 400
+        )
+        assert QuizResponse.objects.filter(attempt=attempt).count() == 2
+
+    @pytest.mark.slow
+    def test_constant_query_count(self, grading_data: Dict[str, Any]) -> None:
+        """Benchmark: query count does not grow with the number of questions."""
+        counts = {}
+        for size in (5, 50):
+            quiz = _create_quiz(grading_data["course"], size, title=f"Quiz {size}")
+            attempt = _start_attempt(grading_data["student"], quiz)
+            responses = _answers(quiz)
+            with CaptureQueriesContext(connection) as ctx:
+                response = _submit(grading_data["client"], attempt, responses)
+            assert response.status_code == 200
+            assert response.data["score"] == 100
+            counts[size] = len(ctx.captured_queries)
+
+        assert counts[5] == counts[50]
@@ -0,0 +1,167 @@
+"""
+Test suite for the Student Quiz Performance API endpoint.
+
+Test cases:
+- Pass/fail counts use each quiz's own pass threshold
+- Per-course breakdown and recent attempt response counts
+- Paginated attempt history
+- Constant query count regardless of attempt history size
+"""
+
+import datetime
+from typing import Any, Dict
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core.models import (
+    Course,
+    QuizAttempt,
+    QuizOption,
+    QuizQuestion,
+    QuizResponse,
+    QuizTask,
+    User,
+)
+
+
+def _attempts(user: User, quiz: QuizTask, scores: list, correct: int = 0) -> None:
+    """Create completed attempts, each answering one question ``correct`` times."""
+    question = QuizQuestion.objects.filter(quiz=quiz).first()
+    option = question.options.first()
+    attempts = QuizAttempt.objects.bulk_create(
+        [
+            QuizAttempt(
+                user=user,
+                quiz=quiz,
+                score=score,
+                time_taken=datetime.timedelta(minutes=1),
+                completion_status="completed",
+            )
+            for score in scores
+        ]
+    )
+    QuizResponse.objects.bulk_create(
+        [
+            QuizResponse(
+                attempt=attempt,
+                question=question,
+                selected_option=option,
+                is_correct=i < correct,
+                time_spent=datetime.timedelta(seconds=5),
+            )
+            for attempt in attempts
+            for i in range(2)
+        ]
+    )
+
+
+def _quiz(course: Course, title: str, pass_threshold: int) -> QuizTask:
+    quiz = QuizTask.objects.create(
+        course=course, title=title, pass_threshold=pass_threshold
+    )
+    question = QuizQuestion.objects.create(quiz=quiz, text="Question")
+    QuizOption.objects.create(question=question, text="A", is_correct=True)
+    return quiz
+
+
+@pytest.fixture
+def performance_data(db: Any) -> Dict[str, Any]:
+    cache.clear()
+    student = User.objects.create_user(
+        username="performance_student",
+        email="performance_student@test.com",
+        password="testpass123",
+    )
+    courses = [
+        Course.objects.create(title=f"Course {i}", description="C", creator=student)
+        for i in range(2)
+    ]
+    client = APIClient()
+    client.force_authenticate(user=student)
+    return {"student": student, "courses": courses, "client": client}
+
+
+def _url(user: User) -> str:
+    return reverse("student_quiz_performance", kwargs={"pk": user.id})
+
+
+@pytest.mark.django_db
+class TestStudentQuizPerformanceAPI:
+    """Test cases for the Student Quiz Performance API."""
+
+    def test_performance_payload(self, performance_data: Dict[str, Any]) -> None:
+        student, courses = performance_data["student"], performance_data["courses"]
+        strict = _quiz(courses[0], "Strict", pass_threshold=90)
+        lenient = _quiz(courses[1], "Lenient", pass_threshold=50)
+        _attempts(student, strict, [80, 95], correct=1)
+        _attempts(student, lenient, [55, 40], correct=2)
+
+        response = performance_data["client"].get(_url(student))
+
+        assert response.status_code == 200
+        data = response.data
+        assert data["overall_stats"] == {
+            "total_attempts": 4,
+            "average_score": 67.5,
+            "quizzes_passed": 2,
+            "quizzes_failed": 2,
+            "pass_rate": 50.0,
+        }
+        assert [
+            (row["course_title"], row["highest_score"], row["lowest_score"])
+            for row in data["course_breakdown"]
+        ] == [("Course 0", 95, 80), ("Course 1", 55, 40)]
+        assert len(data["recent_attempts"]) == 4
+        assert {
+            (row["quiz_title"], row["correct_answers"], row["total_questions"])
+            for row in data["recent_attempts"]
+        } == {("Strict", 1, 2), ("Lenient", 2, 2)}
+        assert data["performance_by_category"] == []
+
+    def test_no_attempts(self, performance_data: Dict[str, Any]) -> None:
+        response = performance_data["client"].get(_url(performance_data["student"]))
+
+        assert response.status_code == 200
+        assert response.data["overall_stats"]["total_attempts"] == 0
+        assert response.data["recent_attempts"] == []
+
+    def test_attempt_history_is_paginated(
+        self, performance_data: Dict[str, Any]
+    ) -> None:
+        student = performance_data["student"]
+        quiz = _quiz(performance_data["courses"][0], "History", pass_threshold=70)
+        _attempts(student, quiz, list(range(12)), correct=1)
+
+        response = performance_data["client"].get(
+            _url(student), {"view": "attempts", "page_size": 5, "page": 3}
+        )
+
+        assert response.status_code == 200
+        assert response.data["count"] == 12
+        assert len(response.data["results"]) == 2
+        assert response.data["results"][0]["correct_answers"] == 1
+
+    @pytest.mark.slow
+    def test_constant_query_count(self, performance_data: Dict[str, Any]) -> None:
+        """Benchmark: query count does not grow with the attempt history."""
+        quiz = _quiz(performance_data["courses"][0], "Bench", pass_threshold=70)
+        counts = {}
+        for size in (5, 2000):
+            user = User.objects.create_user(
+                username=f"bench{size}", email=f"bench{size}@test.com", password="x"
+            )
+            _attempts(user, quiz, [i % 100 for i in range(size)], correct=1)
+            client = APIClient()
+            client.force_authenticate(user=user)
+            with CaptureQueriesContext(connection) as ctx:
+                response = client.get(_url(user))
+            assert response.status_code == 200
+            assert response.data["overall_stats"]["total_attempts"] == size
+            counts[size] = len(ctx.captured_queries)
+
+        assert counts[5] == counts[2000]
@@ -0,0 +1,108 @@
+"""
+Test suite for the stored rendered-HTML descriptions.
+
+Test cases:
+- HTML is rendered on save and only when the markdown changed
+- List endpoints serve stored HTML without rendering
+- Stale HTML after an allow-list change and the rerender_markdown command
+"""
+
+from io import StringIO
+from typing import Any, Dict
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from rest_framework.test import APIClient
+
+from core.models import Course, LearningTask, User
+from utils import markdown_utils
+
+
+@pytest.fixture
+def markdown_data(db: Any) -> Dict[str, Any]:
+    instructor = User.objects.create_user(
+        username="markdown_instructor",
+        email="markdown_instructor@test.com",
+        password="testpass123",
+        role="instructor",
+    )
+    course = Course.objects.create(
+        title="Markdown",
+        description="**Bold** intro",
+        creator=instructor,
+        status="published",
+    )
+    task = LearningTask.objects.create(
+        course=course, title="Task", description="", is_published=True
+    )
+    return {"instructor": instructor, "course": course, "task": task}
+
+
+def _render_spy():
+    return mock.patch(
+        "core.models.convert_markdown_to_html",
+        wraps=markdown_utils.convert_markdown_to_html,
+    )
+
+
+@pytest.mark.django_db
+class TestRenderedDescriptions:
+    """Test cases for persisted description HTML."""
+
+    def test_rendered_on_save_when_changed(self, markdown_data: Dict[str, Any]) -> None:
+        course = Course.objects.get(pk=markdown_data["course"].pk)
+        assert course.description_html_cache == "<p><strong>Bold</strong> intro</p>"
+        assert markdown_data["task"].description_html == ""
+
+        with _render_spy() as render:
+            course.title = "Renamed"
+            course.save()
+            assert render.call_count == 0
+
+            course.description = "*New*"
+            course.save(update_fields=["description"])
+            assert render.call_count == 1
+
+        course.refresh_from_db()
+        assert course.description_html == "<p><em>New</em></p>"
+
+    def test_list_serves_stored_html(self, markdown_data: Dict[str, Any]) -> None:
+        client = APIClient()
+        client.force_authenticate(user=markdown_data["instructor"])
+
+        with _render_spy() as render:
+            response = client.get("/api/v1/courses/")
+
+        assert response.status_code == 200
+        [row] = response.data["results"]
+        assert row["description_html"] == "<p><strong>Bold</strong> intro</p>"
+        assert render.call_count == 0
+
+    def test_stale_after_allow_list_change(self, markdown_data: Dict[str, Any]) -> None:
+        course = markdown_data["course"]
+        Course.objects.filter(pk=course.pk).update(description="<b>raw</b> text")
+        course.refresh_from_db()
+        # Written behind save(): rendered on read until re-rendered
+        assert course.description_html == "<p><b>raw</b> text</p>"
+
+        call_command("rerender_markdown", stdout=StringIO())
+        course.refresh_from_db()
+        stored_hash = course.description_hash
+
+        with mock.patch.object(
+            markdown_utils,
+            "EXTENDED_ALLOWED_TAGS",
+            markdown_utils.EXTENDED_ALLOWED_TAGS - {"b"},
+        ):
+            assert course.description_html == "<p>raw text</p>"
+            out = StringIO()
+            call_command("rerender_markdown", stdout=out)
+            assert "Courses: re-rendered 1 of 1" in out.getvalue()
+            course.refresh_from_db()
+            assert course.description_hash != stored_hash
+            assert course.description_html_cache == "<p>raw text</p>"
+
+        out = StringIO()
+        call_command("rerender_markdown", "--force", stdout=out)
+        assert "Learning tasks: re-rendered 1 of 1" in out.getvalue()
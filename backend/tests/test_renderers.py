@@ -0,0 +1,284 @@
+"""
+Test suite for the orjson and MessagePack renderers and parsers.
+
+Test cases:
+- orjson output is byte-identical to DRF's JSONRenderer except for floats
+- Float notation differs from DRF as documented; NaN and infinity raise
+- Indented output and values orjson rejects fall back to DRF's renderer
+- orjson parsing and parse errors
+- The configured renderers and parsers
+- MessagePack responses via Accept decode to the same data as JSON
+- MessagePack request bodies
+- Benchmark: DRF JSON vs orjson vs MessagePack on analytics payloads
+"""
+
+import datetime
+import decimal
+import io
+import json
+import time
+import uuid
+from typing import Any, Dict
+
+import msgpack
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.test import APIClient
+
+from core.models import Course, LearningTask, QuizAttempt, QuizTask, User
+from core.renderers import (
+    MessagePackParser,
+    MessagePackRenderer,
+    ORJSONParser,
+    ORJSONRenderer,
+)
+
+MSGPACK = "application/msgpack"
+
+# Per student index, with microseconds to exercise duration output
+TIME_SPENT = datetime.timedelta(minutes=1, microseconds=1)
+
+PAYLOAD = {
+    "int_keys": {1: "one", 2: [None, True, 1.5]},
+    "utc": datetime.datetime(2026, 3, 1, 12, 30, tzinfo=datetime.timezone.utc),
+    "micro": datetime.datetime(
+        2026,
+        3,
+        1,
+        12,
+        30,
+        0,
+        1234,
+        tzinfo=datetime.timezone(datetime.timedelta(hours=2)),
+    ),
+    "naive": datetime.datetime(2026, 3, 1, 12, 30),
+    "date": datetime.date(2026, 3, 1),
+    "time": datetime.time(8, 15, 30),
+    "time_spent": datetime.timedelta(minutes=3, microseconds=5),
+    "time_taken": datetime.timedelta(days=1, seconds=7),
+    "score": decimal.Decimal("87.50"),
+    "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "label": gettext_lazy("Course"),
+    "text": "ünïcode \u2028 and \u2029 separators",
+    "tags": ("a", "b"),
+}
+
+
+@pytest.fixture
+def renderer_data(db: Any, add_students: Any) -> Dict[str, Any]:
+    cache.clear()
+    admin = User.objects.create_user(
+        username="renderer_admin",
+        email="renderer_admin@test.com",
+        password="testpass123",
+        role="admin",
+        is_staff=True,
+    )
+    course = Course.objects.create(title="Renderers", description="C", creator=admin)
+    tasks = [
+        LearningTask.objects.create(
+            course=course, title=f"Task {i}", order=i, is_published=True
+        )
+        for i in range(3)
+    ]
+    quiz = QuizTask.objects.create(
+        course=course, title="Quiz", order=3, is_published=True
+    )
+    students = add_students(
+        course, tasks, 4, "renderer_student_", time_spent=TIME_SPENT
+    )
+    QuizAttempt.objects.create(
+        user=students[0],
+        quiz=quiz,
+        score=75,
+        time_taken=datetime.timedelta(minutes=2, seconds=5),
+        completion_status="completed",
+    )
+    client = APIClient()
+    client.force_authenticate(user=admin)
+    return {
+        "course": course,
+        "tasks": tasks + [quiz],
+        "students": students,
+        "client": client,
+    }
+
+
+def _analytics_urls(data: Dict[str, Any]) -> list:
+    course, student = data["course"], data["students"][0]
+    return [
+        reverse("course_analytics", args=[course.pk]),
+        reverse("course_student_progress", args=[course.pk]),
+        reverse("course_task_analytics", args=[course.pk]),
+        reverse("student_quiz_performance", args=[student.pk]),
+        reverse("admin_dashboard"),
+    ]
+
+
+class TestORJSON:
+    """Test cases for renderers.ORJSONRenderer and ORJSONParser."""
+
+    def test_matches_drf(self) -> None:
+        assert ORJSONRenderer().render(PAYLOAD) == JSONRenderer().render(PAYLOAD)
+        assert ORJSONRenderer().render(None) == JSONRenderer().render(None) == b""
+
+    def test_floats(self) -> None:
+        data = {"small": 1e-05, "tiny": 3e-07, "large": 1e16, "plain": 0.1}
+        assert ORJSONRenderer().render(data) == (
+            b'{"small":0.00001,"tiny":3e-7,"large":1e16,"plain":0.1}'
+        )
+        assert JSONRenderer().render(data) == (
+            b'{"small":1e-05,"tiny":3e-07,"large":1e+16,"plain":0.1}'
+        )
+        # Same values once parsed
+        assert json.loads(ORJSONRenderer().render(data)) == data
+
+    @pytest.mark.parametrize("value", [float("nan"), float("inf"), -float("inf")])
+    def test_non_finite_floats(self, value: float) -> None:
+        # e.g. an average over no rows: an error, as with DRF, not null
+        for data in (
+            {"average": value},
+            {"averages": [None, {"score": decimal.Decimal(value)}]},
+            {"scores": (None, {1.5, value})},
+            [value],
+        ):
+            with pytest.raises(ValueError):
+                JSONRenderer().render(data)
+            with pytest.raises(ValueError):
+                ORJSONRenderer().render(data)
+
+        data = {"average": None, "when": PAYLOAD["utc"], "id": PAYLOAD["id"]}
+        assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+    @pytest.mark.parametrize(
+        "data, media_type",
+        [
+            (PAYLOAD, "application/json; indent=2"),
+            ({"big": 2**70}, None),
+        ],
+    )
+    def test_fallback(self, data: Any, media_type: Any) -> None:
+        expected = JSONRenderer().render(data, media_type)
+        assert ORJSONRenderer().render(data, media_type) == expected
+
+    def test_parse(self) -> None:
+        body = JSONRenderer().render({"events": [{"task_id": 1, "text": "\u2028"}]})
+        assert ORJSONParser().parse(io.BytesIO(body)) == json.loads(body)
+
+        for body in (b"{", b'{"score": NaN}'):
+            with pytest.raises(ParseError):
+                ORJSONParser().parse(io.BytesIO(body))
+
+    def test_settings(self) -> None:
+        assert api_settings.DEFAULT_RENDERER_CLASSES[:2] == [
+            ORJSONRenderer,
+            MessagePackRenderer,
+        ]
+        assert api_settings.DEFAULT_PARSER_CLASSES[:2] == [
+            ORJSONParser,
+            MessagePackParser,
+        ]
+
+
+@pytest.mark.django_db
+class TestMessagePack:
+    """Test cases for renderers.MessagePackRenderer and MessagePackParser."""
+
+    def test_same_data_as_json(self, renderer_data: Dict[str, Any]) -> None:
+        client = renderer_data["client"]
+
+        for url in _analytics_urls(renderer_data):
+            as_json = client.get(url, HTTP_ACCEPT="application/json")
+            packed = client.get(url, HTTP_ACCEPT=MSGPACK)
+            assert packed.status_code == as_json.status_code == 200
+            assert packed["Content-Type"] == MSGPACK
+            assert msgpack.unpackb(packed.content) == json.loads(as_json.content)
+
+        # JSON stays the default
+        response = client.get(reverse("admin_dashboard"))
+        assert response["Content-Type"] == "application/json"
+
+    def test_render_values(self) -> None:
+        # MessagePack keeps integer map keys, which JSON turns into strings
+        data = {key: value for key, value in PAYLOAD.items() if key != "int_keys"}
+        unpacked = msgpack.unpackb(MessagePackRenderer().render(data))
+        assert unpacked == json.loads(JSONRenderer().render(data))
+
+    def test_request_body(self, renderer_data: Dict[str, Any]) -> None:
+        student, task = renderer_data["students"][0], renderer_data["tasks"][0]
+        client = APIClient()
+        client.force_authenticate(user=student)
+        body = msgpack.packb(
+            {
+                "events": [
+                    {
+                        "task_id": task.id,
+                        "status": "completed",
+                        "time_spent_delta": 60,
+                        "client_timestamp": "2026-03-01T12:00:00Z",
+                    }
+                ]
+            }
+        )
+
+        response = client.post(
+            "/api/v1/task-progress/bulk/", body, content_type=MSGPACK
+        )
+        assert response.status_code == 200
+        assert response.data["applied"] == 1
+
+        response = client.post(
+            "/api/v1/task-progress/bulk/", b"\xc1", content_type=MSGPACK
+        )
+        assert response.status_code == 400
+
+    @pytest.mark.slow
+    def test_benchmark(self, renderer_data: Dict[str, Any], add_students: Any) -> None:
+        """Benchmark: rendering analytics payloads of a 2,000 student course."""
+        course = renderer_data["course"]
+        tasks = LearningTask.objects.bulk_create(
+            [
+                LearningTask(
+                    course=course, title=f"Bench {i}", order=10 + i, is_published=True
+                )
+                for i in range(20)
+            ]
+        )
+        add_students(course, tasks, 2000, "renderer_bench_", time_spent=TIME_SPENT)
+
+        renderers = {
+            "drf json": JSONRenderer(),
+            "orjson": ORJSONRenderer(),
+            "msgpack": MessagePackRenderer(),
+        }
+        print()
+        for url in _analytics_urls(renderer_data):
+            cache.clear()
+            data = renderer_data["client"].get(url).data
+            timings = {}
+            rendered = {}
+            for name, renderer in renderers.items():
+                started = time.perf_counter()
+                for _ in range(5):
+                    rendered[name] = renderer.render(data)
+                timings[name] = (time.perf_counter() - started) / 5
+
+            # Float notation may differ (see test_floats)
+            assert json.loads(rendered["orjson"]) == json.loads(rendered["drf json"])
+            assert msgpack.unpackb(rendered["msgpack"]) == json.loads(
+                rendered["drf json"]
+            )
+            print(
+                f"{url}: "
+                + ", ".join(
+                    f"{name} {timings[name] * 1000:.2f} ms "
+                    f"({len(rendered[name]) / 1024:.0f} KiB)"
+                    for name in renderers
+                )
+                + f" - orjson {timings['drf json'] / timings['orjson']:.1f}x"
+            )
@@ -0,0 +1,158 @@
+"""
+Test suite for sparse fieldsets and opt-in expansion.
+
+Test cases:
+- Nested blocks are returned by default
+- Fields listed in Meta.expandable_fields are left out unless expanded
+- ?fields= keeps only the named fields, including inside nested blocks
+- Nested blocks that are not selected cost no queries
+- Large text columns that are not selected are deferred
+"""
+
+import datetime
+from typing import Any, Dict, List
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from core.models import (
+    Course,
+    CourseEnrollment,
+    QuizAttempt,
+    QuizOption,
+    QuizQuestion,
+    QuizResponse,
+    QuizTask,
+    User,
+)
+from core.serializers import QuizAttemptSerializer
+
+
+@pytest.fixture
+def sparse_data(db: Any) -> Dict[str, Any]:
+    instructor = User.objects.create_user(
+        username="sparse_instructor",
+        email="sparse_instructor@test.com",
+        password="testpass123",
+        role="instructor",
+    )
+    student = User.objects.create_user(
+        username="sparse_student", email="sparse_student@test.com", password="x"
+    )
+    course = Course.objects.create(
+        title="Sparse",
+        description="# A long markdown description",
+        creator=instructor,
+        status="published",
+    )
+    quiz = QuizTask.objects.create(course=course, title="Quiz", is_published=True)
+    question = QuizQuestion.objects.create(quiz=quiz, text="Q?", points=1, order=0)
+    option = QuizOption.objects.create(
+        question=question, text="A", is_correct=True, order=0
+    )
+    for _ in range(3):
+        attempt = QuizAttempt.objects.create(
+            user=student,
+            quiz=quiz,
+            score=100,
+            time_taken=datetime.timedelta(minutes=1),
+            completion_status="completed",
+        )
+        QuizResponse.objects.create(
+            attempt=attempt,
+            question=question,
+            selected_option=option,
+            is_correct=True,
+            time_spent=datetime.timedelta(seconds=10),
+        )
+    CourseEnrollment.objects.create(user=student, course=course, status="active")
+    client = APIClient()
+    client.force_authenticate(user=student)
+    return {"client": client, "course": course}
+
+
+def _results(client: APIClient, url: str) -> List[Dict[str, Any]]:
+    response = client.get(url)
+    assert response.status_code == 200
+    return response.data["results"]
+
+
+@pytest.mark.django_db
+class TestSparseFields:
+    """Test cases for sparse_fields.SparseFieldsMixin and its view mixin."""
+
+    def test_default_payload(self, sparse_data: Dict[str, Any]) -> None:
+        client = sparse_data["client"]
+
+        attempt = _results(client, "/api/v1/quiz-attempts/")[0]
+        assert attempt["quiz_details"]["questions"][0]["options"][0]["text"] == "A"
+        assert attempt["responses"][0]["question_details"]["text"] == "Q?"
+        assert attempt["user_details"]["username"] == "sparse_student"
+
+        enrollment = _results(client, "/api/v1/enrollments/")[0]
+        assert enrollment["course_details"]["title"] == "Sparse"
+
+    def test_expandable_fields(self, sparse_data: Dict[str, Any]) -> None:
+        class AttemptSerializer(QuizAttemptSerializer):
+            class Meta(QuizAttemptSerializer.Meta):
+                expandable_fields = ["quiz_details"]
+
+        attempt = QuizAttempt.objects.first()
+        data = AttemptSerializer(attempt, context={}).data
+        assert "quiz_details" not in data
+        assert data["responses"][0]["question_details"]["text"] == "Q?"
+
+        data = AttemptSerializer(attempt, context={"expand": "quiz_details"}).data
+        assert data["quiz_details"]["title"] == "Quiz"
+
+    def test_fields(self, sparse_data: Dict[str, Any]) -> None:
+        client = sparse_data["client"]
+
+        attempts = _results(client, "/api/v1/quiz-attempts/?fields=id,score")
+        assert [set(attempt) for attempt in attempts] == [{"id", "score"}] * 3
+
+        attempt = _results(
+            client, "/api/v1/quiz-attempts/?fields=id,quiz_details.title"
+        )[0]
+        assert attempt == {"id": attempt["id"], "quiz_details": {"title": "Quiz"}}
+
+        course = _results(client, "/api/v1/courses/?fields=title,creator_details")[0]
+        assert set(course) == {"title", "creator_details"}
+        assert course["creator_details"]["username"] == "sparse_instructor"
+
+    def test_unselected_blocks_cost_nothing(self, sparse_data: Dict[str, Any]) -> None:
+        client = sparse_data["client"]
+
+        with CaptureQueriesContext(connection) as ctx:
+            _results(client, "/api/v1/quiz-attempts/?fields=id,score,user_details")
+        tables = " ".join(query["sql"] for query in ctx.captured_queries)
+        assert "core_quizquestion" not in tables
+        assert "core_quizresponse" not in tables
+
+        with CaptureQueriesContext(connection) as ctx:
+            _results(client, "/api/v1/enrollments/?fields=id,status")
+        tables = " ".join(query["sql"] for query in ctx.captured_queries)
+        assert "core_courseprogresssummary" not in tables
+
+    def test_deferred_columns(self, sparse_data: Dict[str, Any]) -> None:
+        client = sparse_data["client"]
+
+        with CaptureQueriesContext(connection) as ctx:
+            _results(client, "/api/v1/courses/?fields=id,title")
+        query_count = len(ctx.captured_queries)
+        course_queries = [
+            query["sql"]
+            for query in ctx.captured_queries
+            if query["sql"].startswith('SELECT "core_course"."id"')
+        ]
+        assert len(course_queries) == 1
+        assert '"core_course"."description"' not in course_queries[0]
+        assert '"core_course"."learning_objectives"' not in course_queries[0]
+
+        with CaptureQueriesContext(connection) as ctx:
+            course = _results(client, "/api/v1/courses/?fields=id,description_html")[0]
+        assert course["description_html"].startswith("<h1")
+        # The columns description_html reads are loaded with the rows
+        assert len(ctx.captured_queries) == query_count
@@ -0,0 +1,185 @@
+"""
+Test suite for stale-while-revalidate and degraded-mode serving.
+
+Test cases:
+- Fresh payloads carry the freshness header and their age
+- Payloads past the soft TTL are served stale and refreshed in the background
+- The last good copy is served when a recompute fails or exceeds its budget,
+  and the recompute still stores its result
+- A full refresh pool drops new work and keeps serving cached copies
+- The student dashboard degrades instead of failing with a 500
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+from django.db import DatabaseError
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core import caching
+from core.models import Course, CourseEnrollment, LearningTask, TaskProgress, User
+from core.views import dashboards
+
+
+def _counter(values: List[Any]) -> Any:
+    calls: List[int] = []
+
+    def compute() -> Any:
+        calls.append(1)
+        return values[len(calls) - 1]
+
+    compute.calls = calls
+    return compute
+
+
+class TestServeCached:
+    """Test cases for caching.serve_cached."""
+
+    def test_fresh(self, clean_cache: Any) -> None:
+        compute = _counter(["v1"])
+        first = caching.serve_cached("swr", compute, users=[1])
+        second = caching.serve_cached("swr", compute, users=[1])
+
+        assert (first.data, first.status) == ("v1", caching.FRESH)
+        assert (second.data, second.status) == ("v1", caching.FRESH)
+        assert second.headers == {"X-Cache-Status": "fresh", "Age": "0"}
+        assert len(compute.calls) == 1
+
+    def test_stale_refreshed_in_background(self, clean_cache: Any) -> None:
+        compute = _counter(["v1", "v2"])
+        caching.serve_cached("swr", compute, users=[1])
+
+        # Past the soft TTL, with the background refresh run inline
+        with (
+            mock.patch.object(caching, "SOFT_TTL", 0),
+            mock.patch.object(caching, "_refresh_executor") as executor,
+            mock.patch.object(caching, "connections"),
+        ):
+            executor.submit.side_effect = lambda refresh: refresh()
+            stale = caching.serve_cached("swr", compute, users=[1])
+
+        assert (stale.data, stale.status) == ("v1", caching.STALE)
+        assert executor.submit.call_count == 1
+        fresh = caching.serve_cached("swr", compute, users=[1])
+        assert (fresh.data, fresh.status) == ("v2", caching.FRESH)
+
+    def test_degraded_on_failure(self, clean_cache: Any) -> None:
+        caching.serve_cached("swr", _counter(["v1"]), users=[1])
+        caching.bump_generation(caching.USER, 1)
+
+        failing = mock.Mock(side_effect=DatabaseError("timeout"))
+        degraded = caching.serve_cached("swr", failing, users=[1])
+
+        assert (degraded.data, degraded.status) == ("v1", caching.DEGRADED)
+        # Without a last good copy the error propagates
+        with pytest.raises(DatabaseError):
+            caching.serve_cached("swr", failing, users=[2])
+
+    @pytest.mark.parametrize("locked_elsewhere", [False, True])
+    def test_degraded_over_budget(
+        self, clean_cache: Any, locked_elsewhere: bool
+    ) -> None:
+        caching.serve_cached("swr", _counter(["v1"]), users=[1])
+        caching.bump_generation(caching.USER, 1)
+        if locked_elsewhere:
+            # Another request is already recomputing the new entry
+            key = caching.versioned_key("swr", users=[1])
+            cache.add(caching._lock_key(key), 1, caching.LOCK_TIMEOUT)
+
+        def slow() -> str:
+            time.sleep(0.3)
+            return "v2"
+
+        executor = ThreadPoolExecutor(max_workers=1)
+        with (
+            mock.patch.object(caching, "RECOMPUTE_BUDGET", 0.05),
+            mock.patch.object(caching, "WAIT_TIMEOUT", 0.1),
+            mock.patch.object(caching, "_refresh_executor", executor),
+        ):
+            result = caching.serve_cached("swr", slow, users=[1])
+            executor.shutdown(wait=True)
+
+        assert (result.data, result.status) == ("v1", caching.DEGRADED)
+        # The recompute kept running and stored its result
+        result = caching.serve_cached("swr", _counter(["v3"]), users=[1])
+        assert (result.data, result.status) == ("v2", caching.FRESH)
+
+    def test_saturated_pool(self, clean_cache: Any) -> None:
+        caching.serve_cached("swr", _counter(["v1"]), users=[1])
+        caching.serve_cached("swr", _counter(["v1"]), users=[2])
+        caching.bump_generation(caching.USER, 2)
+
+        # One worker busy and one task waiting fill the pool
+        executor = ThreadPoolExecutor(max_workers=1)
+        release = threading.Event()
+        with (
+            mock.patch.object(caching, "_refresh_executor", executor),
+            mock.patch.object(caching, "_refresh_slots", threading.Semaphore(2)),
+        ):
+            for _ in range(2):
+                caching._in_background(release.wait)
+
+            with mock.patch.object(caching, "SOFT_TTL", 0):
+                stale = caching.serve_cached("swr", _counter(["v2"]), users=[1])
+            degraded = caching.serve_cached("swr", _counter(["v2"]), users=[2])
+            queued = executor._work_queue.qsize()
+            release.set()
+            executor.shutdown(wait=True)
+
+        assert (stale.data, stale.status) == ("v1", caching.STALE)
+        assert (degraded.data, degraded.status) == ("v1", caching.DEGRADED)
+        assert queued == 1
+        # The dropped refresh left its lock for a later request to take
+        key = caching.versioned_key("swr", users=[1])
+        assert cache.get(caching._lock_key(key)) is None
+
+
+@pytest.fixture
+def dashboard_data(db: Any, clean_cache: Any) -> Dict[str, Any]:
+    instructor = User.objects.create_user(
+        username="swr_instructor",
+        email="swr_instructor@test.com",
+        password="testpass123",
+        role="instructor",
+    )
+    student = User.objects.create_user(
+        username="swr_student", email="swr_student@test.com", password="x"
+    )
+    course = Course.objects.create(title="SWR", description="C", creator=instructor)
+    task = LearningTask.objects.create(course=course, title="Task", is_published=True)
+    CourseEnrollment.objects.create(user=student, course=course, status="active")
+    client = APIClient()
+    client.force_authenticate(user=student)
+    return {"student": student, "task": task, "client": client}
+
+
+@pytest.mark.django_db
+class TestDashboardDegradedMode:
+    """Test cases for the dashboard freshness header and fallback."""
+
+    def test_dashboard_degrades(self, dashboard_data: Dict[str, Any]) -> None:
+        client, student = dashboard_data["client"], dashboard_data["student"]
+        url = reverse("student-dashboard-detail", kwargs={"pk": student.id})
+        response = client.get(url)
+        assert response["X-Cache-Status"] == "fresh"
+
+        TaskProgress.objects.create(
+            user=student, task=dashboard_data["task"], status="completed"
+        )
+        with mock.patch.object(
+            dashboards,
+            "student_dashboard_data",
+            side_effect=DatabaseError("statement timeout"),
+        ):
+            response = client.get(url)
+
+        assert response.status_code == 200
+        assert response["X-Cache-Status"] == "degraded"
+        assert response.data["progress"]["completed_tasks"] == 0
+        assert "Age" in response
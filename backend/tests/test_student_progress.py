@@ -0,0 +1,150 @@
+"""
+Test suite for the Student Progress API endpoint.
+
+Test cases:
+- Per-course progress, quiz scores and recent activity
+- Partial refresh with ?course_ids=
+- Constant query count regardless of the number of enrolled courses
+"""
+
+import datetime
+from typing import Any, Dict
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core.models import (
+    Course,
+    CourseEnrollment,
+    LearningTask,
+    QuizAttempt,
+    QuizTask,
+    TaskProgress,
+    User,
+)
+
+
+def _course(creator: User, title: str, tasks: int = 2) -> tuple:
+    course = Course.objects.create(title=title, description="C", creator=creator)
+    created = LearningTask.objects.bulk_create(
+        [
+            LearningTask(course=course, title=f"{title} {i}", is_published=True)
+            for i in range(tasks)
+        ]
+    )
+    return course, created
+
+
+@pytest.fixture
+def progress_data(db: Any) -> Dict[str, Any]:
+    cache.clear()
+    student = User.objects.create_user(
+        username="progress_student",
+        email="progress_student@test.com",
+        password="testpass123",
+    )
+    other = User.objects.create_user(
+        username="progress_other", email="progress_other@test.com", password="x"
+    )
+    client = APIClient()
+    client.force_authenticate(user=student)
+    return {"student": student, "other": other, "client": client}
+
+
+@pytest.mark.django_db
+class TestStudentProgressAPI:
+    """Test cases for the Student Progress API."""
+
+    def test_progress_payload(self, progress_data: Dict[str, Any]) -> None:
+        student, other = progress_data["student"], progress_data["other"]
+        first, first_tasks = _course(student, "First", tasks=4)
+        second, _ = _course(student, "Second")
+        LearningTask.objects.create(course=first, title="Draft")
+        CourseEnrollment.objects.create(user=student, course=first, status="active")
+        CourseEnrollment.objects.create(user=student, course=second, status="completed")
+        for task in first_tasks:
+            TaskProgress.objects.create(user=student, task=task, status="completed")
+            TaskProgress.objects.create(user=other, task=task, status="completed")
+        quiz = QuizTask.objects.create(course=first, title="Quiz")
+        for score in (60, 80):
+            QuizAttempt.objects.create(
+                user=student,
+                quiz=quiz,
+                score=score,
+                time_taken=datetime.timedelta(minutes=1),
+                completion_status="completed",
+            )
+
+        response = progress_data["client"].get(reverse("student_personal_progress"))
+
+        assert response.status_code == 200
+        stats = response.data["overall_stats"]
+        assert (stats["total_courses"], stats["active_courses"]) == (2, 1)
+        assert stats["completed_courses"] == 1
+        assert (stats["total_tasks_completed"], stats["total_tasks"]) == (4, 6)
+        assert stats["average_quiz_score"] == 70
+        courses = {row["course_title"]: row for row in response.data["courses"]}
+        assert courses["First"]["progress_summary"] == {
+            "completion_percentage": 100.0,
+            "completed_tasks": 4,
+            "total_tasks": 4,
+        }
+        assert courses["First"]["assessment_performance"] == {
+            "average_quiz_score": 70.0,
+            "quiz_attempts": 2,
+        }
+        assert len(courses["First"]["recent_activity"]) == 3
+        assert courses["First"]["last_access"] is not None
+        assert courses["Second"]["recent_activity"] == []
+        assert courses["Second"]["last_access"] is None
+
+    def test_partial_refresh(self, progress_data: Dict[str, Any]) -> None:
+        student = progress_data["student"]
+        courses = [_course(student, f"Course {i}")[0] for i in range(3)]
+        for course in courses:
+            CourseEnrollment.objects.create(
+                user=student, course=course, status="active"
+            )
+
+        response = progress_data["client"].get(
+            reverse("student_personal_progress"),
+            {"course_ids": f"{courses[1].id}"},
+        )
+
+        assert response.status_code == 200
+        assert "overall_stats" not in response.data
+        assert [row["course_id"] for row in response.data["courses"]] == [courses[1].id]
+        invalid = progress_data["client"].get(
+            reverse("student_personal_progress"), {"course_ids": "a"}
+        )
+        assert invalid.status_code == 400
+
+    @pytest.mark.slow
+    def test_constant_query_count(self, progress_data: Dict[str, Any]) -> None:
+        """Benchmark: query count does not grow with the number of courses."""
+        counts = {}
+        for size in (1, 30):
+            user = User.objects.create_user(
+                username=f"many{size}", email=f"many{size}@test.com", password="x"
+            )
+            for i in range(size):
+                course, tasks = _course(user, f"C{size}-{i}", tasks=5)
+                CourseEnrollment.objects.create(
+                    user=user, course=course, status="active"
+                )
+                TaskProgress.objects.bulk_create(
+                    [TaskProgress(user=user, task=t, status="completed") for t in tasks]
+                )
+            client = APIClient()
+            client.force_authenticate(user=user)
+            with CaptureQueriesContext(connection) as ctx:
+                response = client.get(reverse("student_personal_progress"))
+            assert response.status_code == 200
+            assert response.data["overall_stats"]["total_tasks_completed"] == size * 5
+            counts[size] = len(ctx.captured_queries)
+
+        assert counts[1] == counts[30]
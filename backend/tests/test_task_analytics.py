@@ -0,0 +1,191 @@
+"""
+Test suite for the Course Task Analytics API endpoint.
+
+Test cases:
+- Status counts and completion time statistics per task
+- Quiz score and question success rate analysis
+- Filtering with ?task_ids=
+- Constant query count regardless of the number of tasks
+"""
+
+import datetime
+from typing import Any, Dict
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.models import (
+    Course,
+    LearningTask,
+    QuizAttempt,
+    QuizOption,
+    QuizQuestion,
+    QuizResponse,
+    QuizTask,
+    TaskProgress,
+    User,
+)
+
+
+def _students(count: int, prefix: str) -> list:
+    return User.objects.bulk_create(
+        [
+            User(username=f"{prefix}{i}", email=f"{prefix}{i}@test.com")
+            for i in range(count)
+        ]
+    )
+
+
+def _complete(task: LearningTask, users: list, hours: list) -> None:
+    """Record completed progress taking the given number of hours per user."""
+    now = timezone.now()
+    TaskProgress.objects.bulk_create(
+        [
+            TaskProgress(
+                user=user,
+                task=task,
+                status="completed",
+                start_date=now - datetime.timedelta(hours=spent),
+                completion_date=now,
+            )
+            for user, spent in zip(users, hours)
+        ]
+    )
+
+
+@pytest.fixture
+def task_data(db: Any) -> Dict[str, Any]:
+    cache.clear()
+    instructor = User.objects.create_user(
+        username="task_analytics_instructor",
+        email="task_analytics_instructor@test.com",
+        password="testpass123",
+        role="instructor",
+    )
+    course = Course.objects.create(
+        title="Task analytics", description="Course", creator=instructor
+    )
+    client = APIClient()
+    client.force_authenticate(user=instructor)
+    return {"course": course, "client": client}
+
+
+def _url(course: Course) -> str:
+    return reverse("course_task_analytics", kwargs={"pk": course.id})
+
+
+@pytest.mark.django_db
+class TestCourseTaskAnalyticsAPI:
+    """Test cases for the Course Task Analytics API."""
+
+    def test_completion_statistics(self, task_data: Dict[str, Any]) -> None:
+        course = task_data["course"]
+        task = LearningTask.objects.create(course=course, title="Reading")
+        users = _students(12, "stats")
+        _complete(task, users[:10], [1, 2, 3, 4, 5, 6, 7, 8, 9, 10])
+        TaskProgress.objects.create(user=users[10], task=task, status="in_progress")
+        TaskProgress.objects.create(user=users[11], task=task, status="not_started")
+
+        response = task_data["client"].get(_url(course))
+
+        assert response.status_code == 200
+        [data] = response.data
+        assert data["type"] == "task"
+        stats = data["completion_stats"]
+        assert stats["total_students"] == 12
+        assert (stats["completed"], stats["in_progress"], stats["not_started"]) == (
+            10,
+            1,
+            1,
+        )
+        assert stats["completion_rate"] == 83.33
+        assert stats["avg_completion_time_hours"] == 5.5
+        assert stats["median_completion_time_hours"] == 5
+        assert stats["p90_completion_time_hours"] == 9
+        assert data["difficulty_assessment"]["estimated_difficulty"] == "low"
+
+    def test_quiz_analysis(self, task_data: Dict[str, Any]) -> None:
+        course = task_data["course"]
+        quiz = QuizTask.objects.create(course=course, title="Quiz")
+        hard = QuizQuestion.objects.create(quiz=quiz, text="Hard")
+        QuizQuestion.objects.create(quiz=quiz, text="Unanswered")
+        right = QuizOption.objects.create(question=hard, text="A", is_correct=True)
+        users = _students(4, "quiz")
+        for i, user in enumerate(users):
+            attempt = QuizAttempt.objects.create(
+                user=user,
+                quiz=quiz,
+                score=25 * i,
+                time_taken=datetime.timedelta(minutes=1),
+                completion_status="completed",
+            )
+            QuizResponse.objects.create(
+                attempt=attempt,
+                question=hard,
+                selected_option=right,
+                is_correct=i == 0,
+                time_spent=datetime.timedelta(seconds=5),
+            )
+
+        response = task_data["client"].get(_url(course))
+
+        [data] = response.data
+        assert data["type"] == "quiz"
+        quiz_data = data["quiz_analysis"]
+        assert quiz_data["average_score"] == 37.5
+        assert quiz_data["total_attempts"] == 4
+        assert [
+            (q["text"], q["success_rate"], q["total_responses"])
+            for q in quiz_data["question_analysis"]
+        ] == [("Unanswered", 0, 0), ("Hard", 25.0, 4)]
+        assert data["completion_stats"]["median_completion_time_hours"] is None
+
+    def test_task_ids_filter(self, task_data: Dict[str, Any]) -> None:
+        course = task_data["course"]
+        tasks = [
+            LearningTask.objects.create(course=course, title=f"Task {i}")
+            for i in range(3)
+        ]
+
+        response = task_data["client"].get(
+            _url(course), {"task_ids": f"{tasks[0].id},{tasks[2].id}"}
+        )
+
+        assert response.status_code == 200
+        assert {row["task_id"] for row in response.data} == {tasks[0].id, tasks[2].id}
+        full = task_data["client"].get(_url(course))
+        assert len(full.data) == 3
+        invalid = task_data["client"].get(_url(course), {"task_ids": "1,x"})
+        assert invalid.status_code == 400
+
+    @pytest.mark.slow
+    def test_constant_query_count(self, task_data: Dict[str, Any]) -> None:
+        """Benchmark: query count does not grow with tasks, students or questions."""
+        counts = {}
+        users = _students(50, "bench")
+        for size in (2, 40):
+            cache.clear()
+            course = Course.objects.create(
+                title=f"Size {size}",
+                description="Course",
+                creator=task_data["course"].creator,
+            )
+            for i in range(size):
+                task = LearningTask.objects.create(course=course, title=f"T{i}")
+                _complete(task, users, range(1, len(users) + 1))
+                quiz = QuizTask.objects.create(course=course, title=f"Q{i}")
+                QuizQuestion.objects.bulk_create(
+                    [QuizQuestion(quiz=quiz, text=f"Q{j}") for j in range(size)]
+                )
+            with CaptureQueriesContext(connection) as ctx:
+                response = task_data["client"].get(_url(course))
+            assert response.status_code == 200
+            assert len(response.data) == size * 2
+            counts[size] = len(ctx.captured_queries)
+
+        assert counts[2] == counts[40]
@@ -30,6 +30,8 @@ from .check_server import (
 from .markdown_utils import (
     convert_markdown_to_html,
     extract_metadata,
+    markdown_content_hash,
+    markdown_render_fingerprint,
     process_code_blocks,
     validate_markdown_content,
 )
@@ -40,6 +42,8 @@ __all__ = [
     "process_code_blocks",
     "validate_markdown_content",
     "extract_metadata",
+    "markdown_content_hash",
+    "markdown_render_fingerprint",
     # Server checks
     "check_server_health",
     "verify_jwt_token",
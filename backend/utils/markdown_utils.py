@@ -6,6 +6,8 @@ used throughout the platform, including course descriptions, task content,
 and quiz questions.
 """
 
+import hashlib
+import json
 import logging
 import re
 from typing import Any, Dict, List, Optional, Tuple
@@ -149,6 +151,38 @@ def convert_markdown_to_html(
         raise
 
 
+def markdown_render_fingerprint() -> str:
+    """
+    Return a fingerprint of the settings that shape sanitized markdown output.
+
+    Stored HTML rendered under a different sanitizer allow-list carries a
+    different content hash, so it is detected as stale.
+    """
+    allow_list = {
+        "tags": sorted(EXTENDED_ALLOWED_TAGS),
+        "attrs": {tag: sorted(attrs) for tag, attrs in EXTENDED_ALLOWED_ATTRS.items()},
+    }
+    return json.dumps(allow_list, sort_keys=True)
+
+
+def markdown_content_hash(content: str, fingerprint: Optional[str] = None) -> str:
+    """
+    Hash markdown content together with the current render fingerprint.
+
+    Args:
+        content (str): The markdown source
+        fingerprint (Optional[str]): ``markdown_render_fingerprint()``, for
+            callers hashing many contents at once
+
+    Returns:
+        str: Hex SHA-256 digest identifying the rendered output
+    """
+    if fingerprint is None:
+        fingerprint = markdown_render_fingerprint()
+    payload = f"{fingerprint}\0{content or ''}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
 def process_code_blocks(html: str, default_lang: str = "text") -> str:
     """
     Process and syntax highlight code blocks in HTML content.